@@ -1,4 +1,3 @@
-import pandas as pd
 import streamlit as st
 import sys
 import os
@@ -10,10 +9,8 @@ from ui.components import ensure_state, sidebar_nav, save_button, t, bootstrap
 from core.db import list_projects, load_project, delete_project
 from core.auth import logout, check_permission
 from core.model import ProjectModel
-from core.engine import calculate_financials
-from core.insights import generate_insights
-import plotly.express as px
-import plotly.graph_objects as go
+# pandas, plotly and the engine are imported where first used so the login
+# form renders without paying for them (see scripts/import_benchmark.py)
 
 st.set_page_config(page_title="Invest Feasibility", layout="wide")
 
@@ -58,6 +55,7 @@ else:
         from core.db import list_project_history
         hist = list_project_history(selected_id)
         if hist:
+            import pandas as pd
             h_df = pd.DataFrame(hist)
             # Rename columns for display
             h_df = h_df.rename(columns={
@@ -118,6 +116,8 @@ if st.session_state.project and st.session_state.project.id:
     st.header(t("exec_summary"))
     
     # Calculate Results
+    from core.engine import calculate_financials
+    from core.insights import generate_insights
     try:
         results = calculate_financials(st.session_state.project)
         
@@ -139,15 +139,31 @@ if st.session_state.project and st.session_state.project.id:
         with c4:
             st.metric(t("payback_period"), f"{kpi.get('payback', 0):.1f}", help=t("payback_help"))
             
+        # --- BREAK-EVEN (goal seek on the batched engine) ---
+        from core.solver import break_even_summary
+        break_even = break_even_summary(st.session_state.project)
+        with st.container(border=True):
+            st.markdown(f"#### {t('be_title')}", help=t("be_help"))
+            be_cols = st.columns(len(break_even))
+            for col, (driver, be) in zip(be_cols, break_even.items()):
+                label = t("var_" + driver.lower().replace(" ", "_"))
+                if be["value"] is None or not be["converged"]:
+                    col.metric(label, t("be_not_found"), help=t("be_not_found_help"))
+                elif driver == "Discount Rate":
+                    col.metric(label, f"{be['value'] * 100:.1f} %")
+                else:
+                    col.metric(label, f"{be['change_pct']:+.1f} %")
+
         # --- INCREMENTAL ANALYSIS (Sprint 1) ---
         if getattr(st.session_state.project, 'baseline_enabled', False):
-            from core.engine import calculate_baseline
-            res_base = calculate_baseline(st.session_state.project)
+            from core.engine import calculate_incremental
+            incremental = calculate_incremental(st.session_state.project)
+            res_base = incremental["without"]
             
             # Avg EBITDA
             ebitda_base = res_base.ebitda_arr.mean() if len(res_base.ebitda_arr) > 0 else 0
             ebitda_curr = results.ebitda_arr.mean() if len(results.ebitda_arr) > 0 else 0
-            delta_ebitda = ebitda_curr - ebitda_base
+            delta_ebitda = incremental["delta_income"]["EBITDA"].mean() if len(res_base.ebitda_arr) > 0 else 0
             
             st.divider()
             
@@ -179,6 +195,8 @@ if st.session_state.project and st.session_state.project.id:
         
         with col_chart:
             st.subheader(t("chart_fcf_trend"))
+            import pandas as pd
+            import plotly.express as px
             df_chart = pd.DataFrame({
                 "Year": results.years,
                 "FCF": results.free_cash_flow
@@ -1,15 +1,31 @@
 """
 Authentication utilities.
 Actual user storage and auth logic is in core/db.py.
+
+Accepted risk: Streamlit cannot set response headers, so the session cookie
+is written by a small script (see _write_session_cookie) and cannot be
+HttpOnly. Any script running on the page can read the token and use it until
+it expires (SESSION_TTL_SECONDS) or the user logs out. The token is kept out
+of URLs and is SameSite=Strict (Secure on https); deployments that need
+HttpOnly cookies should terminate authentication in a reverse proxy.
 """
+from typing import Optional
+
 import streamlit as st
-from core.db import authenticate_user
+from core.db import authenticate_user, is_login_locked, create_session, validate_session, revoke_session, SESSION_TTL_SECONDS
 
 # Let's define roles constants
 ROLE_ADMIN = "Admin"
 ROLE_EDITOR = "Editor"
 ROLE_VIEWER = "Viewer"
 
+# Cookie carrying the session token so a page reload can re-authenticate
+# without another PBKDF2 password check. Kept out of the URL so it does not
+# end up in browser history, proxy logs or Referer headers.
+SESSION_COOKIE = "feasibility_sid"
+# Older builds put the token in this query param; it is dropped, never read.
+LEGACY_QUERY_PARAM = "sid"
+
 def check_permission(user_role: str, action: str) -> bool:
     """
     actions: 'create_project', 'edit_project', 'delete_project', 'view_project', 'export_data', 'manage_users'
@@ -29,13 +45,58 @@ def check_permission(user_role: str, action: str) -> bool:
         
     return False
 
+def _client() -> Optional[str]:
+    """Client address used to key the login lockout (None when unknown)."""
+    try:
+        ip = st.context.ip_address
+    except Exception:
+        return None
+    return ip if isinstance(ip, str) else None
+
+def _write_session_cookie(token: str = "", max_age: int = 0):
+    """Sets (or with max_age=0 clears) the session cookie in the browser."""
+    url = getattr(st.context, "url", None)
+    secure = "; Secure" if isinstance(url, str) and url.startswith("https") else ""
+    st.html(
+        f"<script>document.cookie = '{SESSION_COOKIE}={token}; Path=/; Max-Age={int(max_age)}; SameSite=Strict{secure}';</script>",
+        unsafe_allow_javascript=True,
+    )
+
+def _clear_login():
+    st.session_state.logged_in = False
+    st.session_state.user = None
+    st.session_state.session_token = None
+
 def login_form():
     """Renders login form and handles session state."""
     if 'logged_in' not in st.session_state:
         st.session_state.logged_in = False
+    if LEGACY_QUERY_PARAM in st.query_params:
+        del st.query_params[LEGACY_QUERY_PARAM]
         
     if st.session_state.logged_in:
-        return True
+        # Re-checked on every run so revoked / expired sessions end at once
+        token = st.session_state.get("session_token")
+        user = validate_session(token)
+        if user:
+            st.session_state.user = user
+            if not st.session_state.get("_session_cookie_written"):
+                _write_session_cookie(token, SESSION_TTL_SECONDS)
+                st.session_state._session_cookie_written = True
+            return True
+        _clear_login()
+        
+    # Session lost (reload / new websocket): try the signed token first
+    token = st.context.cookies.get(SESSION_COOKIE)
+    if token:
+        user = validate_session(token)
+        if user:
+            st.session_state.logged_in = True
+            st.session_state.user = user
+            st.session_state.session_token = token
+            st.session_state._session_cookie_written = True
+            return True
+        _write_session_cookie()
         
     st.title("Login Required")
     
@@ -45,12 +106,20 @@ def login_form():
         submitted = st.form_submit_button("Login")
         
         if submitted:
+            client = _client()
+            if is_login_locked(username, client):
+                st.error("Too many failed attempts. Please try again later.")
+                return False
+                
             # Authenticate against DB
-            user = authenticate_user(username, password)
+            user = authenticate_user(username, password, client)
             
             if user:
                 st.session_state.logged_in = True
                 st.session_state.user = user
+                st.session_state.session_token = create_session(user)
+                # The cookie is written on the next run (st.rerun drops this one)
+                st.session_state._session_cookie_written = False
                 st.success("Login successful!")
                 st.rerun()
             else:
@@ -59,6 +128,9 @@ def login_form():
     return False
 
 def logout():
-    st.session_state.logged_in = False
-    st.session_state.user = None
+    token = st.session_state.get("session_token")
+    if token:
+        revoke_session(token)
+    _clear_login()
+    # The login form clears the (now revoked) cookie on the next run
     st.rerun()
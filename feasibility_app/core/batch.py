@@ -0,0 +1,530 @@
+"""
+Batched engine.
+`compile_model` flattens a ProjectModel into per-item arrays once;
+`evaluate_batch` then evaluates many driver combinations (rows) together with
+numpy, vectorized over the batch, instead of one deepcopy + calculate_financials
+per row. Results match `calculate_financials` on a model modified with
+`apply_factor_to_model` (and the rate/term overrides below).
+Stochastic FX / inflation paths (core.paths) enter as (rows x periods) arrays,
+so exchange rates and price levels can vary by period within each row; so do
+targeted shocks on single products, CAPEX items, expenses and loans
+(core.shocks).
+"""
+from typing import Dict, Any, Optional, List, Tuple
+
+import numpy as np
+
+from core.model import ProjectModel
+from core import depreciation, finance
+from core.curves import IndexCurves
+
+# Driver name -> kind.
+# "factor": multiplier on the base inputs (same as core.risk.apply_factor_to_model)
+# "value": absolute value replacing the model input (rates as decimals, term in years)
+DRIVERS = {
+    "Price": "factor",
+    "Volume": "factor",
+    "CAPEX": "factor",
+    "OPEX": "factor",
+    "Discount Rate": "value",   # active mode's rate (WACC or cost of equity)
+    "Interest Rate": "value",   # annual rate, applied to every loan
+    "Loan Term": "value",       # term in years, applied to every loan
+}
+
+BATCH_KPIS = ["npv", "irr", "roi", "dscr_min", "dscr_avg", "ending_debt_balance", "tv_pv"]
+
+class CompiledModel:
+    """Model flattened into arrays. Monetary inputs stay in source currency (see `fx`)."""
+    def __init__(self):
+        self.horizon: int = 0
+        self.pp_year: int = 1
+        self.total_periods: int = 0
+        self.fx: Dict[str, float] = {}
+        self.settings: Dict[str, Any] = {}
+        # Products (one entry per product, growth indices per period)
+        self.products: List[Dict[str, Any]] = []
+        # Per-currency period arrays (source currency, before driver factors)
+        self.fixed_opex: Dict[str, np.ndarray] = {}
+        self.personnel_fixed: Dict[str, np.ndarray] = {}
+        self.personnel_scalable: Dict[str, np.ndarray] = {}
+        self.capex_flow: Dict[str, np.ndarray] = {}
+        self.capex_dep: Dict[str, np.ndarray] = {}
+        # Per item (model index, currency, purchase period, cash flow,
+        # depreciation): FX paths book each asset at the rate of its purchase
+        # period, shocks scale single items
+        self.capex_dep_items: List[Dict[str, Any]] = []
+        # Per fixed expense (model index, currency, period costs) for shocks
+        self.expense_items: List[Dict[str, Any]] = []
+        self.capex_count: int = 0 # CAPEX items in the model (incl. ones outside the horizon)
+        self.grant_dep_reduction: float = 0.0
+        self.grant_cash: np.ndarray = np.array([])
+        self.grant_taxable: np.ndarray = np.array([])
+        self.loans: List[Dict[str, Any]] = []
+        # Leasing is not driven by any driver: precomputed in base currency
+        self.lease: Dict[str, np.ndarray] = {}
+
+def _add(target: Dict[str, np.ndarray], currency: str, arr: np.ndarray):
+    if currency in target:
+        target[currency] = target[currency] + arr
+    else:
+        target[currency] = arr
+
+def compile_model(model: ProjectModel) -> CompiledModel:
+    """Precomputes everything in `calculate_financials` that does not depend on the drivers."""
+    cm = CompiledModel()
+    horizon = model.horizon_years
+    pp_year = 12 if model.granularity == "Month" else 1
+    T = horizon * pp_year
+    cm.horizon, cm.pp_year, cm.total_periods = horizon, pp_year, T
+
+    base_rate = model.exchange_rates.get(model.currency_base, 1.0)
+    for curr in set(model.exchange_rates) | {model.currency_base}:
+        cm.fx[curr] = 1.0 if curr == model.currency_base else model.exchange_rates.get(curr, 1.0) / base_rate
+
+    def fx(curr):
+        return cm.fx.get(curr, model.exchange_rates.get(curr, 1.0) / base_rate)
+
+    cm.settings = {
+        "mode": model.calculation_mode,
+        "discount_rate": model.discount_rate_unlevered if model.calculation_mode == "Unlevered" else model.discount_rate_levered,
+        "equity_contribution": model.equity_contribution,
+        "tax_rate": model.tax_config.corporate_tax_rate,
+        "dso": model.nwc_config.dso,
+        "dio": model.nwc_config.dio,
+        "dpo": model.nwc_config.dpo,
+        "terminal_release": model.nwc_config.terminal_release,
+        "terminal_debt_treatment": model.terminal_debt_treatment,
+        "tv_method": model.tv_config.method,
+        "tv_growth": model.tv_config.growth_rate,
+        "tv_multiple": model.tv_config.exit_multiple,
+    }
+
+    # 1. Products. Growth indices come from core.curves (shared arrays); the
+    # revenue build compounds scalar rates twice per period, the volume index
+    # (scalable personnel) once; both are kept as-is.
+    curves = IndexCurves(model)
+    days_in_period = 365.0 / pp_year
+    for prod in model.products:
+        terms = prod.payment_terms_days if prod.payment_terms_days is not None else model.nwc_config.dso
+        cm.products.append({
+            "initial_volume": prod.initial_volume,
+            "demand_index": curves.get(prod.volume_growth_curve, prod.year_growth_rate, legacy_steps=2),
+            "volume_index": curves.get(prod.volume_growth_curve, prod.year_growth_rate),
+            "price_index": curves.get(prod.price_escalation_curve, prod.price_escalation_rate, legacy_steps=2),
+            "cost_index": curves.get(prod.cost_escalation_curve, prod.cost_escalation_rate, legacy_steps=2),
+            "scrap_divisor": (1 - prod.scrap_rate) if prod.scrap_rate < 1 else 1.0,
+            "sales_yield": 1 - prod.scrap_rate,
+            "max_gross": prod.production_capacity_per_year / pp_year * prod.oee_percent,
+            "currency": prod.currency,
+            "unit_price": prod.unit_price * fx(prod.currency),
+            "unit_cost": prod.unit_cost * fx(prod.currency),
+            "receivable_ratio": (1.0 - prod.advance_payment_pct) * (terms / days_in_period),
+        })
+
+    # 2. OPEX
+    for k, exp in enumerate(model.fixed_expenses):
+        cost = exp.amount_per_year / pp_year * curves.get(exp.growth_curve, exp.growth_rate)
+        _add(cm.fixed_opex, exp.currency, cost)
+        cm.expense_items.append({"index": k, "currency": exp.currency, "cost": cost})
+
+    for pers in model.personnel:
+        period_cost = pers.monthly_gross_salary * 12 * (1 + pers.sgk_tax_rate) / pp_year
+        start_idx = (pers.start_year - 1) * pp_year
+        cost = pers.count * period_cost * curves.rebased(pers.raise_curve, pers.yearly_raise_rate, start_idx)
+        _add(cm.personnel_scalable if pers.is_scalable else cm.personnel_fixed, pers.currency, cost)
+
+    # 3. CAPEX & Depreciation
+    cm.capex_count = len(model.capex_items)
+    for k, item in enumerate(model.capex_items):
+        if pp_year == 12:
+            m = item.month if 1 <= item.month <= 12 else 1
+            idx = (item.year - 1) * pp_year + (m - 1)
+        else:
+            idx = item.year - 1
+        if not 0 <= idx < T:
+            continue
+        customs = item.customs_duty_rate if item.is_imported else 0.0
+        vat = 0.0 if model.tax_config.vat_exemption else item.vat_rate
+        flow = np.zeros(T)
+        flow[idx] = item.amount * (1 + customs) * (1 + vat)
+        _add(cm.capex_flow, item.currency, flow)
+
+        dep_item = item.model_copy(update={"amount": item.amount * (1 + customs)})
+        dep = depreciation.aggregate_depreciation(
+            [dep_item], horizon, model.tax_config.machinery_useful_life, model.tax_config.building_useful_life,
+            payments_per_year=pp_year
+        )
+        _add(cm.capex_dep, item.currency, dep)
+        cm.capex_dep_items.append({"index": k, "currency": item.currency, "period": idx, "flow": flow[idx], "depreciation": dep})
+
+    # 4. Grants
+    cm.grant_cash = np.zeros(T)
+    cm.grant_taxable = np.zeros(T)
+    for grant in model.grants:
+        idx = (grant.year - 1) * pp_year
+        if 0 <= idx < T:
+            cm.grant_cash[idx] += grant.amount
+            if not grant.is_capex_reduction:
+                cm.grant_taxable[idx] += grant.amount
+    total_capex_reduction_grants = sum(g.amount for g in model.grants if g.is_capex_reduction)
+    if total_capex_reduction_grants > 0:
+        avg_life_periods = ((model.tax_config.machinery_useful_life + model.tax_config.building_useful_life) / 2) * pp_year
+        cm.grant_dep_reduction = total_capex_reduction_grants / avg_life_periods
+
+    # 5. Loans (schedules are built at evaluation time; rate/term may be drivers)
+    for loan in model.loans:
+        cm.loans.append({
+            "amount": loan.amount,
+            "interest_rate": loan.interest_rate,
+            "term_years": loan.term_years,
+            "grace_period_years": loan.grace_period_years,
+            "payment_method": loan.payment_method,
+            "start_year": loan.start_year,
+            "currency": loan.currency,
+            "schedule": finance.calculate_loan_schedule(
+                loan.amount, loan.interest_rate, loan.term_years, loan.payment_method,
+                loan.start_year, horizon, loan.grace_period_years, payments_per_year=pp_year
+            ),
+        })
+
+    # 6. Leasing
+    lease = {k: np.zeros(T) for k in ("depreciation", "interest", "principal", "downpayment")}
+    for ls in model.leasings:
+        lease_life_periods = model.tax_config.machinery_useful_life * pp_year
+        lease["depreciation"][:min(T, lease_life_periods)] += ls.asset_value / lease_life_periods
+        if ls.down_payment > 0:
+            lease["downpayment"][0] += ls.down_payment
+        schedule = finance.calculate_loan_schedule(
+            ls.asset_value - ls.down_payment, ls.annual_interest_rate, ls.term_years,
+            "EqualPayment", 1, horizon, 0, payments_per_year=pp_year
+        )
+        lease["interest"] += schedule["interest"]
+        lease["principal"] += schedule["principal"]
+    cm.lease = lease
+
+    return cm
+
+def driver_base_value(model: ProjectModel, driver: str) -> Optional[float]:
+    """Current model value of a driver (1.0 for factors, None if the model has nothing to drive)."""
+    if DRIVERS.get(driver) is None:
+        raise ValueError(f"Unknown driver: {driver}")
+    if DRIVERS[driver] == "factor":
+        return 1.0
+    if driver == "Discount Rate":
+        return model.discount_rate_unlevered if model.calculation_mode == "Unlevered" else model.discount_rate_levered
+    if not model.loans:
+        return None
+    if driver == "Interest Rate":
+        return model.loans[0].interest_rate
+    return float(model.loans[0].term_years)
+
+def _convert(cm: CompiledModel, by_currency: Dict[str, np.ndarray], fx_paths: Optional[Dict[str, np.ndarray]] = None) -> np.ndarray:
+    """Sum in base currency; currencies with an FX path convert at each period's rate."""
+    fx_paths = fx_paths or {}
+    total = np.zeros(cm.total_periods)
+    for curr, arr in by_currency.items():
+        total = total + arr * cm.fx.get(curr, 1.0) * fx_paths.get(curr, 1.0)
+    return total
+
+def _convert_depreciation(cm: CompiledModel, fx_paths: Dict[str, np.ndarray]) -> np.ndarray:
+    """Depreciation in base currency, assets on an FX path at their purchase-period rate."""
+    total = _convert(cm, {curr: arr for curr, arr in cm.capex_dep.items() if curr not in fx_paths})
+    for item in cm.capex_dep_items:
+        curr = item["currency"]
+        if curr in fx_paths:
+            total = total + item["depreciation"] * cm.fx.get(curr, 1.0) * fx_paths[curr][:, item["period"], None]
+    return total
+
+def _evaluate_chunk(cm: CompiledModel, drv: Dict[str, np.ndarray], n: int, loan_structures: Dict[int, Dict[str, np.ndarray]], annual: bool = False, paths: Optional[Dict[str, Any]] = None, shocks: Optional[Dict[Tuple[str, int], np.ndarray]] = None) -> Dict[str, np.ndarray]:
+    T, pp_year, s = cm.total_periods, cm.pp_year, cm.settings
+    col = lambda name, default: drv[name][:, None] if name in drv else default
+
+    f_price = col("Price", 1.0)
+    f_volume = col("Volume", 1.0)
+    f_capex = col("CAPEX", 1.0)
+    f_opex = col("OPEX", 1.0)
+
+    # Stochastic paths: FX multipliers per currency, price level vs base inflation
+    paths = paths or {}
+    fx_paths = paths.get("fx") or {}
+    inflation = paths.get("inflation")
+    price_level = inflation if inflation is not None else 1.0
+    # Targeted shocks: multipliers per (kind, item index), loan rate deviations
+    shocks = shocks or {}
+    shock = lambda kind, idx: shocks.get((kind, idx), 1.0)
+
+    # 1. Revenue / COGS / receivables
+    revenue = np.zeros((n, T))
+    cogs = np.zeros((n, T))
+    receivables = np.zeros((n, T))
+    for j, p in enumerate(cm.products):
+        demand = f_volume * shock("volume", j) * (p["initial_volume"] / pp_year) * p["demand_index"]
+        gross = np.minimum(demand / p["scrap_divisor"], p["max_gross"])
+        fx_p = fx_paths.get(p["currency"], 1.0) * price_level
+        rev = gross * p["sales_yield"] * (f_price * shock("price", j) * p["unit_price"] * p["price_index"]) * fx_p
+        revenue += rev
+        cogs += gross * (shock("cost", j) * p["unit_cost"] * p["cost_index"]) * fx_p
+        receivables += rev * p["receivable_ratio"]
+
+    # 2. OPEX (scalable personnel follows the sales-volume index)
+    fixed_opex = _convert(cm, cm.fixed_opex, fx_paths)
+    for e in cm.expense_items:
+        if ("opex", e["index"]) in shocks:
+            fixed_opex = fixed_opex + (shocks[("opex", e["index"])] - 1.0) * e["cost"] * cm.fx.get(e["currency"], 1.0) * fx_paths.get(e["currency"], 1.0)
+    opex = f_opex * (fixed_opex + _convert(cm, cm.personnel_fixed, fx_paths)) * price_level
+    if cm.personnel_scalable:
+        total_initial = f_volume * sum(p["initial_volume"] for p in cm.products) * np.ones((n, 1))
+        sales_vol = np.zeros((n, T))
+        for j, p in enumerate(cm.products):
+            demand = f_volume * shock("volume", j) * (p["initial_volume"] / pp_year) * p["volume_index"]
+            sales_vol += np.minimum(demand / p["scrap_divisor"], p["max_gross"]) * p["sales_yield"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(total_initial > 0, sales_vol / (total_initial / pp_year), 1.0)
+        opex = opex + f_opex * _convert(cm, cm.personnel_scalable, fx_paths) * price_level * ratio
+    opex = np.broadcast_to(opex, (n, T))
+
+    ebitda = revenue - cogs - opex
+
+    # 3. CAPEX & Depreciation (+ grants, leasing)
+    capex_flow = _convert(cm, cm.capex_flow, fx_paths) * np.ones((n, 1))
+    dep_amort = _convert_depreciation(cm, fx_paths) * np.ones((n, 1))
+    for item in cm.capex_dep_items:
+        if ("capex", item["index"]) in shocks:
+            # Overrun on the purchase-period cost, depreciated with the asset
+            k = item["period"]
+            extra = (shocks[("capex", item["index"])][:, k] - 1.0) * cm.fx.get(item["currency"], 1.0)
+            if item["currency"] in fx_paths:
+                extra = extra * fx_paths[item["currency"]][:, k]
+            capex_flow[:, k] += extra * item["flow"]
+            dep_amort = dep_amort + extra[:, None] * item["depreciation"]
+    capex_flow = f_capex * capex_flow
+    dep_amort = f_capex * dep_amort
+    if cm.grant_dep_reduction > 0:
+        dep_amort = np.maximum(0, dep_amort - cm.grant_dep_reduction)
+    dep_amort = dep_amort + cm.lease["depreciation"]
+
+    # 4. Loans
+    interest = np.zeros((n, T))
+    principal = np.zeros((n, T))
+    drawdown = np.zeros((n, T))
+    debt_balance = np.zeros((n, T))
+    for j, loan in enumerate(cm.loans):
+        # Drawdown, interest, repayment and balance at each period's rate
+        loan_fx = cm.fx.get(loan["currency"], 1.0) * fx_paths.get(loan["currency"], 1.0)
+        structure = loan_structures.get(j, {})
+        rate = structure.get("interest_rate", drv.get("Interest Rate", loan["interest_rate"]))
+        if structure or "Interest Rate" in drv or "Loan Term" in drv:
+            term = np.maximum(np.rint(drv["Loan Term"]), 1).astype(int) if "Loan Term" in drv else loan["term_years"]
+            schedule = finance.calculate_loan_schedule_batch(
+                structure.get("amount", loan["amount"]),
+                rate,
+                structure.get("term_years", term),
+                structure.get("payment_method", loan["payment_method"]),
+                loan["start_year"], cm.horizon,
+                structure.get("grace_period_years", loan["grace_period_years"]),
+                payments_per_year=pp_year
+            )
+        else:
+            schedule = loan["schedule"]
+        loan_interest = schedule["interest"]
+        if ("loan_rate", j) in shocks:
+            # Interest at the shocked rate on the opening balance; the
+            # repayment schedule stays the one at the base rate
+            opening = schedule["balance"] + schedule["principal"]
+            base = np.reshape(np.asarray(rate, dtype=float), (-1, 1))
+            shocked = np.maximum(base + shocks[("loan_rate", j)], 0.0)
+            loan_interest = loan_interest + opening * (shocked - base) / pp_year
+        interest = interest + loan_interest * loan_fx
+        principal = principal + schedule["principal"] * loan_fx
+        drawdown = drawdown + schedule["drawdown"] * loan_fx
+        debt_balance = debt_balance + schedule["balance"] * loan_fx
+
+    total_interest = interest + cm.lease["interest"]
+    ebt = ebitda - dep_amort - total_interest + cm.grant_taxable
+
+    # 5. Tax with loss carryforward
+    tax = np.zeros((n, T))
+    accumulated_loss = np.zeros(n)
+    for i in range(T):
+        ebt_i = ebt[:, i]
+        loss_usage = np.minimum(np.maximum(ebt_i, 0), accumulated_loss)
+        tax[:, i] = np.where(ebt_i < 0, 0.0, (ebt_i - loss_usage) * s["tax_rate"])
+        accumulated_loss = np.where(ebt_i < 0, accumulated_loss - ebt_i, accumulated_loss - loss_usage)
+    net_income = ebt - tax
+
+    # 6. NWC
+    nwc_balance = receivables + cogs * pp_year * (s["dio"] / 365.0) - cogs * pp_year * (s["dpo"] / 365.0)
+    delta_nwc = np.diff(nwc_balance, axis=1, prepend=0.0)
+
+    # 7. Terminal debt
+    ending_debt = debt_balance[:, -1]
+    if s["terminal_debt_treatment"] == "payoff" and s["mode"] == "Levered":
+        payoff = np.where(ending_debt > 1.0, ending_debt, 0.0)
+        principal[:, -1] += payoff
+        ending_debt = ending_debt - payoff
+
+    # 8. Cash flows
+    fcfe = (net_income + dep_amort - delta_nwc - capex_flow - cm.lease["downpayment"] + drawdown
+            - principal - cm.lease["principal"] + cm.grant_cash)
+    nopat = (ebitda - dep_amort + cm.grant_taxable) * (1 - s["tax_rate"])
+    fcff = nopat + dep_amort - delta_nwc - capex_flow - cm.lease["downpayment"] + cm.grant_cash
+    if s["terminal_release"]:
+        fcfe[:, -1] += nwc_balance[:, -1]
+        fcff[:, -1] += nwc_balance[:, -1]
+
+    def aggr_sum(arr):
+        return arr.reshape(n, cm.horizon, pp_year).sum(axis=2)
+
+    ebitda_a = aggr_sum(ebitda)
+    if s["mode"] == "Unlevered":
+        target = aggr_sum(fcff)
+        initial_invest = 0.0
+    else:
+        target = aggr_sum(fcfe)
+        initial_invest = s["equity_contribution"]
+    rate = drv["Discount Rate"] if "Discount Rate" in drv else np.full(n, s["discount_rate"])
+
+    flows = np.concatenate([np.full((n, 1), -initial_invest), target], axis=1)
+    npv = finance.calculate_npv_batch(rate, flows)
+    irr = finance.calculate_irr_batch(flows)
+
+    negative = np.where(flows < 0, -flows, 0.0).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = np.where(negative > 0, flows.sum(axis=1) / negative * 100.0, 0.0)
+
+    # DSCR
+    cfads = ebitda_a - aggr_sum(tax) - aggr_sum(delta_nwc) - aggr_sum(capex_flow) + aggr_sum(cm.grant_cash * np.ones((n, 1)))
+    debt_service = aggr_sum(principal) + aggr_sum(cm.lease["principal"] * np.ones((n, 1))) + aggr_sum(total_interest)
+    valid = debt_service > 0.01
+    n_valid = valid.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dscr = np.where(valid, cfads / debt_service, 0.0)
+        dscr_min = np.where(n_valid > 0, np.where(valid, dscr, np.inf).min(axis=1), 0.0)
+        dscr_avg = np.where(n_valid > 0, dscr.sum(axis=1) / n_valid, 0.0)
+
+    # Terminal value
+    tv_value = np.zeros(n)
+    if s["tv_method"] == "PerpetuityGrowth":
+        g = s["tv_growth"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            tv_value = np.where(rate > g, target[:, -1] * (1 + g) / (rate - g), 0.0)
+    elif s["tv_method"] == "ExitMultiple":
+        tv_value = ebitda_a[:, -1] * s["tv_multiple"]
+        if s["mode"] == "Levered":
+            tv_value = tv_value - ending_debt
+    tv_pv = np.where(tv_value != 0, tv_value / (1 + rate) ** cm.horizon, 0.0)
+
+    out = {
+        "npv": npv + tv_pv,
+        "irr": irr,
+        "roi": roi,
+        "dscr_min": dscr_min,
+        "dscr_avg": dscr_avg,
+        "ending_debt_balance": ending_debt,
+        "tv_pv": tv_pv,
+    }
+    if annual:
+        out["annual_cfads"] = cfads
+        out["annual_debt_service"] = debt_service
+        out["annual_principal"] = aggr_sum(principal)
+    if s["tv_method"] != "None":
+        tv_flows = flows.copy()
+        tv_flows[:, -1] += tv_value
+        out["irr_tv"] = np.where(tv_value != 0, finance.calculate_irr_batch(tv_flows), np.nan)
+    return out
+
+def _as_column(value) -> np.ndarray:
+    """Scalar or 1-D input as an array; numbers as float, labels (payment method) kept as strings."""
+    arr = np.atleast_1d(np.asarray(value))
+    return arr if arr.dtype.kind in "OUS" else arr.astype(float)
+
+def evaluate_batch(
+    cm: CompiledModel,
+    drivers: Optional[Dict[str, Any]] = None,
+    chunk_size: int = 4096,
+    loan_structures: Optional[Dict[int, Dict[str, Any]]] = None,
+    annual: bool = False,
+    paths: Optional[Dict[str, Any]] = None,
+    shocks: Optional[Dict[Tuple[str, int], Any]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluates one row per driver combination.
+    drivers: {driver name: scalar or 1-D array}; arrays are broadcast to a
+    common length. Returns {kpi: array} for BATCH_KPIS (plus "irr_tv" when a
+    terminal value method is set). Rows are processed `chunk_size` at a time
+    so memory stays bounded for large Monte Carlo batches.
+    loan_structures: {loan index: {field: scalar or array}} replaces single
+    loans per row; fields are amount, interest_rate, term_years,
+    grace_period_years and payment_method (takes precedence over drivers).
+    annual=True adds (rows x years) arrays annual_cfads, annual_debt_service
+    and annual_principal for covenant tests.
+    paths: {"fx": {currency: array}, "inflation": array} from
+    core.paths.generate_paths; arrays are (rows x periods) or (periods,).
+    FX paths multiply the model's rate for every flow in that currency
+    (assets depreciate at their purchase-period rate); the inflation path
+    scales prices, unit costs and operating expenses.
+    shocks: {(kind, item index): array} from core.shocks.item_shocks, arrays
+    (rows x periods) or (periods,). Kinds "price" / "volume" / "cost" (product
+    index), "capex" (CAPEX item index, applied in the purchase period) and
+    "opex" (fixed expense index) are multipliers; "loan_rate" (loan index)
+    adds rate deviations to the interest on the scheduled balance.
+    """
+    drivers = drivers or {}
+    loan_structures = loan_structures or {}
+    unknown = [d for d in drivers if d not in DRIVERS]
+    if unknown:
+        raise ValueError(f"Unknown driver(s): {', '.join(unknown)}")
+    bad_loans = [j for j in loan_structures if not 0 <= j < len(cm.loans)]
+    if bad_loans:
+        raise ValueError(f"Unknown loan index: {bad_loans}")
+
+    keys = [("driver", d) for d in drivers] + [(j, f) for j, fields in loan_structures.items() for f in fields]
+    values = [drivers[d] if kind == "driver" else loan_structures[kind][d] for kind, d in keys]
+    arrays = np.broadcast_arrays(*[_as_column(v) for v in values]) if keys else []
+    n = arrays[0].shape[0] if keys else 1
+    columns = {key: np.ascontiguousarray(a).ravel() for key, a in zip(keys, arrays)}
+
+    shocks = shocks or {}
+    item_counts = {"price": len(cm.products), "volume": len(cm.products), "cost": len(cm.products),
+                   "capex": cm.capex_count,
+                   "opex": len(cm.expense_items), "loan_rate": len(cm.loans)}
+    bad_shocks = [key for key in shocks if key[0] not in item_counts or not 0 <= key[1] < item_counts[key[0]]]
+    if bad_shocks:
+        raise ValueError(f"Unknown shock target(s): {bad_shocks}")
+
+    path_arrays = {}
+    if paths or shocks:
+        path_arrays = {("fx", curr): arr for curr, arr in ((paths or {}).get("fx") or {}).items()}
+        if (paths or {}).get("inflation") is not None:
+            path_arrays[("inflation", None)] = paths["inflation"]
+        path_arrays.update({("shock", key): arr for key, arr in shocks.items()})
+        path_arrays = {k: np.atleast_2d(np.asarray(v, dtype=float)) for k, v in path_arrays.items()}
+        bad = [k for k, v in path_arrays.items() if v.ndim != 2 or v.shape[1] != cm.total_periods]
+        if bad:
+            raise ValueError(f"Paths must have {cm.total_periods} periods: {[k[1] or k[0] for k in bad]}")
+        path_rows = {v.shape[0] for v in path_arrays.values()} - {1}
+        if len(path_rows | ({n} if keys and n > 1 else set())) > 1:
+            raise ValueError("Path rows do not match the driver rows")
+        n = max(path_rows | {n})
+        columns = {key: np.broadcast_to(a, (n,)) for key, a in columns.items()}
+
+    parts = []
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        drv, structures = {}, {}
+        for (kind, name), arr in columns.items():
+            if kind == "driver":
+                drv[name] = arr[start:stop]
+            else:
+                structures.setdefault(kind, {})[name] = arr[start:stop]
+        chunk_paths, chunk_shocks = {"fx": {}, "inflation": None}, {}
+        for (kind, key), arr in path_arrays.items():
+            part = arr[start:stop] if arr.shape[0] > 1 else arr
+            if kind == "fx":
+                chunk_paths["fx"][key] = part
+            elif kind == "shock":
+                chunk_shocks[key] = part
+            else:
+                chunk_paths["inflation"] = part
+        parts.append(_evaluate_chunk(cm, drv, stop - start, structures, annual, chunk_paths, chunk_shocks))
+    return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
@@ -0,0 +1,129 @@
+"""
+Correlation matrices for the risk simulations.
+User inputs are pairwise coefficients, which do not always form a valid
+(positive semi-definite) correlation matrix. Such matrices are projected to
+the nearest valid one (Higham 2002, alternating projections with Dykstra's
+correction) and the adjustment is reported instead of dropping the
+correlations. Cholesky factors are cached per matrix digest, so repeated
+simulations on the same inputs only pay one matmul per draw matrix.
+"""
+import hashlib
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+# Smallest eigenvalue kept in a repaired matrix (keeps Cholesky well defined)
+MIN_EIGENVALUE = 1e-10
+# Factors kept in the module cache (oldest dropped first)
+CACHE_SIZE = 32
+
+_cholesky_cache: Dict[str, Tuple[np.ndarray, Dict[str, Any]]] = {}
+
+def _digest(matrix: np.ndarray) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(matrix.shape).encode())
+    h.update(np.ascontiguousarray(matrix, dtype=float).tobytes())
+    return h.hexdigest()
+
+def _project_psd(matrix: np.ndarray, floor: float = 0.0) -> np.ndarray:
+    eigval, eigvec = np.linalg.eigh(matrix)
+    return (eigvec * np.maximum(eigval, floor)) @ eigvec.T
+
+def nearest_correlation(matrix, tol: float = 1e-10, max_iter: int = 500) -> Tuple[np.ndarray, int]:
+    """
+    Nearest correlation matrix in the Frobenius norm (Higham 2002).
+    Returns (matrix, iterations); the result is symmetric with unit diagonal
+    and eigenvalues >= MIN_EIGENVALUE.
+    """
+    a = np.asarray(matrix, dtype=float)
+    y = (a + a.T) / 2
+    delta_s = np.zeros_like(y)
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        r = y - delta_s
+        x = _project_psd(r)
+        delta_s = x - r
+        y_prev = y
+        y = x.copy()
+        np.fill_diagonal(y, 1.0)
+        if np.linalg.norm(y - y_prev, "fro") <= tol * max(1.0, np.linalg.norm(y, "fro")):
+            break
+
+    # Final clean-up: strictly positive spectrum, exact unit diagonal
+    y = _project_psd(y, MIN_EIGENVALUE)
+    d = np.sqrt(np.diag(y))
+    y = y / np.outer(d, d)
+    return (y + y.T) / 2, iterations
+
+def repair_correlation(matrix) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Returns (valid matrix, report). The report says whether the input had to
+    be adjusted, its smallest eigenvalue and the largest / Frobenius change.
+    """
+    a = np.asarray(matrix, dtype=float)
+    if a.ndim != 2 or a.shape[0] != a.shape[1]:
+        raise ValueError("Correlation matrix must be square")
+    if not np.all(np.isfinite(a)):
+        raise ValueError("Correlation matrix contains missing values")
+
+    sym = (a + a.T) / 2
+    min_eig = float(np.linalg.eigvalsh(sym).min()) if a.size else 1.0
+    valid = min_eig >= -1e-12 and np.allclose(np.diag(sym), 1.0) and np.all(np.abs(sym) <= 1.0 + 1e-12)
+    report = {"adjusted": False, "min_eigenvalue": min_eig, "max_change": 0.0, "frobenius_change": 0.0, "iterations": 0}
+    if valid:
+        return sym, report
+
+    fixed, iterations = nearest_correlation(sym)
+    report.update(
+        adjusted=True,
+        max_change=float(np.abs(fixed - sym).max()),
+        frobenius_change=float(np.linalg.norm(fixed - sym, "fro")),
+        iterations=iterations,
+    )
+    return fixed, report
+
+def cholesky_factor(matrix) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Lower Cholesky factor of the (repaired) correlation matrix plus the
+    repair report. Cached per matrix digest; the factor is shared and
+    read-only, the report is a fresh copy the caller may keep or change.
+    """
+    a = np.asarray(matrix, dtype=float)
+    key = _digest(a)
+    hit = _cholesky_cache.get(key)
+    if hit is not None:
+        return hit[0], dict(hit[1])
+
+    fixed, report = repair_correlation(a)
+    try:
+        chol = np.linalg.cholesky(fixed)
+    except np.linalg.LinAlgError:
+        # Valid but singular input (e.g. a +/-1 pair): nudge the spectrum
+        fixed, _ = nearest_correlation(fixed)
+        chol = np.linalg.cholesky(fixed)
+    chol.flags.writeable = False
+
+    if len(_cholesky_cache) >= CACHE_SIZE:
+        _cholesky_cache.pop(next(iter(_cholesky_cache)))
+    _cholesky_cache[key] = (chol, report)
+    return chol, dict(report)
+
+def merge_symmetric_edits(before, after) -> np.ndarray:
+    """
+    Symmetric matrix from an edited copy of a symmetric matrix. For each pair
+    the cell that changed wins (the upper one if both did), so an edit in
+    either triangle is kept; the diagonal stays at 1 and cleared cells keep
+    their old value.
+    """
+    b = np.asarray(before, dtype=float)
+    a = np.asarray(after, dtype=float)
+    a = np.where(np.isnan(a), b, a)
+    upper, lower = np.triu(a, 1), np.triu(a.T, 1)
+    lower_only = np.isclose(upper, np.triu(b, 1)) & ~np.isclose(lower, np.triu(b.T, 1))
+    merged = np.where(lower_only, lower, upper)
+    return merged + merged.T + np.eye(len(a))
+
+def correlated_normals(chol: np.ndarray, iterations: int, rng=None) -> np.ndarray:
+    """(iterations x vars) standard normals with correlation chol @ chol.T: one matmul."""
+    rng = np.random if rng is None else rng
+    return rng.standard_normal(size=(iterations, chol.shape[0])) @ chol.T
@@ -0,0 +1,108 @@
+"""
+Growth / escalation index curves.
+Line items take a scalar annual rate or an optional per-year curve: an
+explicit list of rates or the name of a shared curve in
+`ProjectModel.index_curves` (e.g. "CPI-TR"). Every reference is resolved once
+into a cumulative index vector (one value per engine period, 1.0 in the
+first period); items referencing the same curve share the same array.
+
+Curve entry k is the year-over-year rate into project year k + 2 (year 1 is
+the input value); the last entry carries on to the horizon. Within a year the
+index compounds evenly per period. A one-entry curve [g] equals the scalar
+rate g for expenses and personnel; product scalar rates compound twice per
+period (legacy_steps=2), so for products [g] matches a scalar rate of
+sqrt(1 + g) - 1.
+"""
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from core.model import ProjectModel
+
+CurveRef = Optional[Union[str, List[float]]]
+
+def curve_index(rates: List[float], horizon: int, pp_year: int = 1) -> np.ndarray:
+    """Year-over-year rates -> cumulative index over horizon * pp_year periods."""
+    r = np.asarray(rates if len(rates) else [0.0], dtype=float)
+    if np.any(r <= -1):
+        raise ValueError("Curve rates must be above -100%")
+    r = np.concatenate([r, np.full(max(horizon - len(r), 0), r[-1])])[:max(horizon, 1)]
+    log_growth = np.log1p(r)
+    cumulative = np.concatenate([[0.0], np.cumsum(log_growth)])
+    t = np.arange(horizon * pp_year) / pp_year
+    year = np.floor(t).astype(int)
+    return np.exp(cumulative[year] + (t - year) * log_growth[year])
+
+class IndexCurves:
+    """
+    Resolves curve references of one model. Arrays are cached per named
+    curve, explicit rate list and scalar rate, and are read-only because line
+    items share them.
+    """
+    def __init__(self, model: ProjectModel):
+        self.named = model.index_curves
+        self.horizon = model.horizon_years
+        self.pp_year = 12 if model.granularity == "Month" else 1
+        self._cache: Dict[Tuple, np.ndarray] = {}
+
+    def _resolve(self, key: Tuple, rates: List[float]) -> np.ndarray:
+        hit = self._cache.get(key)
+        if hit is None:
+            hit = curve_index(rates, self.horizon, self.pp_year)
+            hit.flags.writeable = False
+            self._cache[key] = hit
+        return hit
+
+    def get(self, ref: CurveRef, rate: float = 0.0, legacy_steps: int = 1) -> np.ndarray:
+        """
+        Index for a curve reference, or for the scalar `rate` when ref is None.
+        legacy_steps: compounding steps per period for scalar rates (the
+        revenue build has always compounded product rates twice per period);
+        curves always compound once.
+        """
+        if ref is None:
+            return self._resolve(("rate", float(rate), legacy_steps), [(1 + rate) ** legacy_steps - 1])
+        if isinstance(ref, str):
+            if ref not in self.named:
+                raise ValueError(f"Unknown index curve: {ref}")
+            return self._resolve(("name", ref), self.named[ref])
+        return self._resolve(("rates", tuple(float(v) for v in ref)), list(ref))
+
+    def rebased(self, ref: CurveRef, rate: float, start: int) -> np.ndarray:
+        """Index relative to period `start` (1.0 there, 0.0 before), e.g. raises from a hire date."""
+        idx = self.get(ref, rate)
+        out = np.zeros_like(idx)
+        if start < len(idx):
+            out[start:] = idx[start:] / idx[max(start, 0)]
+        return out
+
+def curve_ref_to_text(ref: CurveRef) -> str:
+    """Editable text form: curve name, or rates in % separated by commas."""
+    if ref is None:
+        return ""
+    if isinstance(ref, str):
+        return ref
+    return ", ".join(f"{v * 100:g}" for v in ref)
+
+def curve_ref_from_text(text: Optional[str]) -> CurveRef:
+    """Inverse of curve_ref_to_text: blank -> None, numbers (%) -> rates, else a curve name."""
+    text = (text or "").strip()
+    if not text:
+        return None
+    parts = [p.strip() for p in text.replace(";", ",").split(",") if p.strip()]
+    try:
+        return [float(p) / 100.0 for p in parts]
+    except ValueError:
+        return text
+
+def referenced_curves(model: ProjectModel) -> Dict[str, List[str]]:
+    """Named curves referenced by line items -> item names (to flag missing curves)."""
+    refs: Dict[str, List[str]] = {}
+    items = [(p.name, [p.volume_growth_curve, p.price_escalation_curve, p.cost_escalation_curve]) for p in model.products]
+    items += [(e.name, [e.growth_curve]) for e in model.fixed_expenses]
+    items += [(p.role, [p.raise_curve]) for p in model.personnel]
+    for item_name, item_refs in items:
+        for ref in item_refs:
+            if isinstance(ref, str) and item_name not in refs.setdefault(ref, []):
+                refs[ref].append(item_name)
+    return refs
@@ -3,12 +3,40 @@ import json
 import os
 import datetime
 import hashlib
-from typing import List, Optional, Dict, Any
+import hmac
+import secrets
+import threading
+import time
+from typing import List, Optional, Dict, Any, Tuple
 from core.model import ProjectModel
 
 DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../projects.db'))
 
+PBKDF2_ITERATIONS = 100000
+
+# Session tokens (see create_session / validate_session)
+SESSION_TTL_SECONDS = 8 * 3600
+SESSION_SECRET_ENV = "FEASIBILITY_SESSION_SECRET"
+
+# Login rate limiting inside the window: max failed attempts per username and
+# client (so nobody can lock a user out from another machine), plus a higher
+# cap per username over all clients (rotating addresses gains nothing past it)
+LOGIN_MAX_FAILURES = 5
+LOGIN_MAX_FAILURES_PER_USER = 25
+LOGIN_WINDOW_SECONDS = 15 * 60
+
+# PBKDF2 is CPU bound; cap concurrent derivations so a login burst
+# cannot starve engine runs sharing the same process.
+_PBKDF2_SLOTS = threading.BoundedSemaphore(2)
+
+# init_db is called on every Streamlit rerun; only do the schema work once per DB file.
+_initialized_db_path = None
+
 def init_db():
+    global _initialized_db_path
+    if _initialized_db_path == DB_PATH and os.path.exists(DB_PATH):
+        return
+        
     conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
     
@@ -83,35 +111,110 @@ def init_db():
         timestamp TEXT
     )''')
     
-    # Seed Default Admin
-    c.execute("SELECT * FROM users WHERE username='admin'")
+    # Sessions (token hash only, raw token never stored)
+    c.execute('''CREATE TABLE IF NOT EXISTS sessions (
+        token_hash TEXT PRIMARY KEY,
+        username TEXT,
+        role TEXT,
+        created_at REAL,
+        expires_at REAL
+    )''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_at)")
+    
+    # Login Attempts (rate limiting)
+    c.execute('''CREATE TABLE IF NOT EXISTS login_attempts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT,
+        attempted_at REAL,
+        success INTEGER,
+        client TEXT
+    )''')
+    c.execute("PRAGMA table_info(login_attempts)")
+    if "client" not in [info[1] for info in c.fetchall()]:
+        c.execute("ALTER TABLE login_attempts ADD COLUMN client TEXT")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_login_attempts_user ON login_attempts (username, attempted_at)")
+    
+    # Key/Value settings (session signing secret)
+    c.execute('''CREATE TABLE IF NOT EXISTS app_settings (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )''')
+    
+    c.execute("DELETE FROM sessions WHERE expires_at<=?", (time.time(),))
+    
+    # Evaluated KPI snapshots (latest per project, written in bulk by core.portfolio)
+    c.execute('''CREATE TABLE IF NOT EXISTS project_results (
+        project_id TEXT PRIMARY KEY,
+        version TEXT,
+        model_hash TEXT,
+        status TEXT,
+        error TEXT,
+        kpi_json TEXT,
+        extras_json TEXT,
+        statements_json TEXT,
+        duration_s REAL,
+        evaluated_at TEXT,
+        engine_version INTEGER
+    )''')
+    c.execute("PRAGMA table_info(project_results)")
+    result_columns = [info[1] for info in c.fetchall()]
+    if "statements_json" not in result_columns:
+        c.execute("ALTER TABLE project_results ADD COLUMN statements_json TEXT")
+    if "engine_version" not in result_columns:
+        # Older rows keep NULL, so they are never taken as current
+        c.execute("ALTER TABLE project_results ADD COLUMN engine_version INTEGER")
+    
+    # Job queue for long-running analyses (see core.jobs)
+    c.execute('''CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        job_type TEXT,
+        project_id TEXT,
+        model_hash TEXT,
+        params_json TEXT,
+        data_json TEXT,
+        dedupe_key TEXT,
+        status TEXT, -- queued, running, done, failed, cancelled
+        progress REAL,
+        attempts INTEGER,
+        max_attempts INTEGER,
+        timeout_s REAL,
+        worker_id TEXT,
+        lease_expires REAL,
+        available_at REAL,
+        error TEXT,
+        result_location TEXT,
+        submitted_by TEXT,
+        created_at REAL,
+        started_at REAL,
+        finished_at REAL
+    )''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, available_at)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_jobs_dedupe ON jobs (dedupe_key)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_jobs_project ON jobs (project_id, created_at)")
+    c.execute('''CREATE TABLE IF NOT EXISTS job_results (
+        job_id TEXT PRIMARY KEY,
+        result_json TEXT
+    )''')
+
+    # Seed Default Admin (only hashed once, when the user does not exist yet)
+    c.execute("SELECT 1 FROM users WHERE username='admin'")
     if not c.fetchone():
         # admin / admin123
-        # Use the new hash_password function defined below (need to move definition or call it)
-        # Python isn't hoisted like JS for functions defined later? 
-        # Actually init_db is defined before hash_password.
-        # We should move hash_password usage inside or define it before.
-        # Simple fix: Re-implement hash logic here inline for the seed or move function up.
-        # Moving function up is better but replacing file content chunk is hard for reordering.
-        # Inline the logic for init_db to be safe.
-        
-        salt = os.urandom(16)
-        pw_hash = hashlib.pbkdf2_hmac('sha256', "admin123".encode(), salt, 100000)
-        stored_val = f"{salt.hex()}${pw_hash.hex()}"
-        
         c.execute("INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)", 
-                  ("admin", stored_val, "Admin"))
+                  ("admin", hash_password("admin123"), "Admin"))
         print("\n[SECURITY WARNING] Seeded default admin user (admin/admin123). Please change this in production!\n")
         
     conn.commit()
     conn.close()
+    _initialized_db_path = DB_PATH
 
 # --- Auth ---
 def hash_password(password: str) -> str:
     """Hashes password using PBKDF2 with a random salt."""
     salt = os.urandom(16) # 16 bytes salt
     # 100,000 iterations of SHA256
-    pw_hash = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, 100000)
+    with _PBKDF2_SLOTS:
+        pw_hash = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, PBKDF2_ITERATIONS)
     # Store as salt$hash
     return f"{salt.hex()}${pw_hash.hex()}"
 
@@ -120,33 +223,156 @@ def verify_password(stored_password: str, provided_password: str) -> bool:
     try:
         salt_hex, hash_hex = stored_password.split('$')
         salt = bytes.fromhex(salt_hex)
-        pw_hash = hashlib.pbkdf2_hmac('sha256', provided_password.encode(), salt, 100000)
-        return pw_hash.hex() == hash_hex
+        with _PBKDF2_SLOTS:
+            pw_hash = hashlib.pbkdf2_hmac('sha256', provided_password.encode(), salt, PBKDF2_ITERATIONS)
+        return hmac.compare_digest(pw_hash.hex(), hash_hex)
     except Exception:
         # Fallback for legacy simple SHA256 (if any exists from old version)
         # This allows smooth transition for existing dev DBs without wiping
         try:
              legacy_hash = hashlib.sha256(provided_password.encode()).hexdigest()
-             return legacy_hash == stored_password
+             return hmac.compare_digest(legacy_hash, stored_password)
         except:
             return False
 
-def authenticate_user(username, password) -> Optional[Dict]:
+def _is_locked(c, username: str, client: Optional[str], now: float) -> bool:
+    c.execute("SELECT COUNT(*), COALESCE(SUM(client IS ?), 0) FROM login_attempts WHERE username=? AND success=0 AND attempted_at>?",
+              (client, username, now - LOGIN_WINDOW_SECONDS))
+    total, from_client = c.fetchone()
+    return from_client >= LOGIN_MAX_FAILURES or total >= LOGIN_MAX_FAILURES_PER_USER
+
+def is_login_locked(username: str, client: Optional[str] = None) -> bool:
+    """
+    True if `client` (e.g. an IP address) exceeded LOGIN_MAX_FAILURES for the
+    username inside the window, or all clients together exceeded
+    LOGIN_MAX_FAILURES_PER_USER.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    locked = _is_locked(c, username, client, time.time())
+    conn.close()
+    return locked
+
+def authenticate_user(username, password, client: Optional[str] = None) -> Optional[Dict]:
+    """
+    Verifies credentials (PBKDF2). A username locked out for this client (or
+    for all clients, see is_login_locked) is rejected before any key
+    derivation happens; below the per-user cap other clients can still log in.
+    """
     conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
+    now = time.time()
+    
+    if _is_locked(c, username, client, now):
+        conn.close()
+        return None
     
     c.execute("SELECT username, role, password_hash FROM users WHERE username=?", (username,))
     row = c.fetchone()
-    conn.close()
     
+    user = None
+    if row and verify_password(row[2], password):
+        user = {"username": row[0], "role": row[1]}
+        
+    c.execute("INSERT INTO login_attempts (username, attempted_at, success, client) VALUES (?, ?, ?, ?)",
+              (username, now, 1 if user else 0, client))
+    if user:
+        # Successful login clears this client's failure counter
+        c.execute("DELETE FROM login_attempts WHERE username=? AND client IS ? AND success=0", (username, client))
+    # Keep the table small
+    c.execute("DELETE FROM login_attempts WHERE attempted_at<?", (now - LOGIN_WINDOW_SECONDS,))
+    conn.commit()
+    conn.close()
+    return user
+
+# --- Sessions ---
+# Token format: "<token_id>.<hmac_sha256(secret, token_id)>".
+# The signature lets forged/garbled tokens be rejected without touching the DB;
+# only sha256(token_id) is stored, so a leaked DB does not leak live tokens.
+_session_secret_cache: Dict[str, bytes] = {}
+
+def _get_session_secret() -> bytes:
+    env_secret = os.environ.get(SESSION_SECRET_ENV)
+    if env_secret:
+        return env_secret.encode()
+        
+    if DB_PATH in _session_secret_cache:
+        return _session_secret_cache[DB_PATH]
+        
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("SELECT value FROM app_settings WHERE key='session_secret'")
+    row = c.fetchone()
     if row:
-        stored_hash = row[2]
-        if verify_password(stored_hash, password):
-            return {"username": row[0], "role": row[1]}
+        secret = row[0]
+    else:
+        secret = secrets.token_hex(32)
+        # OR IGNORE: another replica may have created it concurrently
+        c.execute("INSERT OR IGNORE INTO app_settings (key, value) VALUES ('session_secret', ?)", (secret,))
+        conn.commit()
+        c.execute("SELECT value FROM app_settings WHERE key='session_secret'")
+        secret = c.fetchone()[0]
+    conn.close()
+    
+    _session_secret_cache[DB_PATH] = secret.encode()
+    return _session_secret_cache[DB_PATH]
+
+def _sign_token_id(token_id: str) -> str:
+    return hmac.new(_get_session_secret(), token_id.encode(), hashlib.sha256).hexdigest()
+
+def _token_hash(token_id: str) -> str:
+    return hashlib.sha256(token_id.encode()).hexdigest()
+
+def create_session(user: Dict, ttl_seconds: int = SESSION_TTL_SECONDS) -> str:
+    """Creates a signed session token for an authenticated user dict ({'username', 'role'})."""
+    token_id = secrets.token_urlsafe(32)
+    now = time.time()
+    
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("INSERT INTO sessions (token_hash, username, role, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+              (_token_hash(token_id), user["username"], user["role"], now, now + ttl_seconds))
+    conn.commit()
+    conn.close()
+    
+    return f"{token_id}.{_sign_token_id(token_id)}"
+
+def validate_session(token: str) -> Optional[Dict]:
+    """Returns the user dict for a valid, unexpired token. No password hashing involved."""
+    if not token or "." not in token:
+        return None
+    token_id, sig = token.rsplit(".", 1)
+    if not hmac.compare_digest(_sign_token_id(token_id), sig):
+        return None
+        
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("SELECT username, role, expires_at FROM sessions WHERE token_hash=?", (_token_hash(token_id),))
+    row = c.fetchone()
+    conn.close()
+    
+    if row and row[2] > time.time():
+        return {"username": row[0], "role": row[1]}
     return None
 
-    # Seed Default Admin (Moved logic here to ensure it uses new hash function)
-    # Actually init_db calls this. We need to update init_db.
+def revoke_session(token: str):
+    if not token or "." not in token:
+        return
+    token_id = token.rsplit(".", 1)[0]
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("DELETE FROM sessions WHERE token_hash=?", (_token_hash(token_id),))
+    conn.commit()
+    conn.close()
+
+def purge_expired_sessions() -> int:
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("DELETE FROM sessions WHERE expires_at<=?", (time.time(),))
+    removed = c.rowcount
+    conn.commit()
+    conn.close()
+    return removed
 
 
 # --- Project CRUD ---
@@ -254,3 +480,277 @@ def delete_project(project_id: str, user: str):
     
     conn.commit()
     conn.close()
+
+# --- Evaluated Results (Portfolio) ---
+def compute_model_hash(data_json: str) -> str:
+    """Stable content hash of a stored project payload (used to detect stale results)."""
+    return hashlib.sha256(data_json.encode()).hexdigest()
+
+def iter_project_payloads(project_ids: Optional[List[str]] = None, batch_size: int = 50):
+    """
+    Streams (id, name, version, data_json) rows without loading the whole table.
+    Each page is read with its own short-lived connection (keyset pagination),
+    so callers can write results between pages without hitting a DB lock.
+    Validation is left to the caller so it can happen inside worker processes.
+    """
+    if project_ids:
+        ids = list(project_ids)
+        for i in range(0, len(ids), batch_size):
+            page_ids = ids[i:i + batch_size]
+            placeholders = ",".join("?" * len(page_ids))
+            conn = sqlite3.connect(DB_PATH)
+            rows = conn.execute(f"SELECT id, name, version, data_json FROM projects WHERE id IN ({placeholders})", page_ids).fetchall()
+            conn.close()
+            for r in rows:
+                yield r
+        return
+        
+    last_id = ""
+    while True:
+        conn = sqlite3.connect(DB_PATH)
+        rows = conn.execute("SELECT id, name, version, data_json FROM projects WHERE id > ? ORDER BY id LIMIT ?",
+                            (last_id, batch_size)).fetchall()
+        conn.close()
+        if not rows:
+            break
+        for r in rows:
+            yield r
+        last_id = rows[-1][0]
+
+def save_project_results(results: List[Dict]):
+    """Upserts evaluation results in a single transaction."""
+    if not results:
+        return
+    now = datetime.datetime.now().isoformat()
+    rows = [(
+        r["project_id"], r.get("version"), r.get("model_hash"), r["status"], r.get("error"),
+        json.dumps(r.get("kpi") or {}), json.dumps(r.get("extras") or {}),
+        json.dumps(r.get("statements") or []), r.get("duration_s", 0.0), now, r.get("engine_version")
+    ) for r in results]
+    
+    conn = sqlite3.connect(DB_PATH)
+    with conn:
+        conn.executemany('''INSERT OR REPLACE INTO project_results
+            (project_id, version, model_hash, status, error, kpi_json, extras_json, statements_json, duration_s, evaluated_at, engine_version)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', rows)
+    conn.close()
+
+def load_project_results(project_ids: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """Returns stored results keyed by project id."""
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    c = conn.cursor()
+    if project_ids:
+        placeholders = ",".join("?" * len(project_ids))
+        c.execute(f"SELECT * FROM project_results WHERE project_id IN ({placeholders})", list(project_ids))
+    else:
+        c.execute("SELECT * FROM project_results")
+    rows = c.fetchall()
+    conn.close()
+    
+    out = {}
+    for r in rows:
+        d = dict(r)
+        d["kpi"] = json.loads(d.pop("kpi_json") or "{}")
+        d["extras"] = json.loads(d.pop("extras_json") or "{}")
+        d["statements"] = json.loads(d.pop("statements_json") or "[]")
+        out[d["project_id"]] = d
+    return out
+
+# --- Job Queue ---
+# Jobs are claimed under BEGIN IMMEDIATE (one writer at a time), so several
+# workers, Streamlit replicas and the CLI can share the queue in one DB file.
+JOB_ACTIVE_STATUSES = ("queued", "running", "done")
+JOB_COLUMNS = ("id, job_type, project_id, model_hash, params_json, dedupe_key, status, progress, attempts, max_attempts, "
+               "timeout_s, worker_id, lease_expires, available_at, error, result_location, submitted_by, created_at, started_at, finished_at")
+
+def _queue_conn():
+    # Writers wait for each other instead of failing with "database is locked"
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def _job_dict(row) -> Dict[str, Any]:
+    d = dict(row)
+    d["params"] = json.loads(d.pop("params_json") or "{}")
+    return d
+
+def job_dedupe_key(job_type: str, model_hash: str, params: Dict[str, Any]) -> str:
+    """Same analysis of the same model content -> same key."""
+    canonical = json.dumps(params or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{job_type}|{model_hash}|{canonical}".encode()).hexdigest()
+
+def enqueue_job(job_type: str, data_json: str, params: Optional[Dict[str, Any]] = None, project_id: str = None,
+                submitted_by: str = None, max_attempts: int = 3, timeout_s: float = 3600.0, force: bool = False) -> Tuple[str, bool]:
+    """
+    Queues a job and returns (job id, created). Unless `force`, a queued,
+    running or finished job with the same type, model hash and parameters is
+    returned instead of queueing a duplicate (created=False).
+    """
+    params = params or {}
+    model_hash = compute_model_hash(data_json)
+    key = job_dedupe_key(job_type, model_hash, params)
+    now = time.time()
+    conn = _queue_conn()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        if not force:
+            placeholders = ",".join("?" * len(JOB_ACTIVE_STATUSES))
+            row = conn.execute(f"SELECT id FROM jobs WHERE dedupe_key=? AND status IN ({placeholders}) ORDER BY created_at DESC LIMIT 1",
+                               (key, *JOB_ACTIVE_STATUSES)).fetchone()
+            if row:
+                conn.execute("COMMIT")
+                return row["id"], False
+        job_id = secrets.token_hex(8)
+        conn.execute('''INSERT INTO jobs (id, job_type, project_id, model_hash, params_json, data_json, dedupe_key, status, progress,
+            attempts, max_attempts, timeout_s, available_at, submitted_by, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 'queued', 0.0, 0, ?, ?, ?, ?, ?)''',
+            (job_id, job_type, project_id, model_hash, json.dumps(params, default=str), data_json, key,
+             max(1, int(max_attempts)), float(timeout_s), now, submitted_by, now))
+        conn.execute("COMMIT")
+        return job_id, True
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+def claim_job(worker_id: str, lease_s: float = 60.0, job_types: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Atomically takes the oldest runnable job (with its data_json) and leases
+    it to `worker_id`. Running jobs whose lease expired (worker died) are put
+    back in the queue first, or failed when out of attempts.
+    """
+    now = time.time()
+    conn = _queue_conn()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute('''UPDATE jobs SET status='failed', error='Lease expired (worker lost)', finished_at=?
+            WHERE status='running' AND lease_expires<? AND attempts>=max_attempts''', (now, now))
+        conn.execute('''UPDATE jobs SET status='queued', worker_id=NULL, available_at=?, error='Lease expired (worker lost)'
+            WHERE status='running' AND lease_expires<?''', (now, now))
+        sql = "SELECT id FROM jobs WHERE status='queued' AND available_at<=?"
+        args: List[Any] = [now]
+        if job_types:
+            sql += f" AND job_type IN ({','.join('?' * len(job_types))})"
+            args += list(job_types)
+        row = conn.execute(sql + " ORDER BY available_at, created_at LIMIT 1", args).fetchone()
+        if row is None:
+            conn.execute("COMMIT")
+            return None
+        conn.execute('''UPDATE jobs SET status='running', worker_id=?, lease_expires=?, attempts=attempts+1,
+            progress=0.0, started_at=? WHERE id=?''', (worker_id, now + lease_s, now, row["id"]))
+        job = conn.execute(f"SELECT {JOB_COLUMNS}, data_json FROM jobs WHERE id=?", (row["id"],)).fetchone()
+        conn.execute("COMMIT")
+        return _job_dict(job)
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+def heartbeat_job(job_id: str, worker_id: str, lease_s: float = 60.0, progress: Optional[float] = None) -> bool:
+    """Extends the lease (and sets progress). False once the job is no longer this worker's (cancelled / reclaimed)."""
+    conn = _queue_conn()
+    try:
+        cur = conn.execute('''UPDATE jobs SET lease_expires=?, progress=COALESCE(?, progress)
+            WHERE id=? AND worker_id=? AND status='running' ''', (time.time() + lease_s, progress, job_id, worker_id))
+        return cur.rowcount == 1
+    finally:
+        conn.close()
+
+def set_job_progress(job_id: str, progress: float):
+    """Progress (0..1) reported from inside a running task."""
+    conn = _queue_conn()
+    try:
+        conn.execute("UPDATE jobs SET progress=? WHERE id=? AND status='running'", (float(progress), job_id))
+    finally:
+        conn.close()
+
+def finish_job(job_id: str, worker_id: str, result: Dict[str, Any], result_location: Optional[str] = None) -> bool:
+    """Stores the result and marks the job done (ignored if the job was cancelled or reclaimed)."""
+    conn = _queue_conn()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        cur = conn.execute('''UPDATE jobs SET status='done', progress=1.0, error=NULL, result_location=?, finished_at=?, lease_expires=NULL
+            WHERE id=? AND worker_id=? AND status='running' ''', (result_location, time.time(), job_id, worker_id))
+        if cur.rowcount == 1:
+            conn.execute("INSERT OR REPLACE INTO job_results (job_id, result_json) VALUES (?, ?)", (job_id, json.dumps(result)))
+        conn.execute("COMMIT")
+        return cur.rowcount == 1
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+def fail_job(job_id: str, worker_id: str, error: str, retryable: bool = True, backoff_s: float = 30.0) -> str:
+    """
+    Records a failed attempt. Retryable failures go back to the queue after
+    backoff_s * 2^(attempt - 1) while attempts remain. Returns the new status.
+    """
+    now = time.time()
+    conn = _queue_conn()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT attempts, max_attempts FROM jobs WHERE id=? AND worker_id=? AND status='running'",
+                           (job_id, worker_id)).fetchone()
+        if row is None:
+            conn.execute("COMMIT")
+            return "lost"
+        if retryable and row["attempts"] < row["max_attempts"]:
+            status = "queued"
+            conn.execute("UPDATE jobs SET status='queued', worker_id=NULL, lease_expires=NULL, error=?, available_at=? WHERE id=?",
+                         (error, now + backoff_s * 2 ** (row["attempts"] - 1), job_id))
+        else:
+            status = "failed"
+            conn.execute("UPDATE jobs SET status='failed', lease_expires=NULL, error=?, finished_at=? WHERE id=?", (error, now, job_id))
+        conn.execute("COMMIT")
+        return status
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+def cancel_job(job_id: str) -> bool:
+    """Cancels a queued or running job (a running worker stops at its next heartbeat)."""
+    conn = _queue_conn()
+    try:
+        cur = conn.execute("UPDATE jobs SET status='cancelled', finished_at=? WHERE id=? AND status IN ('queued', 'running')",
+                           (time.time(), job_id))
+        return cur.rowcount == 1
+    finally:
+        conn.close()
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    conn = _queue_conn()
+    try:
+        row = conn.execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id=?", (job_id,)).fetchone()
+        return _job_dict(row) if row else None
+    finally:
+        conn.close()
+
+def list_jobs(project_id: Optional[str] = None, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    """Most recent jobs first (without payloads)."""
+    sql, args = f"SELECT {JOB_COLUMNS} FROM jobs WHERE 1=1", []
+    if project_id:
+        sql += " AND project_id=?"
+        args.append(project_id)
+    if status:
+        sql += " AND status=?"
+        args.append(status)
+    conn = _queue_conn()
+    try:
+        rows = conn.execute(sql + " ORDER BY created_at DESC LIMIT ?", (*args, limit)).fetchall()
+        return [_job_dict(r) for r in rows]
+    finally:
+        conn.close()
+
+def load_job_result(job_id: str) -> Optional[Dict[str, Any]]:
+    conn = _queue_conn()
+    try:
+        row = conn.execute("SELECT result_json FROM job_results WHERE job_id=?", (job_id,)).fetchone()
+        return json.loads(row["result_json"]) if row else None
+    finally:
+        conn.close()
@@ -0,0 +1,191 @@
+"""
+Debt sizing against lender covenants.
+Searches amount, tenor, grace and repayment method of one loan for the
+largest debt (or best equity IRR) that keeps min DSCR and gearing within
+limits. Every candidate structure goes through the batched engine's loan
+schedule + tax + CFADS pipeline; nothing else in the model is recomputed.
+"""
+from itertools import product
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.model import ProjectModel
+
+SIZING_OBJECTIVES = ["max_debt", "equity_irr"]
+COVENANT_TEST_YEARS = ["repayment", "all"]
+PAYMENT_METHODS = ["EqualPrincipal", "EqualPayment", "Bullet"]
+
+# Without a binding gearing cap the search range doubles until the DSCR
+# covenant fails for every structure (at most this many times)
+MAX_RANGE_DOUBLINGS = 30
+
+def covenant_dscr(out, test_years: str = "repayment") -> np.ndarray:
+    """
+    Minimum DSCR per row of an `evaluate_batch(..., annual=True)` result over
+    the covenant test years (inf when no year is tested).
+    """
+    cfads, debt_service = out["annual_cfads"], out["annual_debt_service"]
+    if test_years == "repayment":
+        tested = out["annual_principal"] > 0.01
+    else:
+        tested = debt_service > 0.01
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(tested, cfads / debt_service, np.inf).min(axis=1)
+
+def size_debt(
+    model: ProjectModel,
+    loan_index: int = 0,
+    min_dscr: float = 1.2,
+    max_gearing: Optional[float] = 0.7,
+    terms: List[int] = None,
+    grace_periods: List[int] = None,
+    methods: List[str] = None,
+    amount_steps: int = 40,
+    refine_iters: int = 25,
+    objective: str = "max_debt",
+    test_years: str = "repayment"
+) -> pd.DataFrame:
+    """
+    Sizes `model.loans[loan_index]` for every (method, term, grace) structure.
+    Gearing = total debt / total CAPEX outflow (base currency, incl. VAT and
+    customs). max_gearing=None means no gearing covenant: only the DSCR
+    limits the amount (the same holds when there is no CAPEX).
+    The DSCR covenant is tested in years with principal repayment
+    (test_years="repayment", lender practice) or, like the dashboard's
+    min DSCR, in every year with debt service (test_years="all").
+    Candidates are evaluated on the equity (Levered) view, so debt still
+    outstanding at the horizon is paid off in the last year.
+
+    DSCR is assumed to fall as the amount grows: for each structure the
+    largest amount of the leading feasible run on a coarse grid is refined by
+    bisection (all structures together, one batch call per step).
+
+    Returns one row per feasible structure, best first, with the sized
+    amount in the loan's currency.
+    """
+    from core.batch import compile_model, evaluate_batch
+
+    if objective not in SIZING_OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective}")
+    if test_years not in COVENANT_TEST_YEARS:
+        raise ValueError(f"Unknown covenant test years: {test_years}")
+    if not 0 <= loan_index < len(model.loans):
+        raise ValueError("Debt sizing needs an existing loan to size")
+
+    loan = model.loans[loan_index]
+    cm = compile_model(model.model_copy(update={"calculation_mode": "Levered"}))
+
+    loan_fx = cm.fx.get(loan.currency, 1.0)
+    capex_total = sum(arr.sum() * cm.fx.get(curr, 1.0) for curr, arr in cm.capex_flow.items())
+    other_debt = sum(l.amount * cm.fx.get(l.currency, 1.0) for j, l in enumerate(model.loans) if j != loan_index)
+
+    gearing_binds = max_gearing is not None and capex_total > 0
+    if gearing_binds:
+        upper = (max_gearing * capex_total - other_debt) / loan_fx
+    else:
+        upper = max(capex_total / loan_fx, loan.amount, 1.0)
+
+    if terms is None:
+        terms = list(range(1, max(model.horizon_years - loan.start_year + 1, 1) + 1))
+    if grace_periods is None:
+        grace_periods = [0, 1, 2]
+    if methods is None:
+        methods = list(PAYMENT_METHODS)
+
+    structures = list(product(methods, terms, grace_periods))
+    s_method = np.array([s[0] for s in structures], dtype=object)
+    s_term = np.array([s[1] for s in structures], dtype=float)
+    s_grace = np.array([s[2] for s in structures], dtype=float)
+    n_struct = len(structures)
+
+    columns = ["Payment Method", "Term (Years)", "Grace (Years)", "Amount", "Gearing", "Covenant DSCR", "Min DSCR", "Avg DSCR", "Equity IRR", "NPV"]
+    if upper <= 0 or not n_struct:
+        return pd.DataFrame(columns=columns)
+
+    evaluations = 0
+
+    def evaluate(idx, amounts):
+        nonlocal evaluations
+        evaluations += len(amounts)
+        out = evaluate_batch(cm, annual=True, loan_structures={loan_index: {
+            "amount": amounts,
+            "term_years": s_term[idx],
+            "grace_period_years": s_grace[idx],
+            "payment_method": s_method[idx],
+        }})
+        out["covenant_dscr"] = covenant_dscr(out, test_years)
+        return out
+
+    if not gearing_binds:
+        # Grow the range until no structure meets the DSCR covenant at its top
+        every = np.arange(n_struct)
+        for _ in range(MAX_RANGE_DOUBLINGS):
+            if not (evaluate(every, np.full(n_struct, upper))["covenant_dscr"] >= min_dscr).any():
+                break
+            upper *= 2
+
+    # 1. Coarse grid: every structure x every amount in one batch
+    grid = upper * np.arange(1, amount_steps + 1) / amount_steps
+    idx = np.repeat(np.arange(n_struct), amount_steps)
+    coarse = evaluate(idx, np.tile(grid, n_struct))
+    feasible = (coarse["covenant_dscr"] >= min_dscr).reshape(n_struct, amount_steps)
+
+    # Leading run of feasible amounts per structure
+    n_ok = np.where(feasible.all(axis=1), amount_steps, np.argmin(feasible, axis=1))
+    lo = np.where(n_ok > 0, grid[np.maximum(n_ok - 1, 0)], 0.0)
+    hi = np.where(n_ok < amount_steps, grid[np.minimum(n_ok, amount_steps - 1)], upper)
+
+    # 2. Bisection on the covenant boundary. Structures already failing at
+    # the smallest grid amount are dropped: shrinking the loan further only
+    # pushes its debt service under the test threshold.
+    open_ = np.flatnonzero((n_ok > 0) & (n_ok < amount_steps))
+    for _ in range(refine_iters):
+        if not open_.size:
+            break
+        mid = (lo[open_] + hi[open_]) / 2
+        ok = evaluate(open_, mid)["covenant_dscr"] >= min_dscr
+        lo[open_] = np.where(ok, mid, lo[open_])
+        hi[open_] = np.where(ok, hi[open_], mid)
+
+    # 3. Final KPIs at the sized amount
+    sized = np.flatnonzero(lo > 0)
+    final = evaluate(sized, lo[sized])
+    candidates = pd.DataFrame({
+        "Payment Method": s_method[sized],
+        "Term (Years)": s_term[sized].astype(int),
+        "Grace (Years)": s_grace[sized].astype(int),
+        "Amount": lo[sized],
+        "Covenant DSCR": final["covenant_dscr"],
+        "Min DSCR": final["dscr_min"],
+        "Avg DSCR": final["dscr_avg"],
+        "Equity IRR": final["irr"],
+        "NPV": final["npv"],
+    })
+
+    if objective == "equity_irr":
+        # A smaller feasible amount may give the better equity return
+        rows = np.flatnonzero(feasible.ravel() & (np.arange(amount_steps)[None, :] < n_ok[:, None]).ravel())
+        grid_rows = pd.DataFrame({
+            "Payment Method": s_method[idx[rows]],
+            "Term (Years)": s_term[idx[rows]].astype(int),
+            "Grace (Years)": s_grace[idx[rows]].astype(int),
+            "Amount": np.tile(grid, n_struct)[rows],
+            "Covenant DSCR": coarse["covenant_dscr"][rows],
+            "Min DSCR": coarse["dscr_min"][rows],
+            "Avg DSCR": coarse["dscr_avg"][rows],
+            "Equity IRR": coarse["irr"][rows],
+            "NPV": coarse["npv"][rows],
+        })
+        candidates = pd.concat([candidates, grid_rows], ignore_index=True)
+        candidates = candidates.sort_values("Equity IRR", ascending=False)
+        candidates = candidates.drop_duplicates(["Payment Method", "Term (Years)", "Grace (Years)"])
+    else:
+        candidates = candidates.sort_values(["Amount", "Covenant DSCR"], ascending=False)
+
+    candidates["Gearing"] = (candidates["Amount"] * loan_fx + other_debt) / capex_total if capex_total > 0 else np.nan
+    candidates = candidates[columns].reset_index(drop=True)
+    candidates.attrs["evaluations"] = evaluations
+    candidates.attrs["max_amount"] = upper
+    return candidates
@@ -25,21 +25,28 @@ def calculate_depreciation(capex_amount: float, useful_life_years: int, start_ye
         
     return depreciation_stream
 
+def useful_life(item, machinery_life: int, building_life: int) -> int:
+    """Useful life (years) of a CAPEX item by category; land does not depreciate."""
+    life = machinery_life # Default
+    if "building" in item.category.lower() or "construction" in item.category.lower():
+        life = building_life
+    elif "land" in item.category.lower():
+        life = 0 # Land does not depreciate
+    return life
+
+def depreciation_items(capex_items: List, horizon_years: int, machinery_life: int, building_life: int, payments_per_year: int = 1) -> np.ndarray:
+    """
+    Depreciation of every CAPEX item, (items x periods).
+    """
+    total_periods = horizon_years * payments_per_year
+    out = np.zeros((len(capex_items), total_periods))
+    for k, item in enumerate(capex_items):
+        life = useful_life(item, machinery_life, building_life)
+        out[k] = calculate_depreciation(item.amount, life, item.year, horizon_years, payments_per_year)
+    return out
+
 def aggregate_depreciation(capex_items: List, horizon_years: int, machinery_life: int, building_life: int, payments_per_year: int = 1) -> np.ndarray:
     """
     Aggregates depreciation from all CAPEX items.
     """
-    total_periods = horizon_years * payments_per_year
-    total_depreciation = np.zeros(total_periods)
-    
-    for item in capex_items:
-        life = machinery_life # Default
-        if "building" in item.category.lower() or "construction" in item.category.lower():
-            life = building_life
-        elif "land" in item.category.lower():
-            life = 0 # Land does not depreciate
-            
-        dep = calculate_depreciation(item.amount, life, item.year, horizon_years, payments_per_year)
-        total_depreciation += dep
-        
-    return total_depreciation
+    return depreciation_items(capex_items, horizon_years, machinery_life, building_life, payments_per_year).sum(axis=0)
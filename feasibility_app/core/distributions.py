@@ -0,0 +1,186 @@
+"""
+Risk-driver distributions as closed-form, vectorized transforms.
+Every distribution is defined on the percent deviation from the base case
+and returned as a multiplier (1.0 = no change). Uses the scipy.special
+ufuncs (ndtr / ndtri / betainc / betaincinv) directly, so a transform is a
+few array operations regardless of how many drivers are sampled.
+"""
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from scipy.special import betainc, betaincinv, ndtr, ndtri
+
+from core.model import DistributionConfig
+
+DIST_TYPES = ["Normal", "Lognormal", "Uniform", "Triangular", "PERT"]
+
+def validate_config(config: DistributionConfig, name: str = "") -> None:
+    """Raises ValueError for parameters no sampler can use."""
+    label = f"{name}: " if name else ""
+    if config.dist_type not in DIST_TYPES:
+        raise ValueError(f"{label}Unknown distribution type: {config.dist_type}")
+    if config.dist_type in ("Normal", "Lognormal"):
+        if config.std_dev_pct < 0:
+            raise ValueError(f"{label}Standard deviation must not be negative")
+        if config.dist_type == "Lognormal" and config.mean_pct <= -1:
+            raise ValueError(f"{label}Lognormal mean shift must be above -100%")
+    else:
+        if config.min_pct > config.max_pct:
+            raise ValueError(f"{label}Minimum must not exceed maximum")
+        if config.dist_type in ("Triangular", "PERT") and not config.min_pct <= config.mode_pct <= config.max_pct:
+            raise ValueError(f"{label}Mode must lie between minimum and maximum")
+        if config.dist_type == "PERT" and config.pert_lambda <= 0:
+            raise ValueError(f"{label}PERT shape must be positive")
+
+    lo, hi = config.truncate_min_pct, config.truncate_max_pct
+    if lo is not None and hi is not None and lo >= hi:
+        raise ValueError(f"{label}Truncation lower bound must be below the upper bound")
+    if lo is not None or hi is not None:
+        f_lo, f_hi = _truncation_window(config)
+        if f_hi - f_lo <= 0:
+            raise ValueError(f"{label}Truncation bounds leave no probability mass")
+
+def _pert_shape(config: DistributionConfig):
+    span = config.max_pct - config.min_pct
+    alpha = 1 + config.pert_lambda * (config.mode_pct - config.min_pct) / span
+    beta = 1 + config.pert_lambda * (config.max_pct - config.mode_pct) / span
+    return alpha, beta
+
+def _base_cdf(x, config: DistributionConfig) -> np.ndarray:
+    """CDF of the untruncated distribution at deviation x."""
+    x = np.asarray(x, dtype=float)
+    dist = config.dist_type
+    if dist == "Normal":
+        if config.std_dev_pct == 0:
+            return (x >= config.mean_pct).astype(float)
+        return ndtr((x - config.mean_pct) / config.std_dev_pct)
+    if dist == "Lognormal":
+        sigma = config.std_dev_pct
+        ratio = np.maximum(1.0 + x, 0.0) / (1.0 + config.mean_pct)
+        if sigma == 0:
+            return (ratio >= 1.0).astype(float)
+        with np.errstate(divide="ignore"):
+            return ndtr((np.log(ratio) + 0.5 * sigma**2) / sigma)
+
+    a, b = config.min_pct, config.max_pct
+    if b == a:
+        return (x >= a).astype(float)
+    if dist == "Uniform":
+        return np.clip((x - a) / (b - a), 0.0, 1.0)
+    if dist == "Triangular":
+        c = config.mode_pct
+        xc = np.clip(x, a, b)
+        left = (xc - a) ** 2 / ((b - a) * (c - a)) if c > a else np.zeros_like(xc)
+        right = 1 - (b - xc) ** 2 / ((b - a) * (b - c)) if b > c else np.ones_like(xc)
+        return np.where(xc <= c, left, right)
+    alpha, beta = _pert_shape(config)
+    return betainc(alpha, beta, np.clip((x - a) / (b - a), 0.0, 1.0))
+
+def _base_ppf(u: np.ndarray, config: DistributionConfig) -> np.ndarray:
+    """Inverse CDF (deviation) of the untruncated distribution."""
+    dist = config.dist_type
+    if dist == "Normal":
+        return config.mean_pct + ndtri(u) * config.std_dev_pct
+    if dist == "Lognormal":
+        sigma = config.std_dev_pct
+        return (1.0 + config.mean_pct) * np.exp(ndtri(u) * sigma - 0.5 * sigma**2) - 1.0
+
+    a, b = config.min_pct, config.max_pct
+    if dist == "Uniform":
+        return a + u * (b - a)
+    if dist == "Triangular":
+        c = config.mode_pct
+        if b == a:
+            return np.full_like(u, a)
+        f_c = (c - a) / (b - a)
+        left = a + np.sqrt(u * (b - a) * (c - a))
+        right = b - np.sqrt((1 - u) * (b - a) * (b - c))
+        return np.where(u < f_c, left, right)
+    if b == a:
+        return np.full_like(u, a)
+    alpha, beta = _pert_shape(config)
+    return a + (b - a) * betaincinv(alpha, beta, u)
+
+def _truncation_window(config: DistributionConfig):
+    lo, hi = config.truncate_min_pct, config.truncate_max_pct
+    f_lo = float(_base_cdf(lo, config)) if lo is not None else 0.0
+    f_hi = float(_base_cdf(hi, config)) if hi is not None else 1.0
+    return f_lo, f_hi
+
+def _is_truncated(config: DistributionConfig) -> bool:
+    return config.truncate_min_pct is not None or config.truncate_max_pct is not None
+
+def inverse_cdf(u, config: DistributionConfig) -> np.ndarray:
+    """Uniform [0, 1] values (scalar or array) -> multipliers around the base case."""
+    u = np.asarray(u, dtype=float)
+    if _is_truncated(config):
+        f_lo, f_hi = _truncation_window(config)
+        u = f_lo + u * (f_hi - f_lo)
+    x = _base_ppf(u, config)
+    if _is_truncated(config):
+        # Guard the bounds against round-off in the inverse
+        lo = config.truncate_min_pct if config.truncate_min_pct is not None else -np.inf
+        hi = config.truncate_max_pct if config.truncate_max_pct is not None else np.inf
+        x = np.clip(x, lo, hi)
+    return 1.0 + x
+
+def cdf(factor, config: DistributionConfig) -> np.ndarray:
+    """Probability that the multiplier is <= factor (truncation applied)."""
+    p = _base_cdf(np.asarray(factor, dtype=float) - 1.0, config)
+    if _is_truncated(config):
+        f_lo, f_hi = _truncation_window(config)
+        p = np.clip((p - f_lo) / (f_hi - f_lo), 0.0, 1.0)
+    return p
+
+def factors_from_z(z, config: DistributionConfig) -> np.ndarray:
+    """
+    Standard normal scores -> multipliers. Untruncated Normal / Lognormal use
+    z directly (no round trip through the CDF); the rest map Z -> U -> factor.
+    """
+    z = np.asarray(z, dtype=float)
+    if not _is_truncated(config):
+        if config.dist_type == "Normal":
+            return 1.0 + (config.mean_pct + z * config.std_dev_pct)
+        if config.dist_type == "Lognormal":
+            sigma = config.std_dev_pct
+            return (1.0 + config.mean_pct) * np.exp(z * sigma - 0.5 * sigma**2)
+    return inverse_cdf(ndtr(z), config)
+
+def transform_matrix(z_scores: np.ndarray, configs: Dict[str, DistributionConfig], variables: List[str]) -> np.ndarray:
+    """(iterations x vars) normal scores -> multipliers, one column per variable."""
+    for var in variables:
+        validate_config(configs[var], var)
+    factors = np.empty(z_scores.shape)
+    for i, var in enumerate(variables):
+        factors[:, i] = factors_from_z(z_scores[:, i], configs[var])
+    return factors
+
+def factor_cache_key(seed: int, iterations: int, variables: List[str], configs: Dict[str, DistributionConfig], extra: Any = None) -> str:
+    """Digest of everything that determines a sampled factor matrix."""
+    h = hashlib.blake2b(digest_size=16)
+    payload = {
+        "seed": seed,
+        "iterations": iterations,
+        "variables": list(variables),
+        "configs": {v: configs[v].model_dump() for v in variables},
+        "extra": extra,
+    }
+    h.update(json.dumps(payload, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+def cached_factors(key: str, build, cache: Optional[Dict[str, Any]] = None) -> np.ndarray:
+    """
+    Returns build() or the matrix stored under `key` in a caller-owned cache
+    dict (e.g. one per Streamlit session). Only the latest matrix is kept.
+    """
+    if cache is None:
+        return build()
+    hit = cache.get("factors")
+    if hit is None or hit[0] != key:
+        factors = build()
+        factors.flags.writeable = False  # shared between reruns
+        hit = (key, factors)
+        cache["factors"] = hit
+    return hit[1]
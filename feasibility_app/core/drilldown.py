@@ -0,0 +1,57 @@
+"""
+Product / cost drill-downs on the per-item arrays of FinancialResults
+(results.item_arrays), for the Charts page. Everything here reads the arrays
+kept by calculate_financials; the engine is not run again.
+"""
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from core.engine import FinancialResults
+
+def item_labels(results: FinancialResults, ids) -> List[str]:
+    """Item names for ids; names used by several items get their id prefix."""
+    labels = [results.item_names.get(i, i) for i in ids]
+    dupes = {l for l in labels if labels.count(l) > 1}
+    return [f"{l} ({i[:6]})" if l in dupes else l for l, i in zip(labels, ids)]
+
+def _largest_first(obj, top_n: Optional[int], other_label: str):
+    size = obj.abs().sum(axis=1) if isinstance(obj, pd.DataFrame) else obj.abs()
+    obj = obj.loc[size.sort_values(ascending=False, kind="stable").index]
+    if top_n is None or len(obj) <= top_n:
+        return obj
+    rest = obj.iloc[top_n:].sum(axis=0)
+    if isinstance(obj, pd.DataFrame):
+        return pd.concat([obj.iloc[:top_n], rest.rename(other_label).to_frame().T])
+    return pd.concat([obj.iloc[:top_n], pd.Series({other_label: rest})])
+
+def item_table(results: FinancialResults, category: str, top_n: Optional[int] = 8, other_label: str = "Other") -> pd.DataFrame:
+    """
+    Rows of one category labelled by item name, largest (absolute total)
+    first; beyond top_n the rest is summed into one `other_label` row.
+    """
+    df = results.item_arrays[category]
+    table = _largest_first(df.set_axis(item_labels(results, df.index), axis=0), top_n, other_label)
+    table.index.name = category
+    return table
+
+def ebitda_attribution(results: FinancialResults, year: Optional[int] = None, top_n: Optional[int] = 8,
+                       other_label: str = "Other") -> List[Tuple[str, str, float]]:
+    """
+    EBITDA of one year (whole horizon when None) split into the gross margin
+    of each product and each fixed expense / personnel cost.
+    Returns (category, label, value) steps that add up to EBITDA.
+    """
+    if results.item_detail != "annual":
+        raise ValueError("EBITDA attribution needs annual item arrays")
+    pick = (lambda df: df[year]) if year is not None else (lambda df: df.sum(axis=1))
+
+    margin = results.item_arrays["Revenue"] + results.item_arrays["COGS"]
+    steps = []
+    for category, df in (("Products", margin),
+                         ("Fixed Expenses", results.item_arrays["Fixed Expenses"]),
+                         ("Personnel", results.item_arrays["Personnel"])):
+        values = pick(df)
+        values = _largest_first(values.set_axis(item_labels(results, values.index)), top_n, other_label)
+        steps.extend((category, label, float(v)) for label, v in values.items())
+    return steps
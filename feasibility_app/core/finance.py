@@ -163,3 +163,147 @@ def calculate_metrics(cash_flows: np.ndarray, discount_rate: float):
         "payback": payback,
         "roi": roi
     }
+
+def calculate_loan_schedule_batch(amount, annual_rate, term_years, method: str, start_year: int, horizon_years: int, grace_period_years=0, payments_per_year: int = 1):
+    """
+    Vectorized `calculate_loan_schedule` for many loan structures at once.
+    amount, annual_rate, term_years, grace_period_years and method may be
+    scalars or arrays of shape (n,); the period loop is shared and every step
+    works on the whole batch. Returns the same keys with arrays of shape (n, periods).
+    """
+    amount, annual_rate, term_years, grace_period_years, method = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(amount, dtype=float)),
+        np.atleast_1d(np.asarray(annual_rate, dtype=float)),
+        np.atleast_1d(np.asarray(term_years, dtype=int)),
+        np.atleast_1d(np.asarray(grace_period_years, dtype=int)),
+        np.atleast_1d(np.asarray(method, dtype=object))
+    )
+    is_equal_principal = method == "EqualPrincipal"
+    is_equal_payment = method == "EqualPayment"
+    is_bullet = method == "Bullet"
+    n = amount.shape[0]
+    total_periods = horizon_years * payments_per_year
+    term_periods = term_years * payments_per_year
+    grace_periods = grace_period_years * payments_per_year
+    start_idx = (start_year - 1) * payments_per_year
+    per_period_rate = annual_rate / payments_per_year
+
+    interest_payment = np.zeros((n, total_periods))
+    principal_payment = np.zeros((n, total_periods))
+    ending_balance = np.zeros((n, total_periods))
+    debt_drawdown = np.zeros((n, total_periods))
+
+    if start_idx < total_periods:
+        debt_drawdown[:, start_idx] = amount
+
+    current_balance = amount.copy()
+    end_idx = start_idx + term_periods + grace_periods
+    last_period = min(int(end_idx.max()), total_periods) if n else start_idx
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for i in range(start_idx, last_period):
+            active = i < end_idx
+            interest = np.where(active, current_balance * per_period_rate, 0.0)
+
+            periods_elapsed = i - start_idx
+            remaining_periods = term_periods - (periods_elapsed - grace_periods)
+
+            principal = np.zeros(n)
+            if is_equal_principal.any():
+                principal = np.where(is_equal_principal, amount / term_periods, principal)
+            if is_equal_payment.any():
+                growth = (1 + per_period_rate) ** remaining_periods
+                annuity = current_balance * per_period_rate * growth / (growth - 1)
+                no_rate = np.where(remaining_periods > 0, current_balance / remaining_periods, current_balance)
+                principal = np.where(is_equal_payment, np.where(per_period_rate == 0, no_rate, annuity - interest), principal)
+            if is_bullet.any():
+                principal = np.where(is_bullet & (i == end_idx - 1), current_balance, principal)
+
+            principal = np.where(active & (periods_elapsed >= grace_periods), principal, 0.0)
+            principal = np.minimum(principal, current_balance)
+
+            interest_payment[:, i] = interest
+            principal_payment[:, i] = principal
+            current_balance = current_balance - principal
+            ending_balance[:, i] = np.where(active, current_balance, 0.0)
+
+    return {
+        "drawdown": debt_drawdown,
+        "interest": interest_payment,
+        "principal": principal_payment,
+        "balance": ending_balance
+    }
+
+def calculate_npv_batch(discount_rates, cash_flows: np.ndarray) -> np.ndarray:
+    """Row-wise npf.npv: cash_flows has shape (n, periods incl. t=0)."""
+    cash_flows = np.atleast_2d(cash_flows)
+    rates = np.broadcast_to(np.asarray(discount_rates, dtype=float), (cash_flows.shape[0],))
+    t = np.arange(cash_flows.shape[1])
+    return (cash_flows / (1 + rates[:, None]) ** t).sum(axis=1)
+
+def calculate_irr_batch(cash_flows: np.ndarray, max_iter: int = 200, tol: float = 1e-13) -> np.ndarray:
+    """
+    Row-wise IRR with the same conventions as `calculate_metrics` (0.0 when no
+    IRR exists). Rows whose flows change sign exactly once have a unique IRR and
+    are solved together by bracketing + bisection; anything else falls back to
+    npf.irr row by row.
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    n, n_periods = cash_flows.shape
+    irr = np.zeros(n)
+
+    signs = np.sign(cash_flows)
+    sign_changes = np.zeros(n, dtype=int)
+    last_sign = np.zeros(n)
+    for k in range(n_periods):
+        s = signs[:, k]
+        sign_changes += (s != 0) & (last_sign != 0) & (s != last_sign)
+        last_sign = np.where(s != 0, s, last_sign)
+
+    t = np.arange(n_periods)
+
+    def npv_sign(rates, rows):
+        return np.sign((cash_flows[rows] / (1 + rates[:, None]) ** t).sum(axis=1))
+
+    rows = np.flatnonzero(sign_changes == 1)
+    fallback = [np.flatnonzero(sign_changes > 1)]
+
+    if rows.size:
+        lo = np.full(rows.size, -0.5)
+        hi = np.full(rows.size, 1.0)
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            s_lo = npv_sign(lo, rows)
+            s_hi = npv_sign(hi, rows)
+            nonzero = signs[rows] != 0
+            first_sign = signs[rows, nonzero.argmax(axis=1)]
+            # Widen the bracket (towards -100% and upwards) until the root is inside
+            for _ in range(12):
+                open_ = s_lo == s_hi
+                if not open_.any():
+                    break
+                # For large rates NPV takes the sign of the first non-zero flow:
+                # if both ends already show it, the root lies below the bracket
+                down = open_ & (s_hi == first_sign)
+                up = open_ & ~down
+                lo, hi = np.where(down, -1 + (1 + lo) / 10, lo), np.where(up, hi * 4, hi)
+                s_lo = np.where(down, npv_sign(lo, rows), s_lo)
+                s_hi = np.where(up, npv_sign(hi, rows), s_hi)
+
+            bracketed = (s_lo != s_hi) & (s_lo != 0) & (s_hi != 0)
+            fallback.append(rows[~bracketed])
+            rows, lo, hi, s_lo = rows[bracketed], lo[bracketed], hi[bracketed], s_lo[bracketed]
+
+            for _ in range(max_iter):
+                mid = (lo + hi) / 2
+                s_mid = npv_sign(mid, rows)
+                left = s_mid == s_lo
+                lo = np.where(left, mid, lo)
+                hi = np.where(left, hi, mid)
+                if not rows.size or np.all(hi - lo <= tol * np.maximum(1.0, np.abs(lo))):
+                    break
+        irr[rows] = (lo + hi) / 2
+
+    fallback = np.concatenate(fallback)
+    for i in fallback:
+        irr[i] = calculate_metrics(cash_flows[i], 0.0)["irr"]
+    return irr
@@ -0,0 +1,203 @@
+"""
+Persistent job queue for long-running analyses (Monte Carlo, tornado, goal
+seek, full evaluation). Jobs live in the `jobs` table of projects.db (see the
+Job Queue section of core.db), so Streamlit sessions / replicas and the CLI
+submit to one shared queue and results outlive the session that asked.
+
+A JobWorker claims one job at a time and runs it in a child process:
+- the lease is renewed every `lease_s / 3` seconds while the job runs; a
+  worker that dies stops renewing and the job is reclaimed by another worker
+  once the lease expires,
+- a job running longer than its timeout_s is terminated,
+- crashes and timeouts are retried with exponential backoff up to
+  max_attempts; invalid input (ValueError, validation errors) fails at once,
+- cancelling a job (db.cancel_job) stops it at the next heartbeat.
+
+Resubmitting the same analysis of the same model content returns the
+existing job (see db.enqueue_job). Small results are stored as JSON in
+`job_results`; Monte Carlo samples are written to a Parquet file whose path
+is the job's result_location.
+"""
+import json
+import multiprocessing
+import os
+import socket
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core import db
+
+JOB_TYPES = ["evaluate", "tornado", "monte_carlo", "goal_seek"]
+
+def results_dir() -> str:
+    """Directory for file results (next to the DB)."""
+    return os.path.join(os.path.dirname(os.path.abspath(db.DB_PATH)), "job_results")
+
+# --- Tasks (run in the child process) ---
+
+def _task_tornado(data_json: str, params: Dict[str, Any], progress: Callable[[float], None], job_id: str) -> Tuple[Dict[str, Any], Optional[str]]:
+    import pandas as pd
+    from core.risk import run_tornado_analysis
+    from core.service import parse_project
+    model = parse_project(data_json)
+    variables = params.get("variables") or ["Price", "Volume", "CAPEX", "OPEX"]
+    frames = []
+    for i, var in enumerate(variables):
+        frames.append(run_tornado_analysis(model, [var]))
+        progress((i + 1) / len(variables))
+    df = pd.concat(frames, ignore_index=True).sort_values("Range", ascending=True)
+    return {"tornado": df.to_dict(orient="records")}, None
+
+def _task_monte_carlo(data_json: str, params: Dict[str, Any], progress: Callable[[float], None], job_id: str) -> Tuple[Dict[str, Any], Optional[str]]:
+    from core.risk import run_monte_carlo, summarize_monte_carlo
+    from core.service import parse_project
+    model = parse_project(data_json)
+    df = run_monte_carlo(
+        model,
+        iterations=int(params.get("iterations", model.risk_config.monte_carlo_iterations)),
+        importance_sampling=bool(params.get("importance_sampling", False)),
+        loss_threshold=float(params.get("loss_threshold", 0.0)),
+        variables=params.get("variables"),
+    )
+    progress(0.9)
+    os.makedirs(results_dir(), exist_ok=True)
+    location = os.path.join(results_dir(), f"{job_id}.parquet")
+    df.to_parquet(location, index=False)
+    return {"iterations": len(df), "summary": summarize_monte_carlo(df, float(params.get("loss_threshold", 0.0))),
+            "attrs": dict(df.attrs)}, location
+
+def _service_task(name: str):
+    def run(data_json: str, params: Dict[str, Any], progress: Callable[[float], None], job_id: str):
+        from core.service import run_task
+        return run_task(name, data_json, params), None
+    return run
+
+TASKS = {
+    "evaluate": _service_task("evaluate"),
+    "tornado": _task_tornado,
+    "monte_carlo": _task_monte_carlo,
+    "goal_seek": _service_task("goal_seek"),
+}
+
+def execute_job(db_path: str, job_id: str, job_type: str, data_json: str, params: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Child-process entry point: (JSON-ready result, result file or None)."""
+    from core.service import to_jsonable
+    db.DB_PATH = db_path
+    result, location = TASKS[job_type](data_json, params, lambda p: db.set_job_progress(job_id, p), job_id)
+    return to_jsonable(result), location
+
+def _is_input_error(exc: BaseException) -> bool:
+    from pydantic import ValidationError
+    return isinstance(exc, (ValueError, KeyError, TypeError, ValidationError))
+
+# --- Submission helpers ---
+
+def submit_job(job_type: str, model, params: Optional[Dict[str, Any]] = None, submitted_by: str = None,
+               force: bool = False, **policy) -> Tuple[str, bool]:
+    """Queues an analysis of `model` (a ProjectModel). Returns (job id, created)."""
+    if job_type not in TASKS:
+        raise ValueError(f"Unknown job type: {job_type}")
+    return db.enqueue_job(job_type, model.model_dump_json(), params, project_id=model.id,
+                          submitted_by=submitted_by, force=force, **policy)
+
+def load_result(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Stored result of a finished job; Monte Carlo samples come back as "samples" (DataFrame)."""
+    result = db.load_job_result(job["id"]) or {}
+    location = job.get("result_location")
+    if location and location.endswith(".parquet") and os.path.exists(location):
+        import pandas as pd
+        samples = pd.read_parquet(location)
+        samples.attrs.update(result.get("attrs") or {})
+        result["samples"] = samples
+    return result
+
+# --- Worker ---
+
+class JobWorker:
+    """Claims and runs jobs one at a time (start several processes for parallelism)."""
+    def __init__(self, worker_id: Optional[str] = None, lease_s: float = 60.0, poll_s: float = 2.0,
+                 job_types: Optional[List[str]] = None, backoff_s: float = 30.0):
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease_s = lease_s
+        self.poll_s = poll_s
+        self.job_types = job_types
+        self.backoff_s = backoff_s
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = multiprocessing.get_context("spawn").Pool(1)
+        return self._pool
+
+    def _kill_pool(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def run_once(self) -> Optional[Dict[str, Any]]:
+        """Runs the next job, if any. Returns {"id", "status"} or None when the queue is empty."""
+        job = db.claim_job(self.worker_id, self.lease_s, self.job_types)
+        if job is None:
+            return None
+        started = time.monotonic()
+        pending = self._get_pool().apply_async(
+            execute_job, (os.path.abspath(db.DB_PATH), job["id"], job["job_type"], job["data_json"], job["params"])
+        )
+        while True:
+            try:
+                result, location = pending.get(timeout=max(0.05, min(self.lease_s / 3, job["timeout_s"] - (time.monotonic() - started))))
+            except multiprocessing.TimeoutError:
+                if time.monotonic() - started >= job["timeout_s"]:
+                    self._kill_pool()
+                    status = db.fail_job(job["id"], self.worker_id, f"Timed out after {job['timeout_s']:.0f} s", True, self.backoff_s)
+                    return {"id": job["id"], "status": status}
+                if not db.heartbeat_job(job["id"], self.worker_id, self.lease_s):
+                    # Cancelled or reclaimed: stop the computation
+                    self._kill_pool()
+                    return {"id": job["id"], "status": "cancelled"}
+                continue
+            except Exception as e:
+                status = db.fail_job(job["id"], self.worker_id, f"{type(e).__name__}: {e}", not _is_input_error(e), self.backoff_s)
+                return {"id": job["id"], "status": status}
+            done = db.finish_job(job["id"], self.worker_id, result, location)
+            return {"id": job["id"], "status": "done" if done else "cancelled"}
+
+    def run(self, max_jobs: Optional[int] = None, exit_when_idle: bool = False, should_stop: Callable[[], bool] = lambda: False) -> int:
+        """Processes jobs until max_jobs, an empty queue (exit_when_idle) or should_stop(). Returns jobs run."""
+        count = 0
+        try:
+            while not should_stop() and (max_jobs is None or count < max_jobs):
+                outcome = self.run_once()
+                if outcome is None:
+                    if exit_when_idle:
+                        break
+                    time.sleep(self.poll_s)
+                    continue
+                count += 1
+        finally:
+            self.close()
+        return count
+
+def job_summary(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Display row for job tables (timings in seconds)."""
+    now = time.time()
+    started, finished = job.get("started_at"), job.get("finished_at")
+    return {
+        "id": job["id"],
+        "type": job["job_type"],
+        "status": job["status"],
+        "progress": job.get("progress") or 0.0,
+        "attempts": f"{job['attempts']}/{job['max_attempts']}",
+        "queued_s": ((started or now) - job["created_at"]) if job.get("created_at") else None,
+        "run_s": ((finished or now) - started) if started else None,
+        "error": job.get("error"),
+        "params": json.dumps(job.get("params") or {}),
+    }
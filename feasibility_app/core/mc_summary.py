@@ -0,0 +1,122 @@
+"""
+Server-side summaries of Monte Carlo results for charting.
+Instead of sending every sample to the browser, the Risk page plots bin
+counts, a KDE curve and a stratified downsample computed here once per run.
+Weighted (importance-sampling) runs use their likelihood-ratio weights.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+SUMMARY_QUANTILES = [1, 5, 10, 25, 50, 75, 90, 95, 99]
+
+def _weights(df: pd.DataFrame) -> Optional[np.ndarray]:
+    return df["Weight"].to_numpy(dtype=float) if "Weight" in df else None
+
+def histogram(values, weights=None, bins: int = 50) -> Dict[str, np.ndarray]:
+    """
+    Bin edges / centers / counts. Weighted counts are rescaled to the sample
+    size, so bar heights read as (reweighted) frequencies either way.
+    """
+    values = np.asarray(values, dtype=float)
+    keep = np.isfinite(values)
+    values = values[keep]
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)[keep]
+        weights = weights * len(weights) / weights.sum()
+    counts, edges = np.histogram(values, bins=bins, weights=weights)
+    return {"edges": edges, "centers": (edges[:-1] + edges[1:]) / 2, "widths": np.diff(edges), "counts": counts.astype(float)}
+
+def weighted_quantiles(values, weights=None, qs: Sequence[float] = SUMMARY_QUANTILES) -> Dict[float, float]:
+    """Quantiles (percent) of the finite values under optional weights."""
+    values = np.asarray(values, dtype=float)
+    w = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=float)
+    keep = np.isfinite(values)
+    values, w = values[keep], w[keep]
+    if not len(values):
+        return {q: float("nan") for q in qs}
+    order = np.argsort(values)
+    cdf = np.cumsum(w[order])
+    cdf /= cdf[-1]
+    idx = np.minimum(np.searchsorted(cdf, np.asarray(qs, dtype=float) / 100.0), len(values) - 1)
+    return dict(zip(qs, values[order][idx].tolist()))
+
+def kde(values, weights=None, points: int = 200, grid_size: int = 1024) -> Dict[str, np.ndarray]:
+    """
+    Gaussian KDE on a regular grid (Silverman bandwidth). Samples are first
+    binned on `grid_size` cells and the kernel applied by convolution, so the
+    cost is O(n + grid_size * kernel) instead of O(n * points).
+    Returns {"x", "density"} with `points` values; density integrates to 1.
+    """
+    values = np.asarray(values, dtype=float)
+    w = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=float)
+    keep = np.isfinite(values)
+    values, w = values[keep], w[keep]
+    if len(values) < 2 or np.ptp(values) == 0:
+        return {"x": np.array([]), "density": np.array([])}
+
+    w = w / w.sum()
+    mean = w @ values
+    std = np.sqrt(w @ (values - mean) ** 2)
+    q = weighted_quantiles(values, w, [25, 75])
+    iqr = q[75] - q[25]
+    n_eff = 1.0 / (w @ w)
+    spread = min(std, iqr / 1.349) if iqr > 0 else std
+    bandwidth = 0.9 * spread * n_eff ** (-0.2)
+
+    lo, hi = values.min() - 3 * bandwidth, values.max() + 3 * bandwidth
+    grid = np.linspace(lo, hi, grid_size)
+    step = grid[1] - grid[0]
+    binned = np.bincount(np.clip(np.rint((values - lo) / step).astype(int), 0, grid_size - 1), weights=w, minlength=grid_size)
+    half = int(np.ceil(4 * bandwidth / step))
+    offsets = np.arange(-half, half + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    kernel /= kernel.sum() * step  # exact mass even when the bandwidth is below the grid step
+    density = np.convolve(binned, kernel)[half:half + grid_size]
+
+    x = np.linspace(lo, hi, points)
+    return {"x": x, "density": np.interp(x, grid, density)}
+
+def stratified_sample(df: pd.DataFrame, by: str = "NPV", max_points: int = 2000, strata: int = 20, seed: int = 0) -> pd.DataFrame:
+    """
+    About `max_points` rows, drawn evenly from `strata` quantile bands of
+    `by` plus its extreme rows, so both tails stay visible in scatter plots.
+    Smaller frames are returned as-is.
+    """
+    if len(df) <= max_points:
+        return df
+    rng = np.random.default_rng(seed)
+    ranks = df[by].rank(method="first").to_numpy()
+    band = np.minimum(((ranks - 1) * strata / len(df)).astype(int), strata - 1)
+    per_band = max_points // strata
+    picks: List[np.ndarray] = [np.array([np.argmin(ranks), np.argmax(ranks)])]
+    for b in range(strata):
+        rows = np.flatnonzero(band == b)
+        picks.append(rng.choice(rows, size=min(per_band, len(rows)), replace=False))
+    return df.iloc[np.unique(np.concatenate(picks))]
+
+def summarize_results(df: pd.DataFrame, bins: int = 50, max_points: int = 2000, threshold: float = 0.0) -> Dict[str, Any]:
+    """
+    Everything the results tab plots, computed once per run: KPI statistics
+    (core.risk.summarize_monte_carlo), NPV histogram, KDE and quantiles, and
+    a stratified sample of the factor / path columns for scatter plots.
+    """
+    from core.risk import summarize_monte_carlo
+
+    weights = _weights(df)
+    npv = df["NPV"].to_numpy(dtype=float)
+    density = kde(npv, weights)
+    hist = histogram(npv, weights, bins=bins)
+    # KDE rescaled to the histogram's count axis
+    density["counts"] = density["density"] * hist["counts"].sum() * (hist["widths"].mean() if len(hist["widths"]) else 0.0)
+
+    scatter_cols = [c for c in df.columns if c == "NPV" or c.endswith("_Factor") or c.endswith("_End") or c.endswith("_Shock") or c == "Inflation_Avg"]
+    return {
+        "stats": summarize_monte_carlo(df, threshold),
+        "iterations": len(df),
+        "histogram": hist,
+        "kde": density,
+        "quantiles": weighted_quantiles(npv, weights),
+        "sample": stratified_sample(df[scatter_cols], max_points=max_points),
+    }
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional, Literal, Dict, Any
+from typing import List, Optional, Literal, Dict, Any, Union
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 import uuid
 
@@ -35,6 +35,11 @@ class Product(BaseModel):
     year_growth_rate: float = 0.05 # 5% growth
     price_escalation_rate: float = 0.0 # Inflation on price
     cost_escalation_rate: float = 0.0 # Inflation on cost
+    # Optional per-year curves replacing the rates above: a name in
+    # ProjectModel.index_curves or explicit rates (see core.curves)
+    volume_growth_curve: Optional[Union[str, List[float]]] = None
+    price_escalation_curve: Optional[Union[str, List[float]]] = None
+    cost_escalation_curve: Optional[Union[str, List[float]]] = None
     
     # Production / Efficiency
     production_capacity_per_year: float = 10000.0 # Max theoretical
@@ -61,6 +66,7 @@ class ExpenseItem(BaseModel):
     amount_per_year: float = 0.0
     currency: CurrencyType = "TRY"
     growth_rate: float = 0.0
+    growth_curve: Optional[Union[str, List[float]]] = None # Replaces growth_rate (see core.curves)
     category: str = "General" # Personnel, Rent, Energy, etc.
 
 class Personnel(BaseModel):
@@ -75,6 +81,7 @@ class Personnel(BaseModel):
     sgk_tax_rate: float = 0.22 # Employer burden (SGK+Tax)
     annual_raise: float = 0.0 # Real raise
     yearly_raise_rate: float = 0.0 # Alias/Duplicate for backward compat if Engine uses it? Engine uses 'yearly_raise_rate'
+    raise_curve: Optional[Union[str, List[float]]] = None # Replaces yearly_raise_rate (see core.curves)
     
     # Timeline
     start_year: int = 1
@@ -132,23 +139,55 @@ class WorkingCapitalConfig(BaseModel):
     dpo: float = 30.0 # Days Payable Outstanding
     terminal_release: bool = True # Release NWC at end of project
 
-DistributionType = Literal["Normal", "Triangular", "Uniform"]
+DistributionType = Literal["Normal", "Lognormal", "Uniform", "Triangular", "PERT"]
 
 class DistributionConfig(BaseModel):
-    # "Normal", "Triangular", "Uniform", "Lognormal"
+    # "Normal", "Lognormal", "Uniform", "Triangular", "PERT" (see core.distributions)
     dist_type: str = "Normal"
     
     # Normal / Lognormal
     mean_pct: float = 0.0 # Shift from base (e.g. 0.0 means centered on base)
     std_dev_pct: float = 0.10 # 10% standard deviation
     
-    # Triangular
+    # Triangular / PERT (Uniform uses min / max)
     min_pct: float = -0.10
     mode_pct: float = 0.0
     max_pct: float = 0.10
+    pert_lambda: float = 4.0 # PERT shape (4 = classic PERT)
+
+    # Optional truncation of any distribution (deviation bounds)
+    truncate_min_pct: Optional[float] = None
+    truncate_max_pct: Optional[float] = None
     
     model_config = ConfigDict(extra="ignore")
 
+FxProcessType = Literal["GBM", "MeanReverting"]
+
+class FxPathConfig(BaseModel):
+    # Stochastic exchange rate of one currency against the base (see core.paths)
+    process: FxProcessType = "GBM"
+    drift: float = 0.0 # Expected annual change of the rate (e.g. 0.25 = +25%/year)
+    volatility: float = 0.15 # Annual volatility of the log rate
+    mean_reversion: float = 1.0 # Pull back to the drift trend per year (MeanReverting)
+
+class InflationPathConfig(BaseModel):
+    # Annual inflation rate mean-reverting to ProjectModel.inflation_rate
+    volatility: float = 0.02 # Annual std dev of the inflation rate
+    mean_reversion: float = 0.5 # Speed of the pull back to the long-run rate
+
+ShockTargetType = Literal["ProductPrice", "ProductVolume", "ProductCost", "CapexCategory", "ExpenseCategory", "LoanRate"]
+
+class ShockSpec(BaseModel):
+    # Per-item, per-period Monte Carlo shock (see core.shocks)
+    name: str = "Shock 1"
+    target: ShockTargetType = "ProductPrice"
+    item: Optional[str] = None # Product / loan name or CAPEX / expense category; None = all items
+    start_year: int = 1
+    end_year: Optional[int] = None # Inclusive; None = to the horizon
+    mean_pct: float = 0.0 # Expected deviation (0.15 = +15% overrun); LoanRate: rate points
+    std_dev_pct: float = 0.10 # Volatility of the deviation in each period
+    autocorrelation: float = 0.0 # AR(1) coefficient year over year (1 = one shock for the whole range)
+
 class RiskParams(BaseModel):
     monte_carlo_iterations: int = 1000
     random_seed: int = 42
@@ -159,7 +198,15 @@ class RiskParams(BaseModel):
     # Correlation Matrix (Simple pairwise for key variables)
     # Stored as keys "Var1-Var2": correlation_coefficient
     correlation_base: Dict[str, float] = Field(default_factory=dict)
-    
+
+    # Stochastic paths (Monte Carlo only). Correlation keys use the path
+    # variable names "FX USD", "FX EUR", "Inflation".
+    fx_paths: Dict[str, FxPathConfig] = Field(default_factory=dict)
+    inflation_path: Optional[InflationPathConfig] = None
+
+    # Targeted shocks on single products / categories / loans (Monte Carlo only)
+    shocks: List[ShockSpec] = Field(default_factory=list)
+
     def get_config(self, var_name: str) -> DistributionConfig:
         if var_name not in self.var_configs:
             self.var_configs[var_name] = DistributionConfig()
@@ -205,6 +252,8 @@ class ProjectModel(BaseModel):
     horizon_years: int = 10
     start_year: int = 2024
     inflation_rate: float = 0.0
+    # Shared year-over-year index curves, e.g. {"CPI-TR": [0.45, 0.30, 0.20]}
+    index_curves: Dict[str, List[float]] = Field(default_factory=dict)
 
     # Modules
     capex_items: List[CAPEXItem] = []
@@ -0,0 +1,153 @@
+"""
+Stochastic FX and inflation paths for the Monte Carlo simulation.
+Paths are (iterations x periods) arrays generated in one vectorized pass and
+handed to `core.batch.evaluate_batch`; no model is copied per path.
+
+FX paths are multipliers on the model's exchange rate (period 0 = 1.0),
+either GBM or a log rate mean-reverting (Ornstein-Uhlenbeck) to the drift
+trend; both keep E[rate_t] = rate_0 * (1 + drift)^t. Inflation is an OU
+annual rate around `ProjectModel.inflation_rate`; its path is the price level
+relative to the base-case assumption (1.0 while inflation stays on it).
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.model import ProjectModel, FxPathConfig, InflationPathConfig
+
+FX_PROCESSES = ["GBM", "MeanReverting"]
+INFLATION_VARIABLE = "Inflation"
+
+def fx_variable(currency: str) -> str:
+    """Correlation / result name of a currency's path ("FX USD")."""
+    return f"FX {currency}"
+
+def path_variables(model: ProjectModel) -> List[str]:
+    """Configured path variables in generation order (FX by currency, then inflation)."""
+    risk = model.risk_config
+    names = [fx_variable(curr) for curr in sorted(risk.fx_paths)]
+    if risk.inflation_path is not None:
+        names.append(INFLATION_VARIABLE)
+    return names
+
+def validate_paths(model: ProjectModel) -> None:
+    """Raises ValueError for path settings the generator cannot use."""
+    risk = model.risk_config
+    for curr, conf in risk.fx_paths.items():
+        label = f"{fx_variable(curr)}: "
+        if curr == model.currency_base:
+            raise ValueError(f"{label}The base currency cannot have an exchange rate path")
+        if curr not in model.exchange_rates:
+            raise ValueError(f"{label}No exchange rate is set for this currency")
+        if conf.process not in FX_PROCESSES:
+            raise ValueError(f"{label}Unknown process: {conf.process}")
+        if conf.volatility < 0:
+            raise ValueError(f"{label}Volatility must not be negative")
+        if conf.drift <= -1:
+            raise ValueError(f"{label}Drift must be above -100%")
+        if conf.mean_reversion < 0:
+            raise ValueError(f"{label}Mean reversion must not be negative")
+    infl = risk.inflation_path
+    if infl is not None:
+        if infl.volatility < 0:
+            raise ValueError(f"{INFLATION_VARIABLE}: Volatility must not be negative")
+        if infl.mean_reversion < 0:
+            raise ValueError(f"{INFLATION_VARIABLE}: Mean reversion must not be negative")
+
+def bridge_shocks(terminal: np.ndarray, innovations: np.ndarray) -> np.ndarray:
+    """
+    Per-step shocks (iterations x steps) whose scaled sum is `terminal`:
+    z_t = e_t - mean(e) + terminal / sqrt(steps). With N(0, 1) innovations
+    independent of the N(0, 1) terminal scores the shocks are again iid
+    N(0, 1), so a path keeps its law while its cumulative shock carries the
+    correlation with the one-per-iteration Monte Carlo drivers.
+    """
+    steps = innovations.shape[1]
+    if steps == 0:
+        return innovations
+    return innovations - innovations.mean(axis=1, keepdims=True) + terminal[:, None] / np.sqrt(steps)
+
+def _ou_step(kappa: float, dt: float):
+    """(decay, shock scale) of one step of a unit-volatility OU process."""
+    if kappa <= 0:
+        return 1.0, np.sqrt(dt)
+    decay = np.exp(-kappa * dt)
+    return decay, np.sqrt((1 - decay ** 2) / (2 * kappa))
+
+def fx_path(shocks: np.ndarray, config: FxPathConfig, pp_year: int = 1) -> np.ndarray:
+    """(iterations x steps) N(0, 1) shocks -> (iterations x steps + 1) rate multipliers."""
+    n, steps = shocks.shape
+    dt = 1.0 / pp_year
+    t = np.arange(steps + 1) * dt
+    sigma = config.volatility
+    x = np.zeros((n, steps + 1))
+    if config.process == "GBM" or config.mean_reversion <= 0:
+        x[:, 1:] = np.cumsum(shocks, axis=1) * sigma * np.sqrt(dt)
+        variance = sigma ** 2 * t
+    else:
+        decay, scale = _ou_step(config.mean_reversion, dt)
+        for k in range(steps):
+            x[:, k + 1] = decay * x[:, k] + sigma * scale * shocks[:, k]
+        variance = sigma ** 2 * (1 - np.exp(-2 * config.mean_reversion * t)) / (2 * config.mean_reversion)
+    # Trend (1 + drift)^t, log-deviation centred so the mean rate follows it
+    return np.exp(np.log1p(config.drift) * t + x - 0.5 * variance)
+
+def inflation_index(shocks: np.ndarray, config: InflationPathConfig, base_rate: float, pp_year: int = 1) -> np.ndarray:
+    """
+    (iterations x steps) N(0, 1) shocks -> (iterations x steps + 1) price
+    level relative to inflation at `base_rate`. The annual rate starts on
+    base_rate and reverts to it; rates are floored at -99%.
+    """
+    n, steps = shocks.shape
+    dt = 1.0 / pp_year
+    decay, scale = _ou_step(config.mean_reversion, dt)
+    rate = np.full(n, float(base_rate))
+    log_index = np.zeros((n, steps + 1))
+    for k in range(steps):
+        rate = base_rate + (rate - base_rate) * decay + config.volatility * scale * shocks[:, k]
+        log_index[:, k + 1] = log_index[:, k] + dt * (np.log1p(np.maximum(rate, -0.99)) - np.log1p(base_rate))
+    return np.exp(log_index)
+
+def generate_paths(
+    model: ProjectModel,
+    iterations: int,
+    terminal_scores: Optional[np.ndarray] = None,
+    corr_matrix: Optional[np.ndarray] = None,
+    rng=None
+) -> Dict[str, Any]:
+    """
+    Paths of every configured variable, in the form `evaluate_batch` takes:
+    {"fx": {currency: (iterations x periods)}, "inflation": (iterations x
+    periods) or None}.
+    terminal_scores: (iterations x path variables) standard normals taken from
+    the joint draw with the Monte Carlo drivers (drawn here when omitted).
+    corr_matrix: correlation of the path variables (default: the pairwise
+    inputs in risk_config); per-step innovations use the same matrix.
+    """
+    from core.correlation import cholesky_factor, correlated_normals
+
+    validate_paths(model)
+    variables = path_variables(model)
+    pp_year = 12 if model.granularity == "Month" else 1
+    steps = model.horizon_years * pp_year - 1
+    rng = np.random if rng is None else rng
+
+    paths = {"fx": {}, "inflation": None}
+    if not variables:
+        return paths
+    if corr_matrix is None:
+        from core.risk import correlation_matrix
+        corr_matrix = correlation_matrix(model.risk_config, variables)
+    chol, _ = cholesky_factor(corr_matrix)
+    if terminal_scores is None:
+        terminal_scores = correlated_normals(chol, iterations, rng)
+    innovations = rng.standard_normal(size=(iterations, max(steps, 0), len(variables))) @ chol.T
+
+    for i, var in enumerate(variables):
+        shocks = bridge_shocks(terminal_scores[:, i], innovations[:, :, i])
+        if var == INFLATION_VARIABLE:
+            paths["inflation"] = inflation_index(shocks, model.risk_config.inflation_path, model.inflation_rate, pp_year)
+        else:
+            curr = var[len(fx_variable("")):]
+            paths["fx"][curr] = fx_path(shocks, model.risk_config.fx_paths[curr], pp_year)
+    return paths
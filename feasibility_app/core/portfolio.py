@@ -0,0 +1,218 @@
+"""
+Headless portfolio evaluation.
+Streams stored projects out of the DB, evaluates them in a process pool and
+writes KPI snapshots (plus annual statements) back to the `project_results`
+table in bulk. Batch reports reuse those snapshots while they are current.
+"""
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Callable
+
+import numpy as np
+
+from core import db
+from core.model import ProjectModel
+from core.migration import migrate_project_data
+from core.engine import calculate_financials, calculate_baseline, ENGINE_VERSION
+
+def _to_builtin(value):
+    """Converts numpy scalars so KPI dicts are JSON serializable."""
+    if isinstance(value, (np.floating, np.integer)):
+        return value.item()
+    return value
+
+def _kpi_dict(kpi: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: _to_builtin(v) for k, v in kpi.items()}
+
+def statements_to_records(res) -> List[Dict[str, Any]]:
+    """Annual income statement + cash flow in long format (one row per line item and year)."""
+    records = []
+    for statement, df in (("Income Statement", res.income_statement), ("Cash Flow", res.cash_flow_statement)):
+        for line_item in df.columns:
+            for year, value in zip(df.index, df[line_item].to_numpy(dtype=float)):
+                records.append({"statement": statement, "line_item": line_item, "year": int(year), "value": float(value)})
+    return records
+
+def evaluate_project_payload(project_id: str, version: str, data_json: str, options: Dict[str, Any], name: str = None) -> Dict[str, Any]:
+    """
+    Evaluates one stored project. Runs inside worker processes, so it takes and
+    returns plain data only. Never raises: failures are reported in the result.
+    options: {"baseline": bool, "tornado": bool, "mc_iterations": int}
+    """
+    started = time.perf_counter()
+    result = {
+        "project_id": project_id,
+        "name": name,
+        "version": version,
+        "model_hash": db.compute_model_hash(data_json),
+        "engine_version": ENGINE_VERSION,
+        "status": "ok",
+        "error": None,
+        "kpi": {},
+        "extras": {},
+        "statements": [],
+    }
+
+    try:
+        model = ProjectModel.model_validate(migrate_project_data(json.loads(data_json)))
+        res = calculate_financials(model, item_detail=None)
+        result["kpi"] = _kpi_dict(res.kpi)
+        result["statements"] = statements_to_records(res)
+
+        if options.get("baseline") and model.baseline_enabled:
+            res_base = calculate_baseline(model)
+            result["extras"]["baseline_kpi"] = _kpi_dict(res_base.kpi)
+
+        if options.get("tornado"):
+            from core.risk import run_tornado_analysis
+            df_t = run_tornado_analysis(model)
+            result["extras"]["tornado"] = df_t.to_dict(orient="records")
+
+        mc_iterations = int(options.get("mc_iterations") or 0)
+        if mc_iterations > 0:
+            from core.risk import run_monte_carlo
+            npv = run_monte_carlo(model, iterations=mc_iterations)["NPV"].values
+            result["extras"]["mc"] = {
+                "iterations": mc_iterations,
+                "mean_npv": float(np.mean(npv)),
+                "std_npv": float(np.std(npv)),
+                "p5_npv": float(np.percentile(npv, 5)),
+                "p95_npv": float(np.percentile(npv, 95)),
+                "prob_loss": float((npv < 0).mean()),
+            }
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    result["duration_s"] = time.perf_counter() - started
+    return result
+
+def options_from_extras(extras: Dict[str, Any]) -> Dict[str, Any]:
+    """Evaluation options that produced a stored result's extras (see evaluate_project_payload)."""
+    return {
+        "baseline": "baseline_kpi" in extras,
+        "tornado": "tornado" in extras,
+        "mc_iterations": int((extras.get("mc") or {}).get("iterations") or 0),
+    }
+
+def _evaluate_rows(rows, options, workers: int, pool=None) -> List[Dict[str, Any]]:
+    """
+    Evaluates payload rows (id, name, version, data_json), inline or on `pool`.
+    `options` is one dict for all rows or a list with one dict per row.
+    """
+    if not rows:
+        return []
+    ids, names, versions, payloads = (list(col) for col in zip(*rows))
+    per_row = options if isinstance(options, list) else [options] * len(ids)
+    if workers == 1 or pool is None:
+        return [evaluate_project_payload(i, v, d, o, n) for i, n, v, d, o in zip(ids, names, versions, payloads, per_row)]
+    return list(pool.map(evaluate_project_payload, ids, versions, payloads, per_row, names))
+
+def run_portfolio(
+    options: Optional[Dict[str, Any]] = None,
+    project_ids: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 32,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Dict[str, Any]:
+    """
+    Re-evaluates every stored project (or `project_ids`) and persists results.
+    Projects are read and written `chunk_size` at a time so memory stays flat
+    regardless of portfolio size. Each chunk is written in one transaction.
+    Returns a summary with throughput and failures.
+    """
+    options = options or {}
+    workers = workers or os.cpu_count() or 1
+
+    evaluated = 0
+    failures: List[Dict[str, str]] = []
+    started = time.perf_counter()
+
+    def flush(chunk):
+        nonlocal evaluated
+        if not chunk:
+            return
+        results = _evaluate_rows(chunk, options, workers, pool)
+        db.save_project_results(results)
+        evaluated += len(results)
+        failures.extend({"project_id": r["project_id"], "error": r["error"]} for r in results if r["status"] != "ok")
+        if progress:
+            progress(evaluated, len(failures))
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        chunk = []
+        for row in db.iter_project_payloads(project_ids, batch_size=chunk_size):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
+        flush(chunk)
+    finally:
+        if pool:
+            pool.shutdown()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "evaluated": evaluated,
+        "failed": len(failures),
+        "failures": failures,
+        "elapsed_s": elapsed,
+        "projects_per_s": evaluated / elapsed if elapsed > 0 else 0.0,
+        "workers": workers,
+    }
+
+def collect_portfolio_results(
+    project_ids: List[str],
+    workers: Optional[int] = None,
+    use_cache: bool = True,
+    persist: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Returns one result dict per project id (input order, unknown ids skipped).
+    Stored results are reused when their model hash still matches the saved
+    project and they come from the current ENGINE_VERSION; everything else is evaluated in parallel and (optionally) stored.
+    Re-evaluation keeps what the stored row had: extras of a current row are
+    carried over, a changed (or older engine) project is re-run with the options
+    its extras were built from (so run_portfolio's tornado / MC survive).
+    """
+    workers = workers or os.cpu_count() or 1
+    rows = list(db.iter_project_payloads(project_ids))
+    # Read even without use_cache: re-evaluation must not drop stored extras
+    cached = db.load_project_results(project_ids)
+
+    reused, todo, todo_options, carried = {}, [], [], {}
+    for row in rows:
+        hit = cached.get(row[0])
+        current = (hit is not None and hit["status"] == "ok" and hit["engine_version"] == ENGINE_VERSION
+                   and hit["model_hash"] == db.compute_model_hash(row[3]))
+        if use_cache and current and hit["statements"]:
+            hit["name"] = row[1]
+            hit["cached"] = True
+            reused[row[0]] = hit
+            continue
+        todo.append(row)
+        if current:
+            # Unchanged project: the stored extras are still valid
+            carried[row[0]] = hit["extras"]
+            todo_options.append({})
+        else:
+            todo_options.append(options_from_extras(hit["extras"]) if hit and hit["extras"] else {})
+
+    pool = ProcessPoolExecutor(max_workers=min(workers, len(todo))) if workers > 1 and len(todo) > 1 else None
+    try:
+        fresh = _evaluate_rows(todo, todo_options, workers, pool)
+    finally:
+        if pool:
+            pool.shutdown()
+    for r in fresh:
+        if r["project_id"] in carried and r["status"] == "ok":
+            r["extras"] = {**carried[r["project_id"]], **r["extras"]}
+    if persist:
+        db.save_project_results(fresh)
+
+    by_id = dict(reused)
+    by_id.update({r["project_id"]: dict(r, cached=False) for r in fresh})
+    return [by_id[pid] for pid in project_ids if pid in by_id]
@@ -1,6 +1,8 @@
+import hashlib
+
 from core.model import ProjectModel
 from core.engine import FinancialResults
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Any
 import numpy as np
 
 def calculate_data_health(model: ProjectModel, results: FinancialResults) -> Tuple[int, List[Dict[str, str]]]:
@@ -63,74 +65,165 @@ def calculate_data_health(model: ProjectModel, results: FinancialResults) -> Tup
          
     return max(0, score), warnings
 
+# Product rules in priority order (the first match decides): field, test,
+# status, reason. The tests work on a single value and on numpy arrays.
+_PRODUCT_RULES = [
+    # 1. Exclusion Rules (Technical Constraints)
+    ("production_capacity_per_year", lambda v: v <= 0, "⛔ Excluded", "Capacity/Year is 0 or missing."),
+    ("oee_percent", lambda v: v <= 0, "⛔ Excluded", "OEE % is 0% or missing."),
+    ("scrap_rate", lambda v: v >= 1.0, "⛔ Excluded", "Scrap Rate >= 100%."),
+    # 2. "Gray Area" / Included but Zero Revenue
+    ("initial_volume", lambda v: v <= 0, "⚠️ Included (0 Vol)", "Initial Volume is 0. It is set up but produces nothing."),
+    ("unit_price", lambda v: v <= 0, "⚠️ Included (Free)", "Unit Price is 0. It produces volume but no revenue."),
+    # 3. Minor Warnings (Revenue exists but...)
+    ("unit_cost", lambda v: v <= 0, "✅ Included", "Unit Cost is 0 (100% Margin)."),
+    ("advance_payment_pct", lambda v: (v < 0) | (v > 1), "✅ Included", "Advance Payment % warning (0-100)."),
+]
+
 def check_product_status(p) -> Tuple[str, str]:
     """
     Returns (Status, Reason) for a product.
     Status: "✅ Included", "⚠️ Inc. (No Rev)", "⛔ Excluded"
     """
-    # 1. Exclusion Rules (Technical Constraints)
-    if p.production_capacity_per_year <= 0:
-        return "⛔ Excluded", "Capacity/Year is 0 or missing."
-    if p.oee_percent <= 0:
-        return "⛔ Excluded", "OEE % is 0% or missing."
-    if p.scrap_rate >= 1.0:
-        return "⛔ Excluded", "Scrap Rate >= 100%."
-        
-    # 2. "Gray Area" / Included but Zero Revenue
-    # "Included but revenue = 0"
-    if p.initial_volume <= 0:
-        return "⚠️ Included (0 Vol)", "Initial Volume is 0. It is set up but produces nothing."
-    if p.unit_price <= 0:
-        return "⚠️ Included (Free)", "Unit Price is 0. It produces volume but no revenue."
-        
-    # 3. Minor Warnings (Revenue exists but...)
-    if p.unit_cost <= 0:
-        return "✅ Included", "Unit Cost is 0 (100% Margin)."
-    if p.advance_payment_pct < 0 or p.advance_payment_pct > 1:
-        return "✅ Included", "Advance Payment % warning (0-100)."
-        
+    for field, test, status, reason in _PRODUCT_RULES:
+        if test(getattr(p, field)):
+            return status, reason
     return "✅ Included", "Fully active."
 
-def check_input_quality(model: ProjectModel) -> List[Dict[str, str]]:
+# --- Input Quality (sidebar) ---
+# Checks run per model section. With a cache dict (e.g. one per Streamlit
+# session) a section is only re-validated when its key changes. A key is the
+# content digest of the model sections the checks read, as in
+# core.stages.section_digest (whole sections serialize faster than field
+# subsets).
+
+# Section -> model sections its checks read (model_dump include spec)
+QUALITY_SECTIONS: Dict[str, Dict[str, Any]] = {
+    "products": {"products": True},
+    "capex_items": {"horizon_years": True, "capex_items": True},
+    "personnel": {"horizon_years": True, "personnel": True},
+    "loans": {"horizon_years": True, "loans": True},
+    "config": {"nwc_config": True},
+    "curves": {"index_curves": True, "products": True, "fixed_expenses": True, "personnel": True},
+}
+
+def _section_key(model: ProjectModel, include: Dict[str, Any]) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(model.model_dump_json(include=include).encode())
+    return h.hexdigest()
+
+def _attr_array(items, attr: str) -> np.ndarray:
+    return np.fromiter((getattr(i, attr) for i in items), dtype=float, count=len(items))
+
+def _issue(context, item, issue, severity):
+    return {'context': context, 'item': item, 'issue': issue, 'severity': severity}
+
+# check_product_status labels -> sidebar severity ("✅ Included" is not an issue)
+_PRODUCT_SEVERITY = {"⛔": 'error', "⚠️": 'warning'}
+
+def _check_products(model: ProjectModel):
+    items = model.products
+    # Index of the first matching rule per product (-1 = none), as check_product_status
+    matches = [test(_attr_array(items, field)) for field, test, _, _ in _PRODUCT_RULES]
+    first = np.select(matches, np.arange(len(_PRODUCT_RULES)), default=-1) if items else np.array([], dtype=int)
+    issues = []
+    for i in np.flatnonzero(first >= 0):
+        _, _, status, reason = _PRODUCT_RULES[first[i]]
+        severity = _PRODUCT_SEVERITY.get(status.split(" ", 1)[0])
+        if severity:
+            issues.append(_issue('Revenue', items[i].name, reason, severity))
+    return issues
+
+def _check_capex(model: ProjectModel):
+    items = model.capex_items
+    amount = _attr_array(items, "amount")
+    year = _attr_array(items, "year")
+    horizon = model.horizon_years
+    zero = amount <= 0
+    outside = year > horizon
+    issues = []
+    for i in np.flatnonzero(zero | outside):
+        if zero[i]:
+            issues.append(_issue('CAPEX', items[i].name, 'Amount is 0.', 'warning'))
+        if outside[i]:
+            issues.append(_issue('CAPEX', items[i].name, f'Year {int(year[i])} is outside horizon ({horizon}).', 'error'))
+    return issues
+
+def _check_personnel(model: ProjectModel):
+    items = model.personnel
+    count = _attr_array(items, "count")
+    start = _attr_array(items, "start_year")
+    zero = count <= 0
+    outside = start > model.horizon_years
+    issues = []
+    for i in np.flatnonzero(zero | outside):
+        if zero[i]:
+            issues.append(_issue('OPEX', items[i].role, 'Count is 0.', 'warning'))
+        if outside[i]:
+            issues.append(_issue('OPEX', items[i].role, 'Start Year outside horizon.', 'error'))
+    return issues
+
+def _check_loans(model: ProjectModel):
+    items = model.loans
+    amount = _attr_array(items, "amount")
+    start = _attr_array(items, "start_year")
+    grace = _attr_array(items, "grace_period_years")
+    term = _attr_array(items, "term_years")
+    zero = amount <= 0
+    outside = start > model.horizon_years
+    grace_bad = grace >= term
+    issues = []
+    for i in np.flatnonzero(zero | outside | grace_bad):
+        if zero[i]:
+            issues.append(_issue('Finance', 'Loan', 'Amount is 0.', 'warning'))
+        if outside[i]:
+            issues.append(_issue('Finance', 'Loan', 'Start Year outside horizon.', 'error'))
+        if grace_bad[i]:
+            issues.append(_issue('Finance', 'Loan', 'Grace period >= Term.', 'error'))
+    return issues
+
+def _check_config(model: ProjectModel):
+    nwc_cfg = model.nwc_config
+    if nwc_cfg.dso == 0 and nwc_cfg.dpo == 0 and nwc_cfg.dio == 0:
+        return [_issue('Setup', 'Working Capital', 'All NWC days are 0. Logic check needed?', 'info')]
+    return []
+
+def _check_curves(model: ProjectModel):
+    from core.curves import referenced_curves
+    return [
+        _issue('Setup', name, f"Index curve used by {', '.join(items)} is not defined.", 'error')
+        for name, items in referenced_curves(model).items() if name not in model.index_curves
+    ]
+
+_SECTION_CHECKS = {
+    "products": _check_products,
+    "capex_items": _check_capex,
+    "personnel": _check_personnel,
+    "loans": _check_loans,
+    "config": _check_config,
+    "curves": _check_curves,
+}
+
+def check_input_quality(model: ProjectModel, cache: Optional[Dict[str, Any]] = None) -> List[Dict[str, str]]:
     """
     Checks static inputs for logical missing/invalid values.
     Returns list of dicts: {'context': 'CAPEX', 'item': 'Land', 'issue': '...', 'severity': 'error/warning'}
+    
+    cache: optional dict owned by the caller. Per section it keeps (key, issues)
+    and a section is only re-checked when its key changes.
     """
     issues = []
-    
-    # 1. Products
-    for p in model.products:
-        status, reason = check_product_status(p)
-        if "⛔" in status:
-            issues.append({'context': 'Revenue', 'item': p.name, 'issue': reason, 'severity': 'error'})
-        elif "⚠️" in status:
-            issues.append({'context': 'Revenue', 'item': p.name, 'issue': reason, 'severity': 'warning'})
-            
-    # 2. CAPEX
-    for c in model.capex_items:
-        if c.amount <= 0:
-            issues.append({'context': 'CAPEX', 'item': c.name, 'issue': 'Amount is 0.', 'severity': 'warning'})
-        if c.year > model.horizon_years:
-            issues.append({'context': 'CAPEX', 'item': c.name, 'issue': f'Year {c.year} is outside horizon ({model.horizon_years}).', 'severity': 'error'})
-            
-    # 3. Personnel
-    for p_item in model.personnel:
-        if p_item.count <= 0:
-             issues.append({'context': 'OPEX', 'item': p_item.role, 'issue': 'Count is 0.', 'severity': 'warning'})
-        if p_item.start_year > model.horizon_years:
-             issues.append({'context': 'OPEX', 'item': p_item.role, 'issue': 'Start Year outside horizon.', 'severity': 'error'})
-
-    # 4. Loans
-    for l in model.loans:
-        if l.amount <= 0:
-            issues.append({'context': 'Finance', 'item': 'Loan', 'issue': 'Amount is 0.', 'severity': 'warning'})
-        if l.start_year > model.horizon_years:
-            issues.append({'context': 'Finance', 'item': 'Loan', 'issue': 'Start Year outside horizon.', 'severity': 'error'})
-        if l.grace_period_years >= l.term_years:
-             issues.append({'context': 'Finance', 'item': 'Loan', 'issue': 'Grace period >= Term.', 'severity': 'error'})
-             
-    # 5. Global Config
-    if model.nwc_config.dso == 0 and model.nwc_config.dpo == 0 and model.nwc_config.dio == 0:
-         issues.append({'context': 'Setup', 'item': 'Working Capital', 'issue': 'All NWC days are 0. Logic check needed?', 'severity': 'info'})
+    for section, include in QUALITY_SECTIONS.items():
+        check = _SECTION_CHECKS[section]
+        if cache is not None:
+            key = _section_key(model, include)
+            hit = cache.get(section)
+            if hit is None or hit[0] != key:
+                hit = (key, check(model))
+                cache[section] = hit
+            section_issues = hit[1]
+        else:
+            section_issues = check(model)
+        issues.extend(dict(i) for i in section_issues)
          
     return issues
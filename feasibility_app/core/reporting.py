@@ -1,4 +1,6 @@
 import json
+import os
+import numpy as np
 import pandas as pd
 from core.model import ProjectModel
 from core.engine import FinancialResults
@@ -20,24 +22,84 @@ def import_from_json(json_str: str) -> ProjectModel:
         # Fallback for Pydantic v1
         return ProjectModel.parse_raw(json_str)
 
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils import get_column_letter
+# Excel export is written with xlsxwriter in constant_memory mode: every sheet is
+# streamed row by row and flushed to disk, so memory stays flat even for monthly
+# models with 360+ period columns. Rows MUST be written top-down per sheet.
 
-def export_to_excel(project: ProjectModel, results: FinancialResults) -> bytes:
-    """Exports model inputs and result tables to a styled Excel file."""
-    buffer = BytesIO()
+MONTHLY_DETAIL_SHEET = "Period Detail"
+
+def _write_row(ws, row_idx: int, values, fmt=None, label_fmt=None):
+    """Writes one row. The first cell (row label) uses `label_fmt`, the rest `fmt`."""
+    for col_idx, val in enumerate(values):
+        if val is None:
+            continue
+        if isinstance(val, (np.floating, np.integer)):
+            val = val.item()
+        ws.write(row_idx, col_idx, val, label_fmt if col_idx == 0 else fmt)
+
+def _write_frame(ws, df: pd.DataFrame, header_fmt, num_fmt, index_label: str = ""):
+    """Streams a (small, annual) DataFrame: header row + one row per index value."""
+    _write_row(ws, 0, [index_label] + [str(c) for c in df.columns], header_fmt, header_fmt)
+    values = df.to_numpy()
+    for r, idx in enumerate(df.index):
+        _write_row(ws, r + 1, [idx] + values[r].tolist(), num_fmt)
+
+def _write_records(ws, items, columns: list, header_fmt, num_fmt):
+    """Streams pydantic items (CAPEX, Loans) without building a DataFrame."""
+    _write_row(ws, 0, columns, header_fmt, header_fmt)
+    for r, item in enumerate(items):
+        d = item.model_dump(include=set(columns))
+        _write_row(ws, r + 1, [d.get(c) for c in columns], num_fmt, num_fmt)
+
+def _write_period_detail(ws, results: FinancialResults, header_fmt, num_fmt):
+    """
+    Transposed period sheet: one row per line item, one column per engine period.
+    Row-wise writing keeps constant_memory effective for wide (monthly) sheets.
+    """
+    pp_year = results.periods_per_year
+    any_arr = next(iter(results.period_arrays.values()), np.array([]))
+    n_periods = len(any_arr)
+    if pp_year == 12:
+        labels = [f"Y{i // 12 + 1}-M{i % 12 + 1:02d}" for i in range(n_periods)]
+    else:
+        labels = [f"Y{i + 1}" for i in range(n_periods)]
+        
+    _write_row(ws, 0, ["Line Item"] + labels, header_fmt, header_fmt)
+    for r, (name, arr) in enumerate(results.period_arrays.items()):
+        ws.write_string(r + 1, 0, name)
+        for c, val in enumerate(np.asarray(arr, dtype=float).tolist()):
+            ws.write_number(r + 1, c + 1, val, num_fmt)
+    ws.freeze_panes(1, 1)
+
+def write_excel_report(project: ProjectModel, results: FinancialResults, target, include_period_detail: bool = None):
+    """
+    Writes the styled report to `target` (file path or binary file-like object).
+    include_period_detail: add the per-period sheet (default: only for monthly models).
+    """
+    import xlsxwriter
     
-    # Create Excel writer
-    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-        workbook = writer.book
+    if include_period_detail is None:
+        include_period_detail = results.periods_per_year > 1
         
-        # --- Sheet 1: Assumptions ---
-        ws_assump = workbook.add_worksheet("Assumptions")
+    workbook = xlsxwriter.Workbook(target, {'constant_memory': True})
+    try:
         # Formats
         title_fmt = workbook.add_format({'bold': True, 'font_size': 14, 'font_color': '#2c3e50'})
-        header_fmt = workbook.add_format({'bold': True, 'bg_color': '#ecf0f1', 'border': 1})
         num_fmt = workbook.add_format({'num_format': '#,##0.00'})
+        int_fmt = workbook.add_format({'num_format': '#,##0'})
         bold_fmt = workbook.add_format({'bold': True})
+        header_format = workbook.add_format({
+            'bold': True,
+            'text_wrap': True,
+            'valign': 'top',
+            'fg_color': '#D7E4BC',
+            'border': 1
+        })
+        
+        # --- Sheet 1: Assumptions ---
+        ws_assump = workbook.add_worksheet("Assumptions")
+        ws_assump.set_column(0, 0, 30)
+        ws_assump.set_column(1, 1, 40)
         
         ws_assump.write(0, 0, f"Feasibility Study: {project.name}", title_fmt)
         ws_assump.write(1, 0, f"Date: {project.created_at.strftime('%Y-%m-%d')}", bold_fmt)
@@ -53,7 +115,7 @@ def export_to_excel(project: ProjectModel, results: FinancialResults) -> bytes:
         # Investment Summary
         ws_assump.write(10, 0, "Investment Summary", bold_fmt)
         total_capex = sum(c.amount for c in project.capex_items)
-        ws_assump.write(11, 0, "Total CAPEX", bold_fmt); ws_assump.write(11, 1, total_capex, workbook.add_format({'num_format': '#,##0'}))
+        ws_assump.write(11, 0, "Total CAPEX", bold_fmt); ws_assump.write(11, 1, total_capex, int_fmt)
         
         # Products
         ws_assump.write(13, 0, "Revenue Drivers", bold_fmt)
@@ -63,33 +125,7 @@ def export_to_excel(project: ProjectModel, results: FinancialResults) -> bytes:
             ws_assump.write(row, 1, f"Price: {p.unit_price} / Vol: {p.initial_volume}")
             row += 1
             
-        ws_assump.set_column(0, 0, 30)
-        ws_assump.set_column(1, 1, 40)
-
-        # --- Sheet 2: Summary ---
-        
-        # Styling formats for xlsxwriter
-        header_format = workbook.add_format({
-            'bold': True,
-            'text_wrap': True,
-            'valign': 'top',
-            'fg_color': '#D7E4BC',
-            'border': 1
-        })
-        
-        # Helper to style a worksheet for xlsxwriter
-        def style_sheet_xlsxwriter(sheet_name):
-            ws = writer.sheets[sheet_name]
-            
-            # Simple approach: Set column width globally for first 30 columns
-            # xlsxwriter worksheet objects don't expose data dimensions easily without tracking
-            ws.set_column(0, 30, 20) # Set columns A through AE to width 20
-            
-            # Header format check?
-            # Pandas writes header with bold by default.
-            pass
-
-        # 1. Summary Sheet (Transposed)
+        # --- Sheet 2: Summary (Transposed) ---
         summary_data = {
             "Internal ID": project.id,
             "Project Name": project.name,
@@ -104,27 +140,158 @@ def export_to_excel(project: ProjectModel, results: FinancialResults) -> bytes:
             "Terminal Treatment": results.kpi.get("terminal_debt_treatment", ""),
             "Terminal Debt Payoff": results.kpi.get("terminal_debt_payoff", 0)
         }
-        df_summary = pd.DataFrame(list(summary_data.items()), columns=["Metric", "Value"])
-        df_summary.to_excel(writer, sheet_name='Summary', index=False)
-        style_sheet_xlsxwriter('Summary')
-        
-        # 2. Financial Statements
-        results.income_statement.to_excel(writer, sheet_name='Income Statement')
-        style_sheet_xlsxwriter('Income Statement')
-        
-        results.cash_flow_statement.to_excel(writer, sheet_name='Cash Flow')
-        style_sheet_xlsxwriter('Cash Flow')
-        
-        # 3. CAPEX
+        ws = workbook.add_worksheet("Summary")
+        ws.set_column(0, 30, 20)
+        _write_row(ws, 0, ["Metric", "Value"], header_format, header_format)
+        for r, (k, v) in enumerate(summary_data.items()):
+            _write_row(ws, r + 1, [k, v])
+            
+        # --- Financial Statements ---
+        for sheet_name, df in (("Income Statement", results.income_statement), ("Cash Flow", results.cash_flow_statement)):
+            ws = workbook.add_worksheet(sheet_name)
+            ws.set_column(0, 30, 20)
+            _write_frame(ws, df, header_format, num_fmt)
+            
+        # --- CAPEX ---
         if project.capex_items:
-            capex_df = pd.DataFrame([item.dict() for item in project.capex_items])
-            capex_df.to_excel(writer, sheet_name='CAPEX Details', index=False)
-            style_sheet_xlsxwriter('CAPEX Details')
+            ws = workbook.add_worksheet("CAPEX Details")
+            ws.set_column(0, 30, 20)
+            _write_records(ws, project.capex_items, list(type(project.capex_items[0]).model_fields), header_format, num_fmt)
             
-        # 4. Loans
+        # --- Loans ---
         if project.loans:
-            loans_df = pd.DataFrame([item.dict() for item in project.loans])
-            loans_df.to_excel(writer, sheet_name='Financing Details', index=False)
-            style_sheet_xlsxwriter('Financing Details')
+            ws = workbook.add_worksheet("Financing Details")
+            ws.set_column(0, 30, 20)
+            _write_records(ws, project.loans, list(type(project.loans[0]).model_fields), header_format, num_fmt)
             
+        # --- Period Detail (monthly models) ---
+        if include_period_detail and results.period_arrays:
+            ws = workbook.add_worksheet(MONTHLY_DETAIL_SHEET)
+            ws.set_column(0, 0, 24)
+            ws.set_column(1, len(next(iter(results.period_arrays.values()))), 14)
+            _write_period_detail(ws, results, header_format, num_fmt)
+    finally:
+        workbook.close()
+
+def export_to_excel(project: ProjectModel, results: FinancialResults, include_period_detail: bool = None) -> bytes:
+    """Exports model inputs and result tables to a styled Excel file."""
+    buffer = BytesIO()
+    write_excel_report(project, results, buffer, include_period_detail=include_period_detail)
     return buffer.getvalue()
+
+def iter_excel_report(project: ProjectModel, results: FinancialResults, chunk_size: int = 1 << 16, include_period_detail: bool = None):
+    """
+    Yields the report in `chunk_size` byte chunks (for chunked HTTP responses).
+    The workbook is spooled to a temp file, never fully held in memory.
+    """
+    import tempfile
+    
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        write_excel_report(project, results, path, include_period_detail=include_period_detail)
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        os.remove(path)
+
+# --- Multi-Project (Committee Pack) Reports ---
+# Inputs are result dicts from core.portfolio.collect_portfolio_results.
+
+PORTFOLIO_KPI_COLUMNS = [
+    ("npv", "NPV"), ("irr", "IRR"), ("roi", "ROI (%)"), ("payback", "Payback (Yrs)"),
+    ("dscr_min", "Min DSCR"), ("ending_debt_balance", "Ending Debt Balance"),
+]
+
+def _safe_sheet_name(name: str, used: set) -> str:
+    """Excel sheet names: max 31 chars, no []:*?/\\ and unique (case-insensitive)."""
+    clean = "".join("_" if ch in '[]:*?/\\' else ch for ch in (name or "Project")).strip() or "Project"
+    base = clean[:31]
+    candidate, n = base, 2
+    while candidate.lower() in used:
+        suffix = f" ({n})"
+        candidate = base[:31 - len(suffix)] + suffix
+        n += 1
+    used.add(candidate.lower())
+    return candidate
+
+def portfolio_statements_frame(results: list) -> pd.DataFrame:
+    """All annual statements of all projects in long format (BI friendly)."""
+    frames = []
+    for r in results:
+        if not r.get("statements"):
+            continue
+        df = pd.DataFrame.from_records(r["statements"])
+        df.insert(0, "project_name", r.get("name") or "")
+        df.insert(0, "project_id", r["project_id"])
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=["project_id", "project_name", "statement", "line_item", "year", "value"])
+    return pd.concat(frames, ignore_index=True)
+
+def write_portfolio_workbook(results: list, target):
+    """
+    One consolidated workbook: a 'Portfolio Summary' sheet with one KPI row per
+    project, then one sheet per project with its annual statements
+    (line items as rows, years as columns). Streamed in constant_memory mode.
+    """
+    import xlsxwriter
+    
+    workbook = xlsxwriter.Workbook(target, {'constant_memory': True})
+    try:
+        header_format = workbook.add_format({'bold': True, 'text_wrap': True, 'valign': 'top', 'fg_color': '#D7E4BC', 'border': 1})
+        section_fmt = workbook.add_format({'bold': True, 'font_color': '#2c3e50'})
+        num_fmt = workbook.add_format({'num_format': '#,##0.00'})
+        
+        ws = workbook.add_worksheet("Portfolio Summary")
+        ws.set_column(0, 1, 30)
+        ws.set_column(2, 4 + len(PORTFOLIO_KPI_COLUMNS), 16)
+        _write_row(ws, 0, ["Project ID", "Project Name", "Version", "Status"] + [lbl for _, lbl in PORTFOLIO_KPI_COLUMNS] + ["Error"],
+                   header_format, header_format)
+        for i, r in enumerate(results):
+            kpi = r.get("kpi") or {}
+            _write_row(ws, i + 1,
+                       [r["project_id"], r.get("name"), r.get("version"), r.get("status")]
+                       + [kpi.get(k) for k, _ in PORTFOLIO_KPI_COLUMNS] + [r.get("error")],
+                       num_fmt)
+        
+        used_names = {"portfolio summary"}
+        for r in results:
+            if not r.get("statements"):
+                continue
+            ws = workbook.add_worksheet(_safe_sheet_name(r.get("name") or r["project_id"], used_names))
+            ws.set_column(0, 0, 28)
+            ws.set_column(1, 40, 14)
+            df = pd.DataFrame.from_records(r["statements"])
+            row = 0
+            for statement, grp in df.groupby("statement", sort=False):
+                wide = grp.pivot(index="line_item", columns="year", values="value")
+                wide = wide.reindex(pd.unique(grp["line_item"]))
+                ws.write(row, 0, statement, section_fmt)
+                row += 1
+                _write_row(ws, row, ["Line Item"] + [f"Y{y}" for y in wide.columns], header_format, header_format)
+                row += 1
+                for line_item, values in zip(wide.index, wide.to_numpy()):
+                    _write_row(ws, row, [line_item] + values.tolist(), num_fmt)
+                    row += 1
+                row += 1
+    finally:
+        workbook.close()
+
+def write_statements_parquet(results: list, target, partition_cols: list = None):
+    """
+    Writes the long-format statements to Parquet (file, or dataset directory when
+    `partition_cols` is given, e.g. ["project_id"]). Requires pyarrow.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Parquet export requires 'pyarrow' (pip install pyarrow).") from e
+        
+    df = portfolio_statements_frame(results)
+    df.to_parquet(target, index=False, partition_cols=partition_cols)
+    return len(df)
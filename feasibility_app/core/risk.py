@@ -3,7 +3,10 @@ import pandas as pd
 from core.model import ProjectModel, DistributionConfig
 from core.engine import calculate_financials
 import copy
-from typing import List, Dict
+from typing import List, Dict, Any, Optional
+
+# Drivers the simulation can shock (see apply_factor_to_model)
+MC_VARIABLES = ["Volume", "Price", "CAPEX", "OPEX"]
 
 def run_sensitivity_variable(base_model: ProjectModel, variable: str, steps: np.ndarray) -> pd.DataFrame:
     """
@@ -18,7 +21,7 @@ def run_sensitivity_variable(base_model: ProjectModel, variable: str, steps: np.
         sim_model = copy.deepcopy(base_model)
         apply_factor_to_model(sim_model, variable, factor)
         
-        res = calculate_financials(sim_model)
+        res = calculate_financials(sim_model, item_detail=None)
         results_list.append({
             "Change (Multiplier)": factor,
             "Change %": (factor - 1.0) * 100,
@@ -37,20 +40,20 @@ def run_tornado_analysis(base_model: ProjectModel, variables: List[str] = None)
         variables = ["Price", "Volume", "CAPEX", "OPEX"]
         
     results = []
-    base_res = calculate_financials(base_model)
+    base_res = calculate_financials(base_model, item_detail=None)
     base_npv = base_res.kpi["npv"]
     
     for var in variables:
         # Downside (0.9)
         model_down = copy.deepcopy(base_model)
         apply_factor_to_model(model_down, var, 0.9)
-        res_down = calculate_financials(model_down)
+        res_down = calculate_financials(model_down, item_detail=None)
         npv_down = res_down.kpi["npv"]
         
         # Upside (1.1)
         model_up = copy.deepcopy(base_model)
         apply_factor_to_model(model_up, var, 1.1)
-        res_up = calculate_financials(model_up)
+        res_up = calculate_financials(model_up, item_detail=None)
         npv_up = res_up.kpi["npv"]
         
         results.append({
@@ -66,6 +69,29 @@ def run_tornado_analysis(base_model: ProjectModel, variables: List[str] = None)
     df = pd.DataFrame(results)
     return df.sort_values(by="Range", ascending=True) # Sorted for Tornado Chart (Largest at top usually, Plotly does inverted)
 
+def run_grid_sensitivity(base_model: ProjectModel, x_var: str, x_values, y_var: str, y_values, metrics: List[str] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Two-way data table: evaluates every (x, y) combination of two drivers
+    (see core.batch.DRIVERS) in one batched engine call.
+    Returns {metric: DataFrame} with y values as index and x values as columns.
+    """
+    from core.batch import compile_model, evaluate_batch
+
+    if x_var == y_var:
+        raise ValueError("Grid sensitivity needs two different drivers")
+    if metrics is None:
+        metrics = ["npv", "irr", "dscr_min"]
+
+    xs = np.asarray(x_values, dtype=float)
+    ys = np.asarray(y_values, dtype=float)
+    grid_x, grid_y = np.meshgrid(xs, ys)
+
+    out = evaluate_batch(compile_model(base_model), {x_var: grid_x.ravel(), y_var: grid_y.ravel()})
+    return {
+        m: pd.DataFrame(out[m].reshape(grid_x.shape), index=pd.Index(ys, name=y_var), columns=pd.Index(xs, name=x_var))
+        for m in metrics
+    }
+
 def apply_factor_to_model(model: ProjectModel, variable: str, factor: float):
     # Common helper
     if variable == "Price":
@@ -83,108 +109,220 @@ def apply_factor_to_model(model: ProjectModel, variable: str, factor: float):
         for per in model.personnel:
             per.monthly_gross_salary *= factor
 
-def get_inverse_cdf(val: float, config: DistributionConfig) -> float:
+def get_inverse_cdf(val, config: DistributionConfig):
     """
     Inverse Transform Sampling helper.
-    Maps a [0,1] uniform/normal value to the target distribution factor.
-    Ideally we map Normal(0,1) -> Target.
+    Maps uniform [0,1] values (scalar or array) to the target distribution
+    factor around the base case (1.0 = no change).
     """
-    # But for simplicity & Cholesky, we generate Correlated Standard Normals (Z scores).
-    # Then we map Z -> Uniform -> Target Distribution?
-    # Or map Z -> Target directly if Normal/LogNormal.
-    pass
+    from core.distributions import validate_config, inverse_cdf
+
+    validate_config(config)
+    return inverse_cdf(val, config)
 
-def run_monte_carlo(base_model: ProjectModel, iterations: int = 1000) -> pd.DataFrame:
+def correlation_matrix(risk_config, variables: List[str]) -> np.ndarray:
+    """Pairwise correlation matrix of the Monte Carlo variables (unit diagonal)."""
+    n_vars = len(variables)
+    corr_matrix = np.eye(n_vars)
+    for i, v1 in enumerate(variables):
+        for j, v2 in enumerate(variables):
+            if i != j:
+                corr_matrix[i, j] = risk_config.get_correlation(v1, v2)
+    return corr_matrix
+
+def correlated_z_scores(corr_matrix: np.ndarray, iterations: int) -> np.ndarray:
+    """
+    Correlated standard normals (iterations x vars) from the global NumPy RNG.
+    Invalid matrices are repaired to the nearest correlation matrix (see
+    core.correlation) instead of falling back to independent draws.
+    """
+    from core.correlation import cholesky_factor, correlated_normals
+
+    chol, _ = cholesky_factor(corr_matrix)
+    return correlated_normals(chol, iterations)
+
+def z_to_factors(z_scores: np.ndarray, configs: Dict[str, DistributionConfig], variables: List[str]) -> np.ndarray:
+    """
+    Maps correlated standard normals (iterations x vars) to driver multipliers.
+    Base multiplier is 1.0; the distribution defines the deviation from it
+    (via the percent params), e.g. Mean=0.0 means 0% shift -> 1.0.
+    """
+    from core.distributions import transform_matrix
+    return transform_matrix(z_scores, configs, variables)
+
+def find_importance_shift(base_model: ProjectModel, chol: np.ndarray, variables: List[str], threshold: float = 0.0, metric: str = "npv", max_iter: int = 20):
+    """
+    Design point for importance sampling: the most likely independent
+    standard-normal vector e (Z = chol @ e) at which `metric` falls to
+    `threshold`, found by HL-RF (FORM) iterations. Each iteration evaluates
+    the point and its central-difference gradient in one batched call.
+    Returns (shift, evaluations); the shift is zero when the metric does not
+    react to the variables.
+    """
+    from core.batch import compile_model, evaluate_batch
+
+    cm = compile_model(base_model)
+    configs = {v: base_model.risk_config.get_config(v) for v in variables}
+    n_vars = len(variables)
+    h = 1e-3
+    e = np.zeros(n_vars)
+    evaluations = 0
+
+    for _ in range(max_iter):
+        points = np.vstack([e, e + h * np.eye(n_vars), e - h * np.eye(n_vars)])
+        factors = z_to_factors(points @ chol.T, configs, variables)
+        g = evaluate_batch(cm, {v: factors[:, i] for i, v in enumerate(variables)})[metric] - threshold
+        evaluations += len(points)
+
+        grad = (g[1:n_vars + 1] - g[n_vars + 1:]) / (2 * h)
+        norm2 = grad @ grad
+        if not np.isfinite(norm2) or norm2 == 0:
+            return np.zeros(n_vars), evaluations
+        e_new = (grad @ e - g[0]) / norm2 * grad
+        if np.linalg.norm(e_new - e) < 1e-4 * max(1.0, np.linalg.norm(e_new)):
+            return e_new, evaluations
+        e = e_new
+    return e, evaluations
+
+def run_monte_carlo(
+    base_model: ProjectModel,
+    iterations: int = 1000,
+    importance_sampling: bool = False,
+    loss_threshold: float = 0.0,
+    defensive_share: float = 0.3,
+    variables: List[str] = None,
+    cache: Optional[Dict[str, Any]] = None
+) -> pd.DataFrame:
     """
     Runs Monte Carlo simulation with CORRELATED variables.
+
+    importance_sampling=True shifts the sampling of the Z-scores to the
+    design point where NPV falls to `loss_threshold` (see
+    find_importance_shift) for all but `defensive_share` of the draws. Every
+    row gets its likelihood ratio in "Weight", so weighted statistics (see
+    summarize_monte_carlo) stay unbiased while far more draws land in the
+    loss tail. attrs carry "ess" and the "shift" applied per variable.
+
+    variables: any subset of MC_VARIABLES (default: all). Distribution
+    parameters are validated before sampling. cache: optional caller-owned
+    dict; plain runs reuse the factor matrix when seed, iteration count,
+    distributions and correlations are unchanged.
+
+    Stochastic FX / inflation paths configured in risk_config (see
+    core.paths) join the correlation matrix as "FX <currency>" / "Inflation";
+    such runs evaluate all rows in one batched engine call with the paths
+    and add "<path variable>_End" (FX rate vs base in the last period) and
+    "Inflation_Avg" (mean annual inflation) columns. Targeted shocks
+    (risk_config.shocks, see core.shocks) also run batched and add
+    "<shock name>_Shock" (mean multiplier, or rate deviation for loan rates,
+    over the shock's years); they are drawn independently of the drivers.
     """
+    from core.distributions import validate_config, factor_cache_key, cached_factors
+    from core.correlation import cholesky_factor
+    from core.paths import path_variables, validate_paths
+    from core.shocks import validate_shocks
+
     np.random.seed(base_model.risk_config.random_seed)
     
     # 1. Identify Variables involved
-    vars_interest = ["Volume", "Price", "CAPEX", "OPEX"]
+    vars_interest = list(variables) if variables is not None else list(MC_VARIABLES)
+    unknown = [v for v in vars_interest if v not in MC_VARIABLES]
+    if unknown:
+        raise ValueError(f"Unsupported Monte Carlo variable(s): {', '.join(unknown)}")
     n_vars = len(vars_interest)
+
+    # Pre-fetch configs (fail before any engine run on bad parameters)
+    configs = {v: base_model.risk_config.get_config(v) for v in vars_interest}
+    for var_name, conf in configs.items():
+        validate_config(conf, var_name)
+    validate_paths(base_model)
+    validate_shocks(base_model)
+    path_vars = path_variables(base_model)
+    batched = bool(path_vars or base_model.risk_config.shocks)
     
-    # 2. Build Covariance/Correlation Matrix
-    corr_matrix = np.eye(n_vars)
-    for i, v1 in enumerate(vars_interest):
-        for j, v2 in enumerate(vars_interest):
-            if i != j:
-                c = base_model.risk_config.get_correlation(v1, v2)
-                corr_matrix[i, j] = c
-                
+    # 2. Build Covariance/Correlation Matrix (drivers first, then paths)
+    corr_matrix = correlation_matrix(base_model.risk_config, vars_interest + path_vars)
+
     # 3. Generate Correlated Standard Normals (Z-scores)
     # Shape: (iterations, n_vars)
-    # Using multivariate_normal
-    mean_vec = np.zeros(n_vars)
-    
-    try:
-        # Check positive semi-definite, else fallback to independent
-        z_scores = np.random.multivariate_normal(mean_vec, corr_matrix, iterations)
-    except np.linalg.LinAlgError:
-        print("Warning: Correlation matrix not PSD. Falling back to independent.")
-        z_scores = np.random.normal(0, 1, size=(iterations, n_vars))
-        
+    weights = None
+    shift = np.zeros(n_vars)
+    pilot_evals = 0
+    chol, corr_report = cholesky_factor(corr_matrix)
+    if importance_sampling:
+        # The leading block of the Cholesky factor belongs to the drivers;
+        # path coordinates are sampled unshifted
+        shift, pilot_evals = find_importance_shift(base_model, chol[:n_vars, :n_vars], vars_interest, threshold=loss_threshold)
+        np.random.seed(base_model.risk_config.random_seed)
+        # Defensive mixture: a share of the draws stays unshifted, which
+        # bounds the weights by 1 / defensive_share
+        shifted = np.random.random(iterations) >= defensive_share
+        e = np.random.normal(0, 1, size=(iterations, n_vars + len(path_vars)))
+        e[:, :n_vars] += np.outer(shifted, shift)
+        # Likelihood ratio N(0, I) / mixture density in the independent space
+        ratio = np.exp(e[:, :n_vars] @ shift - 0.5 * shift @ shift)
+        weights = 1.0 / (defensive_share + (1.0 - defensive_share) * ratio)
+        z_scores = e @ chol.T
+    elif batched:
+        z_scores = correlated_z_scores(corr_matrix, iterations)
+
+    # 4. Transform Z-scores to Actual Multipliers (Iterations x Vars)
+    if importance_sampling or batched:
+        factors_arr = z_to_factors(z_scores[:, :n_vars], configs, vars_interest)
+    else:
+        key = factor_cache_key(base_model.risk_config.random_seed, iterations, vars_interest, configs, corr_matrix.tolist())
+        factors_arr = cached_factors(
+            key, lambda: z_to_factors(correlated_z_scores(corr_matrix, iterations), configs, vars_interest), cache
+        )
+
+    if batched:
+        df = _run_batch(base_model, factors_arr, vars_interest, z_scores[:, n_vars:], chol, path_vars)
+        if weights is not None:
+            df["Weight"] = weights
+    else:
+        df = _run_model_copies(base_model, factors_arr, vars_interest, weights)
+
+    df.attrs["correlation_adjustment"] = corr_report
+    df.attrs["paths"] = path_vars
+    if weights is not None:
+        df.attrs["importance_sampling"] = True
+        df.attrs["ess"] = float(weights.sum() ** 2 / (weights ** 2).sum())
+        df.attrs["shift"] = dict(zip(vars_interest, shift.tolist()))
+        df.attrs["pilot_evaluations"] = pilot_evals
+    return df
+
+def _run_batch(base_model: ProjectModel, factors_arr: np.ndarray, variables: List[str], path_scores: np.ndarray, chol: np.ndarray, path_vars: List[str]) -> pd.DataFrame:
+    """One batched engine call for all rows: drivers, FX / inflation paths and targeted shocks together."""
+    from core.batch import compile_model, evaluate_batch
+    from core.paths import generate_paths, fx_variable
+    from core.shocks import generate_shocks, item_shocks, shock_summary
+
+    n_vars = len(variables)
+    corr = chol @ chol.T
+    paths = generate_paths(base_model, len(factors_arr), terminal_scores=path_scores, corr_matrix=corr[n_vars:, n_vars:])
+    shock_paths = generate_shocks(base_model, len(factors_arr))
+    cm = compile_model(base_model)
+    out = evaluate_batch(cm, {v: factors_arr[:, i] for i, v in enumerate(variables)}, paths=paths,
+                         shocks=item_shocks(base_model, shock_paths))
+
+    df = pd.DataFrame({"Iteration": np.arange(len(factors_arr)), "NPV": out["npv"], "IRR": out["irr"]})
+    for i, var_name in enumerate(variables):
+        df[f"{var_name}_Factor"] = factors_arr[:, i]
+    for curr, arr in paths["fx"].items():
+        df[f"{fx_variable(curr)}_End"] = cm.fx.get(curr, 1.0) * arr[:, -1]
+    if paths["inflation"] is not None:
+        years = (cm.total_periods - 1) / cm.pp_year
+        base = base_model.inflation_rate
+        df["Inflation_Avg"] = (1 + base) * paths["inflation"][:, -1] ** (1 / years) - 1 if years > 0 else base
+    for name, values in shock_summary(base_model, shock_paths).items():
+        df[f"{name}_Shock"] = values
+    return df
+
+def _run_model_copies(base_model: ProjectModel, factors_arr: np.ndarray, vars_interest: List[str], weights: Optional[np.ndarray]) -> pd.DataFrame:
+    """Per-row model copy + calculate_financials (runs without stochastic paths or shocks)."""
+    iterations = len(factors_arr)
     results_list = []
-    
-    # Pre-fetch configs
-    configs = {v: base_model.risk_config.get_config(v) for v in vars_interest}
-    
-    # 4. Transform Z-scores to Actual Multipliers
-    # We'll batch process for speed instead of loop per iteration if possible?
-    # Actually, calculate_financials is the bottleneck, so loop is fine.
-    
-    # Pre-calculate factors array (Iterations x Vars)
-    factors_arr = np.zeros((iterations, n_vars))
-    
-    from scipy.stats import norm, triang, lognorm, uniform
-    
-    for i_var, var_name in enumerate(vars_interest):
-        conf = configs[var_name]
-        z_col = z_scores[:, i_var] # Standard Normals
-        
-        # Transform Z -> Target
-        # Base multiplier is 1.0. The Distribution defines deviation from 1.0 (via percent params)
-        # e.g. Mean=0.0 means 0% shift -> 1.0.
-        
-        if conf.dist_type == "Normal":
-            # Target: Normal(mean_pct, std_dev_pct)
-            # Factor = 1.0 + (mean_pct + Z * std_dev_pct)
-            factors_arr[:, i_var] = 1.0 + (conf.mean_pct + z_col * conf.std_dev_pct)
-            
-        elif conf.dist_type == "Lognormal":
-            # Lognormal is tricky. Usually defined by Mu, Sigma of underlying normal.
-            # If user inputs Mean Pct and Std Dev Pct of the RESULTING variables?
-            # Simplified: Mean=1.0+mean_pct, Sigma approx. 
-            # Classic Lognormal: exp(mu + sigma*Z).
-            # We want median to be 1.0? Or mean?
-            # Let's assume user inputs 'std_dev_pct' as 'volatility'.
-            # Factor = 1.0 + mean_pct * exp(sigma * Z - 0.5*sigma^2)?
-            # Let's stick to simple LogNormal derived from Normal approximation
-            # If Z is normal, exp(Z*sigma) is lognormal.
-            sigma = conf.std_dev_pct
-            factors_arr[:, i_var] = (1.0 + conf.mean_pct) * np.exp(z_col * sigma - 0.5 * sigma**2)
-            
-        elif conf.dist_type == "Uniform":
-            # Map Z (Normal) -> U[0,1] -> Uniform[Min, Max]
-            u_vals = norm.cdf(z_col)
-            range_span = conf.max_pct - conf.min_pct
-            factors_arr[:, i_var] = 1.0 + (conf.min_pct + u_vals * range_span)
-            
-        elif conf.dist_type == "Triangular":
-            # Map Z (Normal) -> U[0,1] -> Triangular
-            u_vals = norm.cdf(z_col)
-            # scipy.stats.triang takes c (shape), loc, scale
-            # c = (mode - min) / (max - min)
-            # loc = min
-            # scale = max - min
-            denom = (conf.max_pct - conf.min_pct)
-            if denom == 0: denom = 1e-9
-            c = (conf.mode_pct - conf.min_pct) / denom
-            
-            # Using ppf (inverse cdf)
-            tri_vals = triang.ppf(u_vals, c, loc=conf.min_pct, scale=denom)
-            factors_arr[:, i_var] = 1.0 + tri_vals
-            
+
     # 5. Run Simulation Loop
     for i in range(iterations):
         sim_model = copy.deepcopy(base_model)
@@ -196,7 +334,7 @@ def run_monte_carlo(base_model: ProjectModel, iterations: int = 1000) -> pd.Data
             row_factors[var_name] = f
             apply_factor_to_model(sim_model, var_name, f)
             
-        res = calculate_financials(sim_model)
+        res = calculate_financials(sim_model, item_detail=None)
         
         row = {
             "Iteration": i,
@@ -207,7 +345,121 @@ def run_monte_carlo(base_model: ProjectModel, iterations: int = 1000) -> pd.Data
         for k, v in row_factors.items():
             row[f"{k}_Factor"] = v
             
+        if weights is not None:
+            row["Weight"] = weights[i]
+
         results_list.append(row)
-        
+
     return pd.DataFrame(results_list)
 
+def weighted_percentile(values, weights, q: float) -> float:
+    """Percentile q (0-100) of values under the (self-normalized) weights."""
+    values = np.asarray(values, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    order = np.argsort(values)
+    cdf = np.cumsum(weights[order])
+    cdf /= cdf[-1]
+    return float(values[order][min(np.searchsorted(cdf, q / 100.0), len(values) - 1)])
+
+def summarize_monte_carlo(df: pd.DataFrame, threshold: float = 0.0) -> Dict[str, float]:
+    """
+    Mean / std / P5 of NPV and the loss probability P(NPV < threshold) with
+    its standard error. Uses the likelihood-ratio weights of an
+    importance-sampling run when present (plain runs weigh every row 1).
+    "equivalent_iterations" is the plain sample size that would give the
+    same standard error on the loss probability.
+    """
+    npv = df["NPV"].to_numpy(dtype=float)
+    n = len(npv)
+    weights = df["Weight"].to_numpy(dtype=float) if "Weight" in df else np.ones(n)
+    loss = (npv < threshold).astype(float)
+
+    if "Weight" in df:
+        # Loss probability: plain IS estimator; moments: self-normalized
+        prob_loss = float(np.mean(weights * loss))
+        prob_loss_se = float(np.std(weights * loss, ddof=1) / np.sqrt(n)) if n > 1 else 0.0
+        w = weights / weights.sum()
+        mean = float(w @ npv)
+        std = float(np.sqrt(w @ (npv - mean) ** 2))
+        ess = float(weights.sum() ** 2 / (weights ** 2).sum())
+    else:
+        prob_loss = float(loss.mean())
+        prob_loss_se = float(np.sqrt(prob_loss * (1 - prob_loss) / n)) if n else 0.0
+        mean = float(npv.mean())
+        std = float(npv.std(ddof=1)) if n > 1 else 0.0
+        ess = float(n)
+
+    return {
+        "mean_npv": mean,
+        "std_npv": std,
+        "p5_npv": weighted_percentile(npv, weights, 5),
+        "prob_profit": float(np.mean(weights * (npv > threshold))),
+        "prob_loss": prob_loss,
+        "prob_loss_se": prob_loss_se,
+        "ess": ess,
+        "equivalent_iterations": prob_loss * (1 - prob_loss) / prob_loss_se**2 if prob_loss_se > 0 else float(n),
+    }
+
+def run_paired_monte_carlo(variants: Dict[str, ProjectModel], iterations: int = 1000, risk_model: ProjectModel = None) -> pd.DataFrame:
+    """
+    Common random numbers: runs every model variant (e.g. with / without a
+    loan, baseline vs investment case) on ONE shared draw matrix, so the
+    differences between variants are not swamped by sampling noise.
+    Draws, distributions and correlations come from `risk_model` (default:
+    the first variant); the factors are stored once as "<Var>_Factor" and
+    each variant adds "<name>_NPV" and "<name>_IRR". Variants are evaluated
+    through the batched engine.
+    """
+    from core.batch import compile_model, evaluate_batch
+
+    if not variants:
+        raise ValueError("Paired simulation needs at least one variant")
+    names = list(variants)
+    reference = risk_model if risk_model is not None else variants[names[0]]
+
+    vars_interest = list(MC_VARIABLES)
+    np.random.seed(reference.risk_config.random_seed)
+    z_scores = correlated_z_scores(correlation_matrix(reference.risk_config, vars_interest), iterations)
+    configs = {v: reference.risk_config.get_config(v) for v in vars_interest}
+    factors_arr = z_to_factors(z_scores, configs, vars_interest)
+    drivers = {v: factors_arr[:, i] for i, v in enumerate(vars_interest)}
+
+    df = pd.DataFrame({"Iteration": np.arange(iterations)})
+    for i, var_name in enumerate(vars_interest):
+        df[f"{var_name}_Factor"] = factors_arr[:, i]
+    for name in names:
+        out = evaluate_batch(compile_model(variants[name]), drivers)
+        df[f"{name}_NPV"] = out["npv"]
+        df[f"{name}_IRR"] = out["irr"]
+    df.attrs["variants"] = names
+    return df
+
+def paired_difference(df: pd.DataFrame, variant: str, reference: str, metric: str = "NPV", confidence: float = 0.95) -> Dict[str, float]:
+    """
+    Distribution of `variant - reference` over the shared draws of
+    run_paired_monte_carlo: mean with its confidence interval, probability
+    that the variant is better, and the variance reduction against two
+    independent simulations of the same size.
+    """
+    from scipy.stats import norm
+
+    a = df[f"{variant}_{metric}"].to_numpy(dtype=float)
+    b = df[f"{reference}_{metric}"].to_numpy(dtype=float)
+    diff = a - b
+    n = len(diff)
+    se = diff.std(ddof=1) / np.sqrt(n) if n > 1 else 0.0
+    independent_se = np.sqrt((a.var(ddof=1) + b.var(ddof=1)) / n) if n > 1 else 0.0
+    if se <= 1e-9 * max(1.0, abs(diff.mean())):
+        se = 0.0  # constant difference: only round-off noise left
+    z = norm.ppf(0.5 + confidence / 2)
+    return {
+        "differences": diff,
+        "mean": float(diff.mean()),
+        "std": float(diff.std(ddof=1)) if n > 1 else 0.0,
+        "se": float(se),
+        "ci_low": float(diff.mean() - z * se),
+        "ci_high": float(diff.mean() + z * se),
+        "prob_positive": float((diff > 0).mean()),
+        "independent_se": float(independent_se),
+        "variance_reduction": float(independent_se**2 / se**2) if se > 0 else float("inf"),
+    }
@@ -0,0 +1,396 @@
+"""
+Local HTTP calculation service (ASGI, Starlette) for headless and
+integration use, e.g. a planning system pricing thousands of variants.
+
+Requests are parsed and validated on the event loop; the engine work runs in
+a process pool (see WorkerPool). Admission is bounded: when `max_pending`
+evaluations are already queued or running, new work is rejected with 503 and
+a Retry-After header instead of piling up, so callers back off. Request
+size is bounded too: Monte Carlo iterations (also the `mc_iterations`
+evaluate option) and goal-seek `max_evals` above the configured maximums are
+rejected with 413. /metrics reports per-endpoint request counts / latencies
+and the pool state.
+
+Endpoints (JSON):
+    GET  /health
+    GET  /metrics
+    POST /evaluate            project JSON, or {"project": ..., "options": {...}}
+    POST /evaluate/batch      {"projects": [...], "options": {...}}, up to max_pending
+    POST /tornado             {"project": ..., "variables": [...]}
+    POST /monte-carlo         {"project": ..., "iterations": 1000, ...}
+    POST /goal-seek           {"project": ..., "targets": [{"driver", "metric", "target"}]}
+    GET  /projects
+    GET  /projects/{id}       ?version=<tag>
+    POST /projects/{id}/evaluate
+
+Run it with scripts/serve_api.py (binds to localhost by default).
+"""
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from core.model import ProjectModel
+from core.migration import migrate_project_data
+
+# Latencies kept per endpoint for the percentiles in /metrics
+LATENCY_WINDOW = 1000
+# Default admission limit per worker process
+PENDING_PER_WORKER = 64
+# Default per-request limits (create_app / serve_api.py override them)
+MAX_MC_ITERATIONS = 100_000
+MAX_GOAL_SEEK_EVALS = 200
+
+# --- Worker tasks (run in worker processes: plain data in and out) ---
+
+def _task_evaluate(data_json: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    from core.portfolio import evaluate_project_payload
+    head = json.loads(data_json)
+    return evaluate_project_payload(head.get("id"), head.get("version"), data_json, params.get("options") or {}, head.get("name"))
+
+def _task_tornado(data_json: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    from core.risk import run_tornado_analysis
+    model = parse_project(data_json)
+    return {"tornado": run_tornado_analysis(model, params.get("variables")).to_dict(orient="records")}
+
+def _task_monte_carlo(data_json: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    from core.risk import run_monte_carlo, summarize_monte_carlo
+    from core.mc_summary import weighted_quantiles
+    model = parse_project(data_json)
+    threshold = float(params.get("loss_threshold", 0.0))
+    df = run_monte_carlo(
+        model,
+        iterations=int(params.get("iterations", model.risk_config.monte_carlo_iterations)),
+        importance_sampling=bool(params.get("importance_sampling", False)),
+        loss_threshold=threshold,
+        variables=params.get("variables"),
+    )
+    weights = df["Weight"].to_numpy(dtype=float) if "Weight" in df else None
+    return {
+        "iterations": len(df),
+        "summary": summarize_monte_carlo(df, threshold),
+        "npv_quantiles": {str(q): v for q, v in weighted_quantiles(df["NPV"].to_numpy(dtype=float), weights).items()},
+    }
+
+def _task_goal_seek(data_json: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    from core.solver import solve_targets
+    model = parse_project(data_json)
+    return {"results": solve_targets(model, params["targets"], max_evals=int(params.get("max_evals", 40)))}
+
+TASKS: Dict[str, Callable[[str, Dict[str, Any]], Dict[str, Any]]] = {
+    "evaluate": _task_evaluate,
+    "tornado": _task_tornado,
+    "monte_carlo": _task_monte_carlo,
+    "goal_seek": _task_goal_seek,
+}
+
+def parse_project(payload: Any) -> ProjectModel:
+    """Project JSON (dict or string, any stored schema version) -> validated model."""
+    if isinstance(payload, str):
+        payload = json.loads(payload)
+    if not isinstance(payload, dict):
+        raise ValueError("Project must be a JSON object")
+    return ProjectModel.model_validate(migrate_project_data(payload))
+
+def run_task(task: str, data_json: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Entry point of the worker processes. data_json is a validated project
+    (ProjectModel.model_dump_json); results are JSON-ready.
+    """
+    return to_jsonable(TASKS[task](data_json, params))
+
+def to_jsonable(value: Any) -> Any:
+    """numpy / NaN / inf -> plain JSON values (non-finite floats become null)."""
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return to_jsonable(value.tolist())
+    if isinstance(value, (np.floating, np.integer, np.bool_)):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+# --- Pool with bounded admission ---
+
+class Busy(Exception):
+    """Raised when the pool has no room for more pending work."""
+
+class TooLarge(Exception):
+    """Raised when a request asks for more work than the service allows."""
+
+def check_limits(task: str, params: Dict[str, Any], model: Optional[ProjectModel] = None,
+                 max_iterations: int = MAX_MC_ITERATIONS, max_evals: int = MAX_GOAL_SEEK_EVALS) -> None:
+    """
+    Rejects task parameters before they are queued: invalid ones with
+    ValueError (400), oversized ones with TooLarge (413).
+    """
+    if task in ("tornado", "monte_carlo") and params.get("variables") is not None:
+        # Both vary the factor drivers only (core.risk.apply_factor_to_model)
+        from core.batch import DRIVERS
+        supported = [d for d, kind in DRIVERS.items() if kind == "factor"]
+        variables = params["variables"]
+        if not isinstance(variables, list) or not variables:
+            raise ValueError(f"variables must be a non-empty list of: {', '.join(supported)}")
+        unknown = [str(v) for v in variables if v not in supported]
+        if unknown:
+            raise ValueError(f"Unsupported variable(s): {', '.join(unknown)} (supported: {', '.join(supported)})")
+    if task == "monte_carlo":
+        default = model.risk_config.monte_carlo_iterations if model is not None else 0
+        iterations = int(params.get("iterations", default))
+        if iterations < 1:
+            raise ValueError(f"iterations must be at least 1 (got {iterations})")
+        checks = [("iterations", iterations, max_iterations)]
+    elif task == "evaluate":
+        checks = [("options.mc_iterations", (params.get("options") or {}).get("mc_iterations") or 0, max_iterations)]
+    elif task == "goal_seek":
+        checks = [("max_evals", params.get("max_evals", 40), max_evals)]
+    else:
+        checks = []
+    for name, value, limit in checks:
+        if int(value) > limit:
+            raise TooLarge(f"{name}={int(value)} exceeds the limit of {limit}")
+
+class WorkerPool:
+    """
+    Runs tasks on a process pool (a single thread when workers <= 1) with at
+    most `max_pending` tasks admitted (queued or running) at a time.
+    Admission is all-or-nothing per request, so a batch is either taken
+    whole or rejected.
+    """
+    def __init__(self, workers: int = 1, max_pending: Optional[int] = None):
+        self.workers = max(1, int(workers))
+        self.max_pending = max_pending if max_pending is not None else self.workers * PENDING_PER_WORKER
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.workers > 1:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+        return self._executor
+
+    def admit(self, n: int = 1) -> None:
+        """Reserves n slots or raises Busy."""
+        if self.pending + n > self.max_pending:
+            self.rejected += 1
+            raise Busy(f"{self.pending} tasks pending (limit {self.max_pending})")
+        self.pending += n
+
+    async def run(self, task: str, data_json: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Runs one admitted task and releases its slot."""
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._get_executor(), run_task, task, data_json, params)
+            self.completed += 1
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.pending -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "running": min(self.pending, self.workers),
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+class ServiceMetrics:
+    """Request counts, errors and latencies per endpoint."""
+    def __init__(self):
+        self.started = time.time()
+        self.endpoints: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, endpoint: str, status: int, seconds: float) -> None:
+        entry = self.endpoints.setdefault(endpoint, {"count": 0, "errors": 0, "status": {}, "latencies": deque(maxlen=LATENCY_WINDOW)})
+        entry["count"] += 1
+        entry["errors"] += status >= 400
+        entry["status"][str(status)] = entry["status"].get(str(status), 0) + 1
+        entry["latencies"].append(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        out = {}
+        for endpoint, entry in self.endpoints.items():
+            lat = np.array(entry["latencies"]) * 1000.0
+            out[endpoint] = {
+                "count": entry["count"],
+                "errors": entry["errors"],
+                "status": dict(entry["status"]),
+                "mean_ms": float(lat.mean()) if len(lat) else 0.0,
+                "p95_ms": float(np.percentile(lat, 95)) if len(lat) else 0.0,
+                "max_ms": float(lat.max()) if len(lat) else 0.0,
+            }
+        return {"uptime_s": time.time() - self.started, "requests": out}
+
+# --- ASGI app ---
+
+def create_app(workers: int = 1, max_pending: Optional[int] = None, retry_after_s: int = 1,
+               max_iterations: int = MAX_MC_ITERATIONS, max_evals: int = MAX_GOAL_SEEK_EVALS):
+    """Starlette app; `app.state.pool` / `app.state.metrics` hold the service state."""
+    from contextlib import asynccontextmanager
+    from pydantic import ValidationError
+    from starlette.applications import Starlette
+    from starlette.concurrency import run_in_threadpool
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    from core import db
+
+    pool = WorkerPool(workers, max_pending)
+    metrics = ServiceMetrics()
+
+    def reply(content: Any, status: int = 200, headers: Optional[Dict[str, str]] = None):
+        return JSONResponse(to_jsonable(content), status_code=status, headers=headers)
+
+    def endpoint(name: str):
+        """Maps request errors to status codes and records metrics."""
+        def wrap(handler):
+            async def run(request):
+                started = time.perf_counter()
+                try:
+                    response = await handler(request)
+                except Busy as e:
+                    response = reply({"error": str(e)}, 503, {"Retry-After": str(retry_after_s)})
+                except TooLarge as e:
+                    response = reply({"error": str(e)}, 413)
+                except (ValidationError, ValueError, KeyError, TypeError) as e:
+                    # json.JSONDecodeError is a ValueError
+                    response = reply({"error": f"{type(e).__name__}: {e}"}, 422 if isinstance(e, ValidationError) else 400)
+                except Exception as e:
+                    response = reply({"error": f"{type(e).__name__}: {e}"}, 500)
+                metrics.record(name, response.status_code, time.perf_counter() - started)
+                return response
+            return run
+        return wrap
+
+    def limit(task: str, params: Dict[str, Any], model: Optional[ProjectModel] = None) -> None:
+        check_limits(task, params, model, max_iterations, max_evals)
+
+    async def submit(task: str, model: ProjectModel, params: Dict[str, Any]):
+        limit(task, params, model)
+        pool.admit()
+        return await pool.run(task, model.model_dump_json(), params)
+
+    def task_endpoint(task: str, required: List[str] = ()):
+        async def handler(request):
+            body = await request.json()
+            if not isinstance(body, dict) or "project" not in body:
+                raise ValueError("Body must be {\"project\": {...}, ...}")
+            missing = [k for k in required if k not in body]
+            if missing:
+                raise ValueError(f"Missing field(s): {', '.join(missing)}")
+            model = parse_project(body["project"])
+            params = {k: v for k, v in body.items() if k != "project"}
+            return reply(await submit(task, model, params))
+        return handler
+
+    @endpoint("health")
+    async def health(request):
+        return reply({"status": "ok", "pool": pool.stats()})
+
+    @endpoint("metrics")
+    async def metrics_view(request):
+        return reply({**metrics.snapshot(), "pool": pool.stats()})
+
+    @endpoint("evaluate")
+    async def evaluate(request):
+        body = await request.json()
+        # Bare project, or {"project": ..., "options": {...}}
+        if isinstance(body, dict) and "project" in body:
+            model, options = parse_project(body["project"]), body.get("options") or {}
+        else:
+            model, options = parse_project(body), {}
+        return reply(await submit("evaluate", model, {"options": options}))
+
+    @endpoint("evaluate_batch")
+    async def evaluate_batch(request):
+        body = await request.json()
+        projects = body.get("projects") if isinstance(body, dict) else None
+        if not isinstance(projects, list) or not projects:
+            raise ValueError("Body must be {\"projects\": [...]}")
+        if len(projects) > pool.max_pending:
+            raise ValueError(f"At most {pool.max_pending} projects per batch")
+        params = {"options": body.get("options") or {}}
+        limit("evaluate", params)
+        # Invalid variants are reported in place; the rest still run
+        payloads, results = [], [None] * len(projects)
+        for i, project in enumerate(projects):
+            try:
+                payloads.append((i, parse_project(project).model_dump_json()))
+            except (ValidationError, ValueError) as e:
+                results[i] = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+        pool.admit(len(payloads))
+        done = await asyncio.gather(*(pool.run("evaluate", data, params) for _, data in payloads), return_exceptions=True)
+        for (i, _), res in zip(payloads, done):
+            results[i] = {"status": "error", "error": f"{type(res).__name__}: {res}"} if isinstance(res, Exception) else res
+        return reply({"results": results, "failed": sum(r["status"] != "ok" for r in results)})
+
+    @endpoint("list_projects")
+    async def list_projects(request):
+        return reply({"projects": await run_in_threadpool(db.list_projects)})
+
+    async def _stored(request) -> Optional[ProjectModel]:
+        version = request.query_params.get("version")
+        return await run_in_threadpool(db.load_project, request.path_params["project_id"], version)
+
+    @endpoint("get_project")
+    async def get_project(request):
+        model = await _stored(request)
+        if model is None:
+            return reply({"error": "Project not found"}, 404)
+        return reply(model.model_dump(mode="json"))
+
+    @endpoint("evaluate_project")
+    async def evaluate_project(request):
+        model = await _stored(request)
+        if model is None:
+            return reply({"error": "Project not found"}, 404)
+        body = await request.json() if await request.body() else {}
+        return reply(await submit("evaluate", model, {"options": (body or {}).get("options") or {}}))
+
+    routes = [
+        Route("/health", health, methods=["GET"]),
+        Route("/metrics", metrics_view, methods=["GET"]),
+        Route("/evaluate", evaluate, methods=["POST"]),
+        Route("/evaluate/batch", evaluate_batch, methods=["POST"]),
+        Route("/tornado", endpoint("tornado")(task_endpoint("tornado")), methods=["POST"]),
+        Route("/monte-carlo", endpoint("monte_carlo")(task_endpoint("monte_carlo")), methods=["POST"]),
+        Route("/goal-seek", endpoint("goal_seek")(task_endpoint("goal_seek", ["targets"])), methods=["POST"]),
+        Route("/projects", list_projects, methods=["GET"]),
+        Route("/projects/{project_id}", get_project, methods=["GET"]),
+        Route("/projects/{project_id}/evaluate", evaluate_project, methods=["POST"]),
+    ]
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await run_in_threadpool(db.init_db)
+        yield
+        pool.close()
+
+    app = Starlette(routes=routes, lifespan=lifespan)
+    app.state.pool = pool
+    app.state.metrics = metrics
+    return app
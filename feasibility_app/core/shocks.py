@@ -0,0 +1,151 @@
+"""
+Targeted, time-correlated shocks for the Monte Carlo simulation.
+The global drivers (core.risk.apply_factor_to_model) move every item in every
+period alike; a ShockSpec instead hits one product's price / volume / unit
+cost, one CAPEX or expense category, or one loan's rate, over a range of
+years, e.g. a construction-phase CAPEX overrun in years 1-2.
+
+Within its active periods a shock follows a stationary AR(1) process: the
+autocorrelation is year over year (compounded down for monthly models), 0
+draws every period independently and 1 keeps one draw for the whole range.
+The whole (iterations x periods) path is a single matrix product of iid
+normals with the AR(1) kernel. Multiplicative targets get lognormal
+multipliers with mean 1 + mean_pct; loan rates get additive deviations.
+Paths are handed to `core.batch.evaluate_batch` keyed by item, so no model
+is copied per item or per iteration.
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from core.model import ProjectModel, ShockSpec
+
+# ShockSpec.target -> evaluate_batch shock kind
+SHOCK_KINDS = {
+    "ProductPrice": "price",
+    "ProductVolume": "volume",
+    "ProductCost": "cost",
+    "CapexCategory": "capex",
+    "ExpenseCategory": "opex",
+    "LoanRate": "loan_rate",
+}
+# Kinds whose shock is an additive deviation (rate points) instead of a multiplier
+ADDITIVE_KINDS = {"loan_rate"}
+
+ShockKey = Tuple[str, int]
+
+def _pp_year(model: ProjectModel) -> int:
+    return 12 if model.granularity == "Month" else 1
+
+def shock_targets(model: ProjectModel, spec: ShockSpec) -> List[int]:
+    """Indexes of the items a shock hits (products / CAPEX items / expenses / loans)."""
+    if spec.target in ("ProductPrice", "ProductVolume", "ProductCost"):
+        labels = [p.name for p in model.products]
+    elif spec.target == "CapexCategory":
+        labels = [c.category for c in model.capex_items]
+    elif spec.target == "ExpenseCategory":
+        labels = [e.category for e in model.fixed_expenses]
+    elif spec.target == "LoanRate":
+        labels = [l.name for l in model.loans]
+    else:
+        raise ValueError(f"Unknown shock target: {spec.target}")
+    return [i for i, label in enumerate(labels) if not spec.item or label == spec.item]
+
+def active_periods(spec: ShockSpec, horizon: int, pp_year: int = 1) -> slice:
+    """Engine periods covered by the shock's year range."""
+    end_year = spec.end_year if spec.end_year is not None else horizon
+    return slice((spec.start_year - 1) * pp_year, min(end_year, horizon) * pp_year)
+
+def validate_shocks(model: ProjectModel) -> None:
+    """Raises ValueError for shock settings the generator cannot use."""
+    names = set()
+    for spec in model.risk_config.shocks:
+        label = f"{spec.name}: "
+        if spec.name in names:
+            raise ValueError(f"{label}Shock names must be unique")
+        names.add(spec.name)
+        if spec.target not in SHOCK_KINDS:
+            raise ValueError(f"{label}Unknown shock target: {spec.target}")
+        if not shock_targets(model, spec):
+            raise ValueError(f"{label}No item matches '{spec.item or ''}'")
+        if not 1 <= spec.start_year <= model.horizon_years:
+            raise ValueError(f"{label}Start year must be within the horizon")
+        if spec.end_year is not None and spec.end_year < spec.start_year:
+            raise ValueError(f"{label}End year must not be before the start year")
+        if spec.std_dev_pct < 0:
+            raise ValueError(f"{label}Standard deviation must not be negative")
+        if not 0 <= spec.autocorrelation <= 1:
+            raise ValueError(f"{label}Autocorrelation must be between 0 and 1")
+        if SHOCK_KINDS[spec.target] not in ADDITIVE_KINDS and spec.mean_pct <= -1:
+            raise ValueError(f"{label}Mean must be above -100%")
+
+def ar1_kernel(periods: int, autocorrelation: float, pp_year: int = 1) -> np.ndarray:
+    """
+    Lower-triangular (periods x periods) A such that x = e @ A.T turns iid
+    N(0, 1) rows e into stationary unit-variance AR(1) rows x with
+    corr(x_t, x_t+1) = autocorrelation ** (1 / pp_year).
+    """
+    phi = float(autocorrelation) ** (1.0 / pp_year)
+    lag = np.subtract.outer(np.arange(periods), np.arange(periods))
+    scale = np.full(periods, np.sqrt(max(1.0 - phi ** 2, 0.0)))
+    if periods:
+        scale[0] = 1.0
+    return np.where(lag >= 0, phi ** np.maximum(lag, 0), 0.0) * scale
+
+def shock_path(noise: np.ndarray, spec: ShockSpec, total_periods: int, pp_year: int = 1) -> np.ndarray:
+    """
+    (iterations x active periods) iid N(0, 1) -> (iterations x total_periods)
+    shock: multipliers (1.0 outside the range) or, for loan rates, rate
+    deviations (0.0 outside the range).
+    """
+    n = noise.shape[0]
+    window = active_periods(spec, total_periods // pp_year, pp_year)
+    x = noise @ ar1_kernel(noise.shape[1], spec.autocorrelation, pp_year).T
+    sigma = spec.std_dev_pct
+    if SHOCK_KINDS[spec.target] in ADDITIVE_KINDS:
+        out = np.zeros((n, total_periods))
+        out[:, window] = spec.mean_pct + sigma * x
+    else:
+        out = np.ones((n, total_periods))
+        out[:, window] = (1 + spec.mean_pct) * np.exp(sigma * x - 0.5 * sigma ** 2)
+    return out
+
+def generate_shocks(model: ProjectModel, iterations: int, rng=None) -> Dict[str, np.ndarray]:
+    """{shock name: (iterations x periods) path} for every configured shock."""
+    validate_shocks(model)
+    rng = np.random if rng is None else rng
+    pp_year = _pp_year(model)
+    total = model.horizon_years * pp_year
+    out = {}
+    for spec in model.risk_config.shocks:
+        window = active_periods(spec, model.horizon_years, pp_year)
+        noise = rng.standard_normal(size=(iterations, len(range(total)[window])))
+        out[spec.name] = shock_path(noise, spec, total, pp_year)
+    return out
+
+def item_shocks(model: ProjectModel, paths: Dict[str, np.ndarray]) -> Dict[ShockKey, np.ndarray]:
+    """
+    Per-shock paths -> {(kind, item index): path} for evaluate_batch. Items
+    hit by several shocks get the product of the multipliers (sum of the
+    rate deviations).
+    """
+    out: Dict[ShockKey, np.ndarray] = {}
+    for spec in model.risk_config.shocks:
+        kind = SHOCK_KINDS[spec.target]
+        for idx in shock_targets(model, spec):
+            key = (kind, idx)
+            if key not in out:
+                out[key] = paths[spec.name]
+            elif kind in ADDITIVE_KINDS:
+                out[key] = out[key] + paths[spec.name]
+            else:
+                out[key] = out[key] * paths[spec.name]
+    return out
+
+def shock_summary(model: ProjectModel, paths: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Mean of each shock over its active periods, per iteration (result columns)."""
+    pp_year = _pp_year(model)
+    return {
+        spec.name: paths[spec.name][:, active_periods(spec, model.horizon_years, pp_year)].mean(axis=1)
+        for spec in model.risk_config.shocks
+    }
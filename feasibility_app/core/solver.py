@@ -0,0 +1,157 @@
+"""
+Goal seek / break-even solver on the batched engine.
+Finds the driver value where a KPI hits a target (e.g. price multiplier for
+NPV = 0, max CAPEX overrun for IRR >= hurdle). All targets are solved
+together: a coarse ladder brackets every root in one batch, then Illinois
+regula falsi refines all brackets with one batch call per iteration.
+"""
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from core.model import ProjectModel
+
+SOLVER_DRIVERS = ["Price", "Volume", "CAPEX", "OPEX", "Discount Rate"]
+SOLVER_METRICS = ["npv", "irr", "dscr_min"]
+
+# Candidate points used to bracket each root (driver units)
+SEARCH_LADDERS = {
+    "factor": [0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0, 1.1, 1.25, 1.5, 2.0, 3.0, 5.0, 10.0],
+    "Discount Rate": [0.0, 0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.2, 0.25, 0.3, 0.4, 0.5, 0.75, 1.0, 2.0],
+}
+
+# Residual accepted as "on target" (NPV in currency units)
+METRIC_TOLERANCE = {"npv": 1.0, "irr": 1e-6, "dscr_min": 1e-6}
+
+def _ladder(driver: str) -> np.ndarray:
+    from core.batch import DRIVERS
+    return np.array(SEARCH_LADDERS.get(driver, SEARCH_LADDERS["factor"] if DRIVERS[driver] == "factor" else []), dtype=float)
+
+def solve_targets(model: ProjectModel, targets: List[Dict[str, Any]], max_evals: int = 40, xtol: float = 1e-9) -> List[Dict[str, Any]]:
+    """
+    targets: [{"driver": "Price", "metric": "npv", "target": 0.0}, ...]
+    Returns one dict per target with the solved driver `value` (None when no
+    root is bracketed), `change_pct` relative to the base value, `converged`,
+    `residual` and the number of `evaluations` spent on it (<= max_evals).
+    When several roots exist, the one nearest the current value is returned.
+    A metric that stays on target over the whole ladder does not depend on the
+    driver, so it has no break-even either (value None).
+    """
+    from core.batch import DRIVERS, compile_model, evaluate_batch, driver_base_value
+
+    for tgt in targets:
+        if tgt["driver"] not in SOLVER_DRIVERS:
+            raise ValueError(f"Unsupported driver for goal seek: {tgt['driver']}")
+        if tgt["metric"] not in SOLVER_METRICS:
+            raise ValueError(f"Unsupported metric for goal seek: {tgt['metric']}")
+
+    cm = compile_model(model)
+    involved = sorted({tgt["driver"] for tgt in targets})
+    bases = {d: driver_base_value(model, d) for d in involved}
+
+    def evaluate(rows_k: np.ndarray, xs: np.ndarray) -> np.ndarray:
+        """Evaluates target k's driver at x (other drivers at base) -> metric - target."""
+        drivers = {d: np.full(len(xs), bases[d]) for d in involved}
+        for d in involved:
+            mask = np.array([targets[k]["driver"] == d for k in rows_k], dtype=bool)
+            drivers[d][mask] = xs[mask]
+        out = evaluate_batch(cm, drivers)
+        metric = np.array([out[targets[k]["metric"]][i] for i, k in enumerate(rows_k)])
+        goal = np.array([targets[k].get("target", 0.0) for k in rows_k])
+        return metric - goal
+
+    n_targets = len(targets)
+    results = []
+    for tgt in targets:
+        base = bases[tgt["driver"]]
+        results.append({
+            "driver": tgt["driver"],
+            "metric": tgt["metric"],
+            "target": tgt.get("target", 0.0),
+            "base_value": base,
+            "value": None,
+            "change_pct": None,
+            "converged": False,
+            "residual": None,
+            "evaluations": 0,
+        })
+    if not n_targets:
+        return results
+
+    # 1. Bracketing: every target on its ladder, one batch
+    ladders = [_ladder(tgt["driver"])[:max_evals] for tgt in targets]
+    rows_k = np.concatenate([np.full(len(l), k) for k, l in enumerate(ladders)])
+    g_all = evaluate(rows_k, np.concatenate(ladders))
+
+    lo, hi, g_lo, g_hi, active = [], [], [], [], []
+    offset = 0
+    for k, ladder in enumerate(ladders):
+        g = g_all[offset:offset + len(ladder)]
+        offset += len(ladder)
+        results[k]["evaluations"] = len(ladder)
+        base = results[k]["base_value"]
+
+        if np.all(np.abs(g) <= METRIC_TOLERANCE[targets[k]["metric"]]):
+            continue
+        exact = np.flatnonzero(g == 0)
+        brackets = [i for i in range(len(ladder) - 1) if np.sign(g[i]) * np.sign(g[i + 1]) < 0]
+        candidates = [(abs(ladder[i] - base), ladder[i], ladder[i], 0.0, 0.0) for i in exact]
+        for i in brackets:
+            a, b = ladder[i], ladder[i + 1]
+            dist = 0.0 if a <= base <= b else min(abs(a - base), abs(b - base))
+            candidates.append((dist, a, b, g[i], g[i + 1]))
+        if not candidates:
+            continue
+        _, a, b, ga, gb = min(candidates, key=lambda c: c[0])
+        if a == b:
+            results[k].update(value=a, residual=0.0, converged=True)
+            continue
+        lo.append(a); hi.append(b); g_lo.append(ga); g_hi.append(gb); active.append(k)
+
+    # 2. Illinois regula falsi on all open brackets at once
+    lo, hi, g_lo, g_hi = (np.array(v, dtype=float) for v in (lo, hi, g_lo, g_hi))
+    active = np.array(active, dtype=int)
+    best_x = (lo + hi) / 2
+    best_g = np.full(len(active), np.inf)
+    side = np.zeros(len(active))
+    tol = np.array([METRIC_TOLERANCE[targets[k]["metric"]] for k in active])
+
+    while active.size:
+        spent = np.array([results[k]["evaluations"] for k in active])
+        open_ = (spent < max_evals) & (np.abs(best_g) > tol) & (hi - lo > xtol * np.maximum(1.0, np.abs(best_x)))
+        if not open_.any():
+            break
+        idx = np.flatnonzero(open_)
+        x = (lo[idx] * g_hi[idx] - hi[idx] * g_lo[idx]) / (g_hi[idx] - g_lo[idx])
+        g = evaluate(active[idx], x)
+        for k in active[idx]:
+            results[k]["evaluations"] += 1
+
+        better = np.abs(g) < np.abs(best_g[idx])
+        best_x[idx] = np.where(better, x, best_x[idx])
+        best_g[idx] = np.where(better, g, best_g[idx])
+
+        left = np.sign(g) == np.sign(g_lo[idx])
+        # Illinois: halve the stale end when the same side moves twice
+        g_hi[idx] = np.where(left & (side[idx] == 1), g_hi[idx] / 2, g_hi[idx])
+        g_lo[idx] = np.where(~left & (side[idx] == -1), g_lo[idx] / 2, g_lo[idx])
+        lo[idx], g_lo[idx] = np.where(left, x, lo[idx]), np.where(left, g, g_lo[idx])
+        hi[idx], g_hi[idx] = np.where(left, hi[idx], x), np.where(left, g_hi[idx], g)
+        side[idx] = np.where(left, 1, -1)
+
+    for j, k in enumerate(active):
+        results[k].update(
+            value=float(best_x[j]),
+            residual=float(best_g[j]) if np.isfinite(best_g[j]) else None,
+            converged=bool(np.abs(best_g[j]) <= tol[j])
+        )
+
+    for res in results:
+        if res["value"] is not None and res["base_value"]:
+            res["change_pct"] = (res["value"] - res["base_value"]) / res["base_value"] * 100.0
+    return results
+
+def break_even_summary(model: ProjectModel, metric: str = "npv", target: float = 0.0, max_evals: int = 40) -> Dict[str, Dict[str, Any]]:
+    """Break-even of every solver driver for one KPI target (dashboard view)."""
+    targets = [{"driver": d, "metric": metric, "target": target} for d in SOLVER_DRIVERS]
+    return {res["driver"]: res for res in solve_targets(model, targets, max_evals=max_evals)}
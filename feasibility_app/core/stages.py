@@ -0,0 +1,522 @@
+"""
+Staged evaluation for `core.engine.calculate_financials`.
+The engine runs as a small dependency graph: revenue/COGS, OPEX, CAPEX &
+depreciation, grants, debt and leasing read their own model sections; tax &
+NWC, cash flows and KPIs build on them. Every stage is keyed on a digest of
+the sections it reads (see STAGE_SECTIONS) plus the keys of its upstream
+stages, and its outputs are cached per key. Editing a loan therefore
+recomputes debt, tax/NWC, cash flows and KPIs, while revenue, OPEX and
+CAPEX come from the cache.
+
+Source stages keep per-item (items x periods) rows next to their totals
+(the drill-down arrays of FinancialResults.item_arrays). Revenue and OPEX
+also keep the sums before the investment, so the baseline (with/without
+analysis) reuses them and only reruns the derived stages. Cached arrays are shared between results and are
+read-only.
+"""
+import hashlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.model import ProjectModel
+from core import depreciation, finance, nwc
+
+# Entries kept per stage (oldest dropped first)
+CACHE_SIZE = 16
+
+# Sections every stage reads (timeline and currency conversion)
+SHARED_SECTIONS: Dict[str, Any] = {"horizon_years": True, "granularity": True, "currency_base": True, "exchange_rates": True}
+
+# Stage -> model sections it reads (pydantic `include` specs)
+STAGE_SECTIONS: Dict[str, Dict[str, Any]] = {
+    "revenue": {"products": True, "index_curves": True, "nwc_config": {"dso"}},
+    # + products when scalable personnel follow the sales volume
+    "opex": {"fixed_expenses": True, "personnel": True, "index_curves": True},
+    "capex": {"capex_items": True, "tax_config": {"machinery_useful_life", "building_useful_life", "vat_exemption"}},
+    "grants": {"grants": True, "tax_config": {"machinery_useful_life", "building_useful_life"}},
+    "debt": {"loans": True},
+    "leasing": {"leasings": True, "tax_config": {"machinery_useful_life"}},
+    "tax_nwc": {"tax_config": {"corporate_tax_rate"}, "nwc_config": {"dso", "dio", "dpo"}},
+    "cash_flows": {"tax_config": {"corporate_tax_rate"}, "nwc_config": {"terminal_release"},
+                   "calculation_mode": True, "terminal_debt_treatment": True},
+    "kpis": {"calculation_mode": True, "discount_rate_unlevered": True, "discount_rate_levered": True,
+             "equity_contribution": True, "tv_config": True},
+}
+
+# Stage -> upstream stages whose outputs it takes
+STAGE_INPUTS: Dict[str, List[str]] = {
+    "tax_nwc": ["revenue", "opex", "capex", "grants", "debt", "leasing"],
+    "cash_flows": ["tax_nwc", "revenue", "capex", "grants", "debt", "leasing"],
+    "kpis": ["cash_flows", "tax_nwc", "debt", "leasing", "grants", "capex"],
+}
+
+STAGES = list(STAGE_SECTIONS)
+
+_stage_cache: Dict[str, Dict[str, Dict[str, Any]]] = {name: {} for name in STAGES}
+_stage_stats: Dict[str, Dict[str, int]] = {name: {"hits": 0, "misses": 0} for name in STAGES}
+
+def clear_stage_cache() -> None:
+    """Drops every cached stage output and resets the hit counters."""
+    for name in STAGES:
+        _stage_cache[name].clear()
+        _stage_stats[name] = {"hits": 0, "misses": 0}
+
+def stage_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Hits / misses per stage since the last clear."""
+    return {name: dict(stats) for name, stats in _stage_stats.items()}
+
+def section_digest(model: ProjectModel, sections: Dict[str, Any], upstream: List[str] = ()) -> str:
+    """Digest of the given model sections (and upstream stage keys)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(model.model_dump_json(include={**SHARED_SECTIONS, **sections}).encode())
+    for key in upstream:
+        h.update(key.encode())
+    return h.hexdigest()
+
+def _freeze(outputs: Dict[str, Any]) -> Dict[str, Any]:
+    for value in outputs.values():
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+    return outputs
+
+def _cached(stage: str, key: str, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    cache = _stage_cache[stage]
+    hit = cache.get(key)
+    if hit is not None:
+        _stage_stats[stage]["hits"] += 1
+        return hit
+    _stage_stats[stage]["misses"] += 1
+    outputs = _freeze(compute())
+    if len(cache) >= CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+    cache[key] = outputs
+    return outputs
+
+def _periods(model: ProjectModel):
+    pp_year = 12 if model.granularity == "Month" else 1
+    return pp_year, model.horizon_years * pp_year
+
+def fx_multiplier(model: ProjectModel, source_curr: str) -> float:
+    """Base-currency value of one unit of `source_curr` (rate of source / rate of base)."""
+    if source_curr == model.currency_base:
+        return 1.0
+    source_rate = model.exchange_rates.get(source_curr, 1.0)
+    base_rate = model.exchange_rates.get(model.currency_base, 1.0)
+    return source_rate / base_rate
+
+# --- Source stages ---
+
+def baseline_inputs(prod) -> Tuple[float, float, float]:
+    """(OEE, scrap rate, unit cost) of a product before the investment."""
+    return (
+        prod.oee_percent_baseline if prod.oee_percent_baseline is not None else prod.oee_percent,
+        prod.scrap_rate_baseline if prod.scrap_rate_baseline is not None else prod.scrap_rate,
+        prod.unit_cost_baseline if prod.unit_cost_baseline is not None else prod.unit_cost,
+    )
+
+def _has_baseline_overrides(prod) -> bool:
+    return any(v is not None for v in (prod.oee_percent_baseline, prod.scrap_rate_baseline, prod.unit_cost_baseline))
+
+def _product_flows(model: ProjectModel, curves, prod, oee: float, scrap: float, unit_cost: float):
+    """Revenue, COGS and receivables of one product per period (base currency)."""
+    pp_year, _ = _periods(model)
+    fx = fx_multiplier(model, prod.currency)
+
+    # Scalar rates compound twice per period in this build (kept as-is)
+    demand_idx = curves.get(prod.volume_growth_curve, prod.year_growth_rate, legacy_steps=2)
+    price_idx = curves.get(prod.price_escalation_curve, prod.price_escalation_rate, legacy_steps=2)
+    cost_idx = curves.get(prod.cost_escalation_curve, prod.cost_escalation_rate, legacy_steps=2)
+
+    # Production volume (capacity constrained)
+    gross_needed = prod.initial_volume / pp_year * demand_idx
+    if scrap < 1:
+        gross_needed = gross_needed / (1 - scrap)
+    max_gross_prod = prod.production_capacity_per_year / pp_year * oee
+    actual_gross_prod = np.minimum(gross_needed, max_gross_prod)
+    actual_sales_vol = actual_gross_prod * (1 - scrap)
+
+    revenue = actual_sales_vol * (prod.unit_price * fx * price_idx)
+    cogs = actual_gross_prod * (unit_cost * fx * cost_idx)
+    # Receivables only on the portion not advanced; product terms override
+    # global DSO. Balance = period revenue * terms / days in the period
+    terms = prod.payment_terms_days if prod.payment_terms_days is not None else model.nwc_config.dso
+    receivables = revenue * (1.0 - prod.advance_payment_pct) * (terms / (365.0 / pp_year))
+    return revenue, cogs, receivables
+
+def revenue_stage(model: ProjectModel) -> Dict[str, Any]:
+    """
+    Revenue, COGS and receivables per period (base currency), per product
+    ("<line>_items", products x periods) and before the investment
+    ("baseline_<line>": non-incremental products at their baseline OEE /
+    scrap / unit cost).
+    """
+    from core.curves import IndexCurves
+    curves = IndexCurves(model)
+    _, total_periods = _periods(model)
+
+    lines = ("revenue", "cogs", "receivables")
+    items = {line: np.zeros((len(model.products), total_periods)) for line in lines}
+    baseline = {line: np.zeros(total_periods) for line in lines}
+    for j, prod in enumerate(model.products):
+        flows = _product_flows(model, curves, prod, prod.oee_percent, prod.scrap_rate, prod.unit_cost)
+        for line, arr in zip(lines, flows):
+            items[line][j] = arr
+        if prod.is_incremental:
+            continue
+        if _has_baseline_overrides(prod):
+            flows = _product_flows(model, curves, prod, *baseline_inputs(prod))
+        for line, arr in zip(lines, flows):
+            baseline[line] += arr
+
+    out: Dict[str, Any] = {line: items[line].sum(axis=0) for line in lines}
+    out.update({f"{line}_items": items[line] for line in lines})
+    out.update({f"baseline_{line}": baseline[line] for line in lines})
+    return out
+
+def _volume_scale_ratio(model: ProjectModel, curves, products: List[Tuple[Any, float, float]]) -> np.ndarray:
+    """
+    Aggregated sales volume vs the initial volume per period, which scalable
+    personnel follows (volume index compounds once per period).
+    products: (product, OEE, scrap rate).
+    """
+    pp_year, total_periods = _periods(model)
+    total_initial_vol = sum(prod.initial_volume for prod, _, _ in products)
+    if total_initial_vol <= 0:
+        return np.ones(total_periods)
+    total_sales_vol = np.zeros(total_periods)
+    for prod, oee, scrap in products:
+        vol_idx = curves.get(prod.volume_growth_curve, prod.year_growth_rate)
+        gross = prod.initial_volume / pp_year * vol_idx
+        if scrap < 1:
+            gross = gross / (1 - scrap)
+        act_g = np.minimum(gross, prod.production_capacity_per_year / pp_year * oee)
+        total_sales_vol += act_g * (1 - scrap)
+    return total_sales_vol / (total_initial_vol / pp_year)
+
+def opex_stage(model: ProjectModel) -> Dict[str, Any]:
+    """
+    Fixed expenses and personnel per period (base currency), per item
+    ("expense_items", "personnel_items") and before the investment
+    ("baseline_opex": non-incremental items; scalable staff follow the
+    baseline sales volume).
+    """
+    from core.curves import IndexCurves
+    curves = IndexCurves(model)
+    pp_year, total_periods = _periods(model)
+
+    expense_items = np.zeros((len(model.fixed_expenses), total_periods))
+    for k, exp in enumerate(model.fixed_expenses):
+        period_amount = exp.amount_per_year * fx_multiplier(model, exp.currency) / pp_year
+        expense_items[k] = period_amount * curves.get(exp.growth_curve, exp.growth_rate)
+    baseline_opex = expense_items[[not e.is_incremental for e in model.fixed_expenses]].sum(axis=0)
+
+    scalable = any(pers.is_scalable for pers in model.personnel)
+    if scalable:
+        ratio = _volume_scale_ratio(model, curves, [(p, p.oee_percent, p.scrap_rate) for p in model.products])
+        baseline_products = [(p, *baseline_inputs(p)[:2]) for p in model.products if not p.is_incremental]
+        baseline_ratio = _volume_scale_ratio(model, curves, baseline_products)
+
+    personnel_items = np.zeros((len(model.personnel), total_periods))
+    for k, pers in enumerate(model.personnel):
+        fx = fx_multiplier(model, pers.currency)
+        period_cost_per_person = (pers.monthly_gross_salary * fx) * 12 * (1 + pers.sgk_tax_rate) / pp_year
+        # Raises run from the start period (zero before it)
+        start_idx = (pers.start_year - 1) * pp_year
+        cost = pers.count * period_cost_per_person * curves.rebased(pers.raise_curve, pers.yearly_raise_rate, start_idx)
+        personnel_items[k] = cost * ratio if pers.is_scalable else cost
+        if not pers.is_incremental:
+            baseline_opex = baseline_opex + (cost * baseline_ratio if pers.is_scalable else cost)
+
+    return {
+        "opex": expense_items.sum(axis=0) + personnel_items.sum(axis=0),
+        "expense_items": expense_items,
+        "personnel_items": personnel_items,
+        "baseline_opex": baseline_opex,
+    }
+
+def capex_stage(model: ProjectModel) -> Dict[str, Any]:
+    """
+    CAPEX outflow (customs and VAT included) and depreciation before grants,
+    in total and per item ("capex_items", "depreciation_items"; items outside
+    the horizon keep zero rows).
+    """
+    pp_year, total_periods = _periods(model)
+    capex_items = np.zeros((len(model.capex_items), total_periods))
+    dep_base_items = []
+
+    for k, item in enumerate(model.capex_items):
+        fx = fx_multiplier(model, item.currency)
+        if pp_year == 12:
+            m = item.month if 1 <= item.month <= 12 else 1
+            idx = (item.year - 1) * pp_year + (m - 1)
+        else:
+            idx = item.year - 1
+        if not 0 <= idx < total_periods:
+            dep_base_items.append(item.model_copy(update={"amount": 0.0}))
+            continue
+
+        base_amount = item.amount * fx
+        customs_cost = base_amount * item.customs_duty_rate if item.is_imported else 0.0
+        vat_cost = 0.0 if model.tax_config.vat_exemption else (base_amount + customs_cost) * item.vat_rate
+        capex_items[k, idx] = base_amount + customs_cost + vat_cost
+        # Depreciation base (already converted)
+        dep_base_items.append(item.model_copy(update={"amount": base_amount + customs_cost}))
+
+    dep_items = depreciation.depreciation_items(
+        dep_base_items,
+        model.horizon_years,
+        model.tax_config.machinery_useful_life,
+        model.tax_config.building_useful_life,
+        payments_per_year=pp_year
+    )
+    return {
+        "capex_flow": capex_items.sum(axis=0),
+        "depreciation": dep_items.sum(axis=0),
+        "capex_items": capex_items,
+        "depreciation_items": dep_items,
+    }
+
+def grants_stage(model: ProjectModel) -> Dict[str, Any]:
+    """Grant cash, taxable grant income and the depreciation reduction per period."""
+    pp_year, total_periods = _periods(model)
+    grant_cash = np.zeros(total_periods)
+    grant_taxable = np.zeros(total_periods)
+    # Grants are in base currency
+    for grant in model.grants:
+        idx = (grant.year - 1) * pp_year
+        if 0 <= idx < total_periods:
+            grant_cash[idx] += grant.amount
+            if not grant.is_capex_reduction:
+                grant_taxable[idx] += grant.amount
+
+    dep_reduction = 0.0
+    total_capex_reduction_grants = sum(g.amount for g in model.grants if g.is_capex_reduction)
+    if total_capex_reduction_grants > 0:
+        avg_life_periods = ((model.tax_config.machinery_useful_life + model.tax_config.building_useful_life) / 2) * pp_year
+        dep_reduction = total_capex_reduction_grants / avg_life_periods
+    return {"grant_cash": grant_cash, "grant_taxable": grant_taxable, "dep_reduction": dep_reduction}
+
+def debt_stage(model: ProjectModel) -> Dict[str, Any]:
+    """
+    Loan flows and balances, in total and per loan ("interest_items",
+    "principal_items"); schedules run in loan currency, then convert.
+    """
+    pp_year, total_periods = _periods(model)
+    out = {k: np.zeros(total_periods) for k in ("interest", "principal", "drawdown", "balance")}
+    items = {k: np.zeros((len(model.loans), total_periods)) for k in ("interest", "principal")}
+    for j, loan in enumerate(model.loans):
+        fx = fx_multiplier(model, loan.currency)
+        schedule = finance.calculate_loan_schedule(
+            loan.amount, loan.interest_rate, loan.term_years, loan.payment_method,
+            loan.start_year, model.horizon_years, loan.grace_period_years, payments_per_year=pp_year
+        )
+        for k in out:
+            out[k] += schedule[k] * fx
+        for k in items:
+            items[k][j] = schedule[k] * fx
+    out.update({f"{k}_items": arr for k, arr in items.items()})
+    return out
+
+def leasing_stage(model: ProjectModel) -> Dict[str, Any]:
+    """Leased asset depreciation, lease interest / principal and down payments (base currency)."""
+    pp_year, total_periods = _periods(model)
+    out = {k: np.zeros(total_periods) for k in ("depreciation", "interest", "principal", "downpayment")}
+    for lease in model.leasings:
+        lease_life_periods = model.tax_config.machinery_useful_life * pp_year
+        out["depreciation"][:min(total_periods, lease_life_periods)] += lease.asset_value / lease_life_periods
+        if lease.down_payment > 0:
+            out["downpayment"][0] += lease.down_payment
+        schedule = finance.calculate_loan_schedule(
+            lease.asset_value - lease.down_payment, lease.annual_interest_rate, lease.term_years,
+            "EqualPayment", 1, model.horizon_years, 0, payments_per_year=pp_year
+        )
+        out["interest"] += schedule["interest"]
+        out["principal"] += schedule["principal"]
+    return out
+
+# --- Derived stages ---
+
+def tax_nwc_stage(model: ProjectModel, rev, opx, cpx, grt, dbt, lse) -> Dict[str, Any]:
+    """EBITDA down to net income (loss carryforward) and working capital."""
+    pp_year, total_periods = _periods(model)
+    ebitda = rev["revenue"] - rev["cogs"] - opx["opex"]
+    dep_amort = cpx["depreciation"]
+    if grt["dep_reduction"] > 0:
+        dep_amort = np.maximum(0, dep_amort - grt["dep_reduction"])
+    dep_amort = dep_amort + lse["depreciation"]
+    total_interest = dbt["interest"] + lse["interest"]
+    ebt = ebitda - dep_amort - total_interest + grt["grant_taxable"]
+
+    tax = np.zeros(total_periods)
+    accumulated_loss = 0.0
+    for i in range(total_periods):
+        ebt_curr = ebt[i]
+        if ebt_curr < 0:
+            accumulated_loss += abs(ebt_curr)
+        else:
+            loss_usage = min(ebt_curr, accumulated_loss)
+            tax[i] = (ebt_curr - loss_usage) * model.tax_config.corporate_tax_rate
+            accumulated_loss -= loss_usage
+
+    nwc_res = nwc.calculate_nwc(
+        rev["revenue"], rev["cogs"], opx["opex"],
+        model.nwc_config.dso, model.nwc_config.dio, model.nwc_config.dpo,
+        periods_per_year=pp_year,
+        receivables_override=rev["receivables"]
+    )
+    return {
+        "ebitda": ebitda, "dep_amort": dep_amort, "total_interest": total_interest, "ebt": ebt,
+        "tax": tax, "net_income": ebt - tax,
+        "delta_nwc": nwc_res["delta_nwc"], "nwc_balance": nwc_res["nwc_balance"],
+    }
+
+def cash_flows_stage(model: ProjectModel, tn, rev, cpx, grt, dbt, lse) -> Dict[str, Any]:
+    """FCFE / FCFF per period, with the terminal debt payoff and NWC release."""
+    principal = dbt["principal"]
+    ending_debt = dbt["balance"][-1] if len(dbt["balance"]) else 0.0
+    payoff = 0.0
+    if ending_debt > 1.0 and model.terminal_debt_treatment == "payoff" and model.calculation_mode == "Levered":
+        payoff = ending_debt
+        principal = principal.copy()
+        principal[-1] += payoff
+        ending_debt = 0.0
+
+    fcfe = (tn["net_income"] + tn["dep_amort"] - tn["delta_nwc"] - cpx["capex_flow"] - lse["downpayment"]
+            + dbt["drawdown"] - principal - lse["principal"] + grt["grant_cash"])
+    nopat = (tn["ebitda"] - tn["dep_amort"] + grt["grant_taxable"]) * (1 - model.tax_config.corporate_tax_rate)
+    fcff = nopat + tn["dep_amort"] - tn["delta_nwc"] - cpx["capex_flow"] - lse["downpayment"] + grt["grant_cash"]
+    if model.nwc_config.terminal_release:
+        term_balance = tn["nwc_balance"][-1] if len(tn["nwc_balance"]) > 0 else 0
+        fcfe[-1] += term_balance
+        fcff[-1] += term_balance
+    return {"principal": principal, "ending_debt": ending_debt, "payoff": payoff, "fcfe": fcfe, "fcff": fcff}
+
+def aggregate_annual(arr: np.ndarray, pp_year: int) -> np.ndarray:
+    """Per-period array (or items x periods matrix) -> yearly sums."""
+    if pp_year == 1:
+        return arr
+    return arr.reshape(*arr.shape[:-1], arr.shape[-1] // pp_year, pp_year).sum(axis=-1)
+
+def kpis_stage(model: ProjectModel, cf, tn, dbt, lse, grt, cpx, initial_equity: Optional[float] = None) -> Dict[str, Any]:
+    """
+    NPV / IRR / payback, DSCR and terminal value on the yearly streams.
+    initial_equity overrides model.equity_contribution (the baseline has none).
+    """
+    pp_year, _ = _periods(model)
+    aggr = lambda arr: aggregate_annual(arr, pp_year)
+    ebitda_a = aggr(tn["ebitda"])
+
+    if model.calculation_mode == "Unlevered":
+        target_stream = aggr(cf["fcff"])
+        initial_invest = 0.0
+        discount_rate = model.discount_rate_unlevered
+    else:
+        target_stream = aggr(cf["fcfe"])
+        initial_invest = model.equity_contribution if initial_equity is None else initial_equity
+        discount_rate = model.discount_rate_levered
+
+    full_cash_flows = np.insert(target_stream, 0, -initial_invest)
+    metrics = finance.calculate_metrics(full_cash_flows, discount_rate)
+
+    cfads = ebitda_a - aggr(tn["tax"]) - aggr(tn["delta_nwc"]) - aggr(cpx["capex_flow"]) + aggr(grt["grant_cash"])
+    debt_service = aggr(cf["principal"]) + aggr(lse["principal"]) + aggr(tn["total_interest"])
+    valid = debt_service > 0.01
+    dscr_arr = np.zeros(model.horizon_years)
+    dscr_arr[valid] = cfads[valid] / debt_service[valid]
+    valid_dscr_values = dscr_arr[valid].tolist()
+    metrics["dscr_min"] = min(valid_dscr_values) if valid_dscr_values else 0.0
+    metrics["dscr_avg"] = np.mean(valid_dscr_values) if valid_dscr_values else 0.0
+
+    ending_debt = cf["ending_debt"]
+    metrics["ending_debt_balance"] = ending_debt
+    metrics["terminal_debt_treatment"] = model.terminal_debt_treatment
+    metrics["terminal_debt_payoff"] = cf["payoff"]
+
+    # Terminal value
+    tv_value = 0.0
+    tv_pv = 0.0
+    if model.tv_config.method == "PerpetuityGrowth":
+        g = model.tv_config.growth_rate
+        if discount_rate > g:
+            tv_value = target_stream[-1] * (1 + g) / (discount_rate - g)
+    elif model.tv_config.method == "ExitMultiple":
+        tv_value = ebitda_a[-1] * model.tv_config.exit_multiple
+        if model.calculation_mode == "Levered":
+            tv_value = tv_value - ending_debt
+    if tv_value != 0:
+        tv_pv = tv_value / ((1 + discount_rate) ** model.horizon_years)
+
+    metrics["tv_value"] = tv_value
+    metrics["tv_pv"] = tv_pv
+    metrics["tv_method"] = model.tv_config.method
+    metrics["npv"] += tv_pv
+    if tv_value != 0:
+        kpi_flows = full_cash_flows.copy()
+        kpi_flows[-1] += tv_value
+        metrics["irr_tv"] = finance.calculate_metrics(kpi_flows, 0.0)["irr"]
+
+    return {"metrics": metrics, "target_stream": target_stream, "dscr": dscr_arr}
+
+_SOURCE_STAGES = {
+    "revenue": revenue_stage,
+    "opex": opex_stage,
+    "capex": capex_stage,
+    "grants": grants_stage,
+    "debt": debt_stage,
+    "leasing": leasing_stage,
+}
+_DERIVED_STAGES = {
+    "tax_nwc": tax_nwc_stage,
+    "cash_flows": cash_flows_stage,
+    "kpis": kpis_stage,
+}
+
+def stage_keys(model: ProjectModel) -> Dict[str, str]:
+    """Cache key of every stage for the current model state."""
+    keys: Dict[str, str] = {}
+    for stage in STAGES:
+        sections = STAGE_SECTIONS[stage]
+        if stage == "opex" and any(p.is_scalable for p in model.personnel):
+            sections = {**sections, "products": True}
+        keys[stage] = section_digest(model, sections, [keys[s] for s in STAGE_INPUTS.get(stage, [])])
+    return keys
+
+def _baseline_sources(model: ProjectModel, rev: Dict[str, Any], opx: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Source stage outputs before the investment: baseline sums of the
+    revenue / OPEX stages, no CAPEX, grants, loans or leasing.
+    """
+    _, total_periods = _periods(model)
+    zeros = np.zeros(total_periods)
+    zeros.flags.writeable = False
+    return {
+        "revenue": {line: rev[f"baseline_{line}"] for line in ("revenue", "cogs", "receivables")},
+        "opex": {"opex": opx["baseline_opex"]},
+        "capex": {"capex_flow": zeros, "depreciation": zeros},
+        "grants": {"grant_cash": zeros, "grant_taxable": zeros, "dep_reduction": 0.0},
+        "debt": {k: zeros for k in ("interest", "principal", "drawdown", "balance")},
+        "leasing": {k: zeros for k in ("depreciation", "interest", "principal", "downpayment")},
+    }
+
+def run_stages(model: ProjectModel, baseline: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    Outputs of every stage, recomputing only stages whose key changed.
+    baseline=True evaluates the business before the investment (see
+    core.engine.calculate_baseline) from the same cached revenue / OPEX
+    stages; only the derived stages run again, under their own keys.
+    """
+    keys = stage_keys(model)
+    out: Dict[str, Dict[str, Any]] = {}
+    sources = ["revenue", "opex"] if baseline else list(_SOURCE_STAGES)
+    for stage in sources:
+        fn = _SOURCE_STAGES[stage]
+        out[stage] = _cached(stage, keys[stage], lambda fn=fn: fn(model))
+    if baseline:
+        out = _baseline_sources(model, out["revenue"], out["opex"])
+    for stage, fn in _DERIVED_STAGES.items():
+        inputs = [out[s] for s in STAGE_INPUTS[stage]]
+        kwargs = {"initial_equity": 0.0} if baseline and stage == "kpis" else {}
+        key = section_digest(model, {}, [keys[stage], "baseline"]) if baseline else keys[stage]
+        out[stage] = _cached(stage, key, lambda fn=fn, inputs=inputs, kwargs=kwargs: fn(model, *inputs, **kwargs))
+    return out
@@ -45,6 +45,47 @@ with c2:
     
     st.session_state.project.inflation_rate = st.number_input(t("inflation_rate"), value=st.session_state.project.inflation_rate * 100.0, help=t("inflation_rate_help")) / 100.0
 
+# Shared index curves (e.g. CPI-TR) referenced by products, expenses and personnel
+with st.expander(t("index_curves_title")):
+    import pandas as pd
+    from core.curves import curve_ref_to_text, curve_ref_from_text, referenced_curves
+
+    st.caption(t("index_curves_help"))
+    for name, items in st.session_state.pop("_curves_kept", []):
+        st.error(t("curve_in_use").format(name, ", ".join(items)))
+    curves_df = pd.DataFrame(
+        [{"name": k, "rates": curve_ref_to_text(v)} for k, v in st.session_state.project.index_curves.items()],
+        columns=["name", "rates"]
+    )
+    edited_curves = st.data_editor(curves_df, num_rows="dynamic", key="index_curves_editor", use_container_width=True, column_config={
+        "name": st.column_config.TextColumn(t("col_curve_name"), required=True),
+        "rates": st.column_config.TextColumn(t("col_curve_rates"), help=t("col_curve_rates_help")),
+    })
+    new_curves = {}
+    for _, row in edited_curves.iterrows():
+        name = row["name"].strip() if isinstance(row["name"], str) else ""
+        rates = curve_ref_from_text(row["rates"] if isinstance(row["rates"], str) else "")
+        if not name:
+            continue
+        if isinstance(rates, list):
+            new_curves[name] = rates
+        else:
+            st.warning(t("curve_rates_invalid").format(name))
+    # Curves still referenced by line items cannot be deleted or renamed away
+    old_curves = st.session_state.project.index_curves
+    refs = referenced_curves(st.session_state.project)
+    kept = [(name, items) for name, items in refs.items() if name in old_curves and name not in new_curves]
+    for name, _ in kept:
+        new_curves[name] = old_curves[name]
+    st.session_state.project.index_curves = new_curves
+    if kept:
+        st.session_state["_curves_kept"] = kept
+        st.session_state.pop("index_curves_editor", None)
+        st.rerun()
+    for name, items in refs.items():
+        if name not in new_curves:
+            st.error(t("curve_missing").format(name, ", ".join(items)))
+
 st.header(t("valuation_method"))
 mode_map = {"Unlevered": t("val_unlevered"), "Levered": t("val_levered")}
 st.session_state.project.calculation_mode = st.radio(
@@ -1,273 +1,311 @@
 import streamlit as st
 
-from ui.components import ensure_state, sidebar_nav, save_button, t, require_active_project, bootstrap
+from ui.components import ensure_state, sidebar_nav, save_button, t, require_active_project, bootstrap, live_kpi_preview, rerun_fragment, memo_on
 from core.model import Product, ExpenseItem, Personnel
+from core.curves import curve_ref_to_text, curve_ref_from_text
 
 bootstrap(require_project=True)
 sidebar_nav()
 
 st.title(t("rev_opex_title"))
-tab1, tab2, tab3 = st.tabs([t("tab_products"), t("tab_fixed_exp"), t("tab_personnel")])
-
-with tab1:
-    st.subheader(t("tab_products"))
-    
-    # Convert Products to DataFrame-friendly format for editing
-    # We want to edit all fields: Name, Vol, Price, Cost, Currency, Growth, Esc, Capacity, OEE, Scrap, AdvPay, Terms
-    
-    products = st.session_state.project.products
-    
-    # Prepare data for editor
-    # We use a list of dicts.
-    # Note: data_editor with Pydantic models directly might work if we dump to dict?
-    # But we need column config.
-    
+
+# Optional per-year growth curves (core.curves)
+CURVE_FIELDS = ["volume_growth_curve", "price_escalation_curve", "cost_escalation_curve"]
+curve_options = [None] + list(st.session_state.project.index_curves)
+curve_labels = {None: t("curve_none"), **{name: name for name in st.session_state.project.index_curves}}
+
+def product_frame(products):
+    """Editor frame of the products (rates scaled to %, status columns)."""
     import pandas as pd
-    
     # Include ID in the data so we can update existing items
     # SCALING: Convert 0.05 -> 5.0 for user friendly editing
     from core.quality import check_product_status
-    
-    # Include ID in the data so we can update existing items
-    # SCALING: Convert 0.05 -> 5.0 for user friendly editing
+
     data = []
-    
+
     # 3.1 & 3.4: status computation
     for p in products:
         d = p.model_dump()
-        
+
         # Quality Check
         status_code, status_reason = check_product_status(p)
         d['status_display'] = status_code # We will display this
         d['status_reason'] = status_reason # Maybe show as tooltip if possible, or just knowing it.
-        
+
         # Scale rates
         d['year_growth_rate'] = d.get('year_growth_rate', 0) * 100
         d['price_escalation_rate'] = d.get('price_escalation_rate', 0) * 100
         d['cost_escalation_rate'] = d.get('cost_escalation_rate', 0) * 100
+        for k in CURVE_FIELDS:
+            d[k] = curve_ref_to_text(d.get(k))
         d['oee_percent'] = d.get('oee_percent', 0) * 100
         d['scrap_rate'] = d.get('scrap_rate', 0) * 100
         d['advance_payment_pct'] = d.get('advance_payment_pct', 0) * 100
-        
+
         # New Baseline Scaling
         if d.get('oee_percent_baseline') is not None:
              d['oee_percent_baseline'] = d['oee_percent_baseline'] * 100
         if d.get('scrap_rate_baseline') is not None:
              d['scrap_rate_baseline'] = d['scrap_rate_baseline'] * 100
-             
+
         data.append(d)
 
     if not data:
         # Default empty frame needs columns, including status
         df = pd.DataFrame(columns=[
             "id", "status_display", "name", "initial_volume", "year_growth_rate", "unit_price", "unit_cost", "currency", 
-            "price_escalation_rate", "cost_escalation_rate", 
+            "price_escalation_rate", "cost_escalation_rate", *CURVE_FIELDS,
             "production_capacity_per_year", "oee_percent", "scrap_rate",
             "advance_payment_pct", "payment_terms_days", "status_reason"
         ])
     else:
         df = pd.DataFrame(data)
-        
-    # 3.2 Required Fields Hint
-    st.info(t("product_inclusion_hint"))
-
-    # Column Config
-    cc = {
-        "status_display": st.column_config.TextColumn("Status", disabled=True, width="medium", help="✅ Included / ⛔ Excluded"),
-        "status_reason": st.column_config.TextColumn("Issue", disabled=True, width="large"),
-        "name": st.column_config.TextColumn(t("col_prod_name"), required=True),
-        "initial_volume": st.column_config.NumberColumn(t("col_vol"), format="%.0f", min_value=0, help=t("initial_vol_help")),
-        "year_growth_rate": st.column_config.NumberColumn(f"{t('col_vol_growth')} (%)", format="%.2f", help=t("vol_growth_help")),
-        "unit_price": st.column_config.NumberColumn(t("col_price"), format="%.2f", min_value=0, help=t("unit_price_help")),
-        "unit_cost": st.column_config.NumberColumn(t("col_cost"), format="%.2f", min_value=0, help=t("unit_cost_help")),
-        "currency": st.column_config.SelectboxColumn(t("col_curr"), options=["TRY", "USD", "EUR"], width="small", required=True),
-        "price_escalation_rate": st.column_config.NumberColumn(f"{t('col_price_esc')} (%)", format="%.2f", help=t("price_esc_help")),
-        "cost_escalation_rate": st.column_config.NumberColumn(f"{t('col_cost_esc')} (%)", format="%.2f", help=t("cost_esc_help")),
-        "production_capacity_per_year": st.column_config.NumberColumn(t("col_capacity"), format="%.0f", help=t("capacity_help")),
-        "oee_percent": st.column_config.NumberColumn(f"{t('col_oee')} (%)", format="%.2f", min_value=0.0, max_value=100.0, help=t("oee_help")),
-        "scrap_rate": st.column_config.NumberColumn(f"{t('col_scrap')} (%)", format="%.2f", min_value=0.0, max_value=50.0, help=t("scrap_help")),
-        "advance_payment_pct": st.column_config.NumberColumn(f"{t('col_adv_pay')} (%)", format="%.2f", min_value=0.0, max_value=100.0, help=t("advance_help")),
-        "payment_terms_days": st.column_config.NumberColumn(t("col_terms"), min_value=0, max_value=365, help=t("terms_help")),
-        "payment_terms_days": st.column_config.NumberColumn(t("col_terms"), min_value=0, max_value=365, help=t("terms_help")),
-        "is_incremental": st.column_config.CheckboxColumn(t("lbl_is_incremental"), help=t("help_is_incremental"), default=False),
-        
-        # Baseline Fields
-        "oee_percent_baseline": st.column_config.NumberColumn(f"{t('col_oee_base')}", format="%.2f", min_value=0.0, max_value=100.0, help=t("col_oee_base_help")),
-        "scrap_rate_baseline": st.column_config.NumberColumn(f"{t('col_scrap_base')}", format="%.2f", min_value=0.0, max_value=50.0, help=t("col_scrap_base_help")),
-        "unit_cost_baseline": st.column_config.NumberColumn(t("col_cost_base"), format="%.2f", min_value=0, help=t("col_cost_base_help")),
-    }
-    
-    edited_df = st.data_editor(
-        df,
-        key="prod_editor",
-        num_rows="dynamic",
-        use_container_width=True,
-        column_config=cc,
-        column_order=[
-            "status_display", "status_reason", "is_incremental", "name", 
-            "initial_volume", "unit_price", "unit_cost", "currency",
-            "year_growth_rate", "price_escalation_rate", "cost_escalation_rate",
-            "production_capacity_per_year", "oee_percent", "scrap_rate",
-            "oee_percent_baseline", "scrap_rate_baseline", "unit_cost_baseline", # Added here
-            "advance_payment_pct", "payment_terms_days"
-        ]
-    )
-    
-    # Auto-Save Logic
-    # ... (Logic continues) ...
-    
-    # Helper to convert DF row to clean dict
-    def row_to_clean_dict(row):
-        p_data = row.to_dict()
-        clean_data = {}
-        
-        # 1. ID Handling
-        row_id = p_data.get("id")
-        if row_id is not None and not pd.isna(row_id) and str(row_id).strip() != "":
-            clean_data["id"] = str(row_id)
-        
-        # 2. Field Sanitization
-        for k, v in p_data.items():
-            if k == "id": continue 
-            
-            if isinstance(v, list) and len(v) > 0: v = v[0]
-            elif isinstance(v, list) and len(v) == 0: v = None
-            
-            if pd.isna(v) or v is None:
-                if k == "name": clean_data[k] = "New Product"
-                elif k == "currency": clean_data[k] = "TRY"
-                elif k == "payment_terms_days": clean_data[k] = 0
-                else: clean_data[k] = 0.0
-            else:
-                # SCALING BACK: Convert 5.0 -> 0.05
-                if k in ['year_growth_rate', 'price_escalation_rate', 'cost_escalation_rate', 'oee_percent', 'scrap_rate', 'advance_payment_pct']:
-                    clean_data[k] = float(v) / 100.0
-                elif k in ['oee_percent_baseline', 'scrap_rate_baseline']: # New Fields
-                     if v is not None:
-                        clean_data[k] = float(v) / 100.0
-                     else:
-                        clean_data[k] = None
+    return df
+
+# Inputs, autosave and the live preview rerun as one fragment: editing a cell
+# does not rerun the sidebar (quality checks) or the rest of the page.
+@st.fragment
+def inputs_section():
+    tab1, tab2, tab3 = st.tabs([t("tab_products"), t("tab_fixed_exp"), t("tab_personnel")])
+
+    with tab1:
+        st.subheader(t("tab_products"))
+
+        # Convert Products to DataFrame-friendly format for editing
+        # We want to edit all fields: Name, Vol, Price, Cost, Currency, Growth, Esc, Capacity, OEE, Scrap, AdvPay, Terms
+
+        products = st.session_state.project.products
+
+        # Prepare data for editor
+        # We use a list of dicts.
+        # Note: data_editor with Pydantic models directly might work if we dump to dict?
+        # But we need column config.
+
+        import pandas as pd
+
+        # Rebuilt only when the products change (not on reruns for other edits)
+        from core.stages import section_digest
+        df = memo_on("product_frame", section_digest(st.session_state.project, {"products": True, "index_curves": True}),
+                     lambda: product_frame(products))
+
+        # 3.2 Required Fields Hint
+        st.info(t("product_inclusion_hint"))
+
+        # Column Config
+        cc = {
+            "status_display": st.column_config.TextColumn("Status", disabled=True, width="medium", help="✅ Included / ⛔ Excluded"),
+            "status_reason": st.column_config.TextColumn("Issue", disabled=True, width="large"),
+            "name": st.column_config.TextColumn(t("col_prod_name"), required=True),
+            "initial_volume": st.column_config.NumberColumn(t("col_vol"), format="%.0f", min_value=0, help=t("initial_vol_help")),
+            "year_growth_rate": st.column_config.NumberColumn(f"{t('col_vol_growth')} (%)", format="%.2f", help=t("vol_growth_help")),
+            "unit_price": st.column_config.NumberColumn(t("col_price"), format="%.2f", min_value=0, help=t("unit_price_help")),
+            "unit_cost": st.column_config.NumberColumn(t("col_cost"), format="%.2f", min_value=0, help=t("unit_cost_help")),
+            "currency": st.column_config.SelectboxColumn(t("col_curr"), options=["TRY", "USD", "EUR"], width="small", required=True),
+            "price_escalation_rate": st.column_config.NumberColumn(f"{t('col_price_esc')} (%)", format="%.2f", help=t("price_esc_help")),
+            "cost_escalation_rate": st.column_config.NumberColumn(f"{t('col_cost_esc')} (%)", format="%.2f", help=t("cost_esc_help")),
+            "volume_growth_curve": st.column_config.TextColumn(t("col_vol_curve"), help=t("curve_ref_help")),
+            "price_escalation_curve": st.column_config.TextColumn(t("col_price_curve"), help=t("curve_ref_help")),
+            "cost_escalation_curve": st.column_config.TextColumn(t("col_cost_curve"), help=t("curve_ref_help")),
+            "production_capacity_per_year": st.column_config.NumberColumn(t("col_capacity"), format="%.0f", help=t("capacity_help")),
+            "oee_percent": st.column_config.NumberColumn(f"{t('col_oee')} (%)", format="%.2f", min_value=0.0, max_value=100.0, help=t("oee_help")),
+            "scrap_rate": st.column_config.NumberColumn(f"{t('col_scrap')} (%)", format="%.2f", min_value=0.0, max_value=50.0, help=t("scrap_help")),
+            "advance_payment_pct": st.column_config.NumberColumn(f"{t('col_adv_pay')} (%)", format="%.2f", min_value=0.0, max_value=100.0, help=t("advance_help")),
+            "payment_terms_days": st.column_config.NumberColumn(t("col_terms"), min_value=0, max_value=365, help=t("terms_help")),
+            "payment_terms_days": st.column_config.NumberColumn(t("col_terms"), min_value=0, max_value=365, help=t("terms_help")),
+            "is_incremental": st.column_config.CheckboxColumn(t("lbl_is_incremental"), help=t("help_is_incremental"), default=False),
+
+            # Baseline Fields
+            "oee_percent_baseline": st.column_config.NumberColumn(f"{t('col_oee_base')}", format="%.2f", min_value=0.0, max_value=100.0, help=t("col_oee_base_help")),
+            "scrap_rate_baseline": st.column_config.NumberColumn(f"{t('col_scrap_base')}", format="%.2f", min_value=0.0, max_value=50.0, help=t("col_scrap_base_help")),
+            "unit_cost_baseline": st.column_config.NumberColumn(t("col_cost_base"), format="%.2f", min_value=0, help=t("col_cost_base_help")),
+        }
+
+        edited_df = st.data_editor(
+            df,
+            key="prod_editor",
+            num_rows="dynamic",
+            use_container_width=True,
+            column_config=cc,
+            column_order=[
+                "status_display", "status_reason", "is_incremental", "name", 
+                "initial_volume", "unit_price", "unit_cost", "currency",
+                "year_growth_rate", "price_escalation_rate", "cost_escalation_rate", *CURVE_FIELDS,
+                "production_capacity_per_year", "oee_percent", "scrap_rate",
+                "oee_percent_baseline", "scrap_rate_baseline", "unit_cost_baseline", # Added here
+                "advance_payment_pct", "payment_terms_days"
+            ]
+        )
+
+        # Auto-Save Logic
+        # ... (Logic continues) ...
+
+        # Helper to convert DF row to clean dict
+        def row_to_clean_dict(row):
+            p_data = row.to_dict()
+            clean_data = {}
+
+            # 1. ID Handling
+            row_id = p_data.get("id")
+            if row_id is not None and not pd.isna(row_id) and str(row_id).strip() != "":
+                clean_data["id"] = str(row_id)
+
+            # 2. Field Sanitization
+            for k, v in p_data.items():
+                if k == "id": continue 
+                if k in CURVE_FIELDS:
+                    # Curve name or rates in % (blank = use the scalar rate)
+                    clean_data[k] = curve_ref_from_text(v if isinstance(v, str) else None)
+                    continue
+
+                if isinstance(v, list) and len(v) > 0: v = v[0]
+                elif isinstance(v, list) and len(v) == 0: v = None
+
+                if pd.isna(v) or v is None:
+                    if k == "name": clean_data[k] = "New Product"
+                    elif k == "currency": clean_data[k] = "TRY"
+                    elif k == "payment_terms_days": clean_data[k] = 0
+                    else: clean_data[k] = 0.0
                 else:
-                    clean_data[k] = v
-        return clean_data
-
-    # Check for changes
-    # We reconstruct the list from edited_df
-    candidate_products = []
-    errors = []
-    
-    for index, row in edited_df.iterrows():
-        try:
-            clean_data = row_to_clean_dict(row)
-            # Validate with Pydantic (using Model from core to ensure class match)
-            # We store as dict in session state to avoid mismatch, but validation is useful.
-            # actually we can just store the dict if validation passes.
-            # But we want to ensure it IS valid.
-            # Ensure we store Objects, not dicts
-            prod = Product(**clean_data) 
-            candidate_products.append(prod)
-        except Exception as e:
-            errors.append(f"Row {index+1}: {str(e)}")
-
-    if errors:
-        for err in errors:
-            st.error(err)
-    else:
-        # Check equality to avoid redundant updates/reruns
-        # Converting candidates to list of dicts for comparison
-        candidate_dumps = [p.model_dump() for p in candidate_products]
-        current_products_dump = [p.model_dump() for p in st.session_state.project.products]
-        
-        if candidate_dumps != current_products_dump:
-            # FIX: Pydantic V2 Validation Error with Streamlit Reloading
-            # Assigning list of dicts forces Pydantic to re-validate and instantiate
-            # cleanly, avoiding class definition mismatch.
-            st.session_state.project.products = [p.model_dump() for p in candidate_products]
-            
-            # Persist to DB
-            from core.db import save_project
-            import time
-            user = st.session_state.get('user', {'username': 'autosave'})
-            save_project(st.session_state.project, user=user['username'])
-            
-            # Toast Throttling (3 seconds)
-            now = time.time()
-            last_toast = st.session_state.get('last_save_toast_ts', 0)
-            
-            if now - last_toast > 3.0:
-                 st.toast(f"{t('save_products')} (Auto-DB) OK! ({len(candidate_products)})", icon="💾")
-                 st.session_state['last_save_toast_ts'] = now
-            
-            # We do NOT rerun here to avoid interrupting the user while typing. 
-            # The state is updated. On next interaction, it persists.
-
-
-
-with tab2:
-    st.subheader(t("tab_fixed_exp"))
-    
-    # OPEX Clarity
-    with st.expander(t("opex_info_title"), expanded=False):
-        st.info(t("opex_explanation"))
-
-    with st.expander(t("add_expense")):
-        c1, c2, c3 = st.columns(3)
-        e_name = c1.text_input(t("expense_name"))
-        e_cat = c2.text_input(t("category"), "General")
-        e_amount = c3.number_input(t("annual_amount"), 0.0)
-        e_growth = st.number_input(t("growth_rate"), 0.0)
-        e_inc = st.checkbox(t("lbl_is_incremental"), help=t("help_is_incremental"), key="new_exp_inc") # New Checkbox
-        
-        if st.button(t("add_expense")):
-            exp = ExpenseItem(name=e_name, category=e_cat, amount_per_year=e_amount, growth_rate=e_growth/100.0, is_incremental=e_inc)
-            st.session_state.project.fixed_expenses.append(exp)
-            st.rerun()
-            
-    for i, e in enumerate(st.session_state.project.fixed_expenses):
-        st.write(f"{e.name} ({e.amount_per_year}/yr)")
-        if st.button(t("remove") + f" {e.name}", key=f"del_e_{i}"):
-            st.session_state.project.fixed_expenses.pop(i)
-            st.rerun()
-
-with tab3:
-    st.subheader(t("tab_personnel"))
-    with st.expander(t("add_role")):
-        c1, c2 = st.columns(2)
-        role = c1.text_input(t("role"))
-        count = c2.number_input(t("count"), 1, 1000, 1)
-        
-        c3, c4 = st.columns(2)
-        salary = c3.number_input(t("monthly_salary"), 0.0)
-        sgk = c4.number_input(t("employer_tax"), value=22.5) # Example
-        
-        c5, c6 = st.columns(2)
-        start_y = c5.number_input(t("start_year"), 1, st.session_state.project.horizon_years, 1)
-        raise_r = c6.number_input(t("annual_raise"), 0.0)
-        
-        # Scaling Option
-        # Scaling Option & Incremental
-        c7, c8 = st.columns(2)
-        is_scalable = c7.checkbox(t("is_scalable_label"), help=t("is_scalable_help"))
-        is_inc = c8.checkbox(t("lbl_is_incremental"), help=t("help_is_incremental"), key="new_pers_inc")
-        
-        if is_scalable:
-            st.caption(t("scalable_logic_explanation"))
-        
-        if st.button(t("add_personnel")):
-            pers = Personnel(
-                role=role, count=count, monthly_gross_salary=salary,
-                sgk_tax_rate=sgk/100.0, start_year=start_y, yearly_raise_rate=raise_r/100.0,
-                is_scalable=is_scalable, is_incremental=is_inc
-            )
-            st.session_state.project.personnel.append(pers)
-            st.rerun()
-
-    for i, p in enumerate(st.session_state.project.personnel):
-        scale_tag = " (Scalable)" if p.is_scalable else ""
-        st.write(f"{p.count}x {p.role}{scale_tag} | {p.monthly_gross_salary}/m")
-        if st.button(t("remove") + f" {p.role}", key=f"del_pers_{i}"):
-            st.session_state.project.personnel.pop(i)
-            st.rerun()
+                    # SCALING BACK: Convert 5.0 -> 0.05
+                    if k in ['year_growth_rate', 'price_escalation_rate', 'cost_escalation_rate', 'oee_percent', 'scrap_rate', 'advance_payment_pct']:
+                        clean_data[k] = float(v) / 100.0
+                    elif k in ['oee_percent_baseline', 'scrap_rate_baseline']: # New Fields
+                         if v is not None:
+                            clean_data[k] = float(v) / 100.0
+                         else:
+                            clean_data[k] = None
+                    else:
+                        clean_data[k] = v
+            return clean_data
+
+        # Check for changes
+        # We reconstruct the list from edited_df
+        candidate_products = []
+        errors = []
+
+        for index, row in edited_df.iterrows():
+            try:
+                clean_data = row_to_clean_dict(row)
+                # Validate with Pydantic (using Model from core to ensure class match)
+                # We store as dict in session state to avoid mismatch, but validation is useful.
+                # actually we can just store the dict if validation passes.
+                # But we want to ensure it IS valid.
+                # Ensure we store Objects, not dicts
+                prod = Product(**clean_data) 
+                missing = [r for r in (getattr(prod, k) for k in CURVE_FIELDS) if isinstance(r, str) and r not in st.session_state.project.index_curves]
+                if missing:
+                    raise ValueError(t("curve_unknown").format(", ".join(missing)))
+                candidate_products.append(prod)
+            except Exception as e:
+                errors.append(f"Row {index+1}: {str(e)}")
+
+        if errors:
+            for err in errors:
+                st.error(err)
+        else:
+            # Check equality to avoid redundant updates/reruns
+            # Converting candidates to list of dicts for comparison
+            candidate_dumps = [p.model_dump() for p in candidate_products]
+            current_products_dump = [p.model_dump() for p in st.session_state.project.products]
+
+            if candidate_dumps != current_products_dump:
+                # FIX: Pydantic V2 Validation Error with Streamlit Reloading
+                # Assigning list of dicts forces Pydantic to re-validate and instantiate
+                # cleanly, avoiding class definition mismatch.
+                st.session_state.project.products = [p.model_dump() for p in candidate_products]
+
+                # Persist to DB
+                from core.db import save_project
+                import time
+                user = st.session_state.get('user', {'username': 'autosave'})
+                save_project(st.session_state.project, user=user['username'])
+
+                # Toast Throttling (3 seconds)
+                now = time.time()
+                last_toast = st.session_state.get('last_save_toast_ts', 0)
+
+                if now - last_toast > 3.0:
+                     st.toast(f"{t('save_products')} (Auto-DB) OK! ({len(candidate_products)})", icon="💾")
+                     st.session_state['last_save_toast_ts'] = now
+
+                # We do NOT rerun here to avoid interrupting the user while typing. 
+                # The state is updated. On next interaction, it persists.
+
+
+
+    with tab2:
+        st.subheader(t("tab_fixed_exp"))
+
+        # OPEX Clarity
+        with st.expander(t("opex_info_title"), expanded=False):
+            st.info(t("opex_explanation"))
+
+        with st.expander(t("add_expense")):
+            c1, c2, c3 = st.columns(3)
+            e_name = c1.text_input(t("expense_name"))
+            e_cat = c2.text_input(t("category"), "General")
+            e_amount = c3.number_input(t("annual_amount"), 0.0)
+            e_growth = st.number_input(t("growth_rate"), 0.0)
+            e_curve = st.selectbox(t("growth_curve"), curve_options, format_func=curve_labels.get, key="new_exp_curve")
+            e_inc = st.checkbox(t("lbl_is_incremental"), help=t("help_is_incremental"), key="new_exp_inc") # New Checkbox
+
+            if st.button(t("add_expense")):
+                exp = ExpenseItem(name=e_name, category=e_cat, amount_per_year=e_amount, growth_rate=e_growth/100.0, growth_curve=e_curve, is_incremental=e_inc)
+                st.session_state.project.fixed_expenses.append(exp)
+                rerun_fragment()
+
+        for i, e in enumerate(st.session_state.project.fixed_expenses):
+            curve_tag = f" | {curve_ref_to_text(e.growth_curve)}" if e.growth_curve is not None else ""
+            st.write(f"{e.name} ({e.amount_per_year}/yr){curve_tag}")
+            if st.button(t("remove") + f" {e.name}", key=f"del_e_{i}"):
+                st.session_state.project.fixed_expenses.pop(i)
+                rerun_fragment()
+
+    with tab3:
+        st.subheader(t("tab_personnel"))
+        with st.expander(t("add_role")):
+            c1, c2 = st.columns(2)
+            role = c1.text_input(t("role"))
+            count = c2.number_input(t("count"), 1, 1000, 1)
+
+            c3, c4 = st.columns(2)
+            salary = c3.number_input(t("monthly_salary"), 0.0)
+            sgk = c4.number_input(t("employer_tax"), value=22.5) # Example
+
+            c5, c6 = st.columns(2)
+            start_y = c5.number_input(t("start_year"), 1, st.session_state.project.horizon_years, 1)
+            raise_r = c6.number_input(t("annual_raise"), 0.0)
+            raise_curve = st.selectbox(t("raise_curve"), curve_options, format_func=curve_labels.get, key="new_pers_curve")
+
+            # Scaling Option
+            # Scaling Option & Incremental
+            c7, c8 = st.columns(2)
+            is_scalable = c7.checkbox(t("is_scalable_label"), help=t("is_scalable_help"))
+            is_inc = c8.checkbox(t("lbl_is_incremental"), help=t("help_is_incremental"), key="new_pers_inc")
+
+            if is_scalable:
+                st.caption(t("scalable_logic_explanation"))
+
+            if st.button(t("add_personnel")):
+                pers = Personnel(
+                    role=role, count=count, monthly_gross_salary=salary,
+                    sgk_tax_rate=sgk/100.0, start_year=start_y, yearly_raise_rate=raise_r/100.0, raise_curve=raise_curve,
+                    is_scalable=is_scalable, is_incremental=is_inc
+                )
+                st.session_state.project.personnel.append(pers)
+                rerun_fragment()
+
+        for i, p in enumerate(st.session_state.project.personnel):
+            scale_tag = " (Scalable)" if p.is_scalable else ""
+            curve_tag = f" | {curve_ref_to_text(p.raise_curve)}" if p.raise_curve is not None else ""
+            st.write(f"{p.count}x {p.role}{scale_tag} | {p.monthly_gross_salary}/m{curve_tag}")
+            if st.button(t("remove") + f" {p.role}", key=f"del_pers_{i}"):
+                st.session_state.project.personnel.pop(i)
+                rerun_fragment()
+
+    live_kpi_preview()
+
+inputs_section()
 
 st.markdown("---")
 save_button()
@@ -51,6 +51,60 @@ with tab1:
         if st.button(t("remove") + f" {l.name}", key=f"del_loan_{i}"):
             st.session_state.project.loans.pop(i)
             st.rerun()
+
+    if st.session_state.project.loans:
+        with st.expander(t("ds_title"), expanded=False):
+            st.info(t("ds_info"))
+            loans = st.session_state.project.loans
+            c1, c2, c3 = st.columns(3)
+            loan_labels = {j: l.name or f"#{j + 1}" for j, l in enumerate(loans)}
+            ds_loan = c1.selectbox(t("ds_loan"), list(loan_labels), format_func=loan_labels.get)
+            ds_dscr = c2.number_input(t("ds_min_dscr"), 0.0, value=1.2, step=0.05)
+            ds_gearing_on = c3.checkbox(t("ds_gearing_covenant"), value=True, help=t("ds_gearing_covenant_help"))
+            ds_gearing = c3.number_input(t("ds_max_gearing"), 0.0, 100.0, value=70.0, step=5.0, disabled=not ds_gearing_on)
+
+            c4, c5, c6, c7 = st.columns(4)
+            horizon = st.session_state.project.horizon_years
+            ds_term = c4.number_input(t("ds_max_term"), 1, horizon, value=horizon)
+            ds_grace = c5.number_input(t("ds_max_grace"), 0, horizon, value=2)
+            test_map = {"repayment": t("ds_test_repayment"), "all": t("ds_test_all")}
+            obj_map = {"max_debt": t("ds_obj_max_debt"), "equity_irr": t("ds_obj_equity_irr")}
+            ds_test = c6.selectbox(t("ds_test_years"), list(test_map), format_func=test_map.get)
+            ds_obj = c7.selectbox(t("ds_objective"), list(obj_map), format_func=obj_map.get)
+
+            if st.button(t("run_ds")):
+                from core.debt_sizing import size_debt
+                with st.spinner(t("ds_running")):
+                    st.session_state.ds_results = size_debt(
+                        st.session_state.project, loan_index=ds_loan, min_dscr=ds_dscr,
+                        max_gearing=ds_gearing / 100.0 if ds_gearing_on else None, terms=list(range(1, int(ds_term) + 1)),
+                        grace_periods=list(range(0, int(ds_grace) + 1)),
+                        objective=ds_obj, test_years=ds_test
+                    )
+                    st.session_state.ds_loan = ds_loan
+
+            ds_df = st.session_state.get("ds_results")
+            if ds_df is not None and st.session_state.get("ds_loan") == ds_loan:
+                if ds_df.empty:
+                    st.warning(t("ds_no_result"))
+                else:
+                    st.caption(t("ds_evals").format(ds_df.attrs.get("evaluations", 0)))
+                    view = ds_df.copy()
+                    view["Payment Method"] = view["Payment Method"].map(lambda x: pay_map.get(x, x))
+                    st.dataframe(view.style.format({
+                        "Amount": "{:,.0f}", "Gearing": "{:.1%}", "Covenant DSCR": "{:.2f}",
+                        "Min DSCR": "{:.2f}", "Avg DSCR": "{:.2f}", "Equity IRR": "{:.2%}", "NPV": "{:,.0f}"
+                    }), hide_index=True)
+                    if st.button(t("ds_apply")):
+                        best = ds_df.iloc[0]
+                        loan = loans[ds_loan]
+                        loan.amount = float(best["Amount"])
+                        loan.term_years = int(best["Term (Years)"])
+                        loan.grace_period_years = int(best["Grace (Years)"])
+                        loan.payment_method = best["Payment Method"]
+                        del st.session_state["ds_results"]
+                        st.toast(t("ds_applied"))
+                        st.rerun()
             
     st.divider()
     st.header(t("equity_header"))
@@ -1,8 +1,7 @@
 import streamlit as st
 import pandas as pd
 
-from ui.components import ensure_state, sidebar_nav, format_currency, t, require_active_project, bootstrap
-from core.engine import calculate_financials
+from ui.components import ensure_state, sidebar_nav, format_currency, t, t_many, require_active_project, bootstrap, calculate_or_stop
 from core.quality import calculate_data_health
 from core.reporting import export_to_excel
 
@@ -22,7 +21,7 @@ else:
 st.caption(f"**Mode:** {mode_label} | **{discount_label}**")
 
 # Calculate Results
-results = calculate_financials(st.session_state.project)
+results = calculate_or_stop(st.session_state.project)
 
 # Metric Columns
 c1, c2, c3, c4 = st.columns(4)
@@ -67,32 +66,32 @@ else:
 tab1, tab2 = st.tabs([t("tab_income"), t("tab_cashflow")])
 
 # Define Column Translations
-col_map = {
-    "Revenue": t("th_revenue"),
-    "COGS": t("th_cogs"),
-    "Gross Profit": t("th_gross_profit"),
-    "OPEX": t("th_opex"),
-    "EBITDA": t("th_ebitda"),
-    "Depreciation": t("th_depreciation"),
-    "Grant Income": t("th_grant_income"),
-    "EBIT": t("th_ebit"),
-    "Interest": t("th_interest"),
-    "EBT": t("th_ebt"),
-    "Tax": t("th_tax"),
-    "Net Income": t("th_net_income"),
-    "Cash Flow": t("th_cash_flow"),
-    "CAPEX (w/ VAT)": t("th_capex_vat"),
-    "Delta NWC": t("th_delta_nwc"),
-    "Principal Repayment": t("th_debt_principal"),
-    "Debt Drawdown": t("th_debt_proceeds"),
-    "Equity Injection": t("th_equity_inject"),
-    "Free Cash Flow": t("th_fcf"),
-    "Lease Downpayment": t("th_lease_down"),
-    "Lease Repayment": t("th_lease_repay"),
-    "Grants (Cash)": t("th_grants_cash"),
-    "FCFE": t("th_fcfe"),
-    "FCFF": t("th_fcff"),
-}
+col_map = t_many({
+    "Revenue": "th_revenue",
+    "COGS": "th_cogs",
+    "Gross Profit": "th_gross_profit",
+    "OPEX": "th_opex",
+    "EBITDA": "th_ebitda",
+    "Depreciation": "th_depreciation",
+    "Grant Income": "th_grant_income",
+    "EBIT": "th_ebit",
+    "Interest": "th_interest",
+    "EBT": "th_ebt",
+    "Tax": "th_tax",
+    "Net Income": "th_net_income",
+    "Cash Flow": "th_cash_flow",
+    "CAPEX (w/ VAT)": "th_capex_vat",
+    "Delta NWC": "th_delta_nwc",
+    "Principal Repayment": "th_debt_principal",
+    "Debt Drawdown": "th_debt_proceeds",
+    "Equity Injection": "th_equity_inject",
+    "Free Cash Flow": "th_fcf",
+    "Lease Downpayment": "th_lease_down",
+    "Lease Repayment": "th_lease_repay",
+    "Grants (Cash)": "th_grants_cash",
+    "FCFE": "th_fcfe",
+    "FCFF": "th_fcff",
+})
 
 with tab1:
     df_is = results.income_statement.rename(columns=col_map)
@@ -1,19 +1,21 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
 
-from ui.components import ensure_state, sidebar_nav, t, require_active_project, bootstrap
-from core.engine import calculate_financials
+from ui.components import ensure_state, sidebar_nav, t, require_active_project, bootstrap, calculate_or_stop
+from core.drilldown import item_table, ebitda_attribution
 
 bootstrap(require_project=True)
 sidebar_nav()
 
 st.title(t("charts_title"))
-results = calculate_financials(st.session_state.project)
+results = calculate_or_stop(st.session_state.project)
 years = results.years
 
+# Deferred: only needed once results exist
+import plotly.express as px
+import plotly.graph_objects as go
+
 # 1. Cash Flow Waterfall or Bar
 st.subheader(t("fcf_profile"))
 df_cf = pd.DataFrame({
@@ -203,3 +205,57 @@ fig_bridge.update_layout(
     waterfallgap = 0.3
 )
 st.plotly_chart(fig_bridge, use_container_width=True)
+
+# 6. Item Drill-down (per-item arrays kept in the results; no engine rerun)
+st.subheader(t("drilldown_title"))
+cat_labels = {
+    "Revenue": t("item_cat_revenue"),
+    "COGS": t("item_cat_cogs"),
+    "Fixed Expenses": t("item_cat_fixed_expenses"),
+    "Personnel": t("item_cat_personnel"),
+    "CAPEX (w/ VAT)": t("item_cat_capex"),
+    "CAPEX Depreciation": t("item_cat_capex_depreciation"),
+    "Loan Interest": t("item_cat_loan_interest"),
+    "Loan Principal": t("item_cat_loan_principal"),
+}
+c_cat, c_top = st.columns([2, 1])
+category = c_cat.selectbox(t("drilldown_category"), list(results.item_arrays), format_func=lambda c: cat_labels.get(c, c), key="drill_category")
+top_n = c_top.number_input(t("drilldown_top_n"), min_value=1, max_value=30, value=8, step=1, key="drill_top_n")
+
+table = item_table(results, category, top_n=int(top_n), other_label=t("drilldown_other"))
+if table.empty:
+    st.info(t("drilldown_empty"))
+else:
+    df_items = table.reset_index().melt(id_vars=category, var_name="Year", value_name="Value")
+    fig_items = px.bar(
+        df_items, x="Year", y="Value", color=category,
+        labels={"Year": t("year"), "Value": t("amount"), category: cat_labels.get(category, category)}
+    )
+    fig_items.update_layout(barmode="relative", legend=dict(orientation="h", y=-0.2))
+    st.plotly_chart(fig_items, use_container_width=True)
+
+# 7. EBITDA attribution waterfall
+st.subheader(t("attribution_title"))
+year_opts = [None] + list(years)
+attr_year = st.selectbox(
+    t("attribution_year"), year_opts,
+    format_func=lambda y: t("attribution_all_years") if y is None else str(y), key="attr_year"
+)
+steps = ebitda_attribution(results, attr_year, top_n=int(top_n), other_label=t("drilldown_other"))
+if steps:
+    group_labels = {"Products": t("item_cat_products"), "Fixed Expenses": t("item_cat_fixed_expenses"), "Personnel": t("item_cat_personnel")}
+    x_labels = [f"{label} · {group_labels[group]}" for group, label, _ in steps] + ["EBITDA"]
+    values = [v for _, _, v in steps]
+    fig_attr = go.Figure(go.Waterfall(
+        orientation="v",
+        measure=["relative"] * len(values) + ["total"],
+        x=x_labels,
+        y=values + [0],
+        text=[f"{v/1_000_000:.2f}M" for v in values + [sum(values)]],
+        textposition="outside",
+        connector={"line": {"color": "rgb(63, 63, 63)"}},
+    ))
+    fig_attr.update_layout(title=t("attribution_title"), showlegend=False, waterfallgap=0.3)
+    st.plotly_chart(fig_attr, use_container_width=True)
+else:
+    st.info(t("drilldown_empty"))
@@ -1,30 +1,42 @@
 import streamlit as st
 import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import sys
 import os
 
 # sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
-from ui.components import ensure_state, sidebar_nav, t, require_active_project, bootstrap
-from core.risk import run_sensitivity_variable, run_monte_carlo, run_tornado_analysis
+from ui.components import ensure_state, sidebar_nav, t, t_many, tf, require_active_project, bootstrap
+from core.risk import run_sensitivity_variable, run_monte_carlo, run_tornado_analysis, run_grid_sensitivity
 
 bootstrap(require_project=True)
 sidebar_nav()
 
 st.title(t("risk_title"))
-tab_tornado, tab_mc_setup, tab_mc_res = st.tabs([t("tab_tornado"), t("setup_mc_tab"), t("mc_results_tab")])
+
+def queue_job(job_type, params):
+    """Submits an analysis of the current project to the shared job queue (see core.jobs)."""
+    from core.jobs import submit_job
+    user = (st.session_state.get("user") or {}).get("username")
+    job_id, created = submit_job(job_type, st.session_state.project, params, submitted_by=user)
+    st.success(tf("job_queued" if created else "job_exists", job_id))
+
+tab_tornado, tab_grid, tab_mc_setup, tab_mc_res, tab_sobol = st.tabs([t("tab_tornado"), t("tab_grid"), t("setup_mc_tab"), t("mc_results_tab"), t("tab_sobol")])
 
 # --- TAB 1: TORNADO / SENSITIVITY ---
 with tab_tornado:
     st.subheader(t("auto_tornado_title"))
     st.info(t("auto_tornado_info"))
     
-    if st.button(t("run_tornado")):
+    c_run, c_queue = st.columns(2)
+    if c_run.button(t("run_tornado")):
         with st.spinner(t("calc_sens")):
-            df = run_tornado_analysis(st.session_state.project)
-            
+            st.session_state["tornado_results"] = run_tornado_analysis(st.session_state.project)
+    if c_queue.button(t("queue_tornado_btn"), help=t("queue_job_help")):
+        queue_job("tornado", {})
+
+    if "tornado_results" in st.session_state:
+        df = st.session_state["tornado_results"]
+        import plotly.graph_objects as go # Deferred: only needed once results exist
         # Tornado Plot
         # Plotly Express doesn't do "Base relative" easily, use Graph Objects
         fig = go.Figure()
@@ -57,18 +69,95 @@ with tab_tornado:
         
         # Format only numeric columns
         # Localize columns for display
-        df_disp = df.rename(columns={
-            "Variable": t("col_variable"),
-            "Base NPV": t("col_base_npv"),
-            "Downside NPV (0.9x)": t("col_downside_npv"),
-            "Upside NPV (1.1x)": t("col_upside_npv"),
-            "Range": t("col_range"),
-            "Swing Down": t("col_swing_down"),
-            "Swing Up": t("col_swing_up")
-        })
+        df_disp = df.rename(columns=t_many({
+            "Variable": "col_variable",
+            "Base NPV": "col_base_npv",
+            "Downside NPV (0.9x)": "col_downside_npv",
+            "Upside NPV (1.1x)": "col_upside_npv",
+            "Range": "col_range",
+            "Swing Down": "col_swing_down",
+            "Swing Up": "col_swing_up"
+        }))
         st.dataframe(df_disp.style.format("{:,.0f}", subset=df_disp.select_dtypes(include=[np.number]).columns))
 
-# --- TAB 2: MC SETUP ---
+# --- TAB 2: GRID SENSITIVITY ---
+with tab_grid:
+    from core.batch import DRIVERS, driver_base_value
+
+    st.subheader(t("grid_title"))
+    st.info(t("grid_info"))
+
+    project = st.session_state.project
+    driver_labels = {d: t("var_" + d.lower().replace(" ", "_")) for d in DRIVERS}
+    available = [d for d in DRIVERS if driver_base_value(project, d) is not None]
+
+    def axis_values(container, label_key, default_driver, key):
+        """Driver selector + range inputs for one grid axis. Rates are entered in %."""
+        driver = container.selectbox(
+            t(label_key), available, index=available.index(default_driver),
+            format_func=driver_labels.get, key=f"grid_{key}_driver"
+        )
+        base = driver_base_value(project, driver)
+        if DRIVERS[driver] == "factor":
+            scale, lo, hi, steps = 1.0, 0.8, 1.2, 21
+        elif driver == "Loan Term":
+            scale, lo, hi = 1.0, max(1.0, base - 3), base + 3
+            steps = int(hi - lo) + 1
+        else:
+            scale, lo, hi, steps = 100.0, max(0.0, base - 0.05) * 100, (base + 0.05) * 100, 21
+
+        c_a, c_b, c_c = container.columns(3)
+        lo = c_a.number_input(t("grid_from"), value=float(lo), key=f"grid_{key}_{driver}_lo")
+        hi = c_b.number_input(t("grid_to"), value=float(hi), key=f"grid_{key}_{driver}_hi")
+        steps = c_c.number_input(t("grid_steps"), min_value=2, max_value=101, value=steps, key=f"grid_{key}_{driver}_n")
+        values = np.linspace(lo, hi, int(steps)) / scale
+        if driver == "Loan Term":
+            values = np.unique(np.maximum(np.rint(values), 1))
+        return driver, values, scale
+
+    c_x, c_y = st.columns(2)
+    x_var, x_values, x_scale = axis_values(c_x, "grid_x_var", "Price", "x")
+    y_var, y_values, y_scale = axis_values(c_y, "grid_y_var", "Volume", "y")
+
+    if st.button(t("run_grid")):
+        if x_var == y_var:
+            st.warning(t("grid_same_driver"))
+        else:
+            with st.spinner(t("calc_sens")):
+                st.session_state["grid_results"] = {
+                    "x_var": x_var, "y_var": y_var, "x_scale": x_scale, "y_scale": y_scale,
+                    "tables": run_grid_sensitivity(project, x_var, x_values, y_var, y_values)
+                }
+
+    grid = st.session_state.get("grid_results")
+    if grid:
+        import plotly.graph_objects as go
+
+        metric_labels = {"npv": t("npv_label"), "irr": t("irr_label"), "dscr_min": t("min_dscr_label")}
+        metric = st.selectbox(t("grid_metric"), list(metric_labels), format_func=metric_labels.get, key="grid_metric")
+        table = grid["tables"][metric]
+        z = table.values * 100 if metric == "irr" else table.values
+
+        fig = go.Figure(go.Heatmap(
+            z=z,
+            x=table.columns.values * grid["x_scale"],
+            y=table.index.values * grid["y_scale"],
+            colorscale="RdYlGn",
+            zmid=0 if metric != "dscr_min" else 1.0,
+            colorbar=dict(title=metric_labels[metric])
+        ))
+        fig.update_layout(
+            title=t("grid_chart_title").format(metric_labels[metric], driver_labels[grid["x_var"]], driver_labels[grid["y_var"]]),
+            xaxis_title=driver_labels[grid["x_var"]],
+            yaxis_title=driver_labels[grid["y_var"]],
+            height=500
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+        disp = pd.DataFrame(z, index=table.index.values * grid["y_scale"], columns=table.columns.values * grid["x_scale"])
+        st.dataframe(disp.style.format("{:,.2f}" if metric != "npv" else "{:,.0f}"))
+
+# --- TAB 3: MC SETUP ---
 with tab_mc_setup:
     st.subheader(t("simulation_settings"))
     
@@ -92,10 +181,11 @@ with tab_mc_setup:
         with cols[i % 2]:
             st.markdown(f"**{t('var_' + var.lower())}**")
             # Type
+            dist_options = ["Normal", "Triangular", "PERT", "Uniform", "Lognormal"]
             new_type = st.selectbox(
                 t("dist_type"), 
-                ["Normal", "Triangular", "Uniform", "Lognormal"], 
-                index=["Normal", "Triangular", "Uniform", "Lognormal"].index(config.dist_type),
+                dist_options, 
+                index=dist_options.index(config.dist_type) if config.dist_type in dist_options else 0,
                 key=f"dist_{var}_new"
             )
             config.dist_type = new_type
@@ -105,7 +195,7 @@ with tab_mc_setup:
                 c_a, c_b = st.columns(2)
                 config.mean_pct = c_a.number_input(t("mc_mean_shift"), value=config.mean_pct*100, key=f"m_{var}") / 100.0
                 config.std_dev_pct = c_b.number_input(t("mc_std_dev_vol"), value=config.std_dev_pct*100, key=f"s_{var}") / 100.0
-            elif config.dist_type == "Triangular":
+            elif config.dist_type in ["Triangular", "PERT"]:
                 c_a, c_b, c_c = st.columns(3)
                 config.min_pct = c_a.number_input(t("mc_min_pct"), value=config.min_pct*100, key=f"min_{var}") / 100.0
                 config.mode_pct = c_b.number_input(t("mc_mode_pct"), value=config.mode_pct*100, key=f"mod_{var}") / 100.0
@@ -115,31 +205,154 @@ with tab_mc_setup:
                 config.min_pct = c_a.number_input(t("mc_min_pct"), value=config.min_pct*100, key=f"u_min_{var}") / 100.0
                 config.max_pct = c_b.number_input(t("mc_max_pct"), value=config.max_pct*100, key=f"u_max_{var}") / 100.0
 
+    st.markdown(f"### {t('paths_title')}")
+    st.caption(t("paths_info"))
+    from core.model import FxPathConfig, InflationPathConfig
+    from core.paths import FX_PROCESSES, INFLATION_VARIABLE, path_variables
+
+    project = st.session_state.project
+    risk_cfg = project.risk_config
+    process_labels = {"GBM": t("fx_process_gbm"), "MeanReverting": t("fx_process_mr")}
+    foreign = [c for c in project.exchange_rates if c != project.currency_base]
+    path_cols = st.columns(2)
+    for i, curr in enumerate(foreign):
+        with path_cols[i % 2]:
+            if not st.checkbox(t("fx_path_enable").format(curr), value=curr in risk_cfg.fx_paths, key=f"fxp_on_{curr}"):
+                risk_cfg.fx_paths.pop(curr, None)
+                continue
+            fx_conf = risk_cfg.fx_paths.setdefault(curr, FxPathConfig())
+            fx_conf.process = st.selectbox(
+                t("fx_process"), FX_PROCESSES, index=FX_PROCESSES.index(fx_conf.process),
+                format_func=process_labels.get, key=f"fxp_proc_{curr}"
+            )
+            c_a, c_b, c_c = st.columns(3)
+            fx_conf.drift = c_a.number_input(t("fx_drift"), value=fx_conf.drift * 100, key=f"fxp_drift_{curr}") / 100.0
+            fx_conf.volatility = c_b.number_input(t("fx_volatility"), min_value=0.0, value=fx_conf.volatility * 100, key=f"fxp_vol_{curr}") / 100.0
+            if fx_conf.process == "MeanReverting":
+                fx_conf.mean_reversion = c_c.number_input(t("fx_mean_reversion"), min_value=0.0, value=fx_conf.mean_reversion, step=0.1, key=f"fxp_mr_{curr}")
+
+    if st.checkbox(t("infl_path_enable"), value=risk_cfg.inflation_path is not None, key="infl_path_on"):
+        risk_cfg.inflation_path = risk_cfg.inflation_path or InflationPathConfig()
+        c_a, c_b = st.columns(2)
+        risk_cfg.inflation_path.volatility = c_a.number_input(t("infl_volatility"), min_value=0.0, value=risk_cfg.inflation_path.volatility * 100, key="infl_vol") / 100.0
+        risk_cfg.inflation_path.mean_reversion = c_b.number_input(t("infl_mean_reversion"), min_value=0.0, value=risk_cfg.inflation_path.mean_reversion, step=0.1, key="infl_mr")
+    else:
+        risk_cfg.inflation_path = None
+
+    # Targeted shocks: single products / categories / loans over a year range
+    st.markdown(f"### {t('shocks_title')}")
+    st.caption(t("shocks_info"))
+    from core.model import ShockSpec
+    from core.shocks import SHOCK_KINDS, validate_shocks
+
+    shocks_df = pd.DataFrame([{
+        "name": s.name, "target": s.target, "item": s.item or "", "start_year": s.start_year, "end_year": s.end_year,
+        "mean_pct": s.mean_pct * 100, "std_dev_pct": s.std_dev_pct * 100, "autocorrelation": s.autocorrelation,
+    } for s in risk_cfg.shocks], columns=["name", "target", "item", "start_year", "end_year", "mean_pct", "std_dev_pct", "autocorrelation"])
+    edited_shocks = st.data_editor(shocks_df, num_rows="dynamic", key="shocks_editor", use_container_width=True, column_config={
+        "name": st.column_config.TextColumn(t("col_shock_name"), required=True),
+        "target": st.column_config.SelectboxColumn(t("col_shock_target"), options=list(SHOCK_KINDS), required=True, help=t("col_shock_target_help")),
+        "item": st.column_config.TextColumn(t("col_shock_item"), help=t("col_shock_item_help")),
+        "start_year": st.column_config.NumberColumn(t("col_start_year"), min_value=1, max_value=project.horizon_years, step=1, default=1),
+        "end_year": st.column_config.NumberColumn(t("col_end_year"), min_value=1, max_value=project.horizon_years, step=1),
+        "mean_pct": st.column_config.NumberColumn(t("mc_mean_shift"), format="%.1f", default=0.0),
+        "std_dev_pct": st.column_config.NumberColumn(t("mc_std_dev_vol"), min_value=0.0, format="%.1f", default=10.0),
+        "autocorrelation": st.column_config.NumberColumn(t("col_shock_autocorr"), min_value=0.0, max_value=1.0, step=0.05, format="%.2f", default=0.0, help=t("col_shock_autocorr_help")),
+    })
+    new_shocks = []
+    for _, row in edited_shocks.iterrows():
+        if not isinstance(row["name"], str) or not row["name"].strip() or row["target"] not in SHOCK_KINDS:
+            continue
+        new_shocks.append(ShockSpec(
+            name=row["name"].strip(), target=row["target"],
+            item=row["item"].strip() if isinstance(row["item"], str) and row["item"].strip() else None,
+            start_year=int(row["start_year"]) if pd.notna(row["start_year"]) else 1,
+            end_year=int(row["end_year"]) if pd.notna(row["end_year"]) else None,
+            mean_pct=float(row["mean_pct"]) / 100.0 if pd.notna(row["mean_pct"]) else 0.0,
+            std_dev_pct=float(row["std_dev_pct"]) / 100.0 if pd.notna(row["std_dev_pct"]) else 0.10,
+            autocorrelation=float(row["autocorrelation"]) if pd.notna(row["autocorrelation"]) else 0.0,
+        ))
+    risk_cfg.shocks = new_shocks
+    try:
+        validate_shocks(project)
+    except ValueError as e:
+        st.warning(f"{t('shocks_invalid')}: {e}")
+
     st.markdown(f"### {t('correlations')}")
     st.info(t("corr_info"))
+
+    with st.expander(t("corr_matrix_title"), expanded=True):
+        st.caption(t("corr_matrix_help"))
+        from core.risk import correlation_matrix
+        from core.correlation import cholesky_factor, merge_symmetric_edits
+
+        corr_vars = vars_to_config + path_variables(project)
+        var_labels = [
+            t("var_inflation") if v == INFLATION_VARIABLE
+            else t("fx_path_var").format(v.split(" ", 1)[1]) if v.startswith("FX ")
+            else t('var_' + v.lower())
+            for v in corr_vars
+        ]
+        corr_df = pd.DataFrame(correlation_matrix(risk_cfg, corr_vars), index=var_labels, columns=var_labels)
+        edited = st.data_editor(corr_df, key="corr_matrix_editor", column_config={
+            c: st.column_config.NumberColumn(min_value=-1.0, max_value=1.0, step=0.05, format="%.2f") for c in var_labels
+        })
+        merged = merge_symmetric_edits(corr_df.to_numpy(), edited.to_numpy())
+        for i, v1 in enumerate(corr_vars):
+            for j in range(i + 1, len(corr_vars)):
+                risk_cfg.set_correlation(v1, corr_vars[j], float(merged[i, j]))
+        if not np.allclose(merged, edited.to_numpy()):
+            # Redraw from the stored pairs so the mirrored cell and diagonal show what is used
+            st.session_state.pop("corr_matrix_editor", None)
+            st.rerun()
+
+        _, corr_report = cholesky_factor(correlation_matrix(risk_cfg, corr_vars))
+        if corr_report["adjusted"]:
+            st.warning(t("corr_adjusted").format(corr_report["max_change"]))
+
+    use_is = st.checkbox(t("mc_importance"), value=False, help=t("mc_importance_help"))
     
-    corr_pv = st.slider(t("corr_price_vol"), -1.0, 1.0, st.session_state.project.risk_config.get_correlation("Price", "Volume"), 0.1)
-    st.session_state.project.risk_config.set_correlation("Price", "Volume", corr_pv)
-    
+    if st.button(t("queue_mc_btn"), help=t("queue_job_help")):
+        queue_job("monte_carlo", {
+            "iterations": st.session_state.project.risk_config.monte_carlo_iterations,
+            "importance_sampling": use_is,
+        })
+
     if st.button(t("run_sim_btn"), type="primary"):
         with st.spinner(f"{t('running_sim')} ({st.session_state.project.risk_config.monte_carlo_iterations})"):
-            mc_results = run_monte_carlo(
-                st.session_state.project, 
-                iterations=st.session_state.project.risk_config.monte_carlo_iterations
-            )
-            st.session_state['mc_results'] = mc_results
-            st.success(t("sim_success"))
+            try:
+                mc_results = run_monte_carlo(
+                    st.session_state.project, 
+                    iterations=st.session_state.project.risk_config.monte_carlo_iterations,
+                    importance_sampling=use_is,
+                    cache=st.session_state.setdefault("_mc_factor_cache", {})
+                )
+            except ValueError as e:
+                st.error(f"{t('dist_invalid')}: {e}")
+            else:
+                st.session_state['mc_results'] = mc_results
+                # Chart data (bins, KDE, downsample) computed once per run
+                from core.mc_summary import summarize_results
+                st.session_state['mc_summary'] = summarize_results(mc_results)
+                st.success(t("sim_success"))
 
-# --- TAB 3: MC RESULTS ---
+# --- TAB 4: MC RESULTS ---
 with tab_mc_res:
     if 'mc_results' in st.session_state:
+        import plotly.express as px
+        import plotly.graph_objects as go
         df = st.session_state['mc_results']
+        if 'mc_summary' not in st.session_state:
+            from core.mc_summary import summarize_results
+            st.session_state['mc_summary'] = summarize_results(df)
+        summary = st.session_state['mc_summary']
         
-        # KPI Cards
-        mean_npv = df['NPV'].mean()
-        std_npv = df['NPV'].std()
-        prob_profit = (df['NPV'] > 0).mean() * 100
-        p5 = np.percentile(df['NPV'], 5)
+        # KPI Cards (likelihood-ratio weighted for importance-sampling runs)
+        mc_stats = summary["stats"]
+        mean_npv = mc_stats["mean_npv"]
+        std_npv = mc_stats["std_npv"]
+        prob_profit = mc_stats["prob_profit"] * 100
+        p5 = mc_stats["p5_npv"]
         var_95 = mean_npv - p5
         
         col1, col2, col3, col4 = st.columns(4)
@@ -152,7 +365,12 @@ with tab_mc_res:
         st.divider()
         st.subheader(t("risk_decision_title"))
         
-        prob_loss = (df['NPV'] < 0).mean() * 100
+        prob_loss = mc_stats["prob_loss"] * 100
+        if "Weight" in df:
+            st.caption(t("mc_is_caption").format(
+                ess=mc_stats["ess"], n=len(df), p=prob_loss, se=mc_stats["prob_loss_se"] * 100,
+                eq=mc_stats["equivalent_iterations"]
+            ))
         # VaR Amount (Absolute Loss from Mean or just the Value?)
         # Convention: VaR is the generic "Worst Case Value" or "Loss Amount".
         # Let's show the Value at 5% percentile.
@@ -168,28 +386,43 @@ with tab_mc_res:
         with c_d2:
             st.warning(t("var_msg").format(amy=f"{worst_case_val:,.0f}"))
         
-        # Advanced Histogram
+        # Advanced Histogram: precomputed bins + KDE (weighted runs show the
+        # reweighted frequencies), so the chart size does not grow with iterations
         fig = go.Figure()
-        fig.add_trace(go.Histogram(
-            x=df['NPV'], 
-            nbinsx=50, 
+        hist = summary["histogram"]
+        fig.add_trace(go.Bar(
+            x=hist["centers"],
+            y=hist["counts"],
+            width=hist["widths"],
             name=t("npv_dist"),
             marker_color='#1f77b4',
             opacity=0.7
         ))
+        if len(summary["kde"]["x"]):
+            fig.add_trace(go.Scatter(x=summary["kde"]["x"], y=summary["kde"]["counts"], mode="lines", name=t("mc_kde"), line=dict(color="#ff7f0e")))
         
         # Add Lines
         fig.add_vline(x=0, line_width=2, line_dash="dash", line_color="black", annotation_text=t("break_even_line"))
         fig.add_vline(x=mean_npv, line_width=2, line_color="green", annotation_text=t("mean_line"))
         fig.add_vline(x=p5, line_width=2, line_dash="dot", line_color="red", annotation_text=t("var_95"))
         
-        fig.update_layout(title=t("hist_title"), xaxis_title="NPV", yaxis_title="Frekans")
+        fig.update_layout(title=t("hist_title"), xaxis_title="NPV", yaxis_title="Frekans", bargap=0)
         st.plotly_chart(fig, use_container_width=True)
+
+        with st.expander(t("mc_quantiles")):
+            st.dataframe(pd.DataFrame(
+                {"NPV": list(summary["quantiles"].values())},
+                index=[f"P{q}" for q in summary["quantiles"]]
+            ).T.style.format("{:,.0f}"))
+
+        sample = summary["sample"]
+        if len(sample) < len(df):
+            st.caption(t("mc_sample_caption").format(n=len(sample), total=len(df)))
         
         # Scatter for Correlation verification
         with st.expander(t("scatter_expander")):
             fig_scat = px.scatter(
-                df, 
+                sample, 
                 x="Volume_Factor", 
                 y="Price_Factor", 
                 color="NPV", 
@@ -200,6 +433,86 @@ with tab_mc_res:
                 }
             )
             st.plotly_chart(fig_scat, use_container_width=True)
+
+        path_results = [c for c in sample.columns if c.endswith("_End") or c.endswith("_Shock") or c == "Inflation_Avg"]
+        if path_results:
+            with st.expander(t("paths_scatter_expander")):
+                path_col = st.selectbox(t("paths_scatter_var"), path_results, key="mc_path_scatter")
+                st.plotly_chart(px.scatter(sample, x=path_col, y="NPV", opacity=0.5), use_container_width=True)
             
     else:
         st.info(t("mc_run_warning"))
+
+# --- TAB 5: GLOBAL SENSITIVITY (SOBOL) ---
+with tab_sobol:
+    st.subheader(t("sobol_title"))
+    st.info(t("sobol_info"))
+    st.caption(t("sobol_independence_note"))
+
+    c1, c2 = st.columns(2)
+    n_base = c1.selectbox(t("sobol_samples"), [256, 512, 1024, 2048, 4096], index=2)
+    metric_labels = {"npv": t("npv_label"), "irr": t("irr_label")}
+    sobol_metric = c2.selectbox(t("grid_metric"), list(metric_labels), format_func=metric_labels.get, key="sobol_metric")
+
+    if st.button(t("run_sobol")):
+        from core.sensitivity import run_sobol_analysis
+        with st.spinner(t("calc_sens")):
+            st.session_state["sobol_results"] = run_sobol_analysis(st.session_state.project, n_base=n_base)
+
+    if "sobol_results" in st.session_state:
+        import plotly.graph_objects as go
+
+        df_s = st.session_state["sobol_results"]
+        if df_s.attrs.get("correlated_inputs"):
+            st.warning(t("sobol_corr_warning"))
+        st.caption(t("sobol_evals").format(df_s.attrs.get("evaluations", 0), df_s.attrs.get("n_base", 0)))
+
+        view = df_s[df_s["Metric"] == sobol_metric]
+        labels = [t("var_" + v.lower()) for v in view["Variable"]]
+        fig = go.Figure()
+        fig.add_trace(go.Bar(x=labels, y=view["S1"], name=t("sobol_first_order"),
+                             error_y=dict(type="data", array=view["S1_conf"])))
+        fig.add_trace(go.Bar(x=labels, y=view["ST"], name=t("sobol_total"),
+                             error_y=dict(type="data", array=view["ST_conf"])))
+        fig.update_layout(title=t("sobol_chart_title").format(metric_labels[sobol_metric]), barmode="group", height=400)
+        st.plotly_chart(fig, use_container_width=True)
+
+        st.dataframe(view.drop(columns=["Metric"]).set_index("Variable").style.format("{:.3f}"))
+
+# --- BACKGROUND JOBS (shared queue in projects.db) ---
+with st.expander(t("jobs_title")):
+    from core import db
+    from core.jobs import job_summary, load_result
+
+    st.caption(t("jobs_info"))
+    jobs = db.list_jobs(project_id=st.session_state.project.id, limit=20)
+    if not jobs:
+        st.info(t("jobs_empty"))
+    else:
+        rows = pd.DataFrame([job_summary(j) for j in jobs]).drop(columns=["params"])
+        st.dataframe(
+            rows.rename(columns=t_many({
+                "id": "col_job_id", "type": "col_job_type", "status": "col_job_status", "progress": "col_job_progress",
+                "attempts": "col_job_attempts", "queued_s": "col_job_queued_s", "run_s": "col_job_run_s", "error": "col_job_error",
+            })),
+            hide_index=True, use_container_width=True,
+        )
+        by_id = {j["id"]: j for j in jobs}
+        c_sel, c_load, c_cancel = st.columns([2, 1, 1])
+        job_id = c_sel.selectbox(t("col_job_id"), list(by_id), format_func=lambda i: f"{i} · {by_id[i]['job_type']} · {by_id[i]['status']}", key="job_select")
+        job = by_id[job_id]
+        if c_load.button(t("job_load_btn"), disabled=job["status"] != "done"):
+            result = load_result(job)
+            if job["job_type"] == "monte_carlo" and "samples" in result:
+                from core.mc_summary import summarize_results
+                st.session_state["mc_results"] = result["samples"]
+                st.session_state["mc_summary"] = summarize_results(result["samples"])
+                st.success(t("job_loaded_mc"))
+            elif job["job_type"] == "tornado":
+                st.session_state["tornado_results"] = pd.DataFrame(result["tornado"])
+                st.success(t("job_loaded_tornado"))
+            else:
+                st.json(result)
+        if c_cancel.button(t("job_cancel_btn"), disabled=job["status"] not in ("queued", "running")):
+            db.cancel_job(job_id)
+            st.rerun()
@@ -1,12 +1,12 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import sys
 import os
 import copy
-import plotly.express as px
 
 # sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
-from ui.components import ensure_state, sidebar_nav, t, require_active_project, bootstrap
+from ui.components import ensure_state, sidebar_nav, t, require_active_project, bootstrap, calculate_or_stop
 from core.engine import calculate_financials
 
 bootstrap(require_project=True)
@@ -19,11 +19,13 @@ if st.session_state.project and st.session_state.project.id:
     if getattr(st.session_state.project, 'baseline_enabled', False):
         st.subheader(t("growth_analysis_title"))
         
-        from core.engine import calculate_baseline
+        from core.engine import calculate_incremental
         
         with st.spinner("Calculating Baseline Scenario..."):
-            res_baseline = calculate_baseline(st.session_state.project)
-            res_current = calculate_financials(st.session_state.project)
+            # One evaluation for both cases (shared per-item arrays)
+            incremental = calculate_incremental(st.session_state.project)
+            res_baseline = incremental["without"]
+            res_current = incremental["with"]
             
         # Comparison Metrics (Totals for Horizon)
         # Revenue, EBITDA, Free Cash Flow (Firm or Equity based on mode), NPV
@@ -123,7 +125,7 @@ if st.session_state.project and st.session_state.project.id:
             return calculate_financials(proj)
             
         # Base
-        res_base = calculate_financials(st.session_state.project)
+        res_base = calculate_or_stop(st.session_state.project)
         
         # Best
         res_best = run_scenario(b_vol, b_price, b_cost, b_capex)
@@ -164,6 +166,7 @@ if st.session_state.project and st.session_state.project.id:
             "Color": ["red", "grey", "green"]
         })
         
+        import plotly.express as px # Deferred: only needed once scenario results exist
         fig = px.bar(df_chart, x=t("col_scenario"), y="NPV", color=t("col_scenario"), color_discrete_map={
             t("worst_case"): "red",
             t("base_case"): "grey", 
@@ -211,5 +214,68 @@ if st.session_state.project and st.session_state.project.id:
                           }, markers=True)
         st.plotly_chart(fig_line, use_container_width=True)
 
+    # 4. Paired Monte Carlo (common random numbers)
+    st.divider()
+    st.subheader(t("paired_title"))
+    st.info(t("paired_info"))
+
+    project = st.session_state.project
+    variant_labels = {}
+    if project.loans:
+        variant_labels["without_debt"] = t("variant_without_debt")
+    if getattr(project, 'baseline_enabled', False):
+        variant_labels["baseline"] = t("variant_baseline")
+
+    if not variant_labels:
+        st.caption(t("paired_no_variants"))
+    else:
+        chosen = st.multiselect(t("paired_variants"), list(variant_labels), default=list(variant_labels), format_func=variant_labels.get)
+        if st.button(t("run_paired")) and chosen:
+            from core.risk import run_paired_monte_carlo
+            from core.engine import build_baseline_model
+
+            variants = {"current": project}
+            if "without_debt" in chosen:
+                variants["without_debt"] = project.model_copy(update={"loans": []}, deep=True)
+            if "baseline" in chosen:
+                variants["baseline"] = build_baseline_model(project)
+            with st.spinner(t("running_sim")):
+                st.session_state.paired_results = run_paired_monte_carlo(variants, iterations=project.risk_config.monte_carlo_iterations)
+
+        paired_df = st.session_state.get("paired_results")
+        if paired_df is not None:
+            from core.risk import paired_difference
+            from core.mc_summary import histogram
+            import plotly.graph_objects as go
+
+            rows, diffs = [], {}
+            for name in paired_df.attrs.get("variants", [])[1:]:
+                d = paired_difference(paired_df, name, "current")
+                diffs[name] = d["differences"]
+                rows.append({
+                    t("paired_col_variant"): variant_labels.get(name, name),
+                    t("paired_mean_diff"): d["mean"],
+                    t("paired_ci"): f"{d['ci_low']:,.0f} … {d['ci_high']:,.0f}",
+                    t("paired_prob_better"): d["prob_positive"],
+                    t("paired_var_reduction"): d["variance_reduction"],
+                })
+            st.dataframe(
+                pd.DataFrame(rows).style.format({
+                    t("paired_mean_diff"): "{:+,.0f}",
+                    t("paired_prob_better"): "{:.1%}",
+                    t("paired_var_reduction"): lambda v: f"{v:,.0f}x" if np.isfinite(v) else "∞",
+                }),
+                hide_index=True,
+                column_config={t("paired_var_reduction"): st.column_config.Column(help=t("paired_var_reduction_help"))}
+            )
+            for name, diff in diffs.items():
+                label = variant_labels.get(name, name)
+                # Binned server-side: only the bar heights go to the browser
+                hist = histogram(diff, bins=50)
+                fig_diff = go.Figure(go.Bar(x=hist["centers"], y=hist["counts"], width=hist["widths"]))
+                fig_diff.update_layout(title=t("paired_hist_title").format(label), xaxis_title="Δ NPV", bargap=0)
+                fig_diff.add_vline(x=0, line_dash="dash", line_color="black")
+                st.plotly_chart(fig_diff, use_container_width=True)
+
 else:
     st.info(t("navigate_hint"))
@@ -0,0 +1,46 @@
+import sys
+import os
+import argparse
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import db
+from core.portfolio import collect_portfolio_results
+from core.reporting import write_portfolio_workbook, write_statements_parquet
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build a consolidated multi-project report (Excel + Parquet).")
+    parser.add_argument("--db", default=db.DB_PATH, help="Path to projects.db (default: repository projects.db)")
+    parser.add_argument("--ids", nargs="*", help="Project ids to include (default: all stored projects)")
+    parser.add_argument("--xlsx", default="portfolio_report.xlsx", help="Output workbook path")
+    parser.add_argument("--parquet", default=None, help="Output Parquet file/dataset path (optional)")
+    parser.add_argument("--partition-by-project", action="store_true", help="Write the Parquet output as a dataset partitioned by project_id")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes for projects without a current cached result")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every project even if a current stored result exists")
+    return parser.parse_args(argv)
+
+def run(argv=None):
+    args = parse_args(argv)
+    db.DB_PATH = os.path.abspath(args.db)
+    db.init_db()
+
+    project_ids = args.ids or [p["id"] for p in db.list_projects()]
+    started = time.perf_counter()
+    results = collect_portfolio_results(project_ids, workers=args.workers, use_cache=not args.no_cache)
+    cached = sum(1 for r in results if r.get("cached"))
+    failed = [r for r in results if r["status"] != "ok"]
+    print(f"Collected {len(results)} project(s) ({cached} from cache) in {time.perf_counter() - started:.2f} s")
+
+    write_portfolio_workbook(results, args.xlsx)
+    print(f"Workbook: {args.xlsx}")
+
+    if args.parquet:
+        n_rows = write_statements_parquet(results, args.parquet, partition_cols=["project_id"] if args.partition_by_project else None)
+        print(f"Parquet: {args.parquet} ({n_rows} rows)")
+
+    for r in failed:
+        print(f"  FAILED {r['project_id']}: {r['error']}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,50 @@
+import sys
+import os
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import db
+from core.portfolio import run_portfolio
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Re-evaluate every stored project and write KPI results back to the DB.")
+    parser.add_argument("--db", default=db.DB_PATH, help="Path to projects.db (default: repository projects.db)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (1 = run inline)")
+    parser.add_argument("--chunk-size", type=int, default=32, help="Projects per read/write transaction")
+    parser.add_argument("--ids", nargs="*", help="Only evaluate these project ids")
+    parser.add_argument("--baseline", action="store_true", help="Also evaluate the baseline (without investment) case")
+    parser.add_argument("--tornado", action="store_true", help="Also run the +/-10%% tornado analysis")
+    parser.add_argument("--mc", type=int, default=0, metavar="N", help="Also run Monte Carlo with N iterations")
+    return parser.parse_args(argv)
+
+def run(argv=None):
+    args = parse_args(argv)
+    db.DB_PATH = os.path.abspath(args.db)
+    db.init_db()
+
+    options = {"baseline": args.baseline, "tornado": args.tornado, "mc_iterations": args.mc}
+    print(f"Evaluating portfolio in {db.DB_PATH} with {args.workers} worker(s)...")
+
+    def progress(done, failed):
+        print(f"  {done} evaluated, {failed} failed", flush=True)
+
+    summary = run_portfolio(
+        options=options,
+        project_ids=args.ids,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        progress=progress
+    )
+
+    print("\n--- Portfolio Summary ---")
+    print(f"Evaluated: {summary['evaluated']}")
+    print(f"Failed: {summary['failed']}")
+    print(f"Elapsed: {summary['elapsed_s']:.2f} s")
+    print(f"Throughput: {summary['projects_per_s']:.2f} projects/s")
+    for f in summary["failures"]:
+        print(f"  FAILED {f['project_id']}: {f['error']}")
+
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,73 @@
+import sys
+import os
+import argparse
+import subprocess
+
+APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules imported before the login form is shown (app.py -> bootstrap)
+LOGIN_PATH_MODULES = ["ui.components", "core.auth", "core.db", "core.model"]
+
+# Engine / analysis modules: must not pull optional heavy dependencies at import time
+CORE_MODULES = ["core.engine", "core.risk", "core.reporting", "core.quality", "core.insights", "core.portfolio"]
+
+# Only imported inside the functions / page sections that need them
+DEFERRED_PACKAGES = ["scipy", "openpyxl", "xlsxwriter", "plotly", "pyarrow"]
+
+def measure_imports(modules, python=sys.executable):
+    """
+    Imports `modules` in a fresh interpreter with `-X importtime`.
+    Returns {module_name: cumulative_microseconds} for every module loaded.
+    """
+    code = "; ".join(f"import {m}" for m in modules)
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", code],
+        cwd=APP_ROOT, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Import failed:\n{proc.stderr}")
+
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue # header line
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+def loaded_packages(timings, baseline=None, packages=DEFERRED_PACKAGES):
+    """
+    Top-level packages from `packages` that were imported, minus those already
+    loaded by `baseline` (e.g. streamlit itself pulls in a plotly stub and
+    pandas pulls in pyarrow; that is outside our control).
+    """
+    loaded = {name.split(".")[0] for name in timings} & set(packages)
+    if baseline:
+        loaded -= {name.split(".")[0] for name in baseline}
+    return sorted(loaded)
+
+# Framework imports our modules cannot avoid, used as the baseline
+FRAMEWORK_BASELINES = {
+    "Login path": ["streamlit"],
+    "Core modules": ["pandas", "numpy_financial", "pydantic"],
+}
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description="Import-time benchmark (python -X importtime) for the app start path.")
+    parser.add_argument("--top", type=int, default=15, help="Show the N slowest top-level imports")
+    args = parser.parse_args(argv)
+
+    for label, modules in (("Login path", LOGIN_PATH_MODULES), ("Core modules", CORE_MODULES)):
+        timings = measure_imports(modules)
+        top_level = {name: us for name, us in timings.items() if "." not in name}
+        total = sum(top_level.values())
+        print(f"\n--- {label}: {total / 1000:.0f} ms ---")
+        for name, us in sorted(top_level.items(), key=lambda kv: -kv[1])[:args.top]:
+            print(f"{us / 1000:8.1f} ms  {name}")
+        heavy = loaded_packages(timings, measure_imports(FRAMEWORK_BASELINES[label]))
+        print(f"Deferred packages loaded by app code: {', '.join(heavy) if heavy else 'none'}")
+
+if __name__ == "__main__":
+    run()
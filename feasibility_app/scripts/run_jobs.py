@@ -0,0 +1,91 @@
+import sys
+import os
+import json
+import argparse
+import multiprocessing
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import db
+from core.jobs import JOB_TYPES, JobWorker, submit_job, job_summary
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Work on / submit to the shared analysis job queue in projects.db (see core/jobs.py).")
+    parser.add_argument("--db", default=db.DB_PATH, help="Path to projects.db (default: repository projects.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    work = sub.add_parser("work", help="Run worker processes")
+    work.add_argument("--workers", type=int, default=1, help="Worker processes (each runs one job at a time)")
+    work.add_argument("--types", nargs="*", choices=JOB_TYPES, help="Only take these job types")
+    work.add_argument("--lease", type=float, default=60.0, help="Lease seconds; a job whose worker stops renewing is reclaimed")
+    work.add_argument("--poll", type=float, default=2.0, help="Seconds between polls of an empty queue")
+    work.add_argument("--drain", action="store_true", help="Exit once the queue is empty")
+
+    submit = sub.add_parser("submit", help="Queue an analysis of stored projects")
+    submit.add_argument("type", choices=JOB_TYPES)
+    submit.add_argument("ids", nargs="+", help="Project ids")
+    submit.add_argument("--params", default="{}", help='Job parameters as JSON, e.g. \'{"iterations": 5000}\'')
+    submit.add_argument("--force", action="store_true", help="Queue even if the same analysis is already queued or done")
+
+    lst = sub.add_parser("list", help="Show recent jobs")
+    lst.add_argument("--status", choices=["queued", "running", "done", "failed", "cancelled"])
+    lst.add_argument("--limit", type=int, default=20)
+
+    cancel = sub.add_parser("cancel", help="Cancel queued / running jobs")
+    cancel.add_argument("job_ids", nargs="+")
+    return parser.parse_args(argv)
+
+def _work(db_path, args):
+    db.DB_PATH = db_path
+    worker = JobWorker(lease_s=args.lease, poll_s=args.poll, job_types=args.types)
+    print(f"Worker {worker.worker_id} started", flush=True)
+    done = worker.run(exit_when_idle=args.drain)
+    print(f"Worker {worker.worker_id} finished {done} job(s)", flush=True)
+
+def run(argv=None):
+    args = parse_args(argv)
+    db.DB_PATH = os.path.abspath(args.db)
+    db.init_db()
+
+    if args.command == "work":
+        if args.workers <= 1:
+            _work(db.DB_PATH, args)
+            return 0
+        procs = [multiprocessing.Process(target=_work, args=(db.DB_PATH, args)) for _ in range(args.workers)]
+        for p in procs:
+            p.start()
+        try:
+            for p in procs:
+                p.join()
+        except KeyboardInterrupt:
+            for p in procs:
+                p.terminate()
+        return 0
+
+    if args.command == "submit":
+        params = json.loads(args.params)
+        missing = 0
+        for pid in args.ids:
+            model = db.load_project(pid)
+            if model is None:
+                print(f"  NOT FOUND {pid}")
+                missing += 1
+                continue
+            job_id, created = submit_job(args.type, model, params, submitted_by="cli", force=args.force)
+            print(f"  {pid}: job {job_id} ({'queued' if created else 'already queued / done'})")
+        return 1 if missing else 0
+
+    if args.command == "list":
+        for job in db.list_jobs(status=args.status, limit=args.limit):
+            row = job_summary(job)
+            run_s = f"{row['run_s']:.1f}s" if row["run_s"] is not None else "-"
+            print(f"{row['id']}  {row['type']:<12} {row['status']:<9} {row['progress']:>4.0%}  attempts {row['attempts']}  {run_s}  {row['error'] or ''}")
+        return 0
+
+    if args.command == "cancel":
+        for job_id in args.job_ids:
+            print(f"  {job_id}: {'cancelled' if db.cancel_job(job_id) else 'not queued / running'}")
+        return 0
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,34 @@
+import sys
+import os
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import db
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the calculation engine over a local HTTP API (see core/service.py).")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--db", default=db.DB_PATH, help="Path to projects.db (default: repository projects.db)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (1 = one worker thread)")
+    parser.add_argument("--max-pending", type=int, default=None, help="Evaluations queued or running before requests get 503; also the batch size limit (default: 64 per worker)")
+    parser.add_argument("--max-iterations", type=int, default=None, help="Largest Monte Carlo run per request, incl. the mc_iterations evaluate option; larger requests get 413 (default: 100000)")
+    parser.add_argument("--max-evals", type=int, default=None, help="Largest goal-seek max_evals per request; larger requests get 413 (default: 200)")
+    return parser.parse_args(argv)
+
+def run(argv=None):
+    import uvicorn
+    from core.service import create_app, MAX_MC_ITERATIONS, MAX_GOAL_SEEK_EVALS
+
+    args = parse_args(argv)
+    db.DB_PATH = os.path.abspath(args.db)
+    app = create_app(
+        workers=args.workers, max_pending=args.max_pending,
+        max_iterations=args.max_iterations or MAX_MC_ITERATIONS, max_evals=args.max_evals or MAX_GOAL_SEEK_EVALS,
+    )
+    print(f"Serving {db.DB_PATH} on http://{args.host}:{args.port} with {args.workers} worker(s)")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,28 @@
+import pytest
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core import db
+from core.model import ProjectModel, Product, CAPEXItem, Loan
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Fresh projects.db in tmp_path (default users seeded, no session secret from the environment)."""
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "test.db"))
+    monkeypatch.delenv(db.SESSION_SECRET_ENV, raising=False)
+    db.init_db()
+    return db.DB_PATH
+
+@pytest.fixture
+def plant_project():
+    """Factory for a small single-product plant: plant_project(price=100.0, loan=20000.0)."""
+    def make(price: float = 100.0, loan: float = 20000.0) -> ProjectModel:
+        p = ProjectModel(name="Plant", horizon_years=5)
+        p.products.append(Product(name="Widget", unit_price=price, unit_cost=50, initial_volume=1000))
+        p.capex_items.append(CAPEXItem(name="Machine", amount=50000, year=1))
+        if loan:
+            p.loans.append(Loan(amount=loan))
+        return p
+    return make
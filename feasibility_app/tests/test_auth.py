@@ -0,0 +1,67 @@
+import pytest
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core import db
+
+def test_session_round_trip(temp_db):
+    user = db.authenticate_user("admin", "admin123")
+    assert user == {"username": "admin", "role": "Admin"}
+
+    token = db.create_session(user)
+    assert db.validate_session(token) == user
+
+    # Tampered signature / unknown token
+    assert db.validate_session(token[:-1] + ("0" if token[-1] != "0" else "1")) is None
+    assert db.validate_session("garbage") is None
+
+    db.revoke_session(token)
+    assert db.validate_session(token) is None
+
+def test_session_expiry(temp_db):
+    token = db.create_session({"username": "admin", "role": "Admin"}, ttl_seconds=-1)
+    assert db.validate_session(token) is None
+    assert db.purge_expired_sessions() == 1
+
+def test_login_rate_limit(temp_db, monkeypatch):
+    for _ in range(db.LOGIN_MAX_FAILURES):
+        assert db.authenticate_user("admin", "wrong") is None
+
+    assert db.is_login_locked("admin")
+
+    # Correct password is rejected while locked, without running PBKDF2
+    def fail_verify(*args):
+        raise AssertionError("verify_password must not run while locked")
+    monkeypatch.setattr(db, "verify_password", fail_verify)
+    assert db.authenticate_user("admin", "admin123") is None
+
+    # Window elapsed -> unlocked again
+    monkeypatch.undo()
+    monkeypatch.setattr(db, "DB_PATH", temp_db)
+    real_time = time.time
+    monkeypatch.setattr(db.time, "time", lambda: real_time() + db.LOGIN_WINDOW_SECONDS + 1)
+    assert not db.is_login_locked("admin")
+    assert db.authenticate_user("admin", "admin123") is not None
+
+def test_lockout_is_per_client(temp_db):
+    for _ in range(db.LOGIN_MAX_FAILURES):
+        assert db.authenticate_user("admin", "wrong", client="10.0.0.9") is None
+    assert db.is_login_locked("admin", "10.0.0.9")
+    # The attacker's client is locked, the owner elsewhere is not
+    assert not db.is_login_locked("admin", "10.0.0.1")
+    assert db.authenticate_user("admin", "admin123", client="10.0.0.1") is not None
+    assert db.authenticate_user("admin", "admin123", client="10.0.0.9") is None
+
+def test_lockout_caps_failures_per_user(temp_db):
+    # Rotating client addresses: each stays under the per-client limit
+    for i in range(db.LOGIN_MAX_FAILURES_PER_USER):
+        client = f"10.1.{i}.1"
+        assert not db.is_login_locked("admin", client)
+        assert db.authenticate_user("admin", "wrong", client=client) is None
+    # Now every client is locked for this username, other usernames are not
+    assert db.is_login_locked("admin", "10.2.0.1")
+    assert db.authenticate_user("admin", "admin123", client="10.2.0.1") is None
+    assert not db.is_login_locked("someone_else", "10.2.0.1")
@@ -0,0 +1,96 @@
+import pytest
+import copy
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.model import ProjectModel, Product, ExpenseItem, Personnel, CAPEXItem, Loan, Grant, Leasing
+from core.engine import calculate_financials
+from core.finance import calculate_irr_batch, calculate_metrics
+from core.batch import compile_model, evaluate_batch
+from core.risk import apply_factor_to_model, run_grid_sensitivity
+
+def _project(granularity, mode, tv_method):
+    p = ProjectModel(horizon_years=6, granularity=granularity, calculation_mode=mode, equity_contribution=80000)
+    p.tv_config.method = tv_method
+    p.products.append(Product(unit_price=120, unit_cost=60, initial_volume=9000, production_capacity_per_year=12000,
+                              price_escalation_rate=0.03, advance_payment_pct=0.1, payment_terms_days=45))
+    p.products.append(Product(unit_price=20, unit_cost=12, currency="USD", initial_volume=500))
+    p.fixed_expenses.append(ExpenseItem(amount_per_year=50000, growth_rate=0.05))
+    p.personnel.append(Personnel(monthly_gross_salary=3000, count=3, yearly_raise_rate=0.1, start_year=2))
+    p.personnel.append(Personnel(monthly_gross_salary=2000, count=2, is_scalable=True))
+    p.capex_items.append(CAPEXItem(amount=400000, year=1, month=3))
+    p.capex_items.append(CAPEXItem(amount=5000, currency="USD", is_imported=True, customs_duty_rate=0.1, category="Building", year=2))
+    p.loans.append(Loan(amount=200000, interest_rate=0.2, term_years=5, grace_period_years=1))
+    p.loans.append(Loan(amount=3000, currency="EUR", payment_method="Bullet", term_years=3, start_year=2))
+    p.grants.append(Grant(amount=20000))
+    p.grants.append(Grant(amount=10000, is_capex_reduction=False, year=2))
+    p.leasings.append(Leasing(asset_value=30000, down_payment=5000))
+    return p
+
+@pytest.mark.parametrize("granularity,mode,tv_method", [
+    ("Year", "Unlevered", "None"),
+    ("Year", "Levered", "PerpetuityGrowth"),
+    ("Month", "Levered", "ExitMultiple"),
+])
+def test_batch_matches_engine(granularity, mode, tv_method):
+    p = _project(granularity, mode, tv_method)
+    rng = np.random.default_rng(7)
+    n = 5
+    drivers = {v: rng.uniform(0.6, 1.4, n) for v in ["Price", "Volume", "CAPEX", "OPEX"]}
+    drivers["Discount Rate"] = rng.uniform(0.08, 0.3, n)
+    drivers["Interest Rate"] = np.array([0.0, 0.1, 0.2, 0.3, 0.4])
+    drivers["Loan Term"] = np.array([1, 2, 4, 6, 8], dtype=float)
+
+    out = evaluate_batch(compile_model(p), drivers, chunk_size=2)
+
+    for i in range(n):
+        m = copy.deepcopy(p)
+        for v in ["Price", "Volume", "CAPEX", "OPEX"]:
+            apply_factor_to_model(m, v, drivers[v][i])
+        if mode == "Unlevered":
+            m.discount_rate_unlevered = drivers["Discount Rate"][i]
+        else:
+            m.discount_rate_levered = drivers["Discount Rate"][i]
+        for loan in m.loans:
+            loan.interest_rate = drivers["Interest Rate"][i]
+            loan.term_years = int(drivers["Loan Term"][i])
+
+        kpi = calculate_financials(m).kpi
+        for key in ["npv", "irr", "roi", "dscr_min", "dscr_avg", "ending_debt_balance", "tv_pv", "irr_tv"]:
+            if key in kpi:
+                assert out[key][i] == pytest.approx(kpi[key], rel=1e-8, abs=1e-6), key
+
+def test_irr_batch_matches_npf():
+    flows = np.array([
+        [-100, 39, 59, 55, 20],     # one sign change -> solved in batch
+        [0, -100, 0, 0, 74],        # leading zero, negative IRR
+        [-100, 100, 0, -7, 0],      # several sign changes -> npf fallback
+        [100, 10, 10, 10, 10],      # no sign change -> 0.0
+    ], dtype=float)
+    expected = [calculate_metrics(f, 0.0)["irr"] for f in flows]
+    np.testing.assert_allclose(calculate_irr_batch(flows), expected, atol=1e-10)
+
+def test_grid_sensitivity_surface():
+    p = _project("Year", "Levered", "None")
+    xs = np.linspace(0.8, 1.2, 5)
+    ys = np.linspace(0.15, 0.35, 3)
+    tables = run_grid_sensitivity(p, "Price", xs, "Interest Rate", ys)
+
+    npv = tables["npv"]
+    assert npv.shape == (3, 5)
+    assert set(tables) == {"npv", "irr", "dscr_min"}
+    # Higher price -> higher NPV; higher interest -> lower NPV
+    assert (np.diff(npv.values, axis=1) > 0).all()
+    assert (np.diff(npv.values, axis=0) < 0).all()
+
+    m = copy.deepcopy(p)
+    apply_factor_to_model(m, "Price", xs[1])
+    for loan in m.loans:
+        loan.interest_rate = ys[2]
+    assert npv.iloc[2, 1] == pytest.approx(calculate_financials(m).kpi["npv"])
+
+    with pytest.raises(ValueError):
+        run_grid_sensitivity(p, "Price", xs, "Price", xs)
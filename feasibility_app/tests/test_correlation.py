@@ -0,0 +1,63 @@
+import pytest
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.model import ProjectModel
+from core.correlation import nearest_correlation, repair_correlation, cholesky_factor, correlated_normals, merge_symmetric_edits
+from core.risk import run_monte_carlo
+
+def test_nearest_correlation_higham_example():
+    # Example from Higham (2002), Section 4
+    a = np.array([[1.0, 1.0, 0.0], [1.0, 1.0, 1.0], [0.0, 1.0, 1.0]])
+    x, _ = nearest_correlation(a)
+    expected = np.array([[1.0, 0.7607, 0.1573], [0.7607, 1.0, 0.7607], [0.1573, 0.7607, 1.0]])
+    np.testing.assert_allclose(x, expected, atol=1e-4)
+    np.testing.assert_allclose(np.diag(x), 1.0)
+    assert np.linalg.eigvalsh(x).min() > 0
+
+def test_repair_report_and_cache():
+    valid = np.array([[1.0, 0.5], [0.5, 1.0]])
+    fixed, report = repair_correlation(valid)
+    assert not report["adjusted"]
+    np.testing.assert_array_equal(fixed, valid)
+
+    bad = np.array([[1.0, 0.9, 0.9], [0.9, 1.0, -0.9], [0.9, -0.9, 1.0]])
+    chol, report = cholesky_factor(bad)
+    assert report["adjusted"] and report["min_eigenvalue"] < 0 and report["max_change"] > 0
+    assert cholesky_factor(bad.copy())[0] is chol
+    # Callers get their own report; mutating it does not touch the cache
+    report["adjusted"] = False
+    assert cholesky_factor(bad)[1]["adjusted"]
+
+    z = correlated_normals(chol, 20000, rng=np.random.default_rng(0))
+    np.testing.assert_allclose(np.corrcoef(z.T), chol @ chol.T, atol=0.03)
+
+    with pytest.raises(ValueError):
+        repair_correlation(np.ones((2, 3)))
+
+def test_merge_symmetric_edits():
+    before = np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+    after = before.copy()
+    after[1, 0] = -0.4          # lower-triangle edit
+    after[0, 2] = 0.3           # upper-triangle edit
+    after[1, 1] = 0.5           # diagonal edit is ignored
+    after[2, 1] = np.nan        # cleared cell keeps the old value
+    merged = merge_symmetric_edits(before, after)
+    np.testing.assert_allclose(merged, merged.T)
+    np.testing.assert_allclose(np.diag(merged), 1.0)
+    assert merged[0, 1] == -0.4 and merged[0, 2] == 0.3 and merged[1, 2] == 0.0
+
+def test_monte_carlo_keeps_repaired_correlation():
+    p = ProjectModel(horizon_years=3)
+    p.risk_config.set_correlation("Price", "Volume", 0.9)
+    p.risk_config.set_correlation("Price", "CAPEX", 0.9)
+    p.risk_config.set_correlation("Volume", "CAPEX", -0.9)
+
+    df = run_monte_carlo(p, iterations=500)
+    assert df.attrs["correlation_adjustment"]["adjusted"]
+    # Correlations are shrunk to a valid matrix, not dropped
+    assert df["Price_Factor"].corr(df["Volume_Factor"]) > 0.3
+    assert df["Volume_Factor"].corr(df["CAPEX_Factor"]) < -0.3
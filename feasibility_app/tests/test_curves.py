@@ -0,0 +1,81 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.model import ProjectModel, Product, ExpenseItem, Personnel
+from core.engine import calculate_financials
+from core.batch import compile_model, evaluate_batch
+from core.curves import curve_index, IndexCurves, curve_ref_to_text, curve_ref_from_text
+
+def _project(granularity="Year"):
+    p = ProjectModel(horizon_years=6, granularity=granularity, index_curves={"CPI-TR": [0.45, 0.30, 0.20]})
+    p.products.append(Product(unit_price=100, unit_cost=40, initial_volume=5000, production_capacity_per_year=20000,
+                              price_escalation_curve="CPI-TR", cost_escalation_curve="CPI-TR", volume_growth_curve=[0.1, 0.0]))
+    p.products.append(Product(unit_price=50, unit_cost=30, initial_volume=2000, price_escalation_rate=0.2))
+    p.fixed_expenses.append(ExpenseItem(amount_per_year=80000, growth_curve="CPI-TR"))
+    p.personnel.append(Personnel(monthly_gross_salary=4000, count=2, raise_curve="CPI-TR", start_year=3))
+    p.personnel.append(Personnel(monthly_gross_salary=3000, count=1, is_scalable=True, raise_curve=[0.25]))
+    return p
+
+def test_curve_index():
+    np.testing.assert_allclose(curve_index([0.45, 0.30, 0.20], 5), [1.0, 1.45, 1.45 * 1.3, 1.45 * 1.3 * 1.2, 1.45 * 1.3 * 1.2 ** 2])
+    # A one-entry curve equals the scalar rate compounded per period
+    np.testing.assert_allclose(curve_index([0.1], 3, 12), 1.1 ** (np.arange(36) / 12))
+    monthly = curve_index([0.45, 0.30], 3, 12)
+    assert monthly[12] == pytest.approx(1.45) and monthly[24] == pytest.approx(1.45 * 1.3)
+    with pytest.raises(ValueError):
+        curve_index([-1.0], 3)
+
+def test_items_share_resolved_curves():
+    p = _project()
+    curves = IndexCurves(p)
+    assert curves.get("CPI-TR") is curves.get("CPI-TR")
+    assert curves.get([0.1, 0.0]) is curves.get([0.1, 0.0])
+    cm = compile_model(p)
+    assert cm.products[0]["price_index"] is cm.products[0]["cost_index"]
+    with pytest.raises(ValueError):
+        IndexCurves(p).get("PPI")
+
+def test_flat_curves_match_scalar_rates():
+    p = ProjectModel(horizon_years=5, granularity="Month")
+    p.products.append(Product(unit_price=100, unit_cost=40, initial_volume=5000, production_capacity_per_year=20000))
+    p.fixed_expenses.append(ExpenseItem(amount_per_year=80000, growth_rate=0.12))
+    p.personnel.append(Personnel(monthly_gross_salary=4000, yearly_raise_rate=0.3, start_year=2))
+    scalar = calculate_financials(p).kpi["npv"]
+
+    p.fixed_expenses[0].growth_curve = [0.12]
+    p.personnel[0].raise_curve = [0.3]
+    assert calculate_financials(p).kpi["npv"] == pytest.approx(scalar, rel=1e-10)
+
+    # Product scalar rates compound twice per period: [g] matches sqrt(1 + g) - 1
+    p.products[0].price_escalation_rate = 0.1
+    scalar = calculate_financials(p).kpi["npv"]
+    p.products[0].price_escalation_rate = 0.0
+    p.products[0].price_escalation_curve = [1.1 ** 2 - 1]
+    assert calculate_financials(p).kpi["npv"] == pytest.approx(scalar, rel=1e-10)
+
+def test_missing_curve_is_a_quality_error():
+    from core.quality import check_input_quality
+    p = _project()
+    cache = {}
+    assert not check_input_quality(p, cache=cache)
+    p.index_curves = {}
+    issues = check_input_quality(p, cache=cache)
+    assert [(i['item'], i['severity']) for i in issues] == [('CPI-TR', 'error')]
+    assert issues == check_input_quality(p)
+
+@pytest.mark.parametrize("granularity", ["Year", "Month"])
+def test_batch_matches_engine_with_curves(granularity):
+    p = _project(granularity)
+    kpi = calculate_financials(p).kpi
+    out = evaluate_batch(compile_model(p))
+    assert out["npv"][0] == pytest.approx(kpi["npv"], rel=1e-9)
+    assert out["irr"][0] == pytest.approx(kpi["irr"], rel=1e-8)
+
+def test_curve_text_round_trip():
+    assert curve_ref_from_text(curve_ref_to_text([0.45, 0.3])) == pytest.approx([0.45, 0.3])
+    assert curve_ref_from_text(" CPI-TR ") == "CPI-TR"
+    assert curve_ref_from_text("") is None
@@ -0,0 +1,71 @@
+import pytest
+import copy
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.model import ProjectModel, Product, CAPEXItem, ExpenseItem, Loan
+from core.engine import calculate_financials
+from core.debt_sizing import size_debt
+
+def _project():
+    p = ProjectModel(horizon_years=10, calculation_mode="Levered", equity_contribution=50000)
+    p.products.append(Product(unit_price=100, unit_cost=50, initial_volume=3000))
+    p.capex_items.append(CAPEXItem(amount=300000))
+    p.fixed_expenses.append(ExpenseItem(amount_per_year=20000))
+    p.loans.append(Loan(amount=100000, interest_rate=0.15))
+    return p
+
+def _repayment_dscr(model, row, scale=1.0):
+    m = copy.deepcopy(model)
+    loan = m.loans[0]
+    loan.amount = row["Amount"] * scale
+    loan.term_years = int(row["Term (Years)"])
+    loan.grace_period_years = int(row["Grace (Years)"])
+    loan.payment_method = row["Payment Method"]
+    res = calculate_financials(m)
+    repaying = -res.cash_flow_statement["Principal Repayment"].to_numpy() > 0.01
+    return np.min(res.dscr_arr[repaying])
+
+def test_sized_debt_sits_on_dscr_covenant():
+    p = _project()
+    df = size_debt(p, min_dscr=2.0, max_gearing=None, terms=[6, 8], grace_periods=[0, 1], methods=["EqualPrincipal", "EqualPayment"])
+    # Without grace, repayment starts in the CAPEX year (negative CFADS)
+    assert len(df) == 4
+    assert (df["Grace (Years)"] == 1).all()
+    assert df["Amount"].is_monotonic_decreasing
+
+    for _, row in df.iterrows():
+        assert row["Covenant DSCR"] == pytest.approx(2.0, abs=1e-4)
+        assert _repayment_dscr(p, row) >= 2.0 - 1e-6
+        assert _repayment_dscr(p, row, scale=1.01) < 2.0
+
+def test_gearing_cap_and_objective():
+    p = _project()
+    df = size_debt(p, min_dscr=1.2, max_gearing=0.5, terms=[8], grace_periods=[1])
+    assert (df["Gearing"] <= 0.5 + 1e-9).all()
+    assert df["Gearing"].max() == pytest.approx(0.5)
+
+    irr = size_debt(p, min_dscr=1.2, max_gearing=0.5, terms=[8], grace_periods=[1], objective="equity_irr")
+    assert irr["Equity IRR"].is_monotonic_decreasing
+    assert irr["Equity IRR"].iloc[0] >= df["Equity IRR"].max() - 1e-12
+
+def test_no_gearing_covenant_is_not_capped():
+    p = _project()
+    p.products[0].unit_price = 400  # DSCR allows debt well above CAPEX
+    df = size_debt(p, min_dscr=1.5, max_gearing=None, terms=[8], grace_periods=[1], methods=["EqualPayment"])
+    assert df["Gearing"].iloc[0] > 1.0
+    assert df["Covenant DSCR"].iloc[0] == pytest.approx(1.5, abs=1e-4)
+
+def test_invalid_inputs():
+    p = _project()
+    with pytest.raises(ValueError):
+        size_debt(p, objective="min_cost")
+    with pytest.raises(ValueError):
+        size_debt(p, test_years="construction")
+    p.loans = []
+    with pytest.raises(ValueError):
+        size_debt(p)
@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from scipy import stats
+
+from core.model import ProjectModel, DistributionConfig
+from core.distributions import inverse_cdf, cdf, factors_from_z, validate_config, transform_matrix
+from core.risk import run_monte_carlo
+
+U = np.linspace(0.001, 0.999, 41)
+
+@pytest.mark.parametrize("config, reference", [
+    (DistributionConfig(dist_type="Normal", mean_pct=0.05, std_dev_pct=0.1), stats.norm(loc=1.05, scale=0.1)),
+    (DistributionConfig(dist_type="Lognormal", mean_pct=0.1, std_dev_pct=0.2), stats.lognorm(s=0.2, scale=1.1 * np.exp(-0.02))),
+    (DistributionConfig(dist_type="Uniform", min_pct=-0.2, max_pct=0.1), stats.uniform(loc=0.8, scale=0.3)),
+    (DistributionConfig(dist_type="Triangular", min_pct=-0.1, mode_pct=0.05, max_pct=0.3), stats.triang(c=0.375, loc=0.9, scale=0.4)),
+    (DistributionConfig(dist_type="PERT", min_pct=-0.1, mode_pct=0.05, max_pct=0.3), stats.beta(a=2.5, b=3.5, loc=0.9, scale=0.4)),
+])
+def test_inverse_cdf_matches_scipy(config, reference):
+    np.testing.assert_allclose(inverse_cdf(U, config), reference.ppf(U), rtol=1e-10)
+    np.testing.assert_allclose(cdf(inverse_cdf(U, config), config), U, atol=1e-10)
+
+    z = stats.norm.ppf(U)
+    np.testing.assert_allclose(factors_from_z(z, config), reference.ppf(U), rtol=1e-9)
+
+def test_truncation():
+    config = DistributionConfig(dist_type="Normal", mean_pct=0.0, std_dev_pct=0.2, truncate_min_pct=-0.1, truncate_max_pct=0.3)
+    reference = stats.truncnorm(-0.5, 1.5, loc=1.0, scale=0.2)
+    np.testing.assert_allclose(inverse_cdf(U, config), reference.ppf(U), rtol=1e-9)
+
+    f = factors_from_z(np.random.default_rng(0).normal(size=5000), config)
+    assert f.min() >= 0.9 and f.max() <= 1.3
+
+def test_validation_and_variable_lists():
+    with pytest.raises(ValueError):
+        validate_config(DistributionConfig(dist_type="Triangular", min_pct=0.1, mode_pct=0.0, max_pct=0.2))
+    with pytest.raises(ValueError):
+        validate_config(DistributionConfig(dist_type="Normal", std_dev_pct=-0.1))
+    with pytest.raises(ValueError):
+        validate_config(DistributionConfig(dist_type="Gamma"))
+    with pytest.raises(ValueError):
+        validate_config(DistributionConfig(dist_type="Uniform", min_pct=-0.1, max_pct=0.1, truncate_min_pct=0.2))
+
+    configs = {f"Driver {i}": DistributionConfig(dist_type="PERT", min_pct=-0.1 * i, max_pct=0.1 * i) for i in range(1, 25)}
+    factors = transform_matrix(np.zeros((3, 24)), configs, list(configs))
+    np.testing.assert_allclose(factors, 1.0)
+
+    p = ProjectModel(horizon_years=3)
+    p.risk_config.get_config("Price").std_dev_pct = -1.0
+    with pytest.raises(ValueError):
+        run_monte_carlo(p, iterations=10)
+    with pytest.raises(ValueError):
+        run_monte_carlo(ProjectModel(horizon_years=3), iterations=10, variables=["Weather"])
+
+def test_factor_cache_reused_across_reruns():
+    p = ProjectModel(horizon_years=3)
+    cache = {}
+    first = run_monte_carlo(p, iterations=50, variables=["Price", "Volume"], cache=cache)
+    key, factors = cache["factors"]
+    second = run_monte_carlo(p, iterations=50, variables=["Price", "Volume"], cache=cache)
+    assert cache["factors"][1] is factors
+    assert first.equals(second)
+
+    p.risk_config.random_seed = 7
+    run_monte_carlo(p, iterations=50, variables=["Price", "Volume"], cache=cache)
+    assert cache["factors"][0] != key
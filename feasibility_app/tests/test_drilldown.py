@@ -0,0 +1,78 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.model import ProjectModel, Product, CAPEXItem, ExpenseItem, Personnel, Loan
+from core.engine import calculate_financials, ITEM_CATEGORIES
+from core.drilldown import item_table, ebitda_attribution
+
+def _project(granularity="Month"):
+    p = ProjectModel(horizon_years=5, granularity=granularity, calculation_mode="Levered", terminal_debt_treatment="refinance")
+    for k in range(4):
+        p.products.append(Product(name=f"P{k}", unit_price=100 + 10 * k, unit_cost=40, initial_volume=1000 * (k + 1)))
+    p.capex_items.append(CAPEXItem(name="Hall", amount=500000, category="Building"))
+    p.capex_items.append(CAPEXItem(name="Press", amount=200000, category="Machinery", year=2, currency="USD"))
+    p.capex_items.append(CAPEXItem(name="Late", amount=90000, year=9))
+    p.fixed_expenses.append(ExpenseItem(name="Rent", amount_per_year=80000))
+    p.fixed_expenses.append(ExpenseItem(name="Rent", amount_per_year=20000))
+    p.personnel.append(Personnel(role="Operator", monthly_gross_salary=3000, count=4))
+    p.loans.append(Loan(amount=300000, interest_rate=0.2))
+    p.loans.append(Loan(name="EUR loan", amount=100000, interest_rate=0.08, currency="EUR"))
+    return p
+
+@pytest.mark.parametrize("granularity", ["Year", "Month"])
+def test_item_rows_add_up_to_statement_lines(granularity):
+    p = _project(granularity)
+    res = calculate_financials(p)
+    items, inc, cf = res.item_arrays, res.income_statement, res.cash_flow_statement
+    assert set(items) == set(ITEM_CATEGORIES)
+    assert list(items["Revenue"].index) == [prod.id for prod in p.products]
+    np.testing.assert_allclose(items["Revenue"].sum(), inc["Revenue"])
+    np.testing.assert_allclose(items["COGS"].sum(), inc["COGS"])
+    np.testing.assert_allclose(items["Fixed Expenses"].sum() + items["Personnel"].sum(), inc["OPEX"])
+    np.testing.assert_allclose(items["CAPEX (w/ VAT)"].sum(), cf["CAPEX (w/ VAT)"])
+    np.testing.assert_allclose(items["CAPEX Depreciation"].sum(), inc["Depreciation"])
+    np.testing.assert_allclose(items["Loan Interest"].sum(), inc["Interest"])
+    np.testing.assert_allclose(items["Loan Principal"].sum(), cf["Principal Repayment"])
+    # Items outside the horizon keep their (zero) row
+    assert items["CAPEX (w/ VAT)"].shape[0] == 3 and not items["CAPEX (w/ VAT)"].iloc[2].any()
+
+def test_item_detail_levels():
+    p = _project()
+    annual = calculate_financials(p)
+    assert annual.item_detail == "annual"
+    assert list(annual.item_arrays["Personnel"].columns) == annual.years
+
+    monthly = calculate_financials(p, item_detail="period")
+    rev = monthly.item_arrays["Revenue"]
+    assert rev.shape == (4, 60)
+    np.testing.assert_allclose(rev.sum(), monthly.period_arrays["Revenue"])
+    np.testing.assert_allclose(rev.T.groupby((rev.columns - 1) // 12).sum().T.to_numpy(), annual.item_arrays["Revenue"].to_numpy())
+
+    assert calculate_financials(p, item_detail=None).item_arrays == {}
+    with pytest.raises(ValueError):
+        calculate_financials(p, item_detail="weekly")
+
+    # Results own their arrays (stage outputs are shared and read-only)
+    annual.item_arrays["Revenue"].iloc[0, 0] = 0.0
+    assert calculate_financials(p).item_arrays["Revenue"].iloc[0, 0] != 0.0
+
+def test_item_table_and_attribution():
+    res = calculate_financials(_project())
+    table = item_table(res, "Revenue", top_n=2, other_label="Rest")
+    assert list(table.index) == ["P3", "P2", "Rest"]
+    np.testing.assert_allclose(table.sum(), res.income_statement["Revenue"])
+    # Same-named expenses stay apart
+    assert len(set(item_table(res, "Fixed Expenses").index)) == 2
+
+    for year in (None, 3):
+        steps = ebitda_attribution(res, year, top_n=2)
+        total = res.income_statement["EBITDA"].sum() if year is None else res.income_statement.loc[year, "EBITDA"]
+        assert sum(v for _, _, v in steps) == pytest.approx(total)
+        assert [label for group, label, _ in steps if group == "Products"] == ["P3", "P2", "Other"]
+
+    with pytest.raises(ValueError):
+        ebitda_attribution(calculate_financials(_project(), item_detail="period"))
@@ -0,0 +1,24 @@
+import pytest
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from import_benchmark import measure_imports, loaded_packages, LOGIN_PATH_MODULES, CORE_MODULES, FRAMEWORK_BASELINES
+
+# Asserts on WHICH modules load (deterministic), not on wall-clock time,
+# so it behaves the same on any CI machine.
+
+def test_login_path_defers_heavy_dependencies():
+    timings = measure_imports(LOGIN_PATH_MODULES)
+    baseline = measure_imports(FRAMEWORK_BASELINES["Login path"])
+    assert loaded_packages(timings, baseline) == []
+    assert "plotly.express" not in timings
+    # The engine stack is not needed to render the login form either
+    assert "pandas" not in timings
+    assert "core.engine" not in timings
+
+def test_core_modules_defer_optional_dependencies():
+    timings = measure_imports(CORE_MODULES)
+    baseline = measure_imports(FRAMEWORK_BASELINES["Core modules"])
+    assert loaded_packages(timings, baseline) == []
@@ -0,0 +1,85 @@
+import pytest
+import os
+import sys
+import time
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core import db
+from core.engine import calculate_financials
+from core.jobs import JobWorker, submit_job, load_result
+
+def test_resubmission_dedupes(temp_db, plant_project):
+    p = plant_project()
+    job_id, created = submit_job("monte_carlo", p, {"iterations": 100})
+    assert created
+    assert submit_job("monte_carlo", p, {"iterations": 100}) == (job_id, False)
+    assert submit_job("monte_carlo", p, {"iterations": 200})[1]
+    assert submit_job("tornado", p)[1]
+    assert submit_job("monte_carlo", p, {"iterations": 100}, force=True)[0] != job_id
+    # Same content, new analysis once the old one failed
+    p.products[0].unit_price = 120
+    other, _ = submit_job("evaluate", p)
+    assert db.cancel_job(other)
+    assert submit_job("evaluate", p)[0] != other
+
+def test_claims_are_exclusive(temp_db, plant_project):
+    for price in range(5):
+        submit_job("evaluate", plant_project(100 + price))
+    claimed, lock = [], threading.Lock()
+
+    def claim(worker):
+        while (job := db.claim_job(worker)) is not None:
+            with lock:
+                claimed.append(job["id"])
+
+    threads = [threading.Thread(target=claim, args=(f"w{i}",)) for i in range(6)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert len(claimed) == 5 and len(set(claimed)) == 5
+
+def test_retry_policy_and_lease_expiry(temp_db, plant_project):
+    job_id, _ = submit_job("evaluate", plant_project(), max_attempts=2)
+    job = db.claim_job("w1")
+    assert job["attempts"] == 1 and job["data_json"]
+    assert db.fail_job(job_id, "w1", "Crashed", retryable=True, backoff_s=60) == "queued"
+    assert db.claim_job("w2") is None  # backing off
+    with db._queue_conn() as conn:
+        conn.execute("UPDATE jobs SET available_at=0 WHERE id=?", (job_id,))
+    assert db.claim_job("w2")["attempts"] == 2
+    assert db.fail_job(job_id, "w2", "Crashed again", retryable=True) == "failed"
+
+    # Invalid input is not retried
+    job_id, _ = submit_job("goal_seek", plant_project(), {"targets": []})
+    db.claim_job("w1")
+    assert db.fail_job(job_id, "w1", "ValueError", retryable=False) == "failed"
+
+    # A worker that stops renewing its lease loses the job
+    job_id, _ = submit_job("tornado", plant_project(), max_attempts=2)
+    assert db.claim_job("dead", lease_s=-1)["id"] == job_id
+    assert db.claim_job("alive")["id"] == job_id
+    assert not db.heartbeat_job(job_id, "dead") and db.heartbeat_job(job_id, "alive")
+    assert not db.finish_job(job_id, "dead", {})
+
+def test_worker_runs_jobs(temp_db, plant_project):
+    p = plant_project()
+    ev_id, _ = submit_job("evaluate", p)
+    mc_id, _ = submit_job("monte_carlo", p, {"iterations": 300, "variables": ["Price", "Volume"]})
+    to_id, _ = submit_job("tornado", p, {"variables": ["Price", "CAPEX"]})
+    slow_id, _ = submit_job("monte_carlo", p, {"iterations": 50}, force=True, timeout_s=0.01, max_attempts=1)
+
+    worker = JobWorker(lease_s=3, poll_s=0.1, backoff_s=0)
+    assert worker.run(exit_when_idle=True) == 4
+
+    jobs = {j["id"]: j for j in db.list_jobs(project_id=p.id)}
+    assert [jobs[i]["status"] for i in (ev_id, mc_id, to_id)] == ["done"] * 3
+    assert load_result(jobs[ev_id])["kpi"]["npv"] == pytest.approx(calculate_financials(p).kpi["npv"])
+    mc = load_result(jobs[mc_id])
+    assert len(mc["samples"]) == 300 and mc["summary"]["mean_npv"] == pytest.approx(mc["samples"]["NPV"].mean())
+    assert jobs[mc_id]["result_location"].endswith(".parquet")
+    assert [r["Variable"] for r in load_result(jobs[to_id])["tornado"]] != [] and jobs[to_id]["progress"] == 1.0
+    assert jobs[slow_id]["status"] == "failed" and "Timed out" in jobs[slow_id]["error"]
+    assert jobs[ev_id]["finished_at"] >= jobs[ev_id]["started_at"] >= jobs[ev_id]["created_at"]
@@ -4,7 +4,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import pytest
 import numpy as np
-from core.finance import calculate_loan_schedule
+from core.finance import calculate_loan_schedule, calculate_loan_schedule_batch
 
 def test_equal_principal_loan():
     amount = 1000
@@ -54,3 +54,14 @@ def test_grace_period():
     
     assert res["principal"][2] == 200.0
     assert res["interest"][0] == 100.0 # Creates interest during grace
+
+@pytest.mark.parametrize("method", ["EqualPrincipal", "EqualPayment", "Bullet"])
+def test_batch_schedule_matches_scalar(method):
+    rates = np.array([0.0, 0.05, 0.25, 0.40])
+    terms = np.array([1, 3, 5, 8])
+    batch = calculate_loan_schedule_batch(1000, rates, terms, method, 2, 6, grace_period_years=1, payments_per_year=12)
+
+    for i, (rate, term) in enumerate(zip(rates, terms)):
+        single = calculate_loan_schedule(1000, rate, int(term), method, 2, 6, 1, payments_per_year=12)
+        for key in ["drawdown", "interest", "principal", "balance"]:
+            np.testing.assert_allclose(batch[key][i], single[key], rtol=1e-10, atol=1e-8)
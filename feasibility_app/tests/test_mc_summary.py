@@ -0,0 +1,53 @@
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.mc_summary import histogram, weighted_quantiles, kde, stratified_sample, summarize_results
+
+def test_histogram_and_quantiles():
+    rng = np.random.default_rng(0)
+    x = rng.normal(0, 1, 10000)
+    hist = histogram(x, bins=40)
+    assert hist["counts"].sum() == 10000 and len(hist["centers"]) == 40
+
+    # Weighted counts are rescaled to the sample size
+    w = rng.uniform(0.5, 2.0, 10000)
+    assert histogram(np.append(x, np.nan), np.append(w, 1.0))["counts"].sum() == pytest.approx(10000)
+
+    q = weighted_quantiles(x, qs=[5, 50, 95])
+    assert q[50] == pytest.approx(np.percentile(x, 50), abs=1e-3)
+    assert q[95] == pytest.approx(np.percentile(x, 95), abs=1e-2)
+
+def test_kde_matches_normal_density():
+    rng = np.random.default_rng(1)
+    d = kde(rng.normal(5, 2, 100000))
+    assert np.trapezoid(d["density"], d["x"]) == pytest.approx(1.0, abs=1e-3)
+    expected = np.exp(-0.5 * ((d["x"] - 5) / 2) ** 2) / (2 * np.sqrt(2 * np.pi))
+    assert np.abs(d["density"] - expected).max() < 0.01
+    assert len(kde(np.ones(10))["x"]) == 0
+
+def test_stratified_sample_keeps_tails():
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({"NPV": rng.standard_t(3, 50000), "Price_Factor": rng.normal(1, 0.1, 50000)})
+    sample = stratified_sample(df, max_points=1000)
+    assert len(sample) <= 1002
+    assert sample["NPV"].min() == df["NPV"].min() and sample["NPV"].max() == df["NPV"].max()
+    # Every NPV decile is represented about equally
+    deciles = pd.qcut(df["NPV"], 10, labels=False).loc[sample.index]
+    assert deciles.value_counts().min() >= 90
+
+def test_summarize_results_is_compact():
+    rng = np.random.default_rng(3)
+    n = 50000
+    df = pd.DataFrame({"Iteration": np.arange(n), "NPV": rng.normal(1e6, 5e5, n), "IRR": 0.1,
+                       "Price_Factor": rng.normal(1, 0.1, n), "Volume_Factor": rng.normal(1, 0.1, n)})
+    summary = summarize_results(df, max_points=2000)
+    assert summary["iterations"] == n
+    assert list(summary["sample"].columns) == ["NPV", "Price_Factor", "Volume_Factor"]
+    assert len(summary["sample"]) <= 2002
+    assert summary["stats"]["prob_loss"] == pytest.approx((df["NPV"] < 0).mean())
+    assert summary["kde"]["counts"].max() == pytest.approx(summary["histogram"]["counts"].max(), rel=0.1)
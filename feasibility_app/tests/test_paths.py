@@ -0,0 +1,91 @@
+import pytest
+import copy
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.model import ProjectModel, Product, CAPEXItem, Loan, ExpenseItem, FxPathConfig, InflationPathConfig
+from core.engine import calculate_financials
+from core.batch import compile_model, evaluate_batch
+from core.paths import bridge_shocks, fx_path, inflation_index, generate_paths
+from core.risk import run_monte_carlo
+
+def _project(granularity="Year"):
+    p = ProjectModel(horizon_years=6, granularity=granularity, calculation_mode="Levered", equity_contribution=50000, inflation_rate=0.3)
+    p.products.append(Product(unit_price=120, unit_cost=60, initial_volume=9000, production_capacity_per_year=12000))
+    p.products.append(Product(unit_price=20, unit_cost=12, currency="USD", initial_volume=500))
+    p.fixed_expenses.append(ExpenseItem(amount_per_year=50000, growth_rate=0.05))
+    p.capex_items.append(CAPEXItem(amount=8000, currency="USD", year=1))
+    p.capex_items.append(CAPEXItem(amount=4000, currency="USD", year=3))
+    p.loans.append(Loan(amount=6000, currency="USD", interest_rate=0.08, term_years=4))
+    return p
+
+@pytest.mark.parametrize("granularity", ["Year", "Month"])
+def test_constant_fx_path_matches_rescaled_rate(granularity):
+    p = _project(granularity)
+    cm = compile_model(p)
+    out = evaluate_batch(cm, paths={"fx": {"USD": np.full((2, cm.total_periods), 1.25)}})
+
+    m = copy.deepcopy(p)
+    m.exchange_rates["USD"] *= 1.25
+    kpi = calculate_financials(m).kpi
+    assert out["npv"] == pytest.approx([kpi["npv"]] * 2, rel=1e-10)
+    assert out["irr"][0] == pytest.approx(kpi["irr"], rel=1e-8)
+
+def test_fx_depreciation_at_purchase_rate():
+    # The rate doubles after year 1. A year-1 USD asset is paid and depreciated
+    # at the year-1 rate, so with TRY revenue only nothing else moves.
+    p = _project()
+    p.products = p.products[:1]
+    p.loans = []
+    p.capex_items = p.capex_items[:1]
+    cm = compile_model(p)
+    base = evaluate_batch(cm)
+    path = np.array([[1.0, 2.0, 2.0, 2.0, 2.0, 2.0]])
+    out = evaluate_batch(cm, paths={"fx": {"USD": path}})
+    assert out["npv"][0] == pytest.approx(base["npv"][0], rel=1e-12)
+
+    p.capex_items.append(CAPEXItem(amount=4000, currency="USD", year=3))
+    cm = compile_model(p)
+    out = evaluate_batch(cm, paths={"fx": {"USD": path}})
+    assert out["npv"][0] < evaluate_batch(cm)["npv"][0]
+
+def test_path_moments():
+    rng = np.random.default_rng(3)
+    shocks = rng.standard_normal((100000, 8))
+    for conf in [FxPathConfig(drift=0.25, volatility=0.2), FxPathConfig(process="MeanReverting", drift=0.25, volatility=0.2, mean_reversion=0.8)]:
+        path = fx_path(shocks, conf)
+        assert path[:, 0] == pytest.approx(1.0)
+        np.testing.assert_allclose(path.mean(axis=0), 1.25 ** np.arange(9), rtol=0.02)
+
+    flat = inflation_index(np.zeros((3, 8)), InflationPathConfig(), 0.3)
+    np.testing.assert_allclose(flat, 1.0)
+
+    # Bridged shocks stay iid N(0, 1) and sum to the terminal score
+    terminal = rng.standard_normal(100000)
+    z = bridge_shocks(terminal, rng.standard_normal((100000, 8)))
+    np.testing.assert_allclose(z.sum(axis=1) / np.sqrt(8), terminal)
+    np.testing.assert_allclose(np.cov(z.T), np.eye(8), atol=0.02)
+
+def test_monte_carlo_with_correlated_paths():
+    p = _project()
+    p.risk_config.fx_paths["USD"] = FxPathConfig(drift=0.2, volatility=0.3)
+    p.risk_config.inflation_path = InflationPathConfig(volatility=0.05)
+    p.risk_config.set_correlation("FX USD", "Price", 0.6)
+    p.risk_config.set_correlation("FX USD", "Inflation", 0.5)
+
+    df = run_monte_carlo(p, 3000)
+    assert df.attrs["paths"] == ["FX USD", "Inflation"]
+    assert np.corrcoef(df["Price_Factor"], np.log(df["FX USD_End"]))[0, 1] == pytest.approx(0.6, abs=0.05)
+    assert df["FX USD_End"].mean() == pytest.approx(35.0 * 1.2 ** 5, rel=0.05)
+    assert df["Inflation_Avg"].mean() == pytest.approx(0.3, abs=0.01)
+
+    np.random.seed(0)
+    paths = generate_paths(p, 5)
+    assert paths["fx"]["USD"].shape == (5, 6) and paths["inflation"].shape == (5, 6)
+
+    p.risk_config.fx_paths["TRY"] = FxPathConfig()
+    with pytest.raises(ValueError):
+        run_monte_carlo(p, 10)
@@ -0,0 +1,133 @@
+import pytest
+import os
+import sys
+import sqlite3
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core import db
+from core.model import ProjectModel, Product, CAPEXItem
+from core.engine import calculate_financials
+from core.portfolio import run_portfolio
+
+def test_portfolio_bulk_evaluation(temp_db):
+    projects = []
+    for i in range(5):
+        p = ProjectModel(name=f"P{i}", horizon_years=5)
+        p.products.append(Product(name="Widget", unit_price=100 + i, unit_cost=50, initial_volume=1000))
+        p.capex_items.append(CAPEXItem(name="Machine", amount=50000, year=1))
+        db.save_project(p, user="admin")
+        projects.append(p)
+
+    # Corrupt one payload -> reported as failure, others unaffected
+    conn = sqlite3.connect(temp_db)
+    conn.execute("UPDATE projects SET data_json='{\"horizon_years\": 99}' WHERE id=?", (projects[0].id,))
+    conn.commit()
+    conn.close()
+
+    summary = run_portfolio(options={"tornado": True}, workers=1, chunk_size=2)
+
+    assert summary["evaluated"] == 5
+    assert summary["failed"] == 1
+    assert summary["failures"][0]["project_id"] == projects[0].id
+
+    stored = db.load_project_results()
+    assert len(stored) == 5
+    assert stored[projects[0].id]["status"] == "error"
+
+    expected = calculate_financials(projects[3]).kpi["npv"]
+    assert stored[projects[3].id]["kpi"]["npv"] == pytest.approx(expected)
+    assert len(stored[projects[3].id]["extras"]["tornado"]) == 4
+
+def test_batch_report_reuses_cache(temp_db, tmp_path):
+    from openpyxl import load_workbook
+    import pandas as pd
+    from core.portfolio import collect_portfolio_results
+    from core.reporting import write_portfolio_workbook, write_statements_parquet
+
+    ids = []
+    for i in range(3):
+        p = ProjectModel(name="Same Name", horizon_years=4)
+        p.products.append(Product(unit_price=100 + i))
+        db.save_project(p, user="admin")
+        ids.append(p.id)
+
+    first = collect_portfolio_results(ids, workers=1)
+    assert [r["project_id"] for r in first] == ids
+    assert not any(r["cached"] for r in first)
+
+    # Edit one project -> only that one is recomputed
+    edited = db.load_project(ids[1])
+    edited.products[0].unit_price = 500
+    db.save_project(edited, user="admin")
+    second = collect_portfolio_results(ids, workers=1)
+    assert [r["cached"] for r in second] == [True, False, True]
+    assert second[1]["kpi"]["npv"] > first[1]["kpi"]["npv"]
+
+    xlsx = tmp_path / "pack.xlsx"
+    write_portfolio_workbook(second, str(xlsx))
+    wb = load_workbook(xlsx, read_only=True)
+    assert wb.sheetnames == ["Portfolio Summary", "Same Name", "Same Name (2)", "Same Name (3)"]
+
+    pq = tmp_path / "pack.parquet"
+    n_rows = write_statements_parquet(second, str(pq))
+    df = pd.read_parquet(pq)
+    assert len(df) == n_rows
+    assert set(df["project_id"]) == set(ids)
+    assert set(df["statement"]) == {"Income Statement", "Cash Flow"}
+
+def test_collect_keeps_portfolio_extras(temp_db):
+    from core.portfolio import collect_portfolio_results
+    ids = []
+    for i in range(2):
+        p = ProjectModel(name=f"P{i}", horizon_years=4)
+        p.products.append(Product(unit_price=100 + i))
+        db.save_project(p, user="admin")
+        ids.append(p.id)
+    run_portfolio(options={"tornado": True, "mc_iterations": 50}, workers=1)
+
+    # Row from before statements were stored + an edited project
+    conn = sqlite3.connect(temp_db)
+    conn.execute("UPDATE project_results SET statements_json=NULL WHERE project_id=?", (ids[0],))
+    conn.commit()
+    conn.close()
+    edited = db.load_project(ids[1])
+    edited.products[0].unit_price = 500
+    db.save_project(edited, user="admin")
+
+    results = collect_portfolio_results(ids, workers=1)
+    assert [r["cached"] for r in results] == [False, False]
+    stored = db.load_project_results(ids)
+    for pid in ids:
+        assert stored[pid]["statements"]
+        assert len(stored[pid]["extras"]["tornado"]) == 4
+        assert stored[pid]["extras"]["mc"]["iterations"] == 50
+    # The edited project's extras are recomputed, not copied
+    assert stored[ids[1]]["extras"]["mc"]["mean_npv"] > results[0]["extras"]["mc"]["mean_npv"]
+
+def test_results_from_older_engine_are_recomputed(temp_db, monkeypatch):
+    from core import portfolio
+    ids = []
+    for i in range(2):
+        p = ProjectModel(name=f"P{i}", horizon_years=4)
+        p.products.append(Product(unit_price=100 + i))
+        db.save_project(p, user="admin")
+        ids.append(p.id)
+    run_portfolio(options={"mc_iterations": 50}, workers=1)
+    assert all(r["engine_version"] == portfolio.ENGINE_VERSION for r in db.load_project_results(ids).values())
+
+    # Row written before engine versions were stored
+    conn = sqlite3.connect(temp_db)
+    conn.execute("UPDATE project_results SET engine_version=NULL WHERE project_id=?", (ids[0],))
+    conn.commit()
+    conn.close()
+    results = portfolio.collect_portfolio_results(ids, workers=1)
+    assert [r["cached"] for r in results] == [False, True]
+
+    # Engine change: every snapshot is stale, extras are rebuilt with their options
+    monkeypatch.setattr(portfolio, "ENGINE_VERSION", portfolio.ENGINE_VERSION + 1)
+    results = portfolio.collect_portfolio_results(ids, workers=1)
+    assert [r["cached"] for r in results] == [False, False]
+    stored = db.load_project_results(ids)
+    assert all(stored[pid]["engine_version"] == portfolio.ENGINE_VERSION for pid in ids)
+    assert all(stored[pid]["extras"]["mc"]["iterations"] == 50 for pid in ids)
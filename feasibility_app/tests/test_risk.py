@@ -40,3 +40,78 @@ def test_tornado_structure():
     
     # Check sorting
     assert df.iloc[0]["Range"] >= df.iloc[-1]["Range"]
+
+def test_inverse_cdf_matches_mc_transform():
+    from scipy.stats import norm
+    from core.model import DistributionConfig
+    from core.risk import get_inverse_cdf
+
+    z = np.linspace(-2, 2, 9)
+    u = norm.cdf(z)
+    normal = DistributionConfig(dist_type="Normal", mean_pct=0.05, std_dev_pct=0.1)
+    np.testing.assert_allclose(get_inverse_cdf(u, normal), 1.05 + 0.1 * z)
+
+    uniform = DistributionConfig(dist_type="Uniform", min_pct=-0.2, max_pct=0.1)
+    np.testing.assert_allclose(get_inverse_cdf([0.0, 0.5, 1.0], uniform), [0.8, 0.95, 1.1])
+
+    tri = DistributionConfig(dist_type="Triangular", min_pct=-0.1, mode_pct=0.0, max_pct=0.3)
+    assert get_inverse_cdf(0.25, tri) == pytest.approx(1.0)
+
+def test_importance_sampling_tail_estimate():
+    from core.model import Product, CAPEXItem, ExpenseItem
+    from core.batch import compile_model, evaluate_batch
+    from core.risk import summarize_monte_carlo, z_to_factors, correlation_matrix
+
+    p = ProjectModel(horizon_years=8)
+    p.products.append(Product(unit_price=100, unit_cost=60, initial_volume=3000))
+    p.capex_items.append(CAPEXItem(amount=150000))
+    p.fixed_expenses.append(ExpenseItem(amount_per_year=20000))
+    for var, sd in [("Price", 0.08), ("Volume", 0.1), ("CAPEX", 0.1), ("OPEX", 0.1)]:
+        p.risk_config.get_config(var).std_dev_pct = sd
+    p.risk_config.set_correlation("Price", "Volume", 0.3)
+
+    # Reference loss probability (~2%) from a large plain sample on the batched engine
+    variables = ["Volume", "Price", "CAPEX", "OPEX"]
+    rng = np.random.default_rng(0)
+    z = rng.multivariate_normal(np.zeros(4), correlation_matrix(p.risk_config, variables), 200000)
+    f = z_to_factors(z, {v: p.risk_config.get_config(v) for v in variables}, variables)
+    npv = evaluate_batch(compile_model(p), {v: f[:, i] for i, v in enumerate(variables)})["npv"]
+    p_ref = (npv < 0).mean()
+
+    df = run_monte_carlo(p, iterations=300, importance_sampling=True)
+    stats = summarize_monte_carlo(df)
+    plain_se = np.sqrt(p_ref * (1 - p_ref) / 300)
+
+    assert abs(stats["prob_loss"] - p_ref) < 3 * stats["prob_loss_se"] + 3e-4
+    assert stats["prob_loss_se"] < plain_se / 3  # ~10x fewer runs for the same precision
+    assert 0 < stats["ess"] <= 300
+    assert df.attrs["importance_sampling"]
+    assert set(df.attrs["shift"]) == set(variables)
+
+    plain = summarize_monte_carlo(run_monte_carlo(p, iterations=100))
+    assert plain["ess"] == 100
+
+def test_paired_monte_carlo_common_random_numbers():
+    from core.model import Product, CAPEXItem, Loan
+    from core.engine import build_baseline_model
+    from core.risk import run_paired_monte_carlo, paired_difference
+
+    p = ProjectModel(horizon_years=6, calculation_mode="Levered")
+    p.products.append(Product(unit_price=100, unit_cost=60, initial_volume=3000))
+    p.capex_items.append(CAPEXItem(amount=150000))
+    p.loans.append(Loan(amount=80000, interest_rate=0.3))
+    no_debt = p.model_copy(update={"loans": []}, deep=True)
+
+    df = run_paired_monte_carlo({"current": p, "no_debt": no_debt, "baseline": build_baseline_model(p)}, iterations=400)
+
+    # Same draws as a plain run with the same seed, stored once
+    plain = run_monte_carlo(p, iterations=50)
+    np.testing.assert_allclose(df["current_NPV"][:50], plain["NPV"], rtol=1e-9)
+    assert [c for c in df.columns if c.endswith("_Factor")] == ["Volume_Factor", "Price_Factor", "CAPEX_Factor", "OPEX_Factor"]
+
+    d = paired_difference(df, "no_debt", "current")
+    assert d["ci_low"] <= d["mean"] <= d["ci_high"]
+    assert d["se"] < d["independent_se"] / 10
+
+    with pytest.raises(ValueError):
+        run_paired_monte_carlo({})
@@ -0,0 +1,46 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.model import ProjectModel, Product, CAPEXItem, ExpenseItem
+from core.sensitivity import saltelli_sample, sobol_indices, run_sobol_analysis
+
+def test_sobol_estimators_linear_model():
+    # Y = X1 + 2 X2 + 3 X3 with iid inputs: S1_i = ST_i = a_i^2 / sum(a^2)
+    a = np.array([1.0, 2.0, 3.0])
+    A, B, AB = saltelli_sample(4096, 3, seed=1)
+    idx = sobol_indices(A @ a, B @ a, AB @ a, n_bootstrap=50, seed=1)
+
+    expected = a**2 / np.sum(a**2)
+    np.testing.assert_allclose(idx["S1"], expected, atol=0.02)
+    np.testing.assert_allclose(idx["ST"], expected, atol=0.02)
+    assert (idx["S1_conf"] > 0).all()
+
+def test_sobol_analysis_on_project():
+    p = ProjectModel(horizon_years=5)
+    p.products.append(Product(unit_price=100, unit_cost=50, initial_volume=1000))
+    p.capex_items.append(CAPEXItem(amount=100000))
+    # No OPEX lines: the OPEX driver cannot move the result
+    p.risk_config.get_config("Price").std_dev_pct = 0.2
+
+    df = run_sobol_analysis(p, n_base=512, n_bootstrap=20)
+
+    assert df.attrs["evaluations"] == 512 * 6
+    npv = df[df["Metric"] == "npv"].set_index("Variable")
+    assert npv.loc["OPEX", "S1"] == pytest.approx(0.0, abs=1e-12)
+    assert npv.loc["OPEX", "ST"] == pytest.approx(0.0, abs=1e-12)
+    assert npv["S1"].idxmax() == "Price"
+    assert npv["S1"].sum() == pytest.approx(1.0, abs=0.1)
+
+    with pytest.raises(ValueError):
+        run_sobol_analysis(p, variables=["Discount Rate"])
+
+def test_saltelli_sample_keeps_full_power_of_two():
+    import warnings
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        A, B, AB = saltelli_sample(1000, 2, seed=3)
+    assert A.shape == B.shape == (1024, 2) and AB.shape == (2, 1024, 2)
@@ -0,0 +1,142 @@
+import pytest
+import os
+import sys
+import json
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+pytest.importorskip("starlette")
+
+from core import db
+from core.engine import calculate_financials
+from core.service import create_app, WorkerPool, Busy
+
+async def _call(app, method, path, body=None, query=""):
+    """Minimal ASGI client: (status, headers, parsed JSON)."""
+    raw = json.dumps(body).encode() if body is not None else b""
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+             "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+             "root_path": "", "headers": [(b"content-type", b"application/json")], "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 80)}
+    sent = {"body": b""}
+    messages = [{"type": "http.request", "body": raw, "more_body": False}]
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            sent["status"] = message["status"]
+            sent["headers"] = {k.decode(): v.decode() for k, v in message["headers"]}
+        elif message["type"] == "http.response.body":
+            sent["body"] += message.get("body", b"")
+
+    await app(scope, receive, send)
+    return sent["status"], sent["headers"], json.loads(sent["body"])
+
+def _run(app, *calls):
+    async def main():
+        try:
+            return await asyncio.gather(*(_call(app, *c) for c in calls))
+        finally:
+            app.state.pool.close()
+    return asyncio.run(main())
+
+def test_evaluate_and_task_endpoints(temp_db, plant_project):
+    p = plant_project()
+    app = create_app(workers=1)
+    body = {"project": p.model_dump(mode="json")}
+    (s1, _, ev), (s2, _, mc), (s3, _, gs), (s4, _, bad) = _run(
+        app,
+        ("POST", "/evaluate", p.model_dump(mode="json")),
+        ("POST", "/monte-carlo", {**body, "iterations": 200, "variables": ["Price"]}),
+        ("POST", "/goal-seek", {**body, "targets": [{"driver": "Price", "metric": "npv", "target": 0.0}]}),
+        ("POST", "/evaluate", {"project": {"horizon_years": "many"}}),
+    )
+    assert s1 == 200 and ev["status"] == "ok"
+    assert ev["kpi"]["npv"] == pytest.approx(calculate_financials(p).kpi["npv"])
+    assert s2 == 200 and mc["iterations"] == 200 and "prob_loss" in mc["summary"]
+    assert s3 == 200 and gs["results"][0]["converged"]
+    assert s4 == 422
+
+    # Errors inside the task surface as 400
+    ((s5, _, err),) = _run(app, ("POST", "/goal-seek", {**body, "targets": [{"driver": "Tax", "metric": "npv", "target": 0}]}))
+    assert s5 == 400 and "Unsupported driver" in err["error"]
+
+    ((_, _, m),) = _run(app, ("GET", "/metrics"))
+    assert m["requests"]["evaluate"]["count"] == 2 and m["requests"]["evaluate"]["errors"] == 1
+    assert m["pool"]["completed"] == 3 and m["pool"]["failed"] == 1 and m["pool"]["pending"] == 0
+
+def test_batch_and_backpressure(temp_db, plant_project):
+    app = create_app(workers=1, max_pending=4)
+    variants = [plant_project(price).model_dump(mode="json") for price in (90, 100, 110)] + [{"horizon_years": "x"}]
+    ((status, _, out),) = _run(app, ("POST", "/evaluate/batch", {"projects": variants}))
+    assert status == 200 and out["failed"] == 1
+    npvs = [r["kpi"]["npv"] for r in out["results"][:3]]
+    assert npvs == sorted(npvs) and out["results"][3]["status"] == "error"
+
+    # Batches never exceed the admission limit
+    ((status, _, out),) = _run(app, ("POST", "/evaluate/batch", {"projects": variants[:3] * 2}))
+    assert status == 400
+
+    # While the pool is full, new work is rejected with Retry-After
+    app.state.pool.admit(3)
+    ((status, headers, out),) = _run(app, ("POST", "/evaluate/batch", {"projects": variants[:2]}))
+    assert status == 503 and headers["retry-after"] == "1"
+    assert app.state.pool.stats()["rejected"] == 1 and app.state.pool.pending == 3
+
+def test_oversized_requests_are_rejected(temp_db, plant_project):
+    p = plant_project()
+    p.risk_config.monte_carlo_iterations = 5000
+    body = {"project": p.model_dump(mode="json")}
+    app = create_app(workers=1, max_iterations=1000, max_evals=50)
+    results = _run(
+        app,
+        ("POST", "/monte-carlo", {**body, "iterations": 10**9}),
+        ("POST", "/monte-carlo", body),  # the project's own iteration count is checked too
+        ("POST", "/evaluate", {**body, "options": {"mc_iterations": 10**9}}),
+        ("POST", "/evaluate/batch", {"projects": [body["project"]], "options": {"mc_iterations": 5000}}),
+        ("POST", "/goal-seek", {**body, "targets": [{"driver": "Price", "metric": "npv", "target": 0}], "max_evals": 10**6}),
+        ("POST", "/monte-carlo", {**body, "iterations": "lots"}),
+    )
+    assert [status for status, _, _ in results] == [413, 413, 413, 413, 413, 400]
+    assert "exceeds the limit of 1000" in results[0][2]["error"]
+
+    # Invalid parameters are rejected with a clear message
+    results = _run(
+        app,
+        ("POST", "/tornado", {**body, "variables": ["Nope"]}),
+        ("POST", "/monte-carlo", {**body, "iterations": 100, "variables": ["Price", "Discount Rate"]}),
+        ("POST", "/monte-carlo", {**body, "iterations": 0}),
+        ("POST", "/monte-carlo", {**body, "iterations": -5}),
+    )
+    assert [status for status, _, _ in results] == [400, 400, 400, 400]
+    assert "Unsupported variable(s): Nope" in results[0][2]["error"]
+    assert "Discount Rate" in results[1][2]["error"]
+    assert "at least 1" in results[2][2]["error"] and "at least 1" in results[3][2]["error"]
+    # Nothing was queued
+    assert app.state.pool.stats()["completed"] == 0 and app.state.pool.pending == 0
+
+def test_pool_admission():
+    pool = WorkerPool(workers=2, max_pending=2)
+    pool.admit(2)
+    with pytest.raises(Busy):
+        pool.admit()
+    assert pool.stats()["running"] == 2
+
+def test_stored_projects(temp_db, plant_project):
+    p = plant_project()
+    db.save_project(p, user="admin")
+    app = create_app(workers=2)
+    (s1, _, listed), (s2, _, got), (s3, _, ev), (s4, _, _) = _run(
+        app,
+        ("GET", "/projects"),
+        ("GET", f"/projects/{p.id}"),
+        ("POST", f"/projects/{p.id}/evaluate", {"options": {"tornado": True}}),
+        ("GET", "/projects/unknown"),
+    )
+    assert s1 == 200 and [r["id"] for r in listed["projects"]] == [p.id]
+    assert s2 == 200 and got["name"] == "Plant"
+    # Evaluated in a worker process
+    assert s3 == 200 and ev["kpi"]["npv"] == pytest.approx(calculate_financials(p).kpi["npv"]) and ev["extras"]["tornado"]
+    assert s4 == 404
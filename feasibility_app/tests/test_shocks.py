@@ -0,0 +1,106 @@
+import pytest
+import sys
+import os
+import copy
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.model import ProjectModel, Product, CAPEXItem, ExpenseItem, Loan, ShockSpec
+from core.engine import calculate_financials
+from core.batch import compile_model, evaluate_batch
+from core.risk import apply_factor_to_model, run_monte_carlo
+from core.shocks import ar1_kernel, shock_path, generate_shocks, item_shocks, validate_shocks
+
+def _project(granularity="Year"):
+    p = ProjectModel(horizon_years=6, granularity=granularity, calculation_mode="Levered")
+    p.products.append(Product(name="A", unit_price=100, unit_cost=40, initial_volume=5000, production_capacity_per_year=20000))
+    p.products.append(Product(name="B", unit_price=50, unit_cost=30, initial_volume=2000))
+    p.capex_items.append(CAPEXItem(amount=500000, category="Building", year=1))
+    p.capex_items.append(CAPEXItem(amount=200000, category="Machinery", year=2, currency="USD"))
+    p.fixed_expenses.append(ExpenseItem(amount_per_year=80000, category="Rent"))
+    p.fixed_expenses.append(ExpenseItem(amount_per_year=30000, category="Energy"))
+    p.loans.append(Loan(amount=300000, interest_rate=0.2, payment_method="EqualPrincipal"))
+    return p
+
+@pytest.mark.parametrize("granularity", ["Year", "Month"])
+def test_flat_shocks_match_global_factors(granularity):
+    p = _project(granularity)
+    cm = compile_model(p)
+    T = cm.total_periods
+    ref = copy.deepcopy(p)
+    apply_factor_to_model(ref, "Price", 1.1)
+    apply_factor_to_model(ref, "CAPEX", 1.2)
+    for e in ref.fixed_expenses:
+        e.amount_per_year *= 0.9
+    ref.loans[0].interest_rate = 0.25
+    shocks = {("price", 0): np.full(T, 1.1), ("price", 1): np.full(T, 1.1),
+              ("capex", 0): np.full(T, 1.2), ("capex", 1): np.full(T, 1.2),
+              ("opex", 0): np.full(T, 0.9), ("opex", 1): np.full(T, 0.9),
+              ("loan_rate", 0): np.full((2, T), 0.05)}
+    out = evaluate_batch(cm, shocks=shocks)
+    assert out["npv"] == pytest.approx([calculate_financials(ref).kpi["npv"]] * 2, rel=1e-10)
+
+def test_shocks_hit_only_their_items_and_years():
+    p = _project()
+    cm = compile_model(p)
+    base = evaluate_batch(cm)["npv"][0]
+    # Year-1 overrun on the machinery bought in year 2 changes nothing
+    multiplier = np.array([1.5, 1, 1, 1, 1, 1.0])
+    assert evaluate_batch(cm, shocks={("capex", 1): multiplier})["npv"][0] == pytest.approx(base)
+    ref = copy.deepcopy(p)
+    ref.capex_items[0].amount *= 1.5
+    assert evaluate_batch(cm, shocks={("capex", 0): multiplier})["npv"][0] == pytest.approx(calculate_financials(ref).kpi["npv"])
+
+    # Product-specific price shock
+    ref = copy.deepcopy(p)
+    ref.products[1].unit_price *= 0.8
+    assert evaluate_batch(cm, shocks={("price", 1): np.full(6, 0.8)})["npv"][0] == pytest.approx(calculate_financials(ref).kpi["npv"])
+    with pytest.raises(ValueError):
+        evaluate_batch(cm, shocks={("price", 2): np.ones(6)})
+
+def test_ar1_paths():
+    rng = np.random.default_rng(0)
+    spec = ShockSpec(target="ProductPrice", std_dev_pct=0.2, autocorrelation=0.6, mean_pct=0.1, start_year=2, end_year=5)
+    path = shock_path(rng.standard_normal((100000, 4)), spec, 8)
+    assert np.all(path[:, [0, 5, 6, 7]] == 1.0)
+    x = np.log(path[:, 1:5])
+    assert x.std(axis=0) == pytest.approx([0.2] * 4, rel=0.02)
+    assert np.corrcoef(x[:, 1], x[:, 2])[0, 1] == pytest.approx(0.6, abs=0.01)
+    assert np.corrcoef(x[:, 0], x[:, 3])[0, 1] == pytest.approx(0.6 ** 3, abs=0.01)
+    assert path[:, 1:5].mean() == pytest.approx(1.1, rel=0.005)
+
+    # Monthly: same year-over-year correlation, 1 = one draw for the whole range
+    k = ar1_kernel(24, 0.5, 12)
+    cov = k @ k.T
+    assert np.diag(cov) == pytest.approx(np.ones(24)) and cov[0, 12] == pytest.approx(0.5)
+    flat = shock_path(rng.standard_normal((10, 6)), spec.model_copy(update={"autocorrelation": 1.0, "end_year": None, "start_year": 1}), 6)
+    assert np.allclose(flat, flat[:, :1])
+
+def test_monte_carlo_with_targeted_shocks():
+    p = _project()
+    risk = p.risk_config
+    risk.shocks.append(ShockSpec(name="Price A", target="ProductPrice", item="A", std_dev_pct=0.15, autocorrelation=0.8))
+    risk.shocks.append(ShockSpec(name="Build overrun", target="CapexCategory", item="Building", mean_pct=0.1, std_dev_pct=0.2, end_year=2))
+    risk.shocks.append(ShockSpec(name="Rate", target="LoanRate", std_dev_pct=0.03))
+    assert len(item_shocks(p, generate_shocks(p, 10))) == 3
+
+    df = run_monte_carlo(p, iterations=2000, variables=["Volume"])
+    assert {"Price A_Shock", "Build overrun_Shock", "Rate_Shock"} <= set(df.columns)
+    assert df["Build overrun_Shock"].mean() == pytest.approx(1.1, abs=0.02)
+    assert df["NPV"].corr(df["Price A_Shock"]) > 0.5
+    assert df["NPV"].corr(df["Build overrun_Shock"]) < 0
+    again = run_monte_carlo(p, iterations=2000, variables=["Volume"])
+    assert np.array_equal(df["NPV"], again["NPV"])
+
+def test_validate_shocks():
+    p = _project()
+    p.risk_config.shocks.append(ShockSpec(target="ExpenseCategory", item="Marketing"))
+    with pytest.raises(ValueError, match="No item matches"):
+        validate_shocks(p)
+    p.risk_config.shocks = [ShockSpec(target="ProductVolume", autocorrelation=1.5)]
+    with pytest.raises(ValueError, match="Autocorrelation"):
+        validate_shocks(p)
+    p.risk_config.shocks = [ShockSpec(start_year=3, end_year=2)]
+    with pytest.raises(ValueError, match="End year"):
+        validate_shocks(p)
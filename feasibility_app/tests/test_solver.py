@@ -0,0 +1,60 @@
+import pytest
+import copy
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.model import ProjectModel, Product, CAPEXItem, ExpenseItem, Loan
+from core.engine import calculate_financials
+from core.risk import apply_factor_to_model
+from core.solver import solve_targets, break_even_summary
+
+def _project():
+    p = ProjectModel(horizon_years=8, calculation_mode="Levered", equity_contribution=50000)
+    p.products.append(Product(unit_price=100, unit_cost=60, initial_volume=2000))
+    p.capex_items.append(CAPEXItem(amount=150000))
+    p.fixed_expenses.append(ExpenseItem(amount_per_year=10000))
+    p.loans.append(Loan(amount=100000, interest_rate=0.2))
+    return p
+
+def test_break_even_npv_matches_engine():
+    p = _project()
+    summary = break_even_summary(p)
+
+    for driver in ["Price", "Volume", "CAPEX", "OPEX"]:
+        be = summary[driver]
+        assert be["converged"], driver
+        assert be["evaluations"] <= 40
+        m = copy.deepcopy(p)
+        apply_factor_to_model(m, driver, be["value"])
+        assert calculate_financials(m).kpi["npv"] == pytest.approx(0.0, abs=1.0)
+
+    # NPV = 0 discount rate is the IRR
+    assert summary["Discount Rate"]["value"] == pytest.approx(calculate_financials(p).kpi["irr"], abs=1e-6)
+
+def test_multiple_targets_and_no_root():
+    p = _project()
+    res = solve_targets(p, [
+        {"driver": "CAPEX", "metric": "irr", "target": 0.15},
+        {"driver": "Price", "metric": "npv", "target": 1e12},  # unreachable within the ladder
+    ], max_evals=30)
+
+    capex = res[0]
+    m = copy.deepcopy(p)
+    apply_factor_to_model(m, "CAPEX", capex["value"])
+    assert calculate_financials(m).kpi["irr"] == pytest.approx(0.15, abs=1e-5)
+    assert capex["evaluations"] <= 30
+
+    assert res[1]["value"] is None
+    assert not res[1]["converged"]
+
+    with pytest.raises(ValueError):
+        solve_targets(p, [{"driver": "Loan Term", "metric": "npv"}])
+
+def test_driver_without_effect_has_no_break_even():
+    # Empty project: NPV is 0 whatever the driver, so nothing "breaks even"
+    summary = break_even_summary(ProjectModel(horizon_years=5))
+    assert set(summary) == {"Price", "Volume", "CAPEX", "OPEX", "Discount Rate"}
+    for res in summary.values():
+        assert res["value"] is None and res["change_pct"] is None and not res["converged"]
@@ -0,0 +1,129 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from core.model import ProjectModel, Product, CAPEXItem, ExpenseItem, Personnel, Loan, Grant, Leasing
+from core.engine import calculate_financials, calculate_baseline, calculate_incremental, build_baseline_model
+from core import stages
+
+def _project():
+    p = ProjectModel(horizon_years=6, granularity="Month", calculation_mode="Levered")
+    p.products.append(Product(name="A", unit_price=100, unit_cost=40, initial_volume=5000, production_capacity_per_year=20000))
+    p.capex_items.append(CAPEXItem(amount=500000, category="Building"))
+    p.fixed_expenses.append(ExpenseItem(amount_per_year=80000))
+    p.personnel.append(Personnel(monthly_gross_salary=4000))
+    p.loans.append(Loan(amount=300000, interest_rate=0.2))
+    p.grants.append(Grant(amount=50000))
+    p.leasings.append(Leasing(asset_value=100000, down_payment=10000))
+    return p
+
+def _misses(before, after):
+    return {s for s in stages.STAGES if after[s]["misses"] > before[s]["misses"]}
+
+def test_edit_recomputes_downstream_stages_only():
+    p = _project()
+    stages.clear_stage_cache()
+    calculate_financials(p)
+    assert _misses({s: {"misses": 0} for s in stages.STAGES}, stages.stage_cache_stats()) == set(stages.STAGES)
+
+    before = stages.stage_cache_stats()
+    calculate_financials(p)
+    assert _misses(before, stages.stage_cache_stats()) == set()
+
+    before = stages.stage_cache_stats()
+    p.loans[0].interest_rate = 0.3
+    calculate_financials(p)
+    assert _misses(before, stages.stage_cache_stats()) == {"debt", "tax_nwc", "cash_flows", "kpis"}
+
+    before = stages.stage_cache_stats()
+    p.discount_rate_levered = 0.3
+    calculate_financials(p)
+    assert _misses(before, stages.stage_cache_stats()) == {"kpis"}
+
+    # OPEX reads products only through scalable personnel
+    before = stages.stage_cache_stats()
+    p.products[0].unit_price = 120
+    calculate_financials(p)
+    assert "opex" not in _misses(before, stages.stage_cache_stats())
+    p.personnel[0].is_scalable = True
+    calculate_financials(p)
+    before = stages.stage_cache_stats()
+    p.products[0].initial_volume = 6000
+    calculate_financials(p)
+    assert "opex" in _misses(before, stages.stage_cache_stats())
+
+def test_cached_results_match_cold_run():
+    p = _project()
+    calculate_financials(p)
+    edits = [
+        lambda m: setattr(m.capex_items[0], "amount", 650000),
+        lambda m: setattr(m.tax_config, "corporate_tax_rate", 0.3),
+        lambda m: setattr(m, "terminal_debt_treatment", "refinance"),
+        lambda m: setattr(m.products[0], "payment_terms_days", 90),
+        lambda m: m.exchange_rates.update({"USD": 40.0}),
+    ]
+    for edit in edits:
+        edit(p)
+        warm = calculate_financials(p)
+        stages.clear_stage_cache()
+        cold = calculate_financials(p)
+        assert warm.kpi == cold.kpi
+        np.testing.assert_array_equal(warm.period_arrays["FCFE"], cold.period_arrays["FCFE"])
+
+def test_shared_outputs_are_protected():
+    p = _project()
+    res = calculate_financials(p)
+    with pytest.raises(ValueError):
+        res.period_arrays["Revenue"][0] = 0.0
+    res.kpi["npv"] = -1.0
+    assert calculate_financials(p).kpi["npv"] != -1.0
+
+def _expansion(granularity="Year"):
+    p = _project()
+    p.granularity = granularity
+    p.baseline_enabled = True
+    p.equity_contribution = 100000
+    p.products[0].oee_percent_baseline = 0.6
+    p.products[0].unit_cost_baseline = 55
+    p.products.append(Product(name="New", is_incremental=True, unit_price=80, initial_volume=3000))
+    p.fixed_expenses.append(ExpenseItem(amount_per_year=20000, is_incremental=True))
+    p.personnel.append(Personnel(monthly_gross_salary=3000, is_scalable=True))
+    p.personnel.append(Personnel(monthly_gross_salary=2500, is_incremental=True))
+    return p
+
+@pytest.mark.parametrize("granularity", ["Year", "Month"])
+def test_baseline_matches_model_copy(granularity):
+    p = _expansion(granularity)
+    fast = calculate_baseline(p)
+    ref = calculate_financials(build_baseline_model(p))
+    assert fast.kpi["npv"] == pytest.approx(ref.kpi["npv"], rel=1e-12)
+    np.testing.assert_allclose(fast.income_statement.values, ref.income_statement.values, rtol=1e-12, atol=1e-6)
+    np.testing.assert_allclose(fast.cash_flow_statement.values, ref.cash_flow_statement.values, rtol=1e-12, atol=1e-6)
+
+def test_incremental_shares_item_stages():
+    p = _expansion()
+    stages.clear_stage_cache()
+    inc = calculate_incremental(p)
+    stats = stages.stage_cache_stats()
+    assert stats["revenue"]["misses"] == 1 and stats["opex"]["misses"] == 1
+    assert stats["kpis"]["misses"] == 2
+
+    assert inc["delta_kpi"]["npv"] == pytest.approx(inc["with"].kpi["npv"] - inc["without"].kpi["npv"])
+    np.testing.assert_allclose(inc["delta_income"]["EBITDA"], inc["with"].ebitda_arr - inc["without"].ebitda_arr)
+    assert (inc["delta_cash_flow"]["CAPEX (w/ VAT)"] < 0).any()
+
+def test_incremental_irr_and_payback_use_delta_flows():
+    import numpy_financial as npf
+    from core.finance import calculate_metrics
+    p = _expansion()
+    p.calculation_mode = "Levered"
+    inc = calculate_incremental(p)
+    flows = np.insert(inc["delta_cash_flow"]["FCFE"].to_numpy(), 0, -p.equity_contribution)
+    kpi = inc["delta_kpi"]
+    assert kpi["irr"] == pytest.approx(npf.irr(flows))
+    assert kpi["irr"] != pytest.approx(inc["with"].kpi["irr"] - inc["without"].kpi["irr"])
+    assert kpi["payback"] == pytest.approx(calculate_metrics(flows, p.discount_rate_levered)["payback"])
+    assert "dscr_min" not in kpi
@@ -58,3 +58,116 @@ def test_excel_export_run():
     xlsx_data = export_to_excel(p, res)
     assert len(xlsx_data) > 0
     assert isinstance(xlsx_data, bytes)
+
+def test_excel_export_monthly_streaming(tmp_path):
+    from io import BytesIO
+    from openpyxl import load_workbook
+    from core.model import Product
+    from core.reporting import write_excel_report, iter_excel_report, MONTHLY_DETAIL_SHEET
+    
+    p = ProjectModel(granularity="Month", horizon_years=30)
+    p.products.append(Product(name="P1", unit_price=100, unit_cost=40, initial_volume=1200))
+    p.capex_items.append(CAPEXItem(amount=1000))
+    p.loans.append(Loan(amount=500))
+    res = calculate_financials(p)
+    
+    # Straight to a file path
+    path = tmp_path / "report.xlsx"
+    write_excel_report(p, res, str(path))
+    wb = load_workbook(path, read_only=True)
+    assert MONTHLY_DETAIL_SHEET in wb.sheetnames
+    rows = list(wb[MONTHLY_DETAIL_SHEET].iter_rows(values_only=True))
+    assert len(rows[0]) == 1 + 360
+    assert rows[1][0] == "Revenue"
+    assert rows[1][1:] == pytest.approx(res.period_arrays["Revenue"].tolist())
+    
+    # Chunked output matches the file
+    chunked = b"".join(iter_excel_report(p, res, chunk_size=4096))
+    wb2 = load_workbook(BytesIO(chunked), read_only=True)
+    assert wb2.sheetnames == wb.sheetnames
+
+def test_input_quality_cache_rechecks_changed_section_only(monkeypatch):
+    from core import quality
+    from core.model import Product
+    
+    p = ProjectModel(horizon_years=5)
+    p.products.append(Product(name="P1", initial_volume=0))
+    p.capex_items.extend(CAPEXItem(name=f"C{i}", amount=100, year=1) for i in range(2000))
+    
+    cache = {}
+    first = quality.check_input_quality(p, cache=cache)
+    assert first == quality.check_input_quality(p)
+    assert [i['context'] for i in first] == ['Revenue']
+    
+    calls = []
+    for section, fn in list(quality._SECTION_CHECKS.items()):
+        def counting(model, _fn=fn, _section=section):
+            calls.append(_section)
+            return _fn(model)
+        monkeypatch.setitem(quality._SECTION_CHECKS, section, counting)
+    
+    # Unchanged model -> nothing re-checked
+    quality.check_input_quality(p, cache=cache)
+    assert calls == []
+    
+    # Edit one CAPEX cell -> only the CAPEX section is re-checked
+    p.capex_items[1500].year = 9
+    issues = quality.check_input_quality(p, cache=cache)
+    assert calls == ['capex_items']
+    assert any(i['item'] == 'C1500' and i['severity'] == 'error' for i in issues)
+
+    # Replacing the product list (data editor) -> only sections reading products re-checked
+    calls.clear()
+    p.products = [dict(p.products[0].model_dump(), initial_volume=10)]
+    issues = quality.check_input_quality(p, cache=cache)
+    assert calls == ['products', 'curves']
+
+    # Same content in new objects -> nothing re-checked
+    calls.clear()
+    p.capex_items = [c.model_copy() for c in p.capex_items]
+    quality.check_input_quality(p, cache=cache)
+    assert calls == []
+    assert not any(i['context'] == 'Revenue' for i in issues)
+
+def test_vectorized_product_checks_match_product_status():
+    import itertools
+    from core import quality
+    from core.model import Product
+    
+    p = ProjectModel()
+    # Every combination of the rule fields at a failing / passing value
+    fields = [f for f, _, _, _ in quality._PRODUCT_RULES]
+    bad = {"scrap_rate": 1.0, "advance_payment_pct": 1.5}
+    for flags in itertools.product([False, True], repeat=len(fields)):
+        values = {f: (bad.get(f, 0.0) if flag else 0.5) for f, flag in zip(fields, flags)}
+        p.products.append(Product(name=str(len(p.products)), **values))
+    
+    expected = []
+    for prod in p.products:
+        status, reason = quality.check_product_status(prod)
+        severity = quality._PRODUCT_SEVERITY.get(status.split(" ", 1)[0])
+        if severity:
+            expected.append({'context': 'Revenue', 'item': prod.name, 'issue': reason, 'severity': severity})
+    assert quality._check_products(p) == expected
+    assert quality._check_products(ProjectModel(products=[])) == []
+
+def test_i18n_compiled_lookup(monkeypatch):
+    from ui import i18n
+
+    # Turkish falls back to English for keys it does not define
+    monkeypatch.setitem(i18n.TRANSLATIONS["en"], "only_en_key", "English only")
+    monkeypatch.setattr(i18n, "_TABLES", i18n._build_tables())
+    assert i18n.get_text("only_en_key", "tr") == "English only"
+    assert "only_en_key" in i18n.find_untranslated("tr")
+
+    # Unknown key -> key itself, recorded as missing
+    monkeypatch.setattr(i18n, "_missing_keys", {})
+    assert i18n.get_text("no_such_key", "tr") == "no_such_key"
+    assert i18n.get_missing_keys() == {"tr": ["no_such_key"]}
+
+    # Bulk lookups match single lookups
+    keys = ["col_variable", "project_saved", "th_revenue"]
+    assert i18n.get_texts(keys, "tr") == [i18n.get_text(k, "tr") for k in keys]
+    assert i18n.get_texts({"Variable": "col_variable"}, "en") == {"Variable": "Variable"}
+
+    assert i18n.format_text("project_saved", "en", "Demo") == i18n.TRANSLATIONS["en"]["project_saved"].format("Demo")
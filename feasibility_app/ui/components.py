@@ -3,7 +3,7 @@ from core.model import ProjectModel
 from core.db import save_project
 from core.auth import check_permission
 
-from ui.i18n import get_text
+from ui.i18n import get_text, get_texts, format_text
 
 from core.db import save_project, load_project
 
@@ -71,6 +71,14 @@ def require_active_project():
 
 def t(key):
     return get_text(key, st.session_state.language)
+
+def t_many(keys):
+    """Bulk t(): list of keys -> list, {column: key} -> {column: text}."""
+    return get_texts(keys, st.session_state.language)
+
+def tf(key, *args, **kwargs):
+    """t(key).format(...) using the pre-compiled template."""
+    return format_text(key, st.session_state.language, *args, **kwargs)
         
 def save_button():
     # Only show if user has permission
@@ -88,7 +96,7 @@ def save_button():
             st.session_state.project_active = True
             st.query_params["id"] = st.session_state.project.id
             
-            msg = t('project_saved').format(st.session_state.project.name)
+            msg = tf('project_saved', st.session_state.project.name)
             st.toast(f"{msg} ({st.session_state.project.version})", icon="✅")
 
 def period_selector(key_prefix: str) -> dict:
@@ -100,6 +108,82 @@ def period_selector(key_prefix: str) -> dict:
 def format_currency(amount, currency="TRY"):
     return f"{amount:,.0f} {currency}"
 
+def calculate_or_stop(model):
+    """calculate_financials for a results page; shows the input error and stops the page instead of crashing."""
+    from core.engine import calculate_financials
+    try:
+        return calculate_financials(model)
+    except ValueError as e:
+        st.error(tf("calc_failed", e))
+        st.stop()
+
+def input_digest(model) -> str:
+    """Digest of everything the engine reads (the KPI stage key, see core.stages)."""
+    from core.stages import stage_keys
+    return stage_keys(model)["kpis"]
+
+def memo_on(name: str, digest: str, compute):
+    """
+    Per-session memo: returns the value cached under `name` while `digest` is
+    unchanged, otherwise recomputes it. Lets fragments skip heavy sections on
+    reruns that did not change their inputs.
+    """
+    memo = st.session_state.setdefault("_fragment_memo", {})
+    hit = memo.get(name)
+    if hit is None or hit[0] != digest:
+        hit = (digest, compute())
+        memo[name] = hit
+    return hit[1]
+
+def rerun_fragment():
+    """Reruns the enclosing fragment only; a full rerun when the whole page is running."""
+    from streamlit.errors import StreamlitAPIException
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+def _preview_figure(results, view):
+    import pandas as pd
+    import plotly.graph_objects as go
+    annual = results.income_statement
+    fig = go.Figure()
+    if view == "fcf":
+        fig.add_trace(go.Bar(x=results.years, y=results.free_cash_flow, name=t("annual_fcf")))
+        fig.add_trace(go.Scatter(x=results.years, y=pd.Series(results.free_cash_flow).cumsum(), name=t("cumulative_fcf"), mode="lines+markers"))
+    else:
+        fig.add_trace(go.Bar(x=results.years, y=annual["Revenue"].values, name=t("th_revenue")))
+        fig.add_trace(go.Scatter(x=results.years, y=results.ebitda_arr, name="EBITDA", mode="lines+markers"))
+    fig.update_layout(height=280, margin=dict(l=0, r=0, t=10, b=0), legend=dict(orientation="h", y=1.15), xaxis_title=None)
+    return fig
+
+@st.fragment
+def live_kpi_preview():
+    """
+    KPI cards and a small annual chart for the current inputs. Runs as its own
+    fragment (switching the chart reruns only this block); the engine and the
+    figure are recomputed only when the inputs digest changes.
+    """
+    from core.engine import calculate_financials
+    project = st.session_state.project
+    with st.container(border=True):
+        st.markdown(f"#### {t('live_preview_title')}", help=t("live_preview_help"))
+        try:
+            digest = input_digest(project)
+            results = memo_on("preview_results", digest, lambda: calculate_financials(project, item_detail=None))
+        except Exception as e:
+            st.warning(tf("live_preview_failed", e))
+            return
+        kpi = results.kpi
+        c1, c2, c3 = st.columns(3)
+        c1.metric(t("npv_label"), format_currency(kpi.get("npv", 0), project.currency_base))
+        c2.metric(t("irr_label"), f"{kpi.get('irr', 0) * 100:.1f} %")
+        c3.metric(t("payback_period"), f"{kpi.get('payback', 0):.1f}")
+        views = {"pl": t("preview_chart_pl"), "fcf": t("preview_chart_fcf")}
+        view = st.radio(t("preview_chart_label"), list(views), format_func=views.get, horizontal=True, key="preview_view")
+        fig = memo_on(f"preview_fig_{view}", f"{digest}|{st.session_state.language}", lambda: _preview_figure(results, view))
+        st.plotly_chart(fig, use_container_width=True, key="preview_chart")
+
 def sidebar_nav():
     st.sidebar.title(t("app_title"))
     
@@ -113,7 +197,8 @@ def sidebar_nav():
     if st.session_state.get("project_active", False):
         try:
             from core.quality import check_input_quality
-            issues = check_input_quality(st.session_state.project)
+            # Per-session cache: only sections whose inputs changed are re-checked
+            issues = check_input_quality(st.session_state.project, cache=st.session_state.setdefault("_quality_cache", {}))
             
             # Count severity
             errors = [i for i in issues if i['severity'] == 'error']
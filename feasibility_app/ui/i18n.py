@@ -1,3 +1,6 @@
+from types import MappingProxyType
+from collections.abc import Mapping
+
 TRANSLATIONS = {
     "en": {
         # Sidebar
@@ -160,6 +163,20 @@ TRANSLATIONS = {
         "capex_impact": "CAPEX Impact (%)",
         "compare_btn": "Compare Scenarios",
         "comparison_results": "Comparison Results",
+        "paired_title": "Paired Monte Carlo Comparison",
+        "paired_info": "Runs the current project and each variant on the same random draws (common random numbers), so the NPV difference reflects the variant, not sampling noise.",
+        "paired_variants": "Variants",
+        "variant_without_debt": "Without Debt",
+        "variant_baseline": "Baseline (No Investment)",
+        "paired_no_variants": "Add a loan or enable Growth Analysis to compare variants.",
+        "run_paired": "Run Paired Simulation",
+        "paired_col_variant": "Variant",
+        "paired_mean_diff": "Mean Δ NPV",
+        "paired_ci": "95% CI",
+        "paired_prob_better": "P(Variant Better)",
+        "paired_var_reduction": "Variance Reduction",
+        "paired_var_reduction_help": "How many times more iterations two independent simulations would need for the same precision of the mean difference.",
+        "paired_hist_title": "Δ NPV vs Current Project ({})",
         "risk_title": "Risk Analysis",
         "tab_sens": "Sensitivity (Tornado)",
         "tab_mc": "Monte Carlo Simulation",
@@ -178,6 +195,38 @@ TRANSLATIONS = {
         "variable_config": "Variable Configuration",
         "variable_config": "Variable Configuration",
         "dist_type": "Distribution Type",
+        "dist_invalid": "Invalid distribution settings",
+        "corr_matrix_title": "Full Correlation Matrix",
+        "corr_matrix_help": "Edit any pair of drivers in either triangle; the mirrored cell follows and the diagonal stays at 1.",
+        "corr_adjusted": "These correlations do not form a valid correlation matrix. The simulation uses the nearest valid matrix (largest change per pair: {:.3f}).",
+        "paths_title": "Stochastic FX & Inflation",
+        "paths_info": "Simulate exchange rates and inflation as paths over time instead of fixed values. Loans, CAPEX, revenue and costs in that currency convert at each period's simulated rate; inflation above or below the project assumption scales prices, unit costs and OPEX. Paths can be correlated with the drivers in the correlation matrix.",
+        "fx_path_enable": "Simulate {} exchange rate",
+        "fx_process": "Process",
+        "fx_process_gbm": "Random walk (GBM)",
+        "fx_process_mr": "Mean-reverting to trend",
+        "fx_drift": "Expected Change (%/year)",
+        "fx_volatility": "Volatility (%/year)",
+        "fx_mean_reversion": "Mean Reversion (per year)",
+        "infl_path_enable": "Simulate inflation (around the project inflation rate)",
+        "infl_volatility": "Inflation Volatility (pp/year)",
+        "infl_mean_reversion": "Inflation Mean Reversion (per year)",
+        "fx_path_var": "FX {}",
+        "var_inflation": "Inflation",
+        "paths_scatter_expander": "NPV vs. FX / Inflation Paths",
+        "paths_scatter_var": "Path Result",
+        "shocks_title": "Targeted Shocks",
+        "shocks_info": "Shock single products, CAPEX / expense categories or loan rates over a range of years. Each period draws a new deviation, linked to the previous year by the autocorrelation.",
+        "shocks_invalid": "Invalid shock",
+        "col_shock_name": "Shock",
+        "col_shock_target": "Target",
+        "col_shock_target_help": "ProductPrice / ProductVolume / ProductCost, CapexCategory, ExpenseCategory or LoanRate (mean and std dev in rate points)",
+        "col_shock_item": "Item",
+        "col_shock_item_help": "Product or loan name, CAPEX or expense category; empty = all",
+        "col_start_year": "From Year",
+        "col_end_year": "To Year",
+        "col_shock_autocorr": "Autocorrelation",
+        "col_shock_autocorr_help": "Year-over-year persistence: 0 = independent each period, 1 = one shock for the whole range",
         "scatter_expander": "Scatter Plot (Price vs Volume Factor Check)",
         "col_variable": "Variable",
         "col_base_npv": "Base NPV",
@@ -198,6 +247,66 @@ TRANSLATIONS = {
         "var_price": "Price",
         "var_capex": "CAPEX",
         "var_opex": "OPEX",
+        "var_discount_rate": "Discount Rate",
+        "var_interest_rate": "Loan Interest Rate",
+        "var_loan_term": "Loan Term (Years)",
+
+        # Grid Sensitivity
+        "tab_grid": "Grid Sensitivity",
+        "grid_title": "Two-Way Sensitivity (Data Table)",
+        "grid_info": "Evaluates every combination of two drivers. Multipliers (1.0 = base case) for Price/Volume/CAPEX/OPEX; rates in % and term in years otherwise.",
+        "grid_x_var": "X Axis Driver",
+        "grid_y_var": "Y Axis Driver",
+        "grid_from": "From",
+        "grid_to": "To",
+        "grid_steps": "Steps",
+        "grid_metric": "Metric",
+        "run_grid": "Run Grid Sensitivity",
+        "grid_same_driver": "Please select two different drivers.",
+        "grid_chart_title": "{} by {} and {}",
+        "min_dscr_label": "Min DSCR",
+
+        # Global Sensitivity (Sobol)
+        "tab_sobol": "Global Sensitivity",
+        "sobol_title": "Variance-Based Sensitivity (Sobol Indices)",
+        "sobol_info": "Shows which uncertainty actually drives the spread of the result, using the distributions from the Monte Carlo setup. First-order = share of variance explained by the variable alone; Total = including its interactions with the others.",
+        "sobol_samples": "Base Sample Size",
+        "run_sobol": "Run Global Sensitivity",
+        "sobol_first_order": "First-order (S1)",
+        "sobol_total": "Total (ST)",
+        "sobol_chart_title": "Sobol Indices ({})",
+        "sobol_corr_warning": "Correlations from the Monte Carlo setup are not applied: Sobol indices assume independent inputs.",
+        "sobol_evals": "{:,} model evaluations ({:,} base samples)",
+        "sobol_independence_note": "The indices assume independent inputs: each variable is sampled on its own and the correlations from the Monte Carlo setup are not applied.",
+
+        # Break-even
+        "be_title": "Break-even (NPV = 0)",
+        "be_help": "Change of each driver (all others at base case) at which NPV reaches zero. For the discount rate this is the rate itself.",
+        "be_not_found": "n/a",
+        "be_not_found_help": "NPV does not cross zero within the searched range.",
+
+        # Debt Sizing
+        "ds_title": "Debt Sizing (DSCR / Gearing)",
+        "ds_info": "Finds the largest loan amount for each repayment method, term and grace period that keeps the DSCR and gearing within the covenants. Gearing = total debt / total CAPEX.",
+        "ds_loan": "Loan to Size",
+        "ds_min_dscr": "Minimum DSCR",
+        "ds_max_gearing": "Maximum Gearing (%)",
+        "ds_gearing_covenant": "Gearing covenant",
+        "ds_gearing_covenant_help": "Off: no gearing limit, only the DSCR covenant caps the loan amount.",
+        "ds_test_years": "DSCR Test Years",
+        "ds_test_repayment": "Repayment years",
+        "ds_test_all": "All years with debt service",
+        "ds_objective": "Objective",
+        "ds_obj_max_debt": "Maximize debt",
+        "ds_obj_equity_irr": "Maximize equity IRR",
+        "ds_max_term": "Maximum Term (Years)",
+        "ds_max_grace": "Maximum Grace Period (Years)",
+        "run_ds": "Size Debt",
+        "ds_running": "Sizing debt...",
+        "ds_no_result": "No structure meets the covenants.",
+        "ds_apply": "Apply Best Structure",
+        "ds_applied": "Loan updated with the best structure.",
+        "ds_evals": "{:,} structures evaluated",
         
         # Terminal Value
         "tv_title": "Terminal Value",
@@ -236,6 +345,22 @@ TRANSLATIONS = {
         "project_horizon_help": "Duration of the analysis in years.",
         "base_currency_help": "The currency used for final reporting and aggregation.",
         "inflation_rate_help": "General annual inflation rate applied to costs/prices if no specific escalation is set.",
+        "index_curves_title": "Index Curves (CPI, wages, ...)",
+        "index_curves_help": "Named year-over-year rate curves shared by line items, e.g. CPI-TR = 45, 30, 20. The first rate applies from year 1 to year 2; the last one continues to the horizon. Products, expenses and personnel can reference a curve instead of a single growth rate.",
+        "col_curve_name": "Curve Name",
+        "col_curve_rates": "Rates (%/year, comma-separated)",
+        "col_curve_rates_help": "Year-over-year rates in %, starting with the change into year 2.",
+        "curve_rates_invalid": "Curve '{}' needs numeric rates (e.g. 45, 30, 20).",
+        "curve_missing": "Curve '{}' is used by {} but no longer defined.",
+        "curve_in_use": "Curve '{}' is used by {} and was kept. Point those items at another curve before deleting or renaming it.",
+        "curve_unknown": "Unknown index curve: {}",
+        "col_vol_curve": "Volume Curve",
+        "col_price_curve": "Price Curve",
+        "col_cost_curve": "Cost Curve",
+        "curve_ref_help": "Optional: a curve name from Project Setup or rates in % (e.g. 45, 30, 20). Replaces the growth rate when set.",
+        "growth_curve": "Growth Curve",
+        "raise_curve": "Raise Curve",
+        "curve_none": "— Use the rate above —",
         "discount_rate_help": "The rate used to discount future cash flows to Present Value.",
         
         "vat_rate_help": "Value Added Tax (VAT) rate applied to this item.",
@@ -298,7 +423,13 @@ TRANSLATIONS = {
         "risk_decision_title": "🛡️ Decision Support & Risk Summary",
         "prob_loss_msg": "📉 **This investment has a {prob:.1f}% probability of negative value (NPV < 0).**",
         "var_msg": "⚠️ **Value at Risk (VaR 95%):** In the worst 5% of cases, losses will exceed **{amy}**.",
-        "dist_explanation": "ℹ️ **Distributions:**\n\n* **Normal:** Standard uncertainties (Inflation etc.).\n* **Triangular:** Estimates with known min/max bounds (Construction cost etc.).",
+        "mc_importance": "Focus on loss tail (importance sampling)",
+        "mc_importance_help": "Samples more often near the loss region and reweights each draw with its likelihood ratio. Gives a much more precise probability of loss for robust projects with the same number of iterations.",
+        "mc_is_caption": "Importance sampling: effective sample size {ess:,.0f} of {n:,} draws. P(NPV < 0) = {p:.3f}% ± {se:.3f}% (as precise as ≈ {eq:,.0f} plain iterations).",
+        "mc_kde": "Density (KDE)",
+        "mc_quantiles": "NPV Percentiles",
+        "mc_sample_caption": "Scatter plots show a stratified sample of {n:,} of {total:,} iterations (tails included).",
+        "dist_explanation": "ℹ️ **Distributions:**\n\n* **Normal:** Standard uncertainties (Inflation etc.).\n* **Triangular:** Estimates with known min/max bounds (Construction cost etc.).\n* **PERT:** Like Triangular (min / most likely / max) but smoother, with less weight on the extremes.",
         
         "insights_title": "💡 Smart Insights",
         "insight_tv_dominance": "⚠️ **TV Dominance:** %{ratio:.0f} of NPV comes from Terminal Value. Highly sensitive to exit assumptions.",
@@ -320,6 +451,53 @@ TRANSLATIONS = {
         "lbl_net_interest": "Net Interest",
         "lbl_fcff_subtotal": "FCFF (Firm)",
         "lbl_fcfe_final": "FCFE (Equity)",
+        # Background jobs
+        "queue_tornado_btn": "Queue in Background",
+        "queue_mc_btn": "Queue Simulation in Background",
+        "queue_job_help": "Runs on a job worker (python scripts/run_jobs.py work) and keeps the result after this session ends. The same analysis of an unchanged project is not queued twice.",
+        "job_queued": "Job {} queued.",
+        "job_exists": "The same analysis is already queued or done (job {}).",
+        "jobs_title": "Background Jobs",
+        "jobs_info": "Jobs are shared by all sessions and run on job workers: python scripts/run_jobs.py work",
+        "jobs_empty": "No jobs for this project yet.",
+        "job_load_btn": "Load Result",
+        "job_cancel_btn": "Cancel Job",
+        "job_loaded_mc": "Simulation result loaded. See the results tab.",
+        "job_loaded_tornado": "Tornado result loaded. See the tornado tab.",
+        "col_job_id": "Job",
+        "col_job_type": "Type",
+        "col_job_status": "Status",
+        "col_job_progress": "Progress",
+        "col_job_attempts": "Attempts",
+        "col_job_queued_s": "Waited (s)",
+        "col_job_run_s": "Ran (s)",
+        "col_job_error": "Error",
+        # Live preview (input pages)
+        "live_preview_title": "Live Preview",
+        "live_preview_help": "Recalculated only when an input that affects the result changes. Sidebar data quality checks refresh on save or page change.",
+        "live_preview_failed": "Preview unavailable: {}",
+        "calc_failed": "This project cannot be calculated: {}. Fix the inputs (e.g. Project Setup > Index Curves) and come back.",
+        "preview_chart_label": "Chart",
+        "preview_chart_pl": "Revenue & EBITDA",
+        "preview_chart_fcf": "Free Cash Flow",
+        # Item drill-down
+        "drilldown_title": "Item Drill-down",
+        "drilldown_category": "Line",
+        "drilldown_top_n": "Items shown",
+        "drilldown_other": "Other",
+        "drilldown_empty": "No items in this line.",
+        "attribution_title": "EBITDA Attribution by Item",
+        "attribution_year": "Year",
+        "attribution_all_years": "All years",
+        "item_cat_revenue": "Revenue",
+        "item_cat_cogs": "COGS",
+        "item_cat_fixed_expenses": "Fixed Expenses",
+        "item_cat_personnel": "Personnel",
+        "item_cat_capex": "CAPEX (w/ VAT)",
+        "item_cat_capex_depreciation": "CAPEX Depreciation",
+        "item_cat_loan_interest": "Loan Interest",
+        "item_cat_loan_principal": "Loan Principal",
+        "item_cat_products": "Products (gross margin)",
         "baseline_toggle_label": "Enable Incremental Analysis (Baseline vs Investment)",
         "baseline_toggle_help": "If enabled, analyzes the delta between 'Existing Business' (No Capex) and 'With Investment'. Recommended for expansion or technology projects.",
         "inc_ebitda_section": "🚀 EBITDA Impact of Investment (Avg/Year)",
@@ -510,6 +688,20 @@ TRANSLATIONS = {
         "capex_impact": "Yatırım Etkisi (%)",
         "compare_btn": "Senaryoları Karşılaştır",
         "comparison_results": "Karşılaştırma Sonuçları",
+        "paired_title": "Eşleştirilmiş Monte Carlo Karşılaştırması",
+        "paired_info": "Mevcut proje ve her varyant aynı rastgele çekilişlerle (ortak rastgele sayılar) çalıştırılır; böylece NPV farkı örnekleme gürültüsünü değil varyantı yansıtır.",
+        "paired_variants": "Varyantlar",
+        "variant_without_debt": "Borçsuz",
+        "variant_baseline": "Yatırımsız (Baz)",
+        "paired_no_variants": "Varyant karşılaştırmak için kredi ekleyin veya Büyüme Analizini açın.",
+        "run_paired": "Eşleştirilmiş Simülasyonu Çalıştır",
+        "paired_col_variant": "Varyant",
+        "paired_mean_diff": "Ortalama Δ NPV",
+        "paired_ci": "%95 GA",
+        "paired_prob_better": "P(Varyant Daha İyi)",
+        "paired_var_reduction": "Varyans Azaltımı",
+        "paired_var_reduction_help": "Aynı ortalama fark hassasiyeti için iki bağımsız simülasyonun kaç kat daha fazla iterasyona ihtiyaç duyacağı.",
+        "paired_hist_title": "Mevcut Projeye Göre Δ NPV ({})",
         "risk_title": "Risk Analizi",
         "tab_sens": "Duyarlılık (Tornado)",
         "tab_mc": "Monte Carlo Simülasyonu",
@@ -528,6 +720,38 @@ TRANSLATIONS = {
         "variable_config": "Değişken Yapılandırması",
         "variable_config": "Değişken Yapılandırması",
         "dist_type": "Dağılım Tipi",
+        "dist_invalid": "Geçersiz dağılım ayarları",
+        "corr_matrix_title": "Tam Korelasyon Matrisi",
+        "corr_matrix_help": "Herhangi bir sürücü çiftini iki üçgenden birinde düzenleyin; karşı hücre güncellenir, köşegen 1 kalır.",
+        "corr_adjusted": "Bu korelasyonlar geçerli bir korelasyon matrisi oluşturmuyor. Simülasyon en yakın geçerli matrisi kullanır (çift başına en büyük değişim: {:.3f}).",
+        "paths_title": "Stokastik Kur ve Enflasyon",
+        "paths_info": "Döviz kurlarını ve enflasyonu sabit değerler yerine zaman içinde değişen patikalar olarak simüle edin. O para birimindeki krediler, yatırımlar, gelir ve giderler her dönemin simüle edilen kuruyla çevrilir; proje varsayımının üzerindeki veya altındaki enflasyon fiyatları, birim maliyetleri ve giderleri ölçekler. Patikalar korelasyon matrisinde sürücülerle ilişkilendirilebilir.",
+        "fx_path_enable": "{} kurunu simüle et",
+        "fx_process": "Süreç",
+        "fx_process_gbm": "Rastgele yürüyüş (GBM)",
+        "fx_process_mr": "Trende geri dönen",
+        "fx_drift": "Beklenen Değişim (%/yıl)",
+        "fx_volatility": "Oynaklık (%/yıl)",
+        "fx_mean_reversion": "Ortalamaya Dönüş (yıllık)",
+        "infl_path_enable": "Enflasyonu simüle et (proje enflasyon oranı etrafında)",
+        "infl_volatility": "Enflasyon Oynaklığı (puan/yıl)",
+        "infl_mean_reversion": "Enflasyonun Ortalamaya Dönüşü (yıllık)",
+        "fx_path_var": "Kur {}",
+        "var_inflation": "Enflasyon",
+        "paths_scatter_expander": "NPV ve Kur / Enflasyon Patikaları",
+        "paths_scatter_var": "Patika Sonucu",
+        "shocks_title": "Hedefli Şoklar",
+        "shocks_info": "Tek bir ürünü, CAPEX / gider kategorisini veya kredi faizini belirli yıllarda şoklayın. Her dönem yeni bir sapma çekilir; otokorelasyon bir önceki yıla bağlılığı belirler.",
+        "shocks_invalid": "Geçersiz şok",
+        "col_shock_name": "Şok",
+        "col_shock_target": "Hedef",
+        "col_shock_target_help": "ProductPrice / ProductVolume / ProductCost, CapexCategory, ExpenseCategory veya LoanRate (ortalama ve std. sapma faiz puanı olarak)",
+        "col_shock_item": "Kalem",
+        "col_shock_item_help": "Ürün veya kredi adı, CAPEX veya gider kategorisi; boş = tümü",
+        "col_start_year": "Başlangıç Yılı",
+        "col_end_year": "Bitiş Yılı",
+        "col_shock_autocorr": "Otokorelasyon",
+        "col_shock_autocorr_help": "Yıldan yıla kalıcılık: 0 = her dönem bağımsız, 1 = tüm aralık için tek şok",
         
         # Terminal Value
         "tv_title": "Terminal Değer (Vade Sonu)",
@@ -565,7 +789,6 @@ TRANSLATIONS = {
         "mc_results_tab": "MC Sonuçları",
         "correlations": "Korelasyonlar",
         "corr_info": "Ana değişkenler arası ilişkiyi belirleyin (Örn: Fiyat artarsa Hacim düşer).",
-        "corr_price_vol": "Korelasyon: Fiyat <-> Hacim",
         "run_sim_btn": "Simülasyonu Başlat",
         "running_sim": "Simülasyon çalışıyor...",
         "sim_success": "Simülasyon Tamamlandı! Sonuçlar sekmesine geçebilirsiniz.",
@@ -600,6 +823,66 @@ TRANSLATIONS = {
         "var_price": "Fiyat",
         "var_capex": "Yatırım (CAPEX)",
         "var_opex": "Giderler (OPEX)",
+        "var_discount_rate": "İskonto Oranı",
+        "var_interest_rate": "Kredi Faiz Oranı",
+        "var_loan_term": "Kredi Vadesi (Yıl)",
+
+        # Grid Sensitivity
+        "tab_grid": "Izgara Duyarlılık",
+        "grid_title": "İki Yönlü Duyarlılık (Veri Tablosu)",
+        "grid_info": "İki sürücünün tüm kombinasyonlarını hesaplar. Fiyat/Hacim/CAPEX/OPEX için çarpan (1.0 = baz senaryo); oranlar % ve vade yıl olarak girilir.",
+        "grid_x_var": "X Ekseni Sürücüsü",
+        "grid_y_var": "Y Ekseni Sürücüsü",
+        "grid_from": "Başlangıç",
+        "grid_to": "Bitiş",
+        "grid_steps": "Adım",
+        "grid_metric": "Metrik",
+        "run_grid": "Izgara Duyarlılığını Çalıştır",
+        "grid_same_driver": "Lütfen iki farklı sürücü seçin.",
+        "grid_chart_title": "{} ({} ve {} bazında)",
+        "min_dscr_label": "Min DSCR",
+
+        # Global Sensitivity (Sobol)
+        "tab_sobol": "Global Duyarlılık",
+        "sobol_title": "Varyans Tabanlı Duyarlılık (Sobol Endeksleri)",
+        "sobol_info": "Monte Carlo kurulumundaki dağılımları kullanarak sonucun dağılımını hangi belirsizliğin gerçekten belirlediğini gösterir. Birinci derece = değişkenin tek başına açıkladığı varyans payı; Toplam = diğerleriyle etkileşimleri dahil.",
+        "sobol_samples": "Temel Örneklem Büyüklüğü",
+        "run_sobol": "Global Duyarlılığı Çalıştır",
+        "sobol_first_order": "Birinci Derece (S1)",
+        "sobol_total": "Toplam (ST)",
+        "sobol_chart_title": "Sobol Endeksleri ({})",
+        "sobol_corr_warning": "Monte Carlo kurulumundaki korelasyonlar uygulanmaz: Sobol endeksleri bağımsız girdiler varsayar.",
+        "sobol_evals": "{:,} model hesaplaması ({:,} temel örnek)",
+        "sobol_independence_note": "Endeksler bağımsız girdiler varsayar: her değişken ayrı örneklenir ve Monte Carlo kurulumundaki korelasyonlar uygulanmaz.",
+
+        # Break-even
+        "be_title": "Başabaş Noktası (NPV = 0)",
+        "be_help": "Diğer tüm sürücüler baz senaryoda iken NPV'yi sıfıra indiren değişim. İskonto oranı için oranın kendisi gösterilir.",
+        "be_not_found": "yok",
+        "be_not_found_help": "NPV, aranan aralıkta sıfırı geçmiyor.",
+
+        # Debt Sizing
+        "ds_title": "Borç Boyutlandırma (DSCR / Borçlanma Oranı)",
+        "ds_info": "Her ödeme tipi, vade ve ödemesiz dönem için DSCR ve borçlanma oranını kovenant sınırları içinde tutan en yüksek kredi tutarını bulur. Borçlanma oranı = toplam borç / toplam CAPEX.",
+        "ds_loan": "Boyutlandırılacak Kredi",
+        "ds_min_dscr": "Minimum DSCR",
+        "ds_max_gearing": "Maksimum Borçlanma Oranı (%)",
+        "ds_gearing_covenant": "Borçlanma oranı şartı",
+        "ds_gearing_covenant_help": "Kapalı: borçlanma oranı sınırı yok, kredi tutarını yalnızca DSCR şartı sınırlar.",
+        "ds_test_years": "DSCR Test Yılları",
+        "ds_test_repayment": "Geri ödeme yılları",
+        "ds_test_all": "Borç servisi olan tüm yıllar",
+        "ds_objective": "Hedef",
+        "ds_obj_max_debt": "Borcu maksimize et",
+        "ds_obj_equity_irr": "Özkaynak IRR'ını maksimize et",
+        "ds_max_term": "Maksimum Vade (Yıl)",
+        "ds_max_grace": "Maksimum Ödemesiz Dönem (Yıl)",
+        "run_ds": "Borcu Boyutlandır",
+        "ds_running": "Borç boyutlandırılıyor...",
+        "ds_no_result": "Kovenantları sağlayan yapı bulunamadı.",
+        "ds_apply": "En İyi Yapıyı Uygula",
+        "ds_applied": "Kredi en iyi yapı ile güncellendi.",
+        "ds_evals": "{:,} yapı hesaplandı",
         
         # Data Columns (Product Editor)
         "col_prod_name": "Ürün Adı",
@@ -708,6 +991,22 @@ TRANSLATIONS = {
         "project_horizon_help": "Analizin kapsadığı toplam yıl süresi.",
         "base_currency_help": "Raporlama ve sonuçların toplanması için kullanılan ana para birimi.",
         "inflation_rate_help": "Özel bir artış oranı girilmediyse maliyet ve fiyatlara uygulanan genel enflasyon.",
+        "index_curves_title": "Endeks Eğrileri (TÜFE, ücret, ...)",
+        "index_curves_help": "Kalemler arasında paylaşılan, yıldan yıla oran eğrileri; örn. TUFE-TR = 45, 30, 20. İlk oran 1. yıldan 2. yıla geçişte uygulanır; son oran vadenin sonuna kadar devam eder. Ürünler, giderler ve personel tek bir artış oranı yerine bir eğriye bağlanabilir.",
+        "col_curve_name": "Eğri Adı",
+        "col_curve_rates": "Oranlar (%/yıl, virgülle ayrılmış)",
+        "col_curve_rates_help": "Yıldan yıla oranlar (%), 2. yıla geçişle başlar.",
+        "curve_rates_invalid": "'{}' eğrisi sayısal oranlar gerektirir (örn. 45, 30, 20).",
+        "curve_missing": "'{}' eğrisi {} tarafından kullanılıyor ancak artık tanımlı değil.",
+        "curve_in_use": "'{}' eğrisi {} tarafından kullanıldığı için korundu. Silmeden veya yeniden adlandırmadan önce bu kalemleri başka bir eğriye bağlayın.",
+        "curve_unknown": "Bilinmeyen endeks eğrisi: {}",
+        "col_vol_curve": "Hacim Eğrisi",
+        "col_price_curve": "Fiyat Eğrisi",
+        "col_cost_curve": "Maliyet Eğrisi",
+        "curve_ref_help": "İsteğe bağlı: Proje Ayarları'ndaki bir eğri adı veya % oranlar (örn. 45, 30, 20). Girilirse artış oranının yerine geçer.",
+        "growth_curve": "Artış Eğrisi",
+        "raise_curve": "Zam Eğrisi",
+        "curve_none": "— Yukarıdaki oranı kullan —",
         "discount_rate_help": "Gelecekteki nakit akışlarını bugüne indirgemek için kullanılan oran.",
         
         "vat_rate_help": "Bu kaleme uygulanan KDV oranı.",
@@ -770,7 +1069,13 @@ TRANSLATIONS = {
         "risk_decision_title": "🛡️ Karar Destek & Risk Özeti",
         "prob_loss_msg": "📉 **Bu yatırımın %{prob:.1f} olasılıkla değeri negatife düşer (NPV < 0).**",
         "var_msg": "⚠️ **Riske Maruz Değer (VaR 95%):** En kötü %5 senaryoda zarar en az **{amy}** olacak.",
-        "dist_explanation": "ℹ️ **Dağılımlar:**\n\n* **Normal:** Standart belirsizlikler (Enflasyon vb.) için uygundur.\n* **Üçgen (Triangular):** Alt ve üst sınırları tecrübeyle bilinen tahminler (İnşaat maliyeti vb.) için uygundur.",
+        "mc_importance": "Zarar kuyruğuna odaklan (önem örneklemesi)",
+        "mc_importance_help": "Zarar bölgesinin yakınından daha sık örnek alır ve her çekilişi olabilirlik oranıyla yeniden ağırlıklandırır. Sağlam projelerde aynı iterasyon sayısıyla çok daha hassas bir zarar olasılığı verir.",
+        "mc_is_caption": "Önem örneklemesi: {n:,} çekilişten etkin örneklem büyüklüğü {ess:,.0f}. P(NPV < 0) = %{p:.3f} ± %{se:.3f} (≈ {eq:,.0f} düz iterasyon kadar hassas).",
+        "mc_kde": "Yoğunluk (KDE)",
+        "mc_quantiles": "NPV Yüzdelikleri",
+        "mc_sample_caption": "Dağılım grafikleri {total:,} iterasyondan katmanlı {n:,} noktalık bir örnek gösterir (uçlar dahil).",
+        "dist_explanation": "ℹ️ **Dağılımlar:**\n\n* **Normal:** Standart belirsizlikler (Enflasyon vb.) için uygundur.\n* **Üçgen (Triangular):** Alt ve üst sınırları tecrübeyle bilinen tahminler (İnşaat maliyeti vb.) için uygundur.\n* **PERT:** Üçgen gibi (min / en olası / maks) ancak daha yumuşak; uç değerlere daha az ağırlık verir.",
         
         "insights_title": "💡 Akıllı Analiz (Insights)",
         "insight_tv_dominance": "⚠️ **Terminal Değer Baskınlığı:** Proje değerinin (NPV) %{ratio:.0f}'i Terminal Değer'den geliyor. Çıkış çarpanı veya büyüme varsayımlarına karşı çok hassas.",
@@ -792,6 +1097,53 @@ TRANSLATIONS = {
         "lbl_net_interest": "Net Faiz Gideri",
         "lbl_fcff_subtotal": "FCFF (Firma)",
         "lbl_fcfe_final": "FCFE (Özkaynak)",
+        # Background jobs
+        "queue_tornado_btn": "Arka Planda Kuyruğa Al",
+        "queue_mc_btn": "Simülasyonu Arka Planda Kuyruğa Al",
+        "queue_job_help": "Bir iş çalıştırıcısında (python scripts/run_jobs.py work) çalışır ve sonuç bu oturum bittikten sonra da saklanır. Değişmemiş bir projenin aynı analizi iki kez kuyruğa alınmaz.",
+        "job_queued": "{} numaralı iş kuyruğa alındı.",
+        "job_exists": "Aynı analiz zaten kuyrukta veya tamamlandı ({} numaralı iş).",
+        "jobs_title": "Arka Plan İşleri",
+        "jobs_info": "İşler tüm oturumlarca paylaşılır ve iş çalıştırıcılarında yürütülür: python scripts/run_jobs.py work",
+        "jobs_empty": "Bu proje için henüz iş yok.",
+        "job_load_btn": "Sonucu Yükle",
+        "job_cancel_btn": "İşi İptal Et",
+        "job_loaded_mc": "Simülasyon sonucu yüklendi. Sonuçlar sekmesine bakın.",
+        "job_loaded_tornado": "Tornado sonucu yüklendi. Tornado sekmesine bakın.",
+        "col_job_id": "İş",
+        "col_job_type": "Tür",
+        "col_job_status": "Durum",
+        "col_job_progress": "İlerleme",
+        "col_job_attempts": "Deneme",
+        "col_job_queued_s": "Bekleme (sn)",
+        "col_job_run_s": "Çalışma (sn)",
+        "col_job_error": "Hata",
+        # Live preview (input pages)
+        "live_preview_title": "Canlı Önizleme",
+        "live_preview_help": "Yalnızca sonucu etkileyen bir girdi değiştiğinde yeniden hesaplanır. Kenar çubuğundaki veri kalitesi kontrolleri kaydetme veya sayfa değişiminde yenilenir.",
+        "live_preview_failed": "Önizleme hesaplanamadı: {}",
+        "calc_failed": "Bu proje hesaplanamıyor: {}. Girdileri düzeltip (örn. Proje Kurulumu > Endeks Eğrileri) tekrar deneyin.",
+        "preview_chart_label": "Grafik",
+        "preview_chart_pl": "Gelir ve FAVÖK",
+        "preview_chart_fcf": "Serbest Nakit Akışı",
+        # Item drill-down
+        "drilldown_title": "Kalem Bazında Detay",
+        "drilldown_category": "Kalem Grubu",
+        "drilldown_top_n": "Gösterilen kalem sayısı",
+        "drilldown_other": "Diğer",
+        "drilldown_empty": "Bu grupta kalem yok.",
+        "attribution_title": "Kalem Bazında FAVÖK Dağılımı",
+        "attribution_year": "Yıl",
+        "attribution_all_years": "Tüm yıllar",
+        "item_cat_revenue": "Gelir",
+        "item_cat_cogs": "SMM",
+        "item_cat_fixed_expenses": "Sabit Giderler",
+        "item_cat_personnel": "Personel",
+        "item_cat_capex": "CAPEX (KDV dahil)",
+        "item_cat_capex_depreciation": "CAPEX Amortismanı",
+        "item_cat_loan_interest": "Kredi Faizi",
+        "item_cat_loan_principal": "Kredi Anapara",
+        "item_cat_products": "Ürünler (brüt kâr)",
         "baseline_toggle_label": "Mevcut İş / Baz Senaryo Karşılaştırması (Growth Mode)",
         "baseline_toggle_help": "İşaretlenirse, 'Mevcut Durum' (Yatırımsız) ile 'Yatırımlı Durum' arasındaki farkı analiz eder. Teknoloji yatırımları ve kapasite artışları için önerilir.",
         "inc_ebitda_section": "🚀 Yatırımın FAVÖK Etkisi (Yıllık Ort.)",
@@ -823,6 +1175,73 @@ TRANSLATIONS = {
     },
 }
 
+# --- Compiled Lookup Tables ---
+# TRANSLATIONS is the editable source. At import time it is flattened into one
+# immutable table per language with the fallback chain already merged in, so a
+# lookup is a single dict access regardless of which language provided the text.
+
+DEFAULT_LANGUAGE = "en"
+
+# Languages are tried left to right; the key itself is the final fallback
+FALLBACK_CHAIN = {
+    "en": ("en",),
+    "tr": ("tr", "en"),
+}
+
+def _build_tables():
+    tables = {}
+    for lang in TRANSLATIONS:
+        chain = FALLBACK_CHAIN.get(lang, (lang, DEFAULT_LANGUAGE))
+        merged = {}
+        for source in reversed(chain):
+            merged.update(TRANSLATIONS.get(source, {}))
+        tables[lang] = MappingProxyType(merged)
+    return MappingProxyType(tables)
+
+_TABLES = _build_tables()
+
+# Templated strings ("... {} ...") pre-bound to str.format
+_FORMATTERS = MappingProxyType({
+    lang: MappingProxyType({k: v.format for k, v in table.items() if "{" in v})
+    for lang, table in _TABLES.items()
+})
+
+# Keys requested at runtime that no language in the chain provides
+_missing_keys = {}
+
+def _table(lang):
+    return _TABLES.get(lang) or _TABLES[DEFAULT_LANGUAGE]
+
 def get_text(key, lang="en"):
     """Retrieves the translation for a key in the specified language."""
-    return TRANSLATIONS.get(lang, {}).get(key, key)
+    try:
+        return _table(lang)[key]
+    except KeyError:
+        _missing_keys.setdefault(lang, set()).add(key)
+        return key
+
+def format_text(key, lang="en", *args, **kwargs):
+    """get_text + str.format for templated strings (uses the pre-bound formatter)."""
+    formatter = _FORMATTERS.get(lang, _FORMATTERS[DEFAULT_LANGUAGE]).get(key)
+    if formatter is None:
+        return get_text(key, lang)
+    return formatter(*args, **kwargs)
+
+def get_texts(keys, lang="en"):
+    """
+    Bulk lookup for table headers / option lists.
+    A list of keys returns a list; a mapping {column: key} returns {column: text}
+    (ready for DataFrame.rename).
+    """
+    table = _table(lang)
+    if isinstance(keys, Mapping):
+        return {col: table[k] if k in table else get_text(k, lang) for col, k in keys.items()}
+    return [table[k] if k in table else get_text(k, lang) for k in keys]
+
+def get_missing_keys():
+    """Keys looked up at runtime without any translation, per language."""
+    return {lang: sorted(keys) for lang, keys in _missing_keys.items()}
+
+def find_untranslated(lang, reference=DEFAULT_LANGUAGE):
+    """Keys defined in `reference` but not in `lang` itself (served by fallback)."""
+    return sorted(set(TRANSLATIONS.get(reference, {})) - set(TRANSLATIONS.get(lang, {})))